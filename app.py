@@ -3,37 +3,11 @@ from flask_cors import CORS
 import os
 import platform
 import socket
-from datetime import datetime
-import tempfile
-import glob
 
 app = Flask(__name__)
 CORS(app)
 
 
-def cleanup_orphaned_temp_files() -> None:
-    """clean up any orphaned temporary files from previous runs"""
-    try:
-        temp_dir = tempfile.gettempdir()
-        pattern = os.path.join(temp_dir, "tmp*.py")
-        orphaned_files = glob.glob(pattern)
-        cleaned_count = 0
-        for temp_file in orphaned_files:
-            try:
-                file_age = datetime.now().timestamp() - os.path.getmtime(temp_file)
-                if file_age > 3600:
-                    os.unlink(temp_file)
-                    cleaned_count += 1
-            except Exception:
-                pass
-        # only log warnings/errors; skip routine info about cleanup
-    except Exception as e:
-        print(f"warning: could not clean up orphaned temp files: {e}")
-
-
-# clean on startup
-cleanup_orphaned_temp_files()
-
 # register blueprints
 from backend.routes.ui import ui_bp  # noqa: E402
 from backend.routes.flowcharts import flowcharts_bp  # noqa: E402
@@ -105,7 +105,7 @@ def analyze_python_function():
                                 top_level_input_calls.append(variable_name.lower())
 
         for node in tree.body:
-            if isinstance(node, ast.FunctionDef):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 formal_params = [arg.arg for arg in node.args.args]
                 input_calls = []
                 input_variable_names = []
@@ -136,7 +136,7 @@ def analyze_python_function():
                         extract_returns_from_statement(child, items)
                         direct_return_groups.append(items)
                 returns = direct_return_groups[-1] if direct_return_groups else []
-                functions.append({'name': node.name, 'parameters': all_parameters, 'formal_parameters': formal_params, 'input_calls': input_calls, 'input_variable_names': input_variable_names, 'input_variable_details': input_variable_details, 'returns': returns, 'line': node.lineno})
+                functions.append({'name': node.name, 'parameters': all_parameters, 'formal_parameters': formal_params, 'input_calls': input_calls, 'input_variable_names': input_variable_names, 'input_variable_details': input_variable_details, 'returns': returns, 'line': node.lineno, 'is_async': isinstance(node, ast.AsyncFunctionDef)})
 
         if not functions and top_level_input_vars:
             top_level_input_details = []
@@ -163,6 +163,7 @@ def analyze_python_function():
             'input_variable_names': target_function.get('input_variable_names', []),
             'input_variable_details': target_function.get('input_variable_details', []),
             'returns': target_function.get('returns', []),
+            'is_async': target_function.get('is_async', False),
             'line': target_function['line'],
             'total_lines': total_lines
         })
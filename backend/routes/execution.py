@@ -1,16 +1,31 @@
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, jsonify, request, current_app, Response, stream_with_context
 import os
 import subprocess
 import sys
-from datetime import datetime
+import time
+import uuid
+from datetime import datetime, timedelta
 
-from ..services.storage import DEFAULT_FLOWCHART, load_flowchart, save_flowchart, save_execution_history, get_execution_history, delete_execution_history
+from ..services.storage import DEFAULT_FLOWCHART, load_flowchart, save_execution_history, get_execution_entry, get_execution_summaries, delete_execution_history
 from ..services.processes import (
     execute_python_function_with_tracking,
     stop_all_processes,
-    create_temp_execution_script,
-    start_unbuffered_process,
+    stop_processes_with_prefix,
+    prepare_function_call,
+    start_runner_process,
+    build_node_result,
+    ms_since,
+    OutputRing,
+    iter_process_output,
+    stream_buffer_bytes,
 )
+from ..services.worker_pool import get_worker_pool, pool_settings
+from ..services.cache import cache_policy, get_result_cache, run_cached
+from ..services.flow_runs import FlowRun
+from ..services.events import EventLog, sse_stream
+from ..services.artifacts import ArtifactStore, artifact_settings
+from ..services.mapping import MAP_NODE_TYPE, run_map_node
+from ..services.data_matrix import data_matrix_page, iter_csv, iter_jsonl
 
 
 execution_bp = Blueprint('execution', __name__, url_prefix='/api')
@@ -28,48 +43,77 @@ def run_flowchart():
     execution_order = data.get('execution_order', [])
     if not execution_order:
         return jsonify({"status": "error", "message": "no nodes provided for execution"}), 400
-    flowchart_data = load_flowchart(flowchart_name)
-    node_lookup = {node['id']: node for node in flowchart_data['nodes']}
-    results = []
-    for i, node_id in enumerate(execution_order):
-        if node_id not in node_lookup:
-            return jsonify({"status": "error", "message": f"node {node_id} not found", "results": results, "failed_at_index": i}), 404
-        node = node_lookup[node_id]
-        python_file = node.get('pythonFile')
-        if not python_file:
-            return jsonify({"status": "error", "message": f"node {node.get('name', node_id)} has no python file assigned", "results": results, "failed_at_index": i}), 400
+    flow_run = FlowRun(data, flowchart_name, execution_order, data.get('variables') or {}, running_processes, process_lock)
+    invalid = flow_run.validate()
+    if invalid is not None:
+        return jsonify(invalid['body']), invalid['code']
+    try:
+        return jsonify(flow_run.run())
+    except Exception as e:
+        return jsonify({"status": "error", "message": f"failed to execute flowchart: {str(e)}", "results": []})
+
+
+# executor event names as sent to /api/run-stream clients
+RUN_STREAM_EVENTS = {'node_result': 'result'}
+# console lines are live-only: the log keeps just the newest ones (see events.py)
+RUN_STREAM_TRANSIENT = ('stdout', 'stderr')
+
+
+@execution_bp.route('/run-stream', methods=['POST'])
+def run_flowchart_stream():
+    """run the whole flow server-side and stream every node's events over one sse response.
+
+    events: node_start, stdout, stderr, result, condition, node_skipped and a
+    final done carrying the outcome and final variables. dropping the
+    connection cancels the run and stops its processes.
+    """
+    data = request.json or {}
+    flowchart_name = data.get('flowchart_name', DEFAULT_FLOWCHART)
+    execution_order = data.get('execution_order', [])
+    if not execution_order:
+        return jsonify({"status": "error", "message": "no nodes provided for execution"}), 400
+    log = EventLog(transient=RUN_STREAM_TRANSIENT)
+    cancel_event = threading.Event()
+    tracking_prefix = f"stream:{uuid.uuid4()}:"
+
+    def on_event(event, payload):
+        log.publish(RUN_STREAM_EVENTS.get(event, event), payload)
+
+    flow_run = FlowRun(
+        data, flowchart_name, execution_order, data.get('variables') or {}, running_processes, process_lock,
+        tracking_prefix=tracking_prefix, on_event=on_event, cancel_event=cancel_event,
+        stream_output=True, evaluate_conditions=True,
+    )
+    invalid = flow_run.validate()
+    if invalid is not None:
+        return jsonify(invalid['body']), invalid['code']
+
+    app = current_app._get_current_object()
+
+    def work():
+        with app.app_context():
+            try:
+                outcome = flow_run.run()
+                outcome['final_variables'] = flow_run.final_variables()
+            except Exception as e:
+                outcome = {"status": "error", "message": f"failed to execute flowchart: {str(e)}", "results": []}
+        # results were already streamed one by one
+        outcome.pop('results', None)
+        log.publish('done', outcome, close=True)
+
+    threading.Thread(target=work, name='flowcraft-run-stream', daemon=True).start()
+
+    def event_stream():
         try:
-            normalized_python_file = python_file.replace('\\', '/')
-            import re as _re
-            normalized_python_file = _re.sub(r'^(?:nodes/)+', 'nodes/', normalized_python_file)
-            project_root = current_app.config.get('FLOWCRAFT_PROJECT_ROOT') or os.getcwd()
-            # resolve relative to project root regardless of prefix
-            rel = _re.sub(r'^(?:nodes/)+', '', normalized_python_file)
-            file_path = os.path.normpath(os.path.join(project_root, rel))
-            if not os.path.exists(file_path):
-                return jsonify({"status": "error", "message": f"python file not found: {python_file}", "results": results, "failed_at_index": i}), 404
-            # use the tracking function to get line number information
-            result = execute_python_function_with_tracking(file_path, {}, {}, node_id, running_processes, process_lock)
-            node_result = {
-                "node_id": node_id,
-                "node_name": node.get('name', 'unknown'),
-                "python_file": python_file,
-                "success": result.get('success', False),
-                "output": result.get('output', ''),
-                "error": result.get('error'),
-                "error_line": result.get('error_line'),
-                "error_file": result.get('error_file'),
-                "return_value": result.get('return_value'),
-                "index": i
-            }
-            results.append(node_result)
-            if not result.get('success', False):
-                return jsonify({"status": "failed", "message": f"execution stopped at node {node.get('name', node_id)} (index {i})", "results": results, "failed_at_index": i, "total_nodes": len(execution_order), "completed_nodes": i + 1})
-        except subprocess.TimeoutExpired:
-            return jsonify({"status": "error", "message": f"node {node.get('name', node_id)} timed out after 30 seconds", "results": results, "failed_at_index": i})
-        except Exception as e:
-            return jsonify({"status": "error", "message": f"failed to execute node {node.get('name', node_id)}: {str(e)}", "results": results, "failed_at_index": i})
-    return jsonify({"status": "success", "message": f"successfully executed all {len(execution_order)} nodes", "results": results, "total_nodes": len(execution_order), "completed_nodes": len(execution_order)})
+            yield from sse_stream(log)
+        finally:
+            if not log.closed:
+                # client went away mid-run
+                cancel_event.set()
+                stop_processes_with_prefix(running_processes, process_lock, tracking_prefix)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(event_stream(), mimetype='text/event-stream', headers=headers)
 
 
 @execution_bp.route('/execute-node', methods=['POST'])
@@ -89,8 +133,11 @@ def execute_node():
     file_path = os.path.normpath(os.path.join(project_root, rel))
     if not os.path.exists(file_path):
         return jsonify({'success': False, 'error': f'python file not found: {python_file}'}), 404
+    def _execute():
+        return execute_python_function_with_tracking(file_path, function_args, input_values, node_id, running_processes, process_lock)
+    enabled, ttl = cache_policy({'cache': data.get('cache')} if 'cache' in data else None, data.get('use_cache', False))
     try:
-        result = execute_python_function_with_tracking(file_path, function_args, input_values, node_id, running_processes, process_lock)
+        result = run_cached(get_result_cache() if enabled else None, ttl, file_path, function_args, input_values, _execute)
         return result
     except Exception as e:
         return jsonify({'success': False, 'error': f'failed to execute node: {str(e)}'}), 500
@@ -115,12 +162,30 @@ def execute_node_stream():
     if not os.path.exists(file_path):
         return jsonify({'success': False, 'error': f'python file not found: {python_file}'}), 404
 
-    meta = create_temp_execution_script(file_path, function_args, input_values)
+    meta = prepare_function_call(file_path, function_args)
     if 'error' in meta:
         return jsonify({'success': False, 'error': meta['error']}), 400
 
-    temp_script_path = meta['temp_script_path']
-    proc = start_unbuffered_process(temp_script_path)
+    from flask import Response
+    import json as _json
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+    enabled, ttl = cache_policy({'cache': data.get('cache')} if 'cache' in data else None, data.get('use_cache', False))
+    result_cache = get_result_cache() if enabled else None
+    cache_key = None
+    if result_cache is not None:
+        cache_key = result_cache.make_key(file_path, meta['function_name'], meta['call_args'], input_values or {})
+        hit = result_cache.get(cache_key, ttl)
+        if hit is not None:
+            # nothing to stream on a hit; replay the stored result as the only event
+            return Response(iter([f"event: result\ndata: {_json.dumps(hit)}\n\n"]), mimetype='text/event-stream', headers=headers)
+
+    started = time.perf_counter()
+    proc = start_runner_process(file_path, meta['function_name'], meta['call_args'], input_values, unbuffered=True)
+    try:
+        proc.stdin.close()
+    except Exception:
+        pass
 
     # register running process for stop support
     with process_lock:
@@ -128,89 +193,79 @@ def execute_node_stream():
             'process': proc,
             'start_time': datetime.now(),
             'file_path': file_path,
-            'temp_script_path': temp_script_path
         }
 
+    buffer_bytes = stream_buffer_bytes()
+
     def event_stream():
         try:
-            all_stdout_parts = []
-            # stream stdout lines
-            if proc.stdout is not None:
-                for line in proc.stdout:
-                    if not line:
-                        break
-                    all_stdout_parts.append(line)
-                    yield f"event: stdout\ndata: {line.rstrip()}\n\n"
-            # wait for process completion to collect remaining output/error and final result
+            # drain stdout and stderr together; keep only a bounded tail of each for the result
+            console = {'stdout': OutputRing(buffer_bytes), 'stderr': OutputRing(buffer_bytes)}
+            for stream_name, line in iter_process_output(proc):
+                console[stream_name].append(line)
+                yield f"event: {stream_name}\ndata: {line.rstrip()}\n\n"
             proc.wait()
-            stdout = ''.join(all_stdout_parts)
-            stderr = ''
-            try:
-                if proc.stdout:
-                    try:
-                        remaining = proc.stdout.read()
-                        if remaining:
-                            stdout += remaining
-                    except Exception:
-                        pass
-                if proc.stderr:
-                    stderr = proc.stderr.read() or ''
-            except Exception:
-                pass
+            stdout = console['stdout'].text()
+            stderr = console['stderr'].text()
 
-            # parse embedded result if present
-            result_data = None
-            if "__RESULT_START__" in stdout and "__RESULT_END__" in stdout:
-                result_start = stdout.find("__RESULT_START__") + len("__RESULT_START__")
-                result_end = stdout.find("__RESULT_END__")
-                result_json = stdout[result_start:result_end].strip()
-                try:
-                    import json as _json
-                    result_data = _json.loads(result_json)
-                    console_output = stdout[:stdout.find("__RESULT_START__")].strip()
-                    if stdout[result_end + len("__RESULT_END__"):].strip():
-                        console_output += stdout[result_end + len("__RESULT_END__"):].strip()
-                    result_data['output'] = console_output
-                    result_data['error'] = stderr if stderr else result_data.get('error')
-                except Exception:
-                    pass
-            if result_data is None:
-                result_data = {
-                    'success': proc.returncode == 0,
-                    'output': stdout,
-                    'error': stderr if stderr else None,
-                    'return_value': None,
-                }
+            # the result arrives on its own channel; stdout is pure user output
+            result_data = build_node_result(proc.result_channel.result(), stdout, stderr, proc.returncode, ms_since(started))
+            if console['stdout'].truncated or console['stderr'].truncated:
+                result_data['output_truncated'] = True
 
             # clean up from running processes
             with process_lock:
                 running_processes.pop(node_id, None)
 
-            import json as _json
+            if cache_key is not None and result_data.get('success'):
+                result_cache.put(cache_key, result_data)
             yield f"event: result\ndata: {_json.dumps(result_data)}\n\n"
         finally:
-            # ensure temp file is removed
-            try:
-                if temp_script_path and os.path.exists(temp_script_path):
-                    os.unlink(temp_script_path)
-            except Exception:
-                pass
+            # make sure an abandoned stream does not leave the node running or tracked
+            if proc.poll() is None:
+                try:
+                    proc.kill()
+                except Exception:
+                    pass
+            with process_lock:
+                running_processes.pop(node_id, None)
 
-    from flask import Response
-    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     return Response(event_stream(), mimetype='text/event-stream', headers=headers)
 
 
 @execution_bp.route('/stop-execution', methods=['POST'])
 def stop_execution():
-    terminated = 0
-    cleaned = 0
-    import threading as _t
     with process_lock:
         outcome = stop_all_processes(running_processes)
-        terminated = outcome.get('terminated', 0)
-        cleaned = outcome.get('cleaned_files', 0)
-    return jsonify({'status': 'success', 'message': f'terminated {terminated} running processes, cleaned up {cleaned} temporary files'})
+    terminated = outcome.get('terminated', 0)
+    return jsonify({'status': 'success', 'message': f'terminated {terminated} running processes'})
+
+
+@execution_bp.route('/worker-pool', methods=['GET'])
+def worker_pool_status():
+    """report warm interpreter pool settings and per-zygote run counts"""
+    pool = get_worker_pool()
+    if pool is None:
+        return jsonify({'status': 'success', 'enabled': False, 'settings': pool_settings()})
+    return jsonify({'status': 'success', 'enabled': True, 'pool': pool.stats()})
+
+
+@execution_bp.route('/cache', methods=['GET'])
+def result_cache_status():
+    """report node result cache size and hit/miss counters"""
+    return jsonify({'status': 'success', 'cache': get_result_cache().stats()})
+
+
+@execution_bp.route('/cache', methods=['DELETE'])
+def clear_result_cache():
+    removed = get_result_cache().clear()
+    return jsonify({'status': 'success', 'message': f'removed {removed} cached results'})
+
+
+@execution_bp.route('/artifacts', methods=['GET'])
+def artifact_store_status():
+    """report how many return value artifacts are stored and their total size"""
+    return jsonify({'status': 'success', 'artifacts': ArtifactStore(artifact_settings()['artifact_dir']).stats()})
 
 
 @execution_bp.route('/save-execution', methods=['POST'])
@@ -226,61 +281,70 @@ def save_execution():
         return jsonify({'status': 'error', 'message': f'failed to save execution: {str(e)}'}), 500
 
 
+MAX_HISTORY_PAGE = 1000
+
+
+def _history_bound(value, end_of_day=False):
+    """an iso date or datetime from the query string; a bare date as an `until` bound covers that whole day.
+
+    run timestamps are stored as naive server-local iso strings, so a value with
+    an offset (`+02:00`, `Z`) is converted to local time before it is compared.
+    """
+    if not value:
+        return None
+    # fromisoformat only reads a `Z` suffix from python 3.11 on
+    parsed = datetime.fromisoformat(value[:-1] + '+00:00' if value[-1:] in ('Z', 'z') else value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed.isoformat()
+
+
+def _history_list_item(summary):
+    item = dict(summary)
+    item.setdefault('resources', {})
+    try:
+        item['saved_at'] = datetime.fromisoformat(summary.get('timestamp', '')).strftime('%Y-%m-%d %H:%M:%S')
+    except Exception:
+        item['saved_at'] = summary.get('timestamp', '')
+    return item
+
+
 @execution_bp.route('/history', methods=['GET'])
 def get_history():
+    """run summaries for a flowchart, newest first, read from the summaries stored with each run.
+
+    query: limit + before (cursor from `next_before`) for pages, status (comma
+    separated), since / until (iso date or datetime; a bare `until` date is
+    inclusive), failed_node, and fields (comma separated) to project each item.
+    without limit every run is returned.
+    """
     flowchart_name = request.args.get('flowchart_name', DEFAULT_FLOWCHART)
     try:
-        history_entries = get_execution_history(flowchart_name)
-        processed_entries = []
-        for entry in history_entries:
-            try:
-                execution_data = entry.get('execution_data', {})
-                execution_order = execution_data.get('execution_order', []) or []
-                total_nodes = len(execution_order)
-                results = execution_data.get('results', []) or []
-                # exclude data_save nodes: only consider nodes that are part of the execution order
-                order_id_set = set(execution_order)
-                results_in_order = [r for r in results if r.get('node_id') in order_id_set]
-                successful_nodes = len([r for r in results_in_order if r.get('success', False)])
-                success_percentage = (successful_nodes / total_nodes * 100) if total_nodes > 0 else 0
-                failed_node = None
-                for result in results_in_order:
-                    if not result.get('success', False):
-                        failed_node = result.get('node_name', 'unknown')
-                        break
-                elapsed_ms = 0
-                for r in results_in_order:
-                    try:
-                        elapsed_ms += int(r.get('runtime', 0) or 0)
-                    except Exception:
-                        pass
-                def _format_elapsed(ms: int) -> str:
-                    try:
-                        ms = int(ms)
-                    except Exception:
-                        return '0.000s'
-                    seconds = ms / 1000.0
-                    return f"{seconds:.3f}s"
-                try:
-                    saved_at_human = datetime.fromisoformat(entry.get('timestamp', '')).strftime('%Y-%m-%d %H:%M:%S')
-                except Exception:
-                    saved_at_human = entry.get('timestamp', '')
-                processed_entries.append({
-                    'execution_id': entry.get('execution_id'),
-                    'timestamp': entry.get('timestamp'),
-                    'flowchart_name': entry.get('flowchart_name'),
-                    'total_nodes': total_nodes,
-                    'successful_nodes': successful_nodes,
-                    'success_percentage': round(success_percentage, 1),
-                    'failed_node': failed_node,
-                    'status': execution_data.get('status', 'unknown'),
-                    'execution_time': _format_elapsed(elapsed_ms),
-                    'elapsed_ms': elapsed_ms,
-                    'saved_at': saved_at_human
-                })
-            except Exception:
-                pass
-        return jsonify({'status': 'success', 'history': processed_entries, 'count': len(processed_entries)})
+        limit = request.args.get('limit', type=int)
+        if limit is not None:
+            limit = max(1, min(limit, MAX_HISTORY_PAGE))
+        statuses = [s for s in (request.args.get('status') or '').split(',') if s]
+        since = _history_bound(request.args.get('since'))
+        until = _history_bound(request.args.get('until'), end_of_day=True)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': f'invalid history filter: {str(e)}'}), 400
+    fields = [f for f in (request.args.get('fields') or '').split(',') if f]
+    try:
+        page, next_before = get_execution_summaries(
+            flowchart_name,
+            limit=limit,
+            before=request.args.get('before'),
+            statuses=statuses or None,
+            since=since,
+            until=until,
+            failed_node=request.args.get('failed_node') or None,
+        )
+        items = [_history_list_item(summary) for summary in page]
+        if fields:
+            items = [{key: item.get(key) for key in fields} for item in items]
+        return jsonify({'status': 'success', 'history': items, 'count': len(items), 'next_before': next_before, 'has_more': next_before is not None})
     except Exception as e:
         return jsonify({'status': 'error', 'message': f'failed to get history: {str(e)}'}), 500
 
@@ -289,30 +353,50 @@ def get_history():
 def get_execution_details(execution_id):
     flowchart_name = request.args.get('flowchart_name', DEFAULT_FLOWCHART)
     try:
-        entries = get_execution_history(flowchart_name)
-        for entry in entries:
-            if entry.get('execution_id') == execution_id:
-                return jsonify({'status': 'success', 'execution': entry})
+        entry = get_execution_entry(flowchart_name, execution_id)
+        if entry is not None:
+            return jsonify({'status': 'success', 'execution': entry})
         return jsonify({'status': 'error', 'message': 'execution not found'}), 404
     except Exception as e:
         return jsonify({'status': 'error', 'message': f'failed to get execution details: {str(e)}'}), 500
 
 
+@execution_bp.route('/data-matrix', methods=['GET'])
+def get_data_matrix():
+    """data_save values across runs, newest first, from the data save index.
+
+    json is columnar: run fields and saved variables as column names plus one
+    value array per column (see services/data_matrix.py). query: limit + before
+    for pages (like /api/history), status (comma separated), and format=csv or
+    jsonl to stream an export with one line per run (every run unless limit).
+    """
+    flowchart_name = request.args.get('flowchart_name', DEFAULT_FLOWCHART)
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = max(1, min(limit, MAX_HISTORY_PAGE))
+    statuses = [s for s in (request.args.get('status') or '').split(',') if s] or None
+    before = request.args.get('before')
+    export = request.args.get('format')
+    if export in ('csv', 'jsonl'):
+        base = flowchart_name[:-5] if flowchart_name.endswith('.json') else flowchart_name
+        lines = (iter_csv if export == 'csv' else iter_jsonl)(flowchart_name, statuses=statuses, limit=limit, before=before)
+        mimetype = 'text/csv' if export == 'csv' else 'application/x-ndjson'
+        headers = {'Content-Disposition': f'attachment; filename="{base}_data.{export}"'}
+        return Response(stream_with_context(lines), mimetype=mimetype, headers=headers)
+    if export not in (None, 'json'):
+        return jsonify({'status': 'error', 'message': f'unknown format: {export}'}), 400
+    try:
+        return jsonify({'status': 'success', 'flowchart_name': flowchart_name, **data_matrix_page(flowchart_name, limit=limit, before=before, statuses=statuses)})
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': f'failed to build data matrix: {str(e)}'}), 500
+
+
 @execution_bp.route('/history/<execution_id>', methods=['DELETE'])
 def delete_history_entry(execution_id):
     flowchart_name = request.args.get('flowchart_name', DEFAULT_FLOWCHART)
     try:
         success = delete_execution_history(flowchart_name, execution_id)
         if success:
-            # also remove the summary from the flowchart json's executions array
-            try:
-                from ..services.storage import load_flowchart, save_flowchart
-                flow = load_flowchart(flowchart_name)
-                if isinstance(flow, dict) and isinstance(flow.get('executions'), list):
-                    flow['executions'] = [e for e in flow['executions'] if e.get('execution_id') != execution_id]
-                    save_flowchart(flow, flowchart_name)
-            except Exception:
-                pass
             return jsonify({'status': 'success', 'message': 'execution history deleted'})
         else:
             return jsonify({'status': 'error', 'message': 'execution not found'}), 404
@@ -327,7 +411,8 @@ def clear_history_for_flowchart():
         flowchart_name = data.get('flowchart_name') or DEFAULT_FLOWCHART
         entries = []
         try:
-            entries = get_execution_history(flowchart_name)
+            # summaries carry the ids without loading node results
+            entries, _ = get_execution_summaries(flowchart_name)
         except Exception:
             entries = []
         removed = 0
@@ -347,7 +432,7 @@ def clear_history_for_flowchart():
 
 @execution_bp.route('/history/clear-all', methods=['POST'])
 def clear_executions_and_history():
-    """clear both on-disk history files and the embedded `executions` array in the flowchart json.
+    """clear a flowchart's history, run summaries included (the dashboard reads them from history).
     comments: uses existing delete function to remove files.
     """
     try:
@@ -357,7 +442,8 @@ def clear_executions_and_history():
         # clear disk history using existing delete function in a loop
         entries = []
         try:
-            entries = get_execution_history(flowchart_name)
+            # summaries carry the ids without loading node results
+            entries, _ = get_execution_summaries(flowchart_name)
         except Exception:
             entries = []
         removed_count = 0
@@ -370,17 +456,7 @@ def clear_executions_and_history():
                 # comments: ignore and continue
                 pass
 
-        # clear embedded executions in flowchart json
-        try:
-            flow = load_flowchart(flowchart_name)
-            if isinstance(flow, dict):
-                flow['executions'] = []
-                save_flowchart(flow, flowchart_name)
-        except Exception:
-            # comments: still report success for history removal even if json update fails
-            pass
-
-        return jsonify({'status': 'success', 'message': f'cleared {removed_count} history entries and reset executions for {flowchart_name}'})
+        return jsonify({'status': 'success', 'message': f'cleared {removed_count} history entries for {flowchart_name}'})
     except Exception as e:
         return jsonify({'status': 'error', 'message': f'failed to clear executions and history: {str(e)}'}), 500
 
@@ -408,6 +484,19 @@ def resume_execution():
     
     if not nodes_to_execute:
         return jsonify({"status": "error", "message": "no nodes to execute from this point"}), 400
+
+    if data.get('incremental'):
+        # earlier nodes come from history, so previous_variables is optional here
+        flow_run = FlowRun(data, flowchart_name, execution_order, previous_variables, running_processes, process_lock, reuse_before_index=start_index)
+        invalid = flow_run.validate()
+        if invalid is not None:
+            return jsonify(invalid['body']), invalid['code']
+        try:
+            outcome = flow_run.run()
+        except Exception as e:
+            return jsonify({"status": "error", "message": f"failed to resume execution: {str(e)}", "results": []})
+        outcome['final_variables'] = flow_run.final_variables()
+        return jsonify(outcome)
     
     flowchart_data = load_flowchart(flowchart_name)
     node_lookup = {node['id']: node for node in flowchart_data['nodes']}
@@ -437,7 +526,12 @@ def resume_execution():
                 return jsonify({"status": "error", "message": f"python file not found: {python_file}", "results": results, "failed_at_index": i}), 404
             
             # execute with current variables as function arguments
-            result = execute_python_function_with_tracking(file_path, current_variables, {}, node_id, running_processes, process_lock)
+            if node.get('type') == MAP_NODE_TYPE:
+                def _run_item(index, item_args):
+                    return execute_python_function_with_tracking(file_path, item_args, {}, f"{node_id}[{index}]", running_processes, process_lock)
+                result = run_map_node(node, current_variables, _run_item)
+            else:
+                result = execute_python_function_with_tracking(file_path, current_variables, {}, node_id, running_processes, process_lock)
             
             node_result = {
                 "node_id": node_id,
@@ -450,6 +544,7 @@ def resume_execution():
                 "error_file": result.get('error_file'),
                 "return_value": result.get('return_value'),
                 "function_args": result.get('function_args', {}),
+                "map": result.get('map'),
                 "index": i
             }
             
@@ -12,8 +12,18 @@ from ..services.storage import (
     list_backups,
     delete_backup_file,
     restore_backup_file,
+    delete_flowchart_history,
     rename_flowchart as storage_rename_flowchart,
 )
+from ..services.flowchart_cache import get_flowchart_cache
+from ..services.flowchart_patch import PatchError, apply_collection_edits, apply_json_patch
+from ..services.flowchart_saves import (
+    discard_flowchart_saves,
+    flush_flowchart_saves,
+    patch_flowchart_version,
+    restore_flowchart,
+    save_flowchart_version,
+)
 
 flowcharts_bp = Blueprint('flowcharts', __name__, url_prefix='/api')
 
@@ -24,19 +34,27 @@ def get_flowchart():
     return jsonify(load_flowchart(flowchart_name))
 
 
+@flowcharts_bp.route('/flowchart-cache', methods=['GET'])
+def flowchart_cache_status():
+    """report parsed flowchart cache size and hit/miss counters"""
+    return jsonify({'status': 'success', 'cache': get_flowchart_cache().stats()})
+
+
 @flowcharts_bp.route('/flowchart', methods=['POST'])
 def save_flowchart_data():
+    """save the whole document. `version` is the version the client loaded or last
+    saved; a stale one gets 409 `version_conflict` unless `force` is set. the response
+    carries the new version. bursts of saves are written to disk once (see flowchart_saves.py).
+    """
     data = request.json
     flowchart_name = request.json.get('flowchart_name', DEFAULT_FLOWCHART)
     force = bool(request.json.get('force', False))
-    incoming = {k: v for k, v in data.items() if k != 'flowchart_name'}
-    # preserve executions array if client doesn't send it, to avoid wiping dashboard summaries
+    base_version = data.get('version')
+    incoming = {k: v for k, v in data.items() if k not in ('flowchart_name', 'force', 'version')}
     try:
         existing = load_flowchart(flowchart_name)
     except Exception:
         existing = {}
-    if 'executions' not in incoming and isinstance(existing, dict) and isinstance(existing.get('executions'), list):
-        incoming['executions'] = existing.get('executions')
     # detect destructive changes: >90% node drop
     try:
         existing_nodes = len(existing.get('nodes') or [])
@@ -63,13 +81,56 @@ def save_flowchart_data():
             409,
         )
 
-    save_flowchart(incoming, flowchart_name)
-    # optional: also snapshot accepted state to backups for recovery
     try:
-        write_backup_snapshot(flowchart_name, incoming)
-    except Exception:
-        pass
-    return jsonify({"status": "success"})
+        base_version = None if force or base_version is None else int(base_version)
+    except (TypeError, ValueError):
+        return jsonify({"status": "error", "message": "version must be an integer"}), 400
+    # the accepted state is also snapshotted to backups when it reaches disk
+    accepted, version = save_flowchart_version(flowchart_name, incoming, base_version)
+    if not accepted:
+        return _version_conflict(version)
+    return jsonify({"status": "success", "version": version})
+
+
+def _version_conflict(version: int):
+    return (
+        jsonify({
+            "status": "error",
+            "code": "version_conflict",
+            "message": "flowchart was changed elsewhere; reload it before saving",
+            "current_version": version,
+        }),
+        409,
+    )
+
+
+@flowcharts_bp.route('/flowchart', methods=['PATCH'])
+def patch_flowchart_data():
+    """apply a delta to the saved document: `patch` (a json patch list) or
+    `upsert` / `delete` keyed by item identity (see flowchart_patch.py). `version`
+    is required; a stale one gets 409 `version_conflict`, a patch that does not
+    apply gets 400 and changes nothing.
+    """
+    data = request.get_json(silent=True) or {}
+    flowchart_name = data.get('flowchart_name', DEFAULT_FLOWCHART)
+    try:
+        base_version = int(data['version'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"status": "error", "message": "version is required and must be an integer"}), 400
+    if 'patch' in data:
+        operations = data.get('patch')
+        edit = lambda document: apply_json_patch(document, operations)
+    elif 'upsert' in data or 'delete' in data:
+        edit = lambda document: apply_collection_edits(document, data.get('upsert'), data.get('delete'))
+    else:
+        return jsonify({"status": "error", "message": "nothing to apply: send patch, or upsert / delete"}), 400
+    try:
+        accepted, version = patch_flowchart_version(flowchart_name, base_version, edit)
+    except PatchError as e:
+        return jsonify({"status": "error", "code": "invalid_patch", "message": str(e)}), 400
+    if not accepted:
+        return _version_conflict(version)
+    return jsonify({"status": "success", "version": version})
 
 
 @flowcharts_bp.route('/flowcharts', methods=['GET'])
@@ -110,7 +171,7 @@ def create_flowchart():
     if os.path.exists(flowchart_path):
         return jsonify({"status": "error", "message": "flowchart already exists"}), 409
     try:
-        empty_flowchart = {"nodes": [], "links": [], "groups": [], "executions": []}
+        empty_flowchart = {"nodes": [], "links": [], "groups": []}
         save_flowchart(empty_flowchart, flowchart_name + '.json')
         return jsonify({"status": "success", "message": f"created flowchart: {flowchart_name}", "flowchart": {"name": flowchart_name, "filename": flowchart_name + '.json'}})
     except Exception as e:
@@ -123,11 +184,10 @@ def delete_flowchart(flowchart_name):
         flowchart_path = get_flowchart_path(flowchart_name)
         if not os.path.exists(flowchart_path):
             return jsonify({"status": "error", "message": "flowchart not found"}), 404
+        discard_flowchart_saves(flowchart_name)
         os.remove(flowchart_path)
-        history_dir = os.path.join('history', flowchart_name.replace('.json', ''))
-        if os.path.exists(history_dir):
-            import shutil
-            shutil.rmtree(history_dir)
+        get_flowchart_cache().discard(flowchart_path)
+        delete_flowchart_history(flowchart_name)
         return jsonify({"status": "success", "message": f"deleted flowchart: {flowchart_name}"})
     except Exception as e:
         return jsonify({"status": "error", "message": f"failed to delete flowchart: {str(e)}"}), 500
@@ -143,7 +203,7 @@ def restore_latest():
     try:
         data = request.json or {}
         flowchart_name = data.get('flowchart_name') or DEFAULT_FLOWCHART
-        restored = restore_latest_backup(flowchart_name)
+        restored = restore_flowchart(flowchart_name, restore_latest_backup)
         if restored:
             return jsonify({"status": "success", "message": "restored latest backup", "data": restored})
         return jsonify({"status": "error", "message": "no backup available"}), 404
@@ -187,7 +247,7 @@ def restore_backup(timestamp):
             DEFAULT_FLOWCHART
         )
         # ensure .json suffix is handled consistently
-        restored = restore_backup_file(flowchart_name, timestamp)
+        restored = restore_flowchart(flowchart_name, lambda name: restore_backup_file(name, timestamp))
         if restored:
             return jsonify({"status": "success", "message": "restored backup", "data": restored})
         return jsonify({"status": "error", "message": "backup not found"}), 404
@@ -204,6 +264,7 @@ def rename_flowchart():
         new_name = (data.get('new_name') or data.get('name') or '').strip()
         if not old_name or not new_name:
             return jsonify({"status": "error", "message": "old_name and new_name are required"}), 400
+        flush_flowchart_saves(old_name)
         result = storage_rename_flowchart(old_name, new_name)
         return jsonify({"status": "success", **result})
     except FileNotFoundError:
@@ -0,0 +1,112 @@
+from flask import Blueprint, jsonify, request, current_app, Response
+
+from ..services.storage import DEFAULT_FLOWCHART
+from ..services.processes import stop_processes_with_prefix
+from ..services.flow_runs import FlowRun, validate_run
+from ..services.events import sse_stream
+from ..services.jobs import Job, QueueFull, get_job_manager
+from .execution import running_processes, process_lock
+
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api')
+
+
+def _flow_run_for(job, data):
+    """build the FlowRun for a job body: a plain run, or a resume when start_node_id is set"""
+    flowchart_name = job.flowchart_name
+    execution_order = data.get('execution_order', [])
+    common = dict(tracking_prefix=job.tracking_prefix, on_event=job.on_event, cancel_event=job.cancel_event)
+    if job.kind == 'resume':
+        start_index = execution_order.index(data.get('start_node_id'))
+        previous_variables = data.get('previous_variables') or {}
+        if data.get('incremental'):
+            # earlier nodes come from history, like /api/resume-execution
+            return FlowRun(data, flowchart_name, execution_order, previous_variables, running_processes, process_lock, reuse_before_index=start_index, **common)
+        return FlowRun(data, flowchart_name, execution_order[start_index:], previous_variables, running_processes, process_lock, **common)
+    return FlowRun(data, flowchart_name, execution_order, data.get('variables') or {}, running_processes, process_lock, **common)
+
+
+@jobs_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """queue a flow run; body is the /api/run body, plus start_node_id/previous_variables for a resume"""
+    data = request.json or {}
+    flowchart_name = data.get('flowchart_name', DEFAULT_FLOWCHART)
+    execution_order = data.get('execution_order', [])
+    if not execution_order:
+        return jsonify({'status': 'error', 'message': 'no nodes provided for execution'}), 400
+    kind = 'run'
+    if data.get('start_node_id') is not None:
+        if data.get('start_node_id') not in execution_order:
+            return jsonify({'status': 'error', 'message': f"start node {data.get('start_node_id')} not found in execution order"}), 404
+        kind = 'resume'
+
+    job = Job(kind, flowchart_name, data)
+    # validate up front so bad requests fail fast instead of as a failed job
+    checked_order = execution_order
+    if kind == 'resume' and not data.get('incremental'):
+        checked_order = execution_order[execution_order.index(data.get('start_node_id')):]
+    invalid = validate_run(flowchart_name, checked_order)
+    if invalid is not None:
+        return jsonify(invalid['body']), invalid['code']
+
+    app = current_app._get_current_object()
+
+    def work(job):
+        # jobs outlive the request, so give the run its own app context
+        with app.app_context():
+            # built when the job starts: a queued job runs the flowchart, cache and
+            # incremental baseline as they are then, not as they were at submit time
+            flow_run = _flow_run_for(job, data)
+            invalid = flow_run.validate()
+            if invalid is not None:
+                return invalid['body']
+            outcome = flow_run.run()
+            if job.kind == 'resume':
+                outcome['final_variables'] = flow_run.final_variables()
+            return outcome
+
+    try:
+        get_job_manager().submit(job, work)
+    except QueueFull as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 429
+    return jsonify({'status': 'success', 'job_id': job.job_id, 'job': job.summary()}), 202
+
+
+@jobs_bp.route('/jobs', methods=['GET'])
+def list_jobs():
+    flowchart_name = request.args.get('flowchart_name')
+    manager = get_job_manager()
+    jobs = [j.summary() for j in manager.list() if not flowchart_name or j.flowchart_name == flowchart_name]
+    return jsonify({'status': 'success', 'jobs': jobs, 'manager': manager.stats()})
+
+
+@jobs_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """status plus partial (or final) node results"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'job not found'}), 404
+    return jsonify({'status': 'success', 'job': job.summary(include_results=True)})
+
+
+@jobs_bp.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """stream job events as server-sent events (queued, started, node_start, node_result, done)"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'job not found'}), 404
+    since = request.args.get('since', 0, type=int)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(sse_stream(job.events, since), mimetype='text/event-stream', headers=headers)
+
+
+@jobs_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'job not found'}), 404
+    if not manager.cancel(job):
+        return jsonify({'status': 'success', 'message': f'job already {job.status}'})
+    outcome = stop_processes_with_prefix(running_processes, process_lock, job.tracking_prefix)
+    return jsonify({'status': 'success', 'message': f"cancelling job; terminated {outcome.get('terminated', 0)} running processes"})
@@ -0,0 +1,163 @@
+from flask import Blueprint, jsonify, request, current_app, Response
+import os
+import uuid
+
+from ..services.storage import DEFAULT_FLOWCHART, load_flowchart, batch_results_path
+from ..services.processes import execute_python_function_with_tracking, stop_processes_with_prefix
+from ..services.executor import DagExecutor
+from ..services.events import sse_stream
+from ..services.cache import cache_policy, get_result_cache, run_cached
+from ..services.artifacts import artifact_max_bytes, artifact_settings
+from ..services.multirun import (
+    DEFAULT_BATCH_PARALLEL,
+    MultirunBatch,
+    expand_items,
+    get_batch,
+    list_batches,
+    load_items_from_file,
+    read_batch_results,
+    register_batch,
+)
+from .execution import running_processes, process_lock
+
+
+multirun_bp = Blueprint('multirun', __name__, url_prefix='/api')
+
+
+def _parallel_setting(data, key, default):
+    """positive int from the request body, or none when it is not one"""
+    value = data.get(key)
+    if value in (None, ''):
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value >= 1 else None
+
+
+@multirun_bp.route('/multirun', methods=['POST'])
+def start_multirun():
+    """start a batch: run one flowchart once per item (list, file rows and/or grid product)"""
+    data = request.json or {}
+    flowchart_name = data.get('flowchart_name', DEFAULT_FLOWCHART)
+    execution_order = data.get('execution_order', [])
+    if not execution_order:
+        return jsonify({'status': 'error', 'message': 'no nodes provided for execution'}), 400
+    max_parallel = _parallel_setting(data, 'max_parallel', DEFAULT_BATCH_PARALLEL)
+    node_parallel = _parallel_setting(data, 'node_parallel', 1)
+    for key, value in (('max_parallel', max_parallel), ('node_parallel', node_parallel)):
+        if value is None:
+            return jsonify({'status': 'error', 'message': f'{key} must be a positive integer'}), 400
+    project_root = current_app.config.get('FLOWCRAFT_PROJECT_ROOT') or os.getcwd()
+
+    items = list(data.get('items') or [])
+    source = data.get('source')
+    if source:
+        source_file = source.get('file') if isinstance(source, dict) else str(source)
+        source_path = source_file if os.path.isabs(source_file) else os.path.normpath(os.path.join(project_root, source_file))
+        if not os.path.exists(source_path):
+            return jsonify({'status': 'error', 'message': f'item file not found: {source_file}'}), 404
+        try:
+            items.extend(load_items_from_file(source_path, source.get('sheet') if isinstance(source, dict) else None))
+        except Exception as e:
+            return jsonify({'status': 'error', 'message': f'failed to read items: {str(e)}'}), 400
+    items = expand_items(items, data.get('grid'))
+    if not items:
+        return jsonify({'status': 'error', 'message': 'no batch items: provide items, source or grid'}), 400
+    if not all(isinstance(item, dict) for item in items):
+        return jsonify({'status': 'error', 'message': 'every batch item must be an object of variable values'}), 400
+
+    flowchart_data = load_flowchart(flowchart_name)
+    invalid = DagExecutor(flowchart_data, execution_order, None, project_root).validate()
+    if invalid is not None:
+        return jsonify(invalid['body']), invalid['code']
+
+    # resolved here because items run on background threads without an app context
+    result_cache = get_result_cache()
+    artifacts = artifact_settings()
+    use_cache = bool(data.get('use_cache', False))
+
+    def run_node_for(prefix):
+        def run_node(node, file_path, function_args, input_values):
+            def _execute():
+                return execute_python_function_with_tracking(file_path, function_args, input_values, f"{prefix}{node['id']}", running_processes, process_lock, artifacts=artifacts)
+            enabled, ttl = cache_policy(node, use_cache)
+            return run_cached(result_cache if enabled else None, ttl, file_path, function_args, input_values, _execute)
+        return run_node
+
+    batch_id = str(uuid.uuid4())
+    batch = MultirunBatch(
+        flowchart_name,
+        flowchart_data,
+        execution_order,
+        items,
+        run_node_for,
+        project_root,
+        batch_results_path(flowchart_name, batch_id),
+        max_parallel=max_parallel,
+        node_parallel=node_parallel,
+        include_output=bool(data.get('include_output', False)),
+        batch_id=batch_id,
+        artifact_dir=artifacts['artifact_dir'],
+        artifact_max_bytes=artifact_max_bytes(),
+    )
+    register_batch(batch)
+    batch.start()
+    return jsonify({'status': 'success', 'batch_id': batch_id, 'total_items': len(items)})
+
+
+@multirun_bp.route('/multirun', methods=['GET'])
+def list_multiruns():
+    flowchart_name = request.args.get('flowchart_name')
+    batches = [b.summary() for b in list_batches() if not flowchart_name or b.flowchart_name == flowchart_name]
+    return jsonify({'status': 'success', 'batches': batches})
+
+
+@multirun_bp.route('/multirun/<batch_id>', methods=['GET'])
+def multirun_status(batch_id):
+    batch = get_batch(batch_id)
+    if batch is None:
+        return jsonify({'status': 'error', 'message': 'batch not found'}), 404
+    return jsonify({'status': 'success', 'batch': batch.summary()})
+
+
+@multirun_bp.route('/multirun/<batch_id>/events', methods=['GET'])
+def multirun_events(batch_id):
+    """stream batch progress as server-sent events (start, item, done)"""
+    batch = get_batch(batch_id)
+    if batch is None:
+        return jsonify({'status': 'error', 'message': 'batch not found'}), 404
+    since = request.args.get('since', 0, type=int)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(sse_stream(batch.events, since), mimetype='text/event-stream', headers=headers)
+
+
+@multirun_bp.route('/multirun/<batch_id>/results', methods=['GET'])
+def multirun_results(batch_id):
+    """aggregated results; `?format=jsonl` streams the raw results file"""
+    flowchart_name = request.args.get('flowchart_name', DEFAULT_FLOWCHART)
+    batch = get_batch(batch_id)
+    path = batch.results_path if batch is not None else batch_results_path(flowchart_name, batch_id)
+    if not os.path.exists(path):
+        return jsonify({'status': 'error', 'message': 'batch results not found'}), 404
+    if request.args.get('format') == 'jsonl':
+        def _lines():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    yield line
+        return Response(_lines(), mimetype='application/x-ndjson')
+    try:
+        return jsonify({'status': 'success', **read_batch_results(path)})
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': f'failed to read batch results: {str(e)}'}), 500
+
+
+@multirun_bp.route('/multirun/<batch_id>/cancel', methods=['POST'])
+def cancel_multirun(batch_id):
+    batch = get_batch(batch_id)
+    if batch is None:
+        return jsonify({'status': 'error', 'message': 'batch not found'}), 404
+    batch.cancel()
+    outcome = stop_processes_with_prefix(running_processes, process_lock, batch.tracking_prefix())
+    return jsonify({'status': 'success', 'message': f"cancelling batch; terminated {outcome.get('terminated', 0)} running processes"})
@@ -0,0 +1,122 @@
+from flask import Blueprint, jsonify, request, current_app
+import os
+
+from ..services.storage import DEFAULT_FLOWCHART, load_flowchart
+from ..services.executor import build_dag, resolve_python_file
+from ..services.sessions import SessionError, close_session, get_session, list_sessions
+from .execution import running_processes, process_lock
+
+
+sessions_bp = Blueprint('sessions', __name__, url_prefix='/api')
+
+
+def _session_payload(session):
+    info = session.info()
+    try:
+        info['entries'] = session.inspect()
+    except SessionError as e:
+        info['entries'] = []
+        info['error'] = str(e)
+    return info
+
+
+def _upstream_python_nodes(flowchart_data, node_id):
+    """python nodes feeding `node_id`, looking through if/input/data_save nodes in between"""
+    python_ids = [n['id'] for n in flowchart_data.get('nodes', []) or [] if n.get('type', 'python_file') == 'python_file']
+    if node_id not in python_ids:
+        python_ids.append(node_id)
+    order = {nid: i for i, nid in enumerate(python_ids)}
+    return sorted(build_dag(flowchart_data, python_ids).get(node_id, set()), key=lambda nid: order[nid])
+
+
+@sessions_bp.route('/session/execute-node', methods=['POST'])
+def execute_node_in_session():
+    """run one node inside the flowchart's session kernel.
+
+    upstream values are bound from the kernel by reference: from
+    `upstream_node_ids` when given, else from the python nodes linked into
+    this one. `function_args` still override them.
+    """
+    data = request.json or {}
+    flowchart_name = data.get('flowchart_name', DEFAULT_FLOWCHART)
+    node_id = data.get('node_id')
+    if node_id is None:
+        return jsonify({'success': False, 'error': 'node_id is required'}), 400
+    flowchart_data = load_flowchart(flowchart_name)
+    node = next((n for n in flowchart_data.get('nodes', []) or [] if n.get('id') == node_id), None)
+    python_file = data.get('python_file') or (node or {}).get('pythonFile')
+    if not python_file:
+        return jsonify({'success': False, 'error': 'python_file is required'}), 400
+    project_root = current_app.config.get('FLOWCRAFT_PROJECT_ROOT') or os.getcwd()
+    file_path = resolve_python_file(python_file, project_root)
+    if not os.path.exists(file_path):
+        return jsonify({'success': False, 'error': f'python file not found: {python_file}'}), 404
+
+    upstream = data.get('upstream_node_ids')
+    if upstream is None:
+        upstream = _upstream_python_nodes(flowchart_data, node_id)
+    session = get_session(flowchart_name)
+    try:
+        result = session.run_node(
+            node or {'id': node_id},
+            file_path,
+            data.get('function_args') or {},
+            data.get('input_values') or {},
+            upstream,
+            tracking_key=f"session:{flowchart_name}:{node_id}",
+            running_processes=running_processes,
+            process_lock=process_lock,
+        )
+    except SessionError as e:
+        return jsonify({'success': False, 'error': str(e), 'session': True}), 500
+    result['upstream_node_ids'] = upstream
+    return jsonify(result)
+
+
+@sessions_bp.route('/sessions', methods=['GET'])
+def get_sessions():
+    return jsonify({'status': 'success', 'sessions': [s.info() for s in list_sessions()]})
+
+
+@sessions_bp.route('/session', methods=['GET'])
+def inspect_session():
+    """session state plus a summary (type, size, preview) of every value it holds"""
+    flowchart_name = request.args.get('flowchart_name', DEFAULT_FLOWCHART)
+    session = get_session(flowchart_name, create=False)
+    if session is None:
+        return jsonify({'status': 'error', 'message': 'no session for this flowchart'}), 404
+    return jsonify({'status': 'success', 'session': _session_payload(session)})
+
+
+@sessions_bp.route('/session/evict', methods=['POST'])
+def evict_session_values():
+    """drop stored values for `node_ids`, or all of them"""
+    data = request.json or {}
+    session = get_session(data.get('flowchart_name', DEFAULT_FLOWCHART), create=False)
+    if session is None:
+        return jsonify({'status': 'error', 'message': 'no session for this flowchart'}), 404
+    try:
+        evicted = session.evict(data.get('node_ids'))
+    except SessionError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    return jsonify({'status': 'success', 'evicted': evicted})
+
+
+@sessions_bp.route('/session/restart', methods=['POST'])
+def restart_session():
+    """start a fresh kernel for the flowchart, dropping every stored value"""
+    data = request.json or {}
+    session = get_session(data.get('flowchart_name', DEFAULT_FLOWCHART))
+    try:
+        session.restart()
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': f'failed to restart session: {str(e)}'}), 500
+    return jsonify({'status': 'success', 'session': session.info()})
+
+
+@sessions_bp.route('/session', methods=['DELETE'])
+def delete_session():
+    flowchart_name = request.args.get('flowchart_name') or (request.get_json(silent=True) or {}).get('flowchart_name', DEFAULT_FLOWCHART)
+    if not close_session(flowchart_name):
+        return jsonify({'status': 'error', 'message': 'no session for this flowchart'}), 404
+    return jsonify({'status': 'success', 'message': 'session closed'})
@@ -44,8 +44,8 @@ class PythonVariableAnalyzer:
     def _extract_functions(self, tree: ast.AST) -> List[Dict[str, Any]]:
         functions: List[Dict[str, Any]] = []
         for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                func_info: Dict[str, Any] = {'name': node.name, 'parameters': [], 'returns': [], 'line': node.lineno}
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                func_info: Dict[str, Any] = {'name': node.name, 'parameters': [], 'returns': [], 'line': node.lineno, 'is_async': isinstance(node, ast.AsyncFunctionDef)}
                 for arg in node.args.args:
                     func_info['parameters'].append(arg.arg)
                 for child in node.body:
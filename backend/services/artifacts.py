@@ -0,0 +1,350 @@
+"""typed serialization for node return values.
+
+small json-safe values stay inline in the result. anything else (dataframes,
+numpy arrays, bytes, sets, custom objects, or json too large to inline) is
+written once to a content-addressed artifact directory and replaced by a
+reference:
+
+    {"$artifact": "<sha256>", "codec": "npy", "type": "numpy.ndarray",
+     "size_bytes": 8000128, "shape": [1000, 1000], "preview": "array([[..."}
+
+references travel through variables, history and the ui like any other json
+value; the runner swaps them back for the real value (memory-mapped where the
+codec allows) before calling a downstream node. codecs are tried in
+registration order; numpy and pyarrow are optional and only used when
+importable.
+
+the store is an lru: reading or re-writing an artifact bumps its mtime, and
+after each run the least recently used files are removed once the directory
+exceeds FLOWCRAFT_ARTIFACT_MAX_BYTES. cached and reused node results are
+checked with `refs_present` before they are served, so a result whose
+artifact was evicted counts as a miss and the node runs again.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_INLINE_BYTES = 64 * 1024
+DEFAULT_ARTIFACT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+# artifacts used this recently are never evicted: a run still in flight may read them
+EVICT_MIN_AGE_SECONDS = 60.0
+PREVIEW_CHARS = 200
+REF_KEY = '$artifact'
+
+
+class Codec:
+    """how one family of values is written to and read back from an artifact file"""
+
+    def __init__(self, name: str, suffix: str, accepts: Callable[[Any], bool], dump: Callable[[Any, str], None], load: Callable[[str], Any]):
+        self.name = name
+        self.suffix = suffix
+        self.accepts = accepts
+        self.dump = dump
+        self.load = load
+
+
+def _module_of(value: Any) -> str:
+    return type(value).__module__.split('.')[0]
+
+
+def _is_ndarray(value: Any) -> bool:
+    # object arrays need pickle; np.save would refuse them without allow_pickle
+    return _module_of(value) == 'numpy' and type(value).__name__ == 'ndarray' and value.dtype != object
+
+
+def _dump_npy(value: Any, path: str) -> None:
+    import numpy as np
+    with open(path, 'wb') as f:
+        np.save(f, value, allow_pickle=False)
+
+
+def _load_npy(path: str) -> Any:
+    import numpy as np
+    # copy-on-write map: pages load lazily and in-place edits stay private to the node
+    return np.load(path, mmap_mode='c', allow_pickle=False)
+
+
+def _is_arrow_frame(value: Any) -> bool:
+    if _module_of(value) != 'pandas' or type(value).__name__ != 'DataFrame':
+        return False
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _dump_arrow(value: Any, path: str) -> None:
+    import pyarrow as pa
+    table = pa.Table.from_pandas(value)
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _load_arrow(path: str) -> Any:
+    import pyarrow as pa
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def _is_json(value: Any) -> bool:
+    try:
+        json.dumps(value, allow_nan=False)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _dump_json(value: Any, path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(value, f)
+
+
+def _load_json(path: str) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _dump_pickle(value: Any, path: str) -> None:
+    with open(path, 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_pickle(path: str) -> Any:
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return pickle.load(f)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return pickle.loads(mapped)
+
+
+# tried in order; pickle goes last as the catch-all
+CODECS: List[Codec] = [
+    Codec('npy', '.npy', _is_ndarray, _dump_npy, _load_npy),
+    Codec('arrow', '.arrow', _is_arrow_frame, _dump_arrow, _load_arrow),
+    Codec('json', '.json', _is_json, _dump_json, _load_json),
+    Codec('pickle', '.pkl', lambda value: True, _dump_pickle, _load_pickle),
+]
+
+
+def register_codec(codec: Codec, before: Optional[str] = 'pickle') -> None:
+    """add a codec, by default just ahead of the pickle fallback"""
+    names = [c.name for c in CODECS]
+    CODECS.insert(names.index(before) if before in names else len(CODECS), codec)
+
+
+def _codec_named(name: str) -> Codec:
+    for codec in CODECS:
+        if codec.name == name:
+            return codec
+    raise KeyError(f'unknown artifact codec: {name}')
+
+
+def is_artifact_ref(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get(REF_KEY), str) and 'codec' in value
+
+
+def _type_name(value: Any) -> str:
+    kind = type(value)
+    return kind.__name__ if kind.__module__ == 'builtins' else f'{kind.__module__}.{kind.__name__}'
+
+
+def _preview(value: Any) -> str:
+    try:
+        text = repr(value)
+    except Exception:
+        text = f'<{_type_name(value)}>'
+    return text if len(text) <= PREVIEW_CHARS else text[:PREVIEW_CHARS] + '...'
+
+
+def _touch(path: str) -> None:
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """content-addressed files under `directory/<aa>/<sha256><suffix>`"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path_for(self, digest: str, codec: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest + _codec_named(codec).suffix)
+
+    def put(self, value: Any) -> Dict[str, Any]:
+        """write `value` with the first codec that accepts it and return its reference"""
+        os.makedirs(self.directory, exist_ok=True)
+        last_error = None
+        for codec in CODECS:
+            try:
+                if not codec.accepts(value):
+                    continue
+            except Exception:
+                continue
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            os.close(fd)
+            try:
+                codec.dump(value, tmp_path)
+                digest = _file_digest(tmp_path)
+                path = self.path_for(digest, codec.name)
+                if os.path.exists(path):
+                    # identical content is already stored; mark it as recently used
+                    os.remove(tmp_path)
+                    _touch(path)
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(tmp_path, path)
+            except Exception as e:
+                last_error = e
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                continue
+            ref = {REF_KEY: digest, 'codec': codec.name, 'type': _type_name(value), 'size_bytes': os.path.getsize(path), 'preview': _preview(value)}
+            shape = getattr(value, 'shape', None)
+            if isinstance(shape, tuple):
+                ref['shape'] = list(shape)
+            return ref
+        raise ValueError(f'no codec could store {_type_name(value)}: {last_error}')
+
+    def get(self, ref: Dict[str, Any]) -> Any:
+        path = self.path_for(ref[REF_KEY], ref['codec'])
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"artifact {ref[REF_KEY][:12]} is missing from {self.directory}")
+        _touch(path)
+        return _codec_named(ref['codec']).load(path)
+
+    def has(self, ref: Dict[str, Any]) -> bool:
+        """whether the artifact is still stored; marks it as recently used"""
+        try:
+            path = self.path_for(ref[REF_KEY], ref['codec'])
+        except KeyError:
+            return False
+        if not os.path.exists(path):
+            return False
+        _touch(path)
+        return True
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries: List[Tuple[float, int, str]] = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self, max_bytes: int, min_age: float = EVICT_MIN_AGE_SECONDS) -> int:
+        """drop least recently used artifacts until the store fits `max_bytes`; 0 keeps everything"""
+        if max_bytes <= 0:
+            return 0
+        entries = sorted(self._entries())
+        total = sum(size for _mtime, size, _p in entries)
+        cutoff = time.time() - min_age
+        removed = 0
+        for mtime, size, path in entries:
+            if total <= max_bytes or mtime > cutoff:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        return {'directory': self.directory, 'artifacts': len(entries), 'total_bytes': sum(size for _mtime, size, _p in entries)}
+
+
+def artifact_settings() -> Dict[str, Any]:
+    """runner request keys from FLOWCRAFT_ARTIFACT_DIR / FLOWCRAFT_ARTIFACT_INLINE_BYTES; resolve this on the request thread"""
+    # imported here so the runner child, which also uses this module, stays light
+    from .worker_pool import config_value
+    try:
+        inline_bytes = max(0, int(config_value('FLOWCRAFT_ARTIFACT_INLINE_BYTES', DEFAULT_INLINE_BYTES)))
+    except Exception:
+        inline_bytes = DEFAULT_INLINE_BYTES
+    return {'artifact_dir': os.path.abspath(config_value('FLOWCRAFT_ARTIFACT_DIR', 'artifacts')), 'inline_bytes': inline_bytes}
+
+
+def artifact_max_bytes() -> int:
+    """byte budget from FLOWCRAFT_ARTIFACT_MAX_BYTES (0: unbounded); resolve this on the request thread"""
+    from .worker_pool import config_value
+    try:
+        return max(0, int(config_value('FLOWCRAFT_ARTIFACT_MAX_BYTES', DEFAULT_ARTIFACT_MAX_BYTES)))
+    except Exception:
+        return DEFAULT_ARTIFACT_MAX_BYTES
+
+
+def evict_artifacts(artifact_dir: str, max_bytes: int) -> int:
+    """best-effort lru eviction after a run; never raises"""
+    try:
+        return ArtifactStore(artifact_dir).evict(max_bytes)
+    except Exception:
+        return 0
+
+
+def encode_value(value: Any, store: ArtifactStore, inline_bytes: int = DEFAULT_INLINE_BYTES) -> Any:
+    """the value itself when it is small json, else a reference to its artifact"""
+    if value is None or isinstance(value, (bool, int, float)) and _is_json(value):
+        return value
+    try:
+        if len(json.dumps(value, allow_nan=False)) <= inline_bytes:
+            return value
+    except (TypeError, ValueError):
+        pass
+    try:
+        return store.put(value)
+    except Exception:
+        # unstorable values degrade to text, as before artifacts existed
+        return str(value)
+
+
+def encode_return_value(value: Any, store: ArtifactStore, inline_bytes: int = DEFAULT_INLINE_BYTES) -> Any:
+    """encode a node's return value; dict returns are encoded per key since they become variables"""
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return {key: encode_value(item, store, inline_bytes) for key, item in value.items()}
+    return encode_value(value, store, inline_bytes)
+
+
+def refs_present(value: Any, store: ArtifactStore) -> bool:
+    """whether every artifact `value` references (at any depth) is still stored"""
+    if is_artifact_ref(value):
+        return store.has(value)
+    if isinstance(value, dict):
+        return all(refs_present(item, store) for item in value.values())
+    if isinstance(value, list):
+        return all(refs_present(item, store) for item in value)
+    return True
+
+
+def decode_value(value: Any, store: ArtifactStore) -> Any:
+    """load a referenced artifact back into a python value; other values pass through"""
+    if is_artifact_ref(value):
+        return store.get(value)
+    return value
@@ -0,0 +1,186 @@
+"""shared event loop worker for `async def` node functions.
+
+started as `python -m backend.services.async_runner` (or forked from the worker
+pool) by `async_workers.py`. unlike runner.py it stays up and runs many node
+calls at once as tasks on one asyncio loop, so i/o-bound nodes of a flow
+overlap in a single process instead of paying a subprocess each.
+
+requests arrive on stdin with runner.py framing; each carries an `id`:
+
+  - {"op": "run", "id", file_path, function_name, function_args, input_values,
+     artifact_dir?, inline_bytes?}
+  - {"op": "cancel", "id"}
+
+every finished run is answered with one result frame (tagged with its `id`) on
+the FLOWCRAFT_RESULT_FD channel. print() and input() are routed per task, so
+concurrent nodes never see each other's console.
+"""
+
+import asyncio
+import builtins
+import contextvars
+import inspect
+import io
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .artifacts import DEFAULT_INLINE_BYTES, ArtifactStore, decode_value, encode_return_value
+from .runner import FRAME_RESULT_JSON, RESULT_FD_ENV, _error_location, _MockInput, encode_frame, read_message
+
+# console and input() of the task currently running
+_current_task: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar('flowcraft_task', default=None)
+
+
+class _TaskStream:
+    """stdout/stderr stand-in that writes into the current task's buffer"""
+
+    def __init__(self, name: str, fallback: Any):
+        self.name = name
+        self.fallback = fallback
+
+    def write(self, text: str) -> int:
+        task = _current_task.get()
+        return (task[self.name] if task is not None else self.fallback).write(text)
+
+    def flush(self) -> None:
+        if _current_task.get() is None:
+            self.fallback.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.fallback, name)
+
+
+def _task_input(prompt: str = '') -> str:
+    task = _current_task.get()
+    return task['input'](prompt) if task is not None else ''
+
+
+def _load_function(file_path: str, function_name: str) -> Any:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    namespace: Dict[str, Any] = {'__name__': '__main__', '__file__': file_path, '__builtins__': builtins}
+    exec(compile(source, file_path, 'exec'), namespace)
+    return namespace[function_name]
+
+
+def _decode_args(call_args: Dict[str, Any], store: ArtifactStore) -> Dict[str, Any]:
+    return {name: decode_value(value, store) for name, value in call_args.items()}
+
+
+async def run_task(request: Dict[str, Any]) -> Dict[str, Any]:
+    """run one node call as a task; blocking sync functions go to a thread"""
+    file_path = request['file_path']
+    function_name = request['function_name']
+    call_args = request.get('function_args') or {}
+    input_values = request.get('input_values') or {}
+    mock_input = _MockInput(input_values)
+    task = {'stdout': io.StringIO(), 'stderr': io.StringIO(), 'input': mock_input}
+    _current_task.set(task)
+    store = ArtifactStore(request['artifact_dir']) if request.get('artifact_dir') else None
+    if os.path.dirname(file_path) not in sys.path:
+        sys.path.insert(0, os.path.dirname(file_path))
+
+    def _base() -> Dict[str, Any]:
+        return {
+            'id': request.get('id'),
+            'function_name': function_name,
+            'function_args': call_args,
+            'input_values': input_values,
+            'input_calls': mock_input.calls,
+            'input_used': bool(mock_input.calls > 0),
+            'output': task['stdout'].getvalue().strip(),
+            'stderr': task['stderr'].getvalue(),
+            # cpu and rss are shared by every task in this process, so only time is per node
+            'metrics': {'run_ms': int((time.perf_counter() - started) * 1000), 'shared_process': True},
+        }
+
+    started = time.perf_counter()
+    try:
+        # module code, artifact loads and stores block, so they run on threads and
+        # leave the loop to the other tasks; to_thread copies the context, so the
+        # thread still prints into this task
+        function = await asyncio.to_thread(_load_function, file_path, function_name)
+        values = await asyncio.to_thread(_decode_args, call_args, store) if store else call_args
+        if inspect.iscoroutinefunction(function):
+            result = await function(**values)
+        else:
+            result = await asyncio.to_thread(function, **values)
+        if store is not None:
+            result = await asyncio.to_thread(encode_return_value, result, store, request.get('inline_bytes', DEFAULT_INLINE_BYTES))
+        return {'success': True, 'return_value': result, **_base()}
+    except asyncio.CancelledError:
+        return {'success': False, 'error': 'execution cancelled', 'return_value': None, **_base()}
+    except Exception as e:
+        error_line, error_file = _error_location(sys.exc_info()[2], file_path)
+        error_msg = str(e)
+        if error_line is not None:
+            error_msg = f"Line {error_line}: {error_msg}"
+        return {'success': False, 'error': error_msg, 'error_line': error_line, 'error_file': error_file, 'return_value': None, **_base()}
+
+
+def main() -> None:
+    result_fd = int(os.environ[RESULT_FD_ENV])
+    os.set_inheritable(result_fd, False)
+    channel = os.fdopen(result_fd, 'wb')
+    write_lock = threading.Lock()
+    sys.stdout = _TaskStream('stdout', sys.stdout)
+    sys.stderr = _TaskStream('stderr', sys.stderr)
+    builtins.input = _task_input
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    tasks: Dict[Any, asyncio.Task] = {}
+
+    def send(payload: Dict[str, Any]) -> None:
+        with write_lock:
+            channel.write(encode_frame(FRAME_RESULT_JSON, json.dumps(payload, default=str).encode('utf-8')))
+            channel.flush()
+
+    def start(request: Dict[str, Any]) -> None:
+        task_id = request.get('id')
+        # each task gets a fresh context so console routing never leaks between nodes
+        task = loop.create_task(run_task(request), context=contextvars.Context())
+        tasks[task_id] = task
+
+        def _done(finished: asyncio.Task) -> None:
+            tasks.pop(task_id, None)
+            try:
+                send(finished.result())
+            except BaseException as e:
+                send({'id': task_id, 'success': False, 'error': f'async runner error: {str(e)}', 'return_value': None})
+
+        task.add_done_callback(_done)
+
+    def cancel(task_id: Any) -> None:
+        task = tasks.get(task_id)
+        if task is not None:
+            task.cancel()
+
+    def read_requests() -> None:
+        stream = sys.stdin.buffer
+        while True:
+            try:
+                request = read_message(stream)
+            except Exception:
+                break
+            if request.get('op') == 'cancel':
+                loop.call_soon_threadsafe(cancel, request.get('id'))
+            else:
+                loop.call_soon_threadsafe(start, request)
+        # stdin closed: the server is done with this worker
+        loop.call_soon_threadsafe(loop.stop)
+
+    threading.Thread(target=read_requests, daemon=True).start()
+    try:
+        loop.run_forever()
+    finally:
+        for task in list(tasks.values()):
+            task.cancel()
+
+
+if __name__ == '__main__':
+    main()
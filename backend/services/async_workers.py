@@ -0,0 +1,256 @@
+"""shared asyncio worker for `async def` node functions.
+
+nodes whose function is a coroutine do not get a process each: they are sent
+to one long-lived `async_runner.py` child and run as tasks on its event loop,
+so i/o-bound nodes running at the same time (parallel branches, map items)
+overlap in a single interpreter. synchronous nodes keep the one-process-per-run
+path in `processes.py`.
+
+config keys/env vars:
+  - FLOWCRAFT_ASYNC_WORKER: run async nodes on the shared loop (default on;
+    0 runs them like any other node, each under asyncio.run in its own process)
+"""
+
+import atexit
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from .processes import OutputRing, iter_process_output, ms_since, spawn_python_process
+from .runner import FRAME_RESULT_JSON, encode_message, read_frame
+from .worker_pool import config_value
+
+ASYNC_RUNNER_MODULE = 'backend.services.async_runner'
+# stray worker output (threads, c extensions) kept for inspection
+CONSOLE_BUFFER_BYTES = 64 * 1024
+
+
+def async_worker_enabled() -> bool:
+    return str(config_value('FLOWCRAFT_ASYNC_WORKER', '1')).lower() not in ('0', 'false', 'no', 'off')
+
+
+class AsyncTaskHandle:
+    """stands in for a process in `running_processes` while a task runs on the shared loop.
+
+    `shared` tells stop_all_processes to cancel the task instead of killing the
+    worker pid, which other nodes are still using.
+    """
+
+    shared = True
+
+    def __init__(self, worker: 'AsyncWorker', task_id: int, future: Future):
+        self.worker = worker
+        self.task_id = task_id
+        self.future = future
+        self.pid = worker.pid
+
+    def poll(self) -> Optional[int]:
+        return 0 if self.future.done() else None
+
+    def terminate(self) -> None:
+        self.worker.cancel(self.task_id)
+
+    kill = terminate
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        try:
+            self.future.result(timeout)
+        except FutureTimeout:
+            raise
+        except Exception:
+            pass
+        return 0
+
+
+class AsyncWorker:
+    """one async runner process; requests are tagged with ids and answered in any order"""
+
+    def __init__(self):
+        self.process = None
+        self.started_at: Optional[float] = None
+        self.console = OutputRing(CONSOLE_BUFFER_BYTES)
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process is not None else None
+
+    def _start(self) -> None:
+        process = spawn_python_process(['-m', ASYNC_RUNNER_MODULE], result_pipe=True)
+
+        def _read_responses(fd: int) -> None:
+            try:
+                with os.fdopen(fd, 'rb') as stream:
+                    while True:
+                        frame = read_frame(stream)
+                        if frame is None:
+                            break
+                        if frame[0] != FRAME_RESULT_JSON:
+                            continue
+                        response = json.loads(frame[1].decode('utf-8'))
+                        with self._lock:
+                            future = self._pending.pop(response.get('id'), None)
+                        if future is not None:
+                            future.set_result(response)
+            except Exception:
+                pass
+            finally:
+                # eof: the worker exited, so nothing in flight will be answered
+                with self._lock:
+                    if self.process is process:
+                        self.process = None
+                    orphaned = [self._pending.pop(tid) for tid, f in list(self._pending.items()) if f.worker_process is process]
+                for future in orphaned:
+                    future.set_result({'success': False, 'error': 'async worker exited while the node was running', 'return_value': None})
+
+        def _drain_console() -> None:
+            for _, line in iter_process_output(process):
+                self.console.append(line)
+
+        threading.Thread(target=_read_responses, args=(process.result_fd,), daemon=True).start()
+        threading.Thread(target=_drain_console, daemon=True).start()
+        self.process = process
+        self.started_at = time.time()
+
+    def _send(self, payload: Dict[str, Any]) -> None:
+        self.process.stdin.buffer.write(encode_message(payload))
+        self.process.stdin.flush()
+
+    def submit(self, payload: Dict[str, Any]) -> AsyncTaskHandle:
+        """queue one run on the loop, starting the worker if needed"""
+        future: Future = Future()
+        with self._lock:
+            if not self.alive:
+                self._start()
+            task_id = next(self._ids)
+            future.worker_process = self.process
+            self._pending[task_id] = future
+            try:
+                self._send({**payload, 'op': 'run', 'id': task_id})
+            except (BrokenPipeError, OSError, ValueError) as e:
+                self._pending.pop(task_id, None)
+                future.set_result({'success': False, 'error': f'async worker is not accepting requests: {str(e)}', 'return_value': None})
+        return AsyncTaskHandle(self, task_id, future)
+
+    def cancel(self, task_id: int) -> None:
+        with self._lock:
+            if task_id not in self._pending or not self.alive:
+                return
+            try:
+                self._send({'op': 'cancel', 'id': task_id})
+            except (BrokenPipeError, OSError, ValueError):
+                pass
+
+    def shutdown(self) -> None:
+        with self._lock:
+            process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            # closing stdin stops the loop; kill if it does not go quietly
+            process.stdin.close()
+            process.wait(timeout=2)
+        except Exception:
+            try:
+                process.kill()
+                process.wait(timeout=5)
+            except Exception:
+                pass
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._pending)
+        return {'alive': self.alive, 'pid': self.pid if self.alive else None, 'started_at': self.started_at, 'in_flight': in_flight, 'console_tail': self.console.text()[-2000:]}
+
+
+_worker: Optional[AsyncWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_async_worker() -> AsyncWorker:
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = AsyncWorker()
+        return _worker
+
+
+def shutdown_async_worker() -> None:
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.shutdown()
+
+
+atexit.register(shutdown_async_worker)
+
+
+def execute_async_function(
+    file_path: str,
+    meta: Dict[str, Any],
+    input_values: Dict[str, Any],
+    artifacts: Dict[str, Any],
+    node_id: Optional[str] = None,
+    running_processes: Optional[Dict[str, Any]] = None,
+    process_lock: Optional[Any] = None,
+    on_output: Optional[Callable[[str, str], None]] = None,
+    timeout: float = 30,
+) -> Dict[str, Any]:
+    """run a prepared coroutine-function call on the shared loop; same result shape as a process run.
+
+    console output only exists once the task finishes, so `on_output` gets it
+    then rather than line by line.
+    """
+    started = time.perf_counter()
+    handle = get_async_worker().submit({
+        'file_path': file_path,
+        'function_name': meta['function_name'],
+        'function_args': meta['call_args'],
+        'input_values': input_values,
+        **artifacts,
+    })
+    tracked = node_id and running_processes is not None and process_lock is not None
+    if tracked:
+        with process_lock:
+            running_processes[node_id] = {'process': handle, 'start_time': datetime.now(), 'file_path': file_path}
+    try:
+        try:
+            result = handle.future.result(timeout)
+        except FutureTimeout:
+            handle.terminate()
+            try:
+                handle.future.result(5)
+            except FutureTimeout:
+                # the cancel never landed, so something is blocking the loop itself
+                handle.worker.shutdown()
+            return {'success': False, 'error': f'execution timed out after {timeout:.0f} seconds', 'output': '', 'return_value': None, 'metrics': {'wall_ms': ms_since(started)}}
+    finally:
+        if tracked:
+            with process_lock:
+                running_processes.pop(node_id, None)
+    result.pop('id', None)
+    stderr = result.pop('stderr', '')
+    if on_output is not None:
+        for stream_name, text in (('stdout', result.get('output') or ''), ('stderr', stderr)):
+            for line in text.splitlines(keepends=True):
+                try:
+                    on_output(stream_name, line)
+                except Exception:
+                    pass
+    if stderr:
+        result['error'] = stderr if result.get('success') else f"{result.get('error')}\n{stderr}"
+    result['metrics'] = {'wall_ms': ms_since(started), **(result.get('metrics') or {})}
+    return result
@@ -0,0 +1,311 @@
+"""deduplicated, delta-encoded flowchart backups.
+
+each flowchart has a folder under `flowcharts/backups/<name>/` holding one file
+per snapshot, named by its timestamp:
+  - `<ts>.json.gz`: a keyframe, the whole document gzipped
+  - `<ts>.delta.json.gz`: the edits from the latest keyframe before it (see
+    `document_delta` in flowchart_patch.py), gzipped, naming that keyframe
+  - `<ts>.json`: a plain full snapshot written before this format; read as a keyframe
+both gzipped kinds carry the sha256 of the document they hold.
+
+a snapshot whose content hash matches the newest one is not written. a new
+keyframe starts after FLOWCRAFT_BACKUP_KEYFRAME_INTERVAL deltas (default 20) or
+when a delta would be over half its keyframe's size. every delta depends only
+on its keyframe, so restoring reads at most two files. the `version` key is not
+backed up: restores are stamped with a fresh one.
+
+pruning drops whole chains (a keyframe and its deltas) from the oldest end
+while at least `keep` snapshots remain, so no delta loses its keyframe.
+deleting a single keyframe promotes its first delta and rebases the rest.
+
+`index.json` in the same folder records each snapshot's timestamp, kind, byte
+size, content hash and node / link / group counts as it is written, so listing
+backups reads one small file instead of decoding every snapshot. entries the
+index is missing (files copied in by hand, an older folder) are filled in on
+the next listing; `flowcraft backups rebuild-index` recreates it from scratch.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from .flowchart_patch import apply_document_delta, document_delta
+from .worker_pool import config_value
+
+FORMAT = 1
+KEYFRAME_SUFFIX = '.json.gz'
+DELTA_SUFFIX = '.delta.json.gz'
+LEGACY_SUFFIX = '.json'
+DEFAULT_KEYFRAME_INTERVAL = 20
+TIMESTAMP_FORMAT = '%Y%m%dT%H%M%S'
+_TIMESTAMP = re.compile(r'^\d{8}T\d{6}$')
+INDEX_FILENAME = 'index.json'
+
+
+class BackupEntry(NamedTuple):
+    timestamp: str
+    filename: str
+    keyframe: bool
+
+
+def keyframe_interval() -> int:
+    try:
+        return max(0, int(config_value('FLOWCRAFT_BACKUP_KEYFRAME_INTERVAL', DEFAULT_KEYFRAME_INTERVAL)))
+    except (TypeError, ValueError):
+        return DEFAULT_KEYFRAME_INTERVAL
+
+
+def backup_content(document: Dict[str, Any]) -> Dict[str, Any]:
+    """the part of a document a backup keeps"""
+    return {k: v for k, v in (document or {}).items() if k != 'version'}
+
+
+def content_hash(document: Dict[str, Any]) -> str:
+    canonical = json.dumps(document, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _entry(filename: str) -> Optional[BackupEntry]:
+    if filename.endswith(DELTA_SUFFIX):
+        return BackupEntry(filename[:-len(DELTA_SUFFIX)], filename, False)
+    if filename.endswith(KEYFRAME_SUFFIX):
+        return BackupEntry(filename[:-len(KEYFRAME_SUFFIX)], filename, True)
+    if filename.endswith(LEGACY_SUFFIX):
+        return BackupEntry(filename[:-len(LEGACY_SUFFIX)], filename, True)
+    return None
+
+
+def list_entries(backup_dir: str) -> List[BackupEntry]:
+    """snapshots in the folder, oldest first"""
+    try:
+        names = os.listdir(backup_dir)
+    except FileNotFoundError:
+        return []
+    entries = [entry for entry in map(_entry, names) if entry is not None and _TIMESTAMP.match(entry.timestamp)]
+    entries.sort(key=lambda entry: entry.timestamp)
+    return entries
+
+
+def find_entry(backup_dir: str, timestamp: str) -> Optional[BackupEntry]:
+    for entry in list_entries(backup_dir):
+        if entry.timestamp == timestamp:
+            return entry
+    return None
+
+
+def _read(path: str) -> Dict[str, Any]:
+    """the stored payload; a legacy snapshot reads as an unhashed keyframe"""
+    if path.endswith(KEYFRAME_SUFFIX) or path.endswith(DELTA_SUFFIX):
+        with gzip.open(path, 'rb') as f:
+            return json.loads(f.read().decode('utf-8'))
+    with open(path, 'r') as f:
+        return {'document': json.load(f)}
+
+
+def _pack(payload: Dict[str, Any]) -> bytes:
+    return gzip.compress(json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8'), compresslevel=6)
+
+
+def _write(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def read_snapshot(backup_dir: str, entry: BackupEntry, keyframes: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """the document a snapshot holds. `keyframes` memoizes decoded keyframes across calls"""
+    keyframes = {} if keyframes is None else keyframes
+    if entry.keyframe:
+        if entry.filename not in keyframes:
+            keyframes[entry.filename] = _read(os.path.join(backup_dir, entry.filename))['document']
+        return keyframes[entry.filename]
+    payload = _read(os.path.join(backup_dir, entry.filename))
+    base = _entry(payload['base'])
+    return apply_document_delta(read_snapshot(backup_dir, base, keyframes), payload['delta'])
+
+
+def snapshot_hash(backup_dir: str, entry: BackupEntry) -> str:
+    payload = _read(os.path.join(backup_dir, entry.filename))
+    if payload.get('hash'):
+        return payload['hash']
+    return content_hash(backup_content(read_snapshot(backup_dir, entry)))
+
+
+def _record(backup_dir: str, entry: BackupEntry, document: Dict[str, Any], digest: Optional[str] = None) -> Dict[str, Any]:
+    """index record for a snapshot holding `document`"""
+    document = document or {}
+    return {
+        'timestamp': entry.timestamp,
+        'filename': entry.filename,
+        'keyframe': entry.keyframe,
+        'bytes': os.path.getsize(os.path.join(backup_dir, entry.filename)),
+        'hash': digest or content_hash(backup_content(document)),
+        'nodes': len(document.get('nodes') or []),
+        'links': len(document.get('links') or []),
+        'groups': len(document.get('groups') or []),
+    }
+
+
+def read_index(backup_dir: str) -> Dict[str, Dict[str, Any]]:
+    """filename -> record as last written; empty when the index is missing or unreadable"""
+    try:
+        with open(os.path.join(backup_dir, INDEX_FILENAME), 'r') as f:
+            records = json.load(f).get('entries') or []
+        return {record['filename']: record for record in records}
+    except (OSError, ValueError, AttributeError, KeyError, TypeError):
+        return {}
+
+
+def _write_index(backup_dir: str, records: Dict[str, Dict[str, Any]]) -> None:
+    ordered = sorted(records.values(), key=lambda record: record['timestamp'])
+    data = json.dumps({'format': FORMAT, 'entries': ordered}, separators=(',', ':')).encode('utf-8')
+    _write(os.path.join(backup_dir, INDEX_FILENAME), data)
+
+
+def _update_index(backup_dir: str, add: Iterable[Dict[str, Any]] = (), remove: Iterable[str] = ()) -> None:
+    records = read_index(backup_dir)
+    for filename in remove:
+        records.pop(filename, None)
+    for record in add:
+        records[record['filename']] = record
+    _write_index(backup_dir, records)
+
+
+def index_records(backup_dir: str) -> List[Dict[str, Any]]:
+    """index records of every snapshot, newest first. the folder listing is the
+    source of truth: records for vanished files are dropped and missing ones are
+    built from their snapshot, then the index is saved"""
+    entries = list_entries(backup_dir)
+    records = read_index(backup_dir)
+    present = {entry.filename for entry in entries}
+    missing = [entry for entry in entries if entry.filename not in records]
+    stale = [filename for filename in records if filename not in present]
+    if missing or stale:
+        keyframes: Dict[str, Dict[str, Any]] = {}
+        for entry in missing:
+            try:
+                records[entry.filename] = _record(backup_dir, entry, read_snapshot(backup_dir, entry, keyframes))
+            except (OSError, ValueError, KeyError, TypeError):
+                # unreadable snapshots are listed without counts rather than hidden
+                records[entry.filename] = {
+                    'timestamp': entry.timestamp, 'filename': entry.filename, 'keyframe': entry.keyframe,
+                    'bytes': 0, 'hash': None, 'nodes': 0, 'links': 0, 'groups': 0,
+                }
+        for filename in stale:
+            del records[filename]
+        _write_index(backup_dir, records)
+    return [records[entry.filename] for entry in reversed(entries)]
+
+
+def rebuild_index(backup_dir: str) -> int:
+    """rewrite the index from the snapshot files alone; returns the number of snapshots indexed"""
+    try:
+        os.remove(os.path.join(backup_dir, INDEX_FILENAME))
+    except FileNotFoundError:
+        pass
+    return len(index_records(backup_dir))
+
+
+def _encode(backup_dir: str, timestamp: str, document: Dict[str, Any], digest: str, keyframe: Optional[BackupEntry]) -> str:
+    """write `document` as a delta against `keyframe` when that is worth it, else as a keyframe; returns the filename"""
+    if keyframe is not None:
+        base = read_snapshot(backup_dir, keyframe)
+        delta = document_delta(base, document)
+        data = _pack({'format': FORMAT, 'hash': digest, 'base': keyframe.filename, 'delta': delta})
+        if len(data) * 2 <= os.path.getsize(os.path.join(backup_dir, keyframe.filename)):
+            filename = timestamp + DELTA_SUFFIX
+            _write(os.path.join(backup_dir, filename), data)
+            return filename
+    filename = timestamp + KEYFRAME_SUFFIX
+    _write(os.path.join(backup_dir, filename), _pack({'format': FORMAT, 'hash': digest, 'document': document}))
+    return filename
+
+
+def write_snapshot(backup_dir: str, document: Dict[str, Any], keep: int = 50) -> str:
+    """store a snapshot unless it matches the newest one; returns the path of the snapshot now holding this content"""
+    document = backup_content(document)
+    digest = content_hash(document)
+    entries = list_entries(backup_dir)
+    newest = read_index(backup_dir).get(entries[-1].filename, {}).get('hash') if entries else None
+    if entries and (newest or snapshot_hash(backup_dir, entries[-1])) == digest:
+        return os.path.join(backup_dir, entries[-1].filename)
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    if entries and entries[-1].timestamp >= timestamp:
+        # a second snapshot within the same second replaces the first
+        remove_snapshot(backup_dir, entries[-1])
+        entries = list_entries(backup_dir)
+    keyframe = None
+    since = 0
+    for entry in reversed(entries):
+        if entry.keyframe:
+            keyframe = entry
+            break
+        since += 1
+    if keyframe is not None and since >= keyframe_interval():
+        keyframe = None
+    filename = _encode(backup_dir, timestamp, document, digest, keyframe)
+    _update_index(backup_dir, add=[_record(backup_dir, _entry(filename), document, digest)])
+    prune(backup_dir, keep)
+    return os.path.join(backup_dir, filename)
+
+
+def _chains(entries: List[BackupEntry]) -> List[List[BackupEntry]]:
+    """entries grouped into keyframe + following deltas, oldest first"""
+    chains: List[List[BackupEntry]] = []
+    for entry in entries:
+        if entry.keyframe or not chains:
+            chains.append([entry])
+        else:
+            chains[-1].append(entry)
+    return chains
+
+
+def prune(backup_dir: str, keep: int = 50) -> int:
+    """drop the oldest chains while at least `keep` snapshots remain; returns the number deleted"""
+    entries = list_entries(backup_dir)
+    remaining = len(entries)
+    deleted: List[str] = []
+    for chain in _chains(entries):
+        if remaining - len(chain) < keep:
+            break
+        for entry in chain:
+            try:
+                os.remove(os.path.join(backup_dir, entry.filename))
+                deleted.append(entry.filename)
+            except OSError:
+                pass
+        remaining -= len(chain)
+    if deleted:
+        _update_index(backup_dir, remove=deleted)
+    return len(deleted)
+
+
+def remove_snapshot(backup_dir: str, entry: BackupEntry) -> None:
+    """delete one snapshot; a keyframe's first delta becomes the keyframe for the others"""
+    added: List[Dict[str, Any]] = []
+    removed = [entry.filename]
+    if entry.keyframe:
+        chain = next((chain for chain in _chains(list_entries(backup_dir)) if chain[0] == entry), [entry])
+        dependents = chain[1:]
+        if dependents:
+            keyframes: Dict[str, Dict[str, Any]] = {}
+            documents = [(dependent, read_snapshot(backup_dir, dependent, keyframes)) for dependent in dependents]
+            promoted = None
+            for dependent, document in documents:
+                digest = content_hash(document)
+                filename = _encode(backup_dir, dependent.timestamp, document, digest, promoted)
+                if filename != dependent.filename:
+                    os.remove(os.path.join(backup_dir, dependent.filename))
+                    removed.append(dependent.filename)
+                written = _entry(filename)
+                added.append(_record(backup_dir, written, document, digest))
+                if written.keyframe:
+                    promoted = written
+    os.remove(os.path.join(backup_dir, entry.filename))
+    _update_index(backup_dir, add=added, remove=removed)
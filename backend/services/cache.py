@@ -0,0 +1,355 @@
+"""content-addressed cache of node results.
+
+a cache key hashes the node file, the local modules it imports, the function
+name, the bound arguments, the mocked input values and the interpreter nodes
+run under. entries live on disk as
+`<cache dir>/<key[:2]>/<key>.json` and are evicted least-recently-used once the
+directory grows past its byte budget. hits are returned without spawning a
+process and are flagged with `cached: true`. a hit whose return value refers to
+an artifact that has since been evicted (see artifacts.py) is a miss.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .artifacts import ArtifactStore, artifact_settings, refs_present
+from .worker_pool import config_value
+
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_fingerprint_lock = threading.Lock()
+# path -> ((st_mtime_ns, st_size), sha256 of contents, local imports)
+_fingerprint_memo: Dict[str, Tuple[Tuple[int, int], str, List[str]]] = {}
+
+
+def _cache_dir() -> str:
+    try:
+        from flask import current_app
+        value = current_app.config.get('FLOWCRAFT_CACHE_DIR')
+        if value:
+            return value
+    except Exception:
+        pass
+    return os.environ.get('FLOWCRAFT_CACHE_DIR') or 'cache'
+
+
+def _local_imports(file_path: str, source: str) -> List[str]:
+    """files under the node's folder that it imports (the runner puts that folder on sys.path)"""
+    base_dir = os.path.dirname(os.path.abspath(file_path))
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return []
+    modules: List[Tuple[str, int]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.extend((alias.name, 0) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ''
+            modules.append((module, node.level))
+            # `from pkg import mod` may name submodules as well as attributes
+            modules.extend((f"{module}.{alias.name}" if module else alias.name, node.level) for alias in node.names)
+    found: List[str] = []
+    for name, level in modules:
+        root = base_dir
+        for _ in range(max(0, level - 1)):
+            root = os.path.dirname(root)
+        parts = [p for p in name.split('.') if p]
+        if not parts:
+            continue
+        for i in range(1, len(parts) + 1):
+            stem = os.path.join(root, *parts[:i])
+            for candidate in (stem + '.py', os.path.join(stem, '__init__.py')):
+                if os.path.isfile(candidate):
+                    found.append(os.path.abspath(candidate))
+    return sorted(set(found))
+
+
+def _file_digest(file_path: str) -> Tuple[str, List[str]]:
+    """hash of one file plus its direct local imports, memoized on (mtime_ns, size)"""
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _fingerprint_lock:
+        memo = _fingerprint_memo.get(path)
+    if memo and memo[0] == stamp:
+        return memo[1], memo[2]
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    imports = _local_imports(path, raw.decode('utf-8', errors='replace'))
+    with _fingerprint_lock:
+        _fingerprint_memo[path] = (stamp, digest, imports)
+    return digest, imports
+
+
+def file_fingerprint(file_path: str) -> str:
+    """hash of a node file and, transitively, the local modules it imports"""
+    seen: Set[str] = set()
+    parts: List[str] = []
+    stack = [os.path.abspath(file_path)]
+    while stack:
+        path = stack.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            digest, imports = _file_digest(path)
+        except OSError:
+            parts.append(f"{path}:missing")
+            continue
+        parts.append(f"{path}:{digest}")
+        stack.extend(imports)
+    return hashlib.sha256('\n'.join(sorted(parts)).encode('utf-8')).hexdigest()
+
+
+def runtime_fingerprint() -> str:
+    """the interpreter node processes run under; a different python or venv gets its own entries"""
+    return hashlib.sha256(f"{sys.executable}\0{sys.version}".encode('utf-8')).hexdigest()
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str, separators=(',', ':'))
+
+
+def inputs_hash(call_args: Dict[str, Any], input_values: Dict[str, Any]) -> str:
+    """hash of what flows into a node: its bound arguments and mocked input() values"""
+    return hashlib.sha256(f"{_canonical(call_args)}\0{_canonical(input_values or {})}".encode('utf-8')).hexdigest()
+
+
+def node_signature(file_path: str, function_args: Dict[str, Any], input_values: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """function name, script fingerprint and inputs hash for a call; none if the file has no callable function"""
+    from .processes import prepare_function_call
+    try:
+        meta = prepare_function_call(file_path, function_args)
+    except Exception:
+        return None
+    if 'error' in meta:
+        return None
+    return {
+        'function_name': meta['function_name'],
+        'fingerprint': file_fingerprint(file_path),
+        'inputs_hash': inputs_hash(meta['call_args'], input_values),
+    }
+
+
+def cache_policy(node: Optional[Dict[str, Any]], use_cache: bool = False) -> Tuple[bool, Optional[float]]:
+    """(enabled, ttl seconds) for a node; `node.cache` in the flowchart json overrides the request flag"""
+    settings = (node or {}).get('cache')
+    if isinstance(settings, bool):
+        return settings, None
+    if not isinstance(settings, dict):
+        return bool(use_cache), None
+    enabled = settings.get('enabled')
+    if enabled is None:
+        enabled = use_cache
+    ttl = settings.get('ttl')
+    try:
+        ttl = float(ttl) if ttl not in (None, '', 0) else None
+    except Exception:
+        ttl = None
+    return bool(enabled), ttl
+
+
+class NodeResultCache:
+    """disk-backed lru of successful node results"""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES, artifact_dir: Optional[str] = None):
+        self.directory = directory
+        self.max_bytes = max(0, int(max_bytes))
+        # where referenced return values live; hits are only served while those files exist
+        self.artifact_dir = artifact_dir
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def make_key(self, file_path: str, function_name: str, call_args: Dict[str, Any], input_values: Dict[str, Any]) -> str:
+        return self.key_for_signature({
+            'function_name': function_name,
+            'fingerprint': file_fingerprint(file_path),
+            'inputs_hash': inputs_hash(call_args, input_values),
+        })
+
+    def key_for_signature(self, signature: Dict[str, str]) -> str:
+        h = hashlib.sha256()
+        for part in (signature['fingerprint'], signature['function_name'], signature['inputs_hash'], runtime_fingerprint()):
+            h.update(part.encode('utf-8'))
+            h.update(b'\0')
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries: List[Tuple[float, int, str]] = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for root, _dirs, files in os.walk(self.directory):
+            for fn in files:
+                if not fn.endswith('.json'):
+                    continue
+                path = os.path.join(root, fn)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception:
+            with self._lock:
+                self.misses += 1
+            return None
+        expired = ttl is not None and time.time() - float(entry.get('created_at', 0)) > ttl
+        if expired or not self._artifacts_present(entry):
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            # bump mtime so eviction treats this entry as recently used
+            os.utime(path, None)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        result = dict(entry.get('result') or {})
+        result['cached'] = True
+        result['cached_at'] = entry.get('created_at')
+        return result
+
+    def _artifacts_present(self, entry: Dict[str, Any]) -> bool:
+        if not self.artifact_dir:
+            return True
+        return refs_present((entry.get('result') or {}).get('return_value'), ArtifactStore(self.artifact_dir))
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            body = json.dumps({'created_at': time.time(), 'result': result}, default=str)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        except Exception:
+            return
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _mtime, size, _p in self._entries())
+            else:
+                self._total_bytes += len(body.encode('utf-8'))
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _remove(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes = max(0, self._total_bytes - size)
+
+    def evict(self) -> int:
+        """drop least recently used entries until the cache fits its byte budget"""
+        entries = sorted(self._entries())
+        total = sum(size for _mtime, size, _p in entries)
+        removed = 0
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        with self._lock:
+            self._total_bytes = total
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for _mtime, _size, path in self._entries():
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        with self._lock:
+            self._total_bytes = 0
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        return {
+            'directory': self.directory,
+            'entries': len(entries),
+            'bytes': sum(size for _mtime, size, _p in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+_caches: Dict[str, NodeResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache() -> NodeResultCache:
+    """cache for the current app's cache dir; resolve this on the request thread"""
+    directory = os.path.abspath(_cache_dir())
+    try:
+        max_bytes = int(config_value('FLOWCRAFT_CACHE_MAX_BYTES', DEFAULT_CACHE_MAX_BYTES))
+    except Exception:
+        max_bytes = DEFAULT_CACHE_MAX_BYTES
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = NodeResultCache(directory, max_bytes)
+            _caches[directory] = cache
+        cache.max_bytes = max_bytes
+        cache.artifact_dir = artifact_settings()['artifact_dir']
+        return cache
+
+
+def run_cached(
+    cache: Optional[NodeResultCache],
+    ttl: Optional[float],
+    file_path: str,
+    function_args: Dict[str, Any],
+    input_values: Dict[str, Any],
+    execute: Callable[[], Dict[str, Any]],
+    signature: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """return a cached result for this call when present, otherwise execute and store on success"""
+    if cache is None:
+        return execute()
+    # keyed on the bound args only, so unrelated upstream variables don't bust the cache
+    signature = signature or node_signature(file_path, function_args, input_values)
+    if signature is None:
+        return execute()
+    key = cache.key_for_signature(signature)
+    hit = cache.get(key, ttl)
+    if hit is not None:
+        return hit
+    result = execute()
+    if result.get('success'):
+        cache.put(key, result)
+    result['cached'] = False
+    return result
@@ -0,0 +1,104 @@
+"""server-side evaluation of if-node conditions.
+
+mirrors `ExecutionEngine.evaluateConditions` in the browser: an if node's
+incoming links from python nodes carry `conditions` (a list of
+{variable, operator, value, combiner}); the node is met when any link's
+conditions hold against its source node's variables. when it is not met the
+python nodes directly downstream of the if node are skipped.
+"""
+
+from typing import Any, Dict, List, Optional, Set
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _loose_equal(value: Any, compare: Any) -> bool:
+    """javascript-style `==`: numbers compare numerically, everything else as text"""
+    if value == compare:
+        return True
+    left, right = _number(value), _number(compare)
+    if left is not None and right is not None:
+        return left == right
+    return str(value) == str(compare)
+
+
+def _length(value: Any) -> Optional[int]:
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def evaluate_condition(value: Any, operator: str, compare: Any) -> bool:
+    """evaluate one condition; unknown operators and incomparable values are false"""
+    if operator == '==':
+        return _loose_equal(value, compare)
+    if operator == '===':
+        return type(value) is type(compare) and value == compare
+    if operator == '!=':
+        return not _loose_equal(value, compare)
+    if operator in ('>', '>=', '<', '<='):
+        left, right = _number(value), _number(compare)
+        if left is None or right is None:
+            return False
+        return {'>': left > right, '>=': left >= right, '<': left < right, '<=': left <= right}[operator]
+    if operator in ('len==', 'len<', 'len>'):
+        size, target = _length(value), _number(compare)
+        if size is None or target is None:
+            return False
+        return {'len==': size == target, 'len<': size < target, 'len>': size > target}[operator]
+    if operator == 'contains':
+        return str(compare) in str(value)
+    if operator == 'not contains':
+        return str(compare) not in str(value)
+    if operator == 'is true':
+        return value is True or value == 'true' or (value == 1 and not isinstance(value, bool))
+    if operator == 'is false':
+        return value is False or value == 'false' or (value == 0 and not isinstance(value, bool))
+    if operator == 'is empty':
+        return not value
+    if operator == 'is not empty':
+        return bool(value)
+    return False
+
+
+def evaluate_conditions(conditions: List[Dict[str, Any]], variables: Dict[str, Any]) -> bool:
+    """combine a link's conditions; the first condition's combiner ('and' | 'or') applies to all"""
+    if not conditions:
+        return False
+    combiner = conditions[0].get('combiner') or 'and'
+    results = [evaluate_condition(variables.get(c.get('variable')), c.get('operator'), c.get('value')) for c in conditions]
+    return all(results) if combiner == 'and' else any(results)
+
+
+def evaluate_if_node(flowchart_data: Dict[str, Any], node_id: Any, node_variables: Dict[Any, Dict[str, Any]]) -> Dict[str, Any]:
+    """evaluate an if node against the variables its python sources produced.
+
+    returns {'condition_met': bool, 'blocked': [python node ids skipped when not met]}.
+    """
+    nodes = {node['id']: node for node in flowchart_data.get('nodes', []) or []}
+    links = flowchart_data.get('links', []) or []
+    met = False
+    for link in links:
+        if link.get('target') != node_id:
+            continue
+        source = nodes.get(link.get('source'))
+        if not source or source.get('type') != 'python_file' or not link.get('conditions'):
+            continue
+        if evaluate_conditions(link['conditions'], node_variables.get(source['id'], {})):
+            met = True
+            break
+    blocked: Set[Any] = set()
+    if not met:
+        for link in links:
+            target = nodes.get(link.get('target'))
+            if link.get('source') == node_id and target and target.get('type') == 'python_file':
+                blocked.add(target['id'])
+    return {'condition_met': met, 'blocked': sorted(blocked, key=str)}
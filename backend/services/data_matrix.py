@@ -0,0 +1,142 @@
+"""data_save values across runs as one columnar payload, for the data matrix page.
+
+a page of runs comes from the stored run summaries and their saved values from
+the `data_saves` index kept by the history store, so building it never loads
+history entries or node results. runs are newest first; every value array has
+one slot per run, none where that run did not save the column.
+
+json pages look like:
+    {"runs": {"columns": [...RUN_COLUMNS], "values": [[...], ...]},
+     "data_saves": {"columns": [{"node_name", "variable_name"}, ...],
+                    "values": [[...], ...], "types": [[...], ...]}}
+csv and jsonl exports have one line per run instead.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .storage import get_data_saves, get_execution_summaries
+
+RUN_COLUMNS = (
+    'execution_id', 'timestamp', 'status', 'successful_nodes', 'total_nodes',
+    'success_percentage', 'execution_time', 'elapsed_ms', 'failed_node', 'error_snippet',
+)
+
+# runs fetched per query while streaming an export
+EXPORT_PAGE = 500
+
+
+def _matrix(page: List[Dict[str, Any]]) -> Tuple[List[Tuple[Any, Any]], List[List[Any]], List[List[Any]]]:
+    """(column keys, values, types) for a page of summaries; columns in order of first appearance"""
+    saves = get_data_saves([s.get('execution_id') for s in page])
+    keys: List[Tuple[Any, Any]] = []
+    index: Dict[Tuple[Any, Any], int] = {}
+    values: List[List[Any]] = []
+    types: List[List[Any]] = []
+    for row, summary in enumerate(page):
+        for node_name, variable_name, value_type, value in saves.get(summary.get('execution_id'), []):
+            key = (node_name, variable_name)
+            column = index.get(key)
+            if column is None:
+                column = index[key] = len(keys)
+                keys.append(key)
+                values.append([None] * len(page))
+                types.append([None] * len(page))
+            values[column][row] = value
+            types[column][row] = value_type
+    return keys, values, types
+
+
+def data_matrix_page(
+    flowchart_name: str,
+    limit: Optional[int] = None,
+    before: Optional[str] = None,
+    statuses: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """one page of the matrix; `next_before` is the cursor for the next page, none on the last"""
+    page, next_before = get_execution_summaries(flowchart_name, limit=limit, before=before, statuses=statuses)
+    keys, values, types = _matrix(page)
+    return {
+        'count': len(page),
+        'runs': {
+            'columns': list(RUN_COLUMNS),
+            'values': [[summary.get(column) for summary in page] for column in RUN_COLUMNS],
+        },
+        'data_saves': {
+            'columns': [{'node_name': node_name, 'variable_name': variable_name} for node_name, variable_name in keys],
+            'values': values,
+            'types': types,
+        },
+        'next_before': next_before,
+        'has_more': next_before is not None,
+    }
+
+
+def column_label(node_name: Any, variable_name: Any) -> str:
+    """export header for a saved variable: the data name, plus the variable when they differ"""
+    node_name = node_name or variable_name or 'data'
+    if variable_name and variable_name != node_name:
+        return f'{node_name}.{variable_name}'
+    return str(node_name)
+
+
+def _export_pages(flowchart_name: str, statuses: Optional[List[str]], limit: Optional[int], before: Optional[str]) -> Iterator[List[Dict[str, Any]]]:
+    """summary pages for an export, at most `limit` runs in total (all when none)"""
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = EXPORT_PAGE if remaining is None else min(EXPORT_PAGE, remaining)
+        page, before = get_execution_summaries(flowchart_name, limit=size, before=before, statuses=statuses)
+        if page:
+            yield page
+        if remaining is not None:
+            remaining -= len(page)
+        if before is None:
+            return
+
+
+def iter_jsonl(flowchart_name: str, statuses: Optional[List[str]] = None, limit: Optional[int] = None, before: Optional[str] = None) -> Iterator[str]:
+    """one json object per run: the run columns plus `data_saves` {label: value}"""
+    for page in _export_pages(flowchart_name, statuses, limit, before):
+        keys, values, _ = _matrix(page)
+        for row, summary in enumerate(page):
+            line = {column: summary.get(column) for column in RUN_COLUMNS}
+            line['data_saves'] = {
+                column_label(*key): values[column][row] for column, key in enumerate(keys) if values[column][row] is not None
+            }
+            yield json.dumps(line, default=str) + '\n'
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return '' if value is None else value
+
+
+def iter_csv(flowchart_name: str, statuses: Optional[List[str]] = None, limit: Optional[int] = None, before: Optional[str] = None) -> Iterator[str]:
+    """csv with one row per run. data save columns are only known once every run
+    was read, so a first pass over the index collects them before rows stream"""
+    labels: Dict[str, None] = {}
+    for page in _export_pages(flowchart_name, statuses, limit, before):
+        for saves in get_data_saves([s.get('execution_id') for s in page]).values():
+            for node_name, variable_name, _, _ in saves:
+                labels.setdefault(column_label(node_name, variable_name), None)
+    header = list(RUN_COLUMNS) + list(labels)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def _flush() -> str:
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    writer.writerow(header)
+    yield _flush()
+    for page in _export_pages(flowchart_name, statuses, limit, before):
+        keys, values, _ = _matrix(page)
+        for row, summary in enumerate(page):
+            saved = {column_label(*key): values[column][row] for column, key in enumerate(keys)}
+            writer.writerow([_csv_cell(summary.get(column)) for column in RUN_COLUMNS] + [_csv_cell(saved.get(label)) for label in labels])
+        yield _flush()
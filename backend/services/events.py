@@ -0,0 +1,91 @@
+"""append-only event log shared by background work (jobs, multirun batches).
+
+producers `publish` events; any number of sse handlers tail the log with
+`iter_events`, resuming from a sequence number, and stop once the log is
+closed.
+
+events named in `transient` (console lines, say) are only kept while they are
+among the newest `keep_transient` of their kind; older ones are dropped, so a
+chatty run does not grow the log without bound. other events are kept for
+replay. a tail that falls behind skips the dropped events.
+"""
+
+import json
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set
+
+DEFAULT_KEEP_TRANSIENT = 1000
+
+
+class EventLog:
+    def __init__(self, transient: Iterable[str] = (), keep_transient: int = DEFAULT_KEEP_TRANSIENT):
+        self.events: List[Dict[str, Any]] = []
+        self.closed = False
+        self.transient = frozenset(transient)
+        self.keep_transient = max(1, int(keep_transient))
+        self._cond = threading.Condition()
+        self._next_seq = 0
+        self._transient_seqs: Deque[int] = deque()
+        self._dropped: Set[int] = set()
+
+    def publish(self, event: str, data: Dict[str, Any], close: bool = False) -> None:
+        """append an event; `close` marks it as the last one so tails finish after it"""
+        with self._cond:
+            seq = self._next_seq
+            self._next_seq += 1
+            self.events.append({'seq': seq, 'event': event, 'data': data})
+            if event in self.transient:
+                self._transient_seqs.append(seq)
+                if len(self._transient_seqs) > self.keep_transient:
+                    self._dropped.add(self._transient_seqs.popleft())
+                    # compact once as many are dropped as kept, so dropping stays o(1) amortised
+                    if len(self._dropped) >= self.keep_transient:
+                        self.events = [item for item in self.events if item['seq'] not in self._dropped]
+                        self._dropped.clear()
+            if close:
+                self.closed = True
+            self._cond.notify_all()
+
+    def _position(self, seq: int) -> int:
+        """index of the first retained event with a sequence number >= `seq`"""
+        low, high = 0, len(self.events)
+        while low < high:
+            middle = (low + high) // 2
+            if self.events[middle]['seq'] < seq:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def iter_events(self, since: int = 0, heartbeat: float = 15.0) -> Iterator[Optional[Dict[str, Any]]]:
+        """yield events from `since` until the log closes; yields none as a keep-alive"""
+        cursor = max(0, int(since))
+        while True:
+            with self._cond:
+                if cursor >= self._next_seq and not self.closed:
+                    self._cond.wait(heartbeat)
+                pending = [event for event in self.events[self._position(cursor):] if event['seq'] not in self._dropped]
+                cursor = max(cursor, self._next_seq)
+                closed = self.closed
+            if not pending:
+                if closed:
+                    return
+                yield None
+                continue
+            for event in pending:
+                yield event
+
+
+def sse_stream(log: EventLog, since: int = 0) -> Iterator[str]:
+    """format an event log tail as server-sent events"""
+    for event in log.iter_events(since):
+        if event is None:
+            yield ": keep-alive\n\n"
+            continue
+        yield f"id: {event['seq']}\nevent: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
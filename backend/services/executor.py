@@ -0,0 +1,377 @@
+"""server-side flow executor.
+
+builds a dag from a flowchart's `nodes`/`links`, runs ready nodes concurrently
+up to a configurable parallelism, and passes return values along edges. node
+results use the same per-node shape as the sequential `/api/run` loop.
+"""
+
+import ast
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .conditions import evaluate_if_node
+from .mapping import MAP_NODE_TYPE, run_map_node
+from .worker_pool import config_value
+
+DEFAULT_MAX_PARALLEL = 4
+
+# node types that never spawn a process; they only forward upstream variables
+PASS_THROUGH_TYPES = ('if_node', 'input_node', 'data_save')
+
+
+def max_parallel_setting(requested: Any = None) -> int:
+    """resolve max parallelism from the request, then FLOWCRAFT_MAX_PARALLEL, then default"""
+    value = requested if requested not in (None, '') else config_value('FLOWCRAFT_MAX_PARALLEL', DEFAULT_MAX_PARALLEL)
+    try:
+        return max(1, int(value))
+    except Exception:
+        return DEFAULT_MAX_PARALLEL
+
+
+def resolve_python_file(python_file: str, project_root: str) -> str:
+    """resolve a node's `pythonFile` relative to the project root, stripping any leading 'nodes/'"""
+    normalized = python_file.replace('\\', '/')
+    rel = re.sub(r'^(?:nodes/)+', '', normalized)
+    return os.path.normpath(os.path.join(project_root, rel))
+
+
+def variable_name_for_node(node: Dict[str, Any]) -> str:
+    """variable name used for non-dict return values (mirrors the builder's naming)"""
+    return re.sub(r'[^a-zA-Z0-9]', '_', str(node.get('name', node.get('id', ''))).lower())
+
+
+def single_return_name(file_path: str) -> Optional[str]:
+    """name of the variable returned by the first top-level function, if it returns a bare name"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+    except Exception:
+        return None
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            returns = [child for child in node.body if isinstance(child, ast.Return)]
+            if returns and isinstance(returns[-1].value, ast.Name):
+                return returns[-1].value.id
+            return None
+    return None
+
+
+def merge_return_value(variables: Dict[str, Any], node: Dict[str, Any], return_value: Any, return_name: Optional[str] = None) -> None:
+    """fold a node's return value into the variable map passed downstream"""
+    if return_value is None:
+        return
+    if isinstance(return_value, dict):
+        variables.update(return_value)
+        return
+    variables[variable_name_for_node(node)] = return_value
+    if return_name:
+        variables[return_name] = return_value
+
+
+def build_dag(flowchart_data: Dict[str, Any], node_ids: List[Any]) -> Dict[Any, Set[Any]]:
+    """map each selected node id to the selected nodes it directly depends on.
+
+    links through nodes outside the selection (e.g. a data_save or an if_node the
+    client did not include) are collapsed so ordering is still respected.
+    """
+    selected = set(node_ids)
+    incoming: Dict[Any, List[Any]] = {}
+    for link in flowchart_data.get('links', []) or []:
+        if link.get('type') == 'input_connection':
+            continue
+        incoming.setdefault(link.get('target'), []).append(link.get('source'))
+
+    predecessors: Dict[Any, Set[Any]] = {}
+    for node_id in node_ids:
+        found: Set[Any] = set()
+        seen: Set[Any] = {node_id}
+        stack = list(incoming.get(node_id, []))
+        while stack:
+            source = stack.pop()
+            if source in seen:
+                continue
+            seen.add(source)
+            if source in selected:
+                found.add(source)
+            else:
+                stack.extend(incoming.get(source, []))
+        predecessors[node_id] = found
+    return predecessors
+
+
+def input_values_for(flowchart_data: Dict[str, Any], node_id: Any) -> Dict[str, Any]:
+    """mocked input() values from an input node attached to `node_id`"""
+    for node in flowchart_data.get('nodes', []) or []:
+        if node.get('type') == 'input_node' and node.get('targetNodeId') == node_id:
+            return dict(node.get('inputValues') or {})
+    return {}
+
+
+def execution_order_for(flowchart_data: Dict[str, Any]) -> List[Any]:
+    """node ids in the order the builder runs them (port of calculateNodeOrder in FlowchartBuilder.Utils.js).
+
+    only linked nodes take part; input and data_save nodes are left out. ready
+    nodes go top to bottom, then left to right, and a group whose nodes are all
+    ready is taken in one go.
+    """
+    nodes = flowchart_data.get('nodes', []) or []
+    node_types = {node.get('id'): node.get('type') for node in nodes}
+    side_types = ('input_node', 'data_save')
+    links = [
+        link for link in flowchart_data.get('links', []) or []
+        if link.get('type') != 'input_connection'
+        and node_types.get(link.get('source')) not in side_types
+        and node_types.get(link.get('target')) not in side_types
+    ]
+    linked_ids = {link.get('source') for link in links} | {link.get('target') for link in links}
+    connected = [node for node in nodes if node.get('type') not in side_types and node.get('id') in linked_ids]
+    incoming: Dict[Any, List[Any]] = {node['id']: [] for node in connected}
+    for link in links:
+        if link.get('target') in incoming and link.get('source') in incoming:
+            incoming[link['target']].append(link['source'])
+    group_members: Dict[Any, Set[Any]] = {}
+    for node in connected:
+        if node.get('groupId'):
+            group_members.setdefault(node['groupId'], set()).add(node['id'])
+
+    order: List[Any] = []
+    processed: Set[Any] = set()
+
+    def _ready(node: Dict[str, Any]) -> bool:
+        return node['id'] not in processed and all(dep in processed for dep in incoming[node['id']])
+
+    while len(processed) < len(connected):
+        ready = [node for node in connected if _ready(node)]
+        if not ready:
+            # a cycle; the executor reports it
+            break
+        ready_groups = {
+            node['groupId'] for node in ready
+            if node.get('groupId') and all(_ready(member) for member in connected if member['id'] in group_members[node['groupId']])
+        }
+        if ready_groups:
+            batch = [node for node in ready if node.get('groupId') in ready_groups]
+        else:
+            ready.sort(key=lambda node: (node.get('y', 0), node.get('x', 0)))
+            top = ready[0].get('y', 0)
+            batch = [node for node in ready if abs(node.get('y', 0) - top) < 10]
+        for node in sorted(batch, key=lambda node: node.get('x', 0)):
+            order.append(node['id'])
+            processed.add(node['id'])
+    return order
+
+
+class DagExecutor:
+    """run a flowchart's nodes as a dag with bounded concurrency.
+
+    `run_node(node, file_path, function_args, input_values)` executes a single
+    python node and returns the result dict from the process layer. `on_event`
+    (optional) is called with ('node_start' | 'node_result', payload) as nodes
+    start and finish; setting `cancel_event` stops scheduling further nodes.
+    with `evaluate_conditions`, if nodes are evaluated like the browser does
+    ('condition' events) and python nodes behind an unmet if node are skipped
+    ('node_skipped' events) instead of run. map nodes (see mapping.py) call
+    `run_node` once per item and report 'map_progress' events; `artifact_dir`
+    is where they load a list that arrives as an artifact reference.
+    """
+
+    def __init__(
+        self,
+        flowchart_data: Dict[str, Any],
+        execution_order: List[Any],
+        run_node: Callable[[Dict[str, Any], str, Dict[str, Any], Dict[str, Any]], Dict[str, Any]],
+        project_root: str,
+        max_parallel: int = DEFAULT_MAX_PARALLEL,
+        initial_variables: Optional[Dict[str, Any]] = None,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        evaluate_conditions: bool = False,
+        artifact_dir: Optional[str] = None,
+    ):
+        self.flowchart_data = flowchart_data
+        self.execution_order = list(execution_order)
+        self.run_node = run_node
+        self.project_root = project_root
+        self.max_parallel = max(1, int(max_parallel))
+        self.initial_variables = dict(initial_variables or {})
+        self.on_event = on_event
+        self.cancel_event = cancel_event
+        self.evaluate_conditions = evaluate_conditions
+        self.artifact_dir = artifact_dir
+        self.node_lookup = {node['id']: node for node in flowchart_data.get('nodes', []) or []}
+        self.index_of = {node_id: i for i, node_id in enumerate(self.execution_order)}
+        self._lock = threading.Lock()
+        self.node_variables: Dict[Any, Dict[str, Any]] = {}
+
+    def final_variables(self) -> Dict[str, Any]:
+        """variables visible after the run, later nodes in execution order winning"""
+        merged = dict(self.initial_variables)
+        for node_id in self.execution_order:
+            merged.update(self.node_variables.get(node_id, {}))
+        return merged
+
+    def validate(self) -> Optional[Dict[str, Any]]:
+        """check nodes and files up front; returns an error payload (with http code) or none"""
+        for i, node_id in enumerate(self.execution_order):
+            if node_id not in self.node_lookup:
+                return {'code': 404, 'body': {"status": "error", "message": f"node {node_id} not found", "results": [], "failed_at_index": i}}
+            node = self.node_lookup[node_id]
+            if node.get('type') in PASS_THROUGH_TYPES:
+                continue
+            python_file = node.get('pythonFile')
+            if not python_file:
+                return {'code': 400, 'body': {"status": "error", "message": f"node {node.get('name', node_id)} has no python file assigned", "results": [], "failed_at_index": i}}
+            if not os.path.exists(resolve_python_file(python_file, self.project_root)):
+                return {'code': 404, 'body': {"status": "error", "message": f"python file not found: {python_file}", "results": [], "failed_at_index": i}}
+        return None
+
+    def _execute_one(self, node_id: Any, variables: Dict[str, Any]) -> Dict[str, Any]:
+        node = self.node_lookup[node_id]
+        python_file = node.get('pythonFile')
+        file_path = resolve_python_file(python_file, self.project_root)
+        started = time.perf_counter()
+        try:
+            if node.get('type') == MAP_NODE_TYPE:
+                result = self._execute_map(node, file_path, variables)
+            else:
+                result = self.run_node(node, file_path, dict(variables), input_values_for(self.flowchart_data, node_id))
+        except Exception as e:
+            result = {'success': False, 'error': f"failed to execute node {node.get('name', node_id)}: {str(e)}", 'output': '', 'return_value': None}
+        if '_return_name' not in result:
+            result['_return_name'] = single_return_name(file_path) if result.get('success') else None
+        # time spent on this node in this run (near zero for cache hits and reused results)
+        result['_runtime_ms'] = int((time.perf_counter() - started) * 1000)
+        return result
+
+    def _execute_map(self, node: Dict[str, Any], file_path: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """fan a map node out; each item runs through `run_node` under its own id"""
+        input_values = input_values_for(self.flowchart_data, node['id'])
+
+        def run_item(index: int, function_args: Dict[str, Any]) -> Dict[str, Any]:
+            return self.run_node(dict(node, id=f"{node['id']}[{index}]"), file_path, function_args, input_values)
+
+        def on_progress(progress: Dict[str, Any]) -> None:
+            self._emit('map_progress', {'node_id': node['id'], 'node_name': node.get('name', 'unknown'), **progress})
+
+        result = run_map_node(node, variables, run_item, on_progress, self.cancel_event, self.artifact_dir)
+        # the list is collected under `map.output`; expose it by that name only
+        result['_return_name'] = None
+        return result
+
+    def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(event, data)
+        except Exception:
+            # a broken listener must never break the run
+            pass
+
+    def _cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def _node_result(self, node_id: Any, result: Dict[str, Any]) -> Dict[str, Any]:
+        node = self.node_lookup[node_id]
+        return {
+            "node_id": node_id,
+            "node_name": node.get('name', 'unknown'),
+            "python_file": node.get('pythonFile'),
+            "success": result.get('success', False),
+            "output": result.get('output', ''),
+            "error": result.get('error'),
+            "error_line": result.get('error_line'),
+            "error_file": result.get('error_file'),
+            "return_value": result.get('return_value'),
+            "function_args": result.get('function_args', {}),
+            "runtime": result.get('_runtime_ms', 0),
+            "metrics": result.get('metrics'),
+            "cached": bool(result.get('cached', False)),
+            "reused": bool(result.get('reused', False)),
+            "fingerprint": result.get('fingerprint'),
+            "inputs_hash": result.get('inputs_hash'),
+            "map": result.get('map'),
+            "index": self.index_of[node_id],
+        }
+
+    def run(self) -> Dict[str, Any]:
+        predecessors = build_dag(self.flowchart_data, self.execution_order)
+        remaining = {node_id: set(deps) for node_id, deps in predecessors.items()}
+        node_variables = self.node_variables = {}
+        results: List[Dict[str, Any]] = []
+        blocked: Set[Any] = set()
+        skipped: List[Any] = []
+        failed_node_id = None
+
+        def _inputs_for(node_id: Any) -> Dict[str, Any]:
+            merged = dict(self.initial_variables)
+            # follow execution_order so later upstream values win deterministically
+            for dep in sorted(predecessors[node_id], key=lambda d: self.index_of[d]):
+                merged.update(node_variables.get(dep, {}))
+            return merged
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            in_flight: Dict[Any, Any] = {}
+            while True:
+                if failed_node_id is None and not self._cancelled():
+                    ready = [n for n in self.execution_order if n in remaining and not remaining[n]]
+                    for node_id in ready:
+                        del remaining[node_id]
+                        node = self.node_lookup[node_id]
+                        variables = _inputs_for(node_id)
+                        if self.evaluate_conditions and node.get('type') == 'if_node':
+                            evaluation = evaluate_if_node(self.flowchart_data, node_id, node_variables)
+                            blocked.update(evaluation['blocked'])
+                            self._emit('condition', {'node_id': node_id, 'node_name': node.get('name', 'unknown'), 'index': self.index_of[node_id], **evaluation})
+                        elif node_id in blocked:
+                            skipped.append(node_id)
+                            self._emit('node_skipped', {'node_id': node_id, 'node_name': node.get('name', 'unknown'), 'index': self.index_of[node_id], 'reason': 'blocked by condition'})
+                        if node.get('type') in PASS_THROUGH_TYPES or node_id in blocked:
+                            # skipped nodes forward their inputs so later nodes still run
+                            node_variables[node_id] = variables
+                            for deps in remaining.values():
+                                deps.discard(node_id)
+                            continue
+                        self._emit('node_start', {'node_id': node_id, 'node_name': node.get('name', 'unknown'), 'index': self.index_of[node_id]})
+                        in_flight[pool.submit(self._execute_one, node_id, variables)] = (node_id, variables)
+                    if any(not deps for deps in remaining.values()):
+                        # pass-through nodes may have unblocked more work
+                        continue
+                if not in_flight:
+                    break
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_id, variables = in_flight.pop(future)
+                    result = future.result()
+                    node_result = self._node_result(node_id, result)
+                    results.append(node_result)
+                    self._emit('node_result', node_result)
+                    if result.get('success', False):
+                        outputs = dict(variables)
+                        merge_return_value(outputs, self.node_lookup[node_id], result.get('return_value'), result.get('_return_name'))
+                        node_variables[node_id] = outputs
+                        for deps in remaining.values():
+                            deps.discard(node_id)
+                    elif failed_node_id is None or self.index_of[node_id] < self.index_of[failed_node_id]:
+                        failed_node_id = node_id
+
+        results.sort(key=lambda r: r['index'])
+        total = len(self.execution_order)
+        if self._cancelled() and (remaining or failed_node_id is not None):
+            return {"status": "cancelled", "message": f"execution cancelled after {len(results)} of {total} nodes", "results": results, "total_nodes": total, "completed_nodes": len(results)}
+        if failed_node_id is not None:
+            node = self.node_lookup[failed_node_id]
+            i = self.index_of[failed_node_id]
+            return {"status": "failed", "message": f"execution stopped at node {node.get('name', failed_node_id)} (index {i})", "results": results, "failed_at_index": i, "total_nodes": total, "completed_nodes": len(results)}
+        if remaining:
+            # leftover nodes can only mean a cycle in the selected graph
+            stuck = min(remaining, key=lambda n: self.index_of[n])
+            return {"status": "error", "message": f"cycle detected at node {self.node_lookup[stuck].get('name', stuck)}", "results": results, "failed_at_index": self.index_of[stuck], "total_nodes": total, "completed_nodes": len(results)}
+        outcome = {"status": "success", "message": f"successfully executed all {total} nodes", "results": results, "total_nodes": total, "completed_nodes": total}
+        if skipped:
+            outcome['skipped_nodes'] = sorted(skipped, key=lambda n: self.index_of[n])
+            outcome['message'] = f"successfully executed {total - len(skipped)} of {total} nodes ({len(skipped)} skipped by conditions)"
+        return outcome
@@ -0,0 +1,175 @@
+"""server-side flow runs shared by `/api/run`, `/api/resume-execution` and jobs.
+
+a `FlowRun` wires a `DagExecutor` to the process layer with the request's
+cache/incremental options, and optionally saves the finished run to history so
+it can serve as the baseline for later incremental runs. construct it and call
+`run()` inside an app context; nodes themselves run on executor threads.
+"""
+
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import current_app
+
+from .artifacts import artifact_max_bytes, artifact_settings, evict_artifacts
+from .cache import cache_policy, get_result_cache
+from .executor import DagExecutor, max_parallel_setting
+from .history_store import json_type
+from .incremental import baseline_results, run_node_incrementally
+from .processes import execute_python_function_with_tracking
+from .storage import load_flowchart, save_execution_history
+
+
+def collect_data_saves(flowchart_data: Dict[str, Any], node_variables: Dict[Any, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """the builder's normalized data_saves for a server-side run.
+
+    each data_save node saves its selected variable (`dataSource.variable.name`)
+    from the python node linked into it, like the browser does after a node runs.
+    """
+    saves = []
+    nodes = {node.get('id'): node for node in flowchart_data.get('nodes', []) or []}
+    for link in flowchart_data.get('links', []) or []:
+        target = nodes.get(link.get('target'))
+        if not target or target.get('type') != 'data_save':
+            continue
+        variables = node_variables.get(link.get('source'))
+        if not variables:
+            continue
+        variable = (target.get('dataSource') or {}).get('variable') or {}
+        variable_name = variable.get('name') if isinstance(variable, dict) else variable
+        if not variable_name:
+            variable_name = next(iter(variables))
+        if variable_name not in variables:
+            continue
+        value = variables[variable_name]
+        saves.append({
+            'node_name': target.get('name') or 'data save',
+            'variable_name': variable_name,
+            'variable_content': [json_type(value), value],
+        })
+    return saves
+
+
+def save_run_history(
+    flowchart_name: str,
+    execution_order: List[Any],
+    outcome: Dict[str, Any],
+    final_variables: Dict[str, Any],
+    data_saves: Optional[List[Dict[str, Any]]] = None,
+) -> str:
+    """persist a server-side run in the same shape the builder saves"""
+    results = outcome.get('results', [])
+    execution_data = {
+        'status': outcome.get('status'),
+        'execution_order': list(execution_order),
+        'results': results,
+        'total_nodes': len(execution_order),
+        'successful_nodes': len([r for r in results if r.get('success')]),
+        'error_message': None if outcome.get('status') == 'success' else outcome.get('message'),
+        'variable_state': final_variables,
+    }
+    if data_saves is not None:
+        execution_data['data_saves'] = data_saves
+    return save_execution_history(flowchart_name, execution_data)
+
+
+def validate_run(flowchart_name: str, execution_order: List[Any]) -> Optional[Dict[str, Any]]:
+    """`FlowRun.validate` for a run that starts later, without resolving caches or an incremental baseline"""
+    project_root = current_app.config.get('FLOWCRAFT_PROJECT_ROOT') or os.getcwd()
+    return DagExecutor(load_flowchart(flowchart_name), execution_order, None, project_root).validate()
+
+
+class FlowRun:
+    """one dag run of a flowchart configured from a request body.
+
+    options: use_cache, incremental, save_history, max_parallel. nodes before
+    `reuse_before_index` reuse their last successful result when one exists.
+    running processes are tracked under `tracking_prefix + node id`. with
+    `stream_output`, console lines reach `on_event` as 'stdout' / 'stderr'
+    events while nodes run; `evaluate_conditions` applies if-node conditions.
+    """
+
+    def __init__(
+        self,
+        options: Dict[str, Any],
+        flowchart_name: str,
+        execution_order: List[Any],
+        initial_variables: Dict[str, Any],
+        running_processes: Dict[str, Any],
+        process_lock: Any,
+        reuse_before_index: int = 0,
+        tracking_prefix: str = '',
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        cancel_event: Optional[Any] = None,
+        stream_output: bool = False,
+        evaluate_conditions: bool = False,
+    ):
+        self.options = options
+        self.flowchart_name = flowchart_name
+        self.execution_order = list(execution_order)
+        self.incremental = bool(options.get('incremental', False))
+        flowchart_data = self.flowchart_data = load_flowchart(flowchart_name)
+        project_root = current_app.config.get('FLOWCRAFT_PROJECT_ROOT') or os.getcwd()
+        # resolved here because nodes run on executor threads without an app context
+        result_cache = get_result_cache()
+        artifacts = artifact_settings()
+        self.artifact_budget = (artifacts['artifact_dir'], artifact_max_bytes())
+        use_cache = bool(options.get('use_cache', False))
+        baseline = baseline_results(flowchart_name, self.execution_order) if self.incremental else {}
+        position = {node_id: i for i, node_id in enumerate(self.execution_order)}
+
+        def run_node(node, file_path, function_args, input_values):
+            on_output = None
+            if stream_output and on_event is not None:
+                def on_output(stream_name, line):
+                    on_event(stream_name, {'node_id': node['id'], 'line': line.rstrip('\n')})
+
+            def _execute():
+                # use the tracking function to get line number information
+                return execute_python_function_with_tracking(file_path, function_args, input_values, f"{tracking_prefix}{node['id']}", running_processes, process_lock, on_output=on_output, artifacts=artifacts)
+            enabled, ttl = cache_policy(node, use_cache)
+            # a node that opts out of caching is also never reused by incremental runs
+            previous = baseline.get(node['id']) if cache_policy(node, True)[0] else None
+            return run_node_incrementally(
+                file_path, function_args, input_values, _execute,
+                previous=previous,
+                force_reuse=position.get(node['id'], 0) < reuse_before_index,
+                cache=result_cache if enabled else None,
+                ttl=ttl,
+                artifact_dir=artifacts['artifact_dir'],
+            )
+
+        # independent branches run concurrently; edges pass return values downstream
+        self.executor = DagExecutor(
+            flowchart_data,
+            self.execution_order,
+            run_node,
+            project_root,
+            max_parallel=max_parallel_setting(options.get('max_parallel')),
+            initial_variables=initial_variables,
+            on_event=on_event,
+            cancel_event=cancel_event,
+            evaluate_conditions=evaluate_conditions,
+            artifact_dir=artifacts['artifact_dir'],
+        )
+
+    def validate(self) -> Optional[Dict[str, Any]]:
+        """error payload with http `code`/`body`, or none when the run can start"""
+        return self.executor.validate()
+
+    def run(self) -> Dict[str, Any]:
+        outcome = self.executor.run()
+        # incremental runs save by default so the next one has a baseline
+        if self.options.get('save_history', self.incremental):
+            try:
+                outcome['execution_id'] = save_run_history(
+                    self.flowchart_name, self.execution_order, outcome, self.executor.final_variables(),
+                    data_saves=collect_data_saves(self.flowchart_data, self.executor.node_variables),
+                )
+            except Exception:
+                pass
+        evict_artifacts(*self.artifact_budget)
+        return outcome
+
+    def final_variables(self) -> Dict[str, Any]:
+        return self.executor.final_variables()
@@ -0,0 +1,146 @@
+"""process-wide lru of parsed flowchart documents.
+
+entries are keyed by the flowchart file's absolute path and validated against
+its (st_mtime_ns, st_size) on every read, so edits made outside the server are
+picked up while unchanged files are served without touching the json parser.
+`save_flowchart` writes through, storing the document it just wrote. memory is
+bounded by the summed size of the cached files (FLOWCRAFT_FLOWCHART_CACHE_BYTES);
+the least recently used documents are dropped first.
+
+saves that are accepted but not yet on disk (see flowchart_saves.py) are staged
+here; a staged document wins over the file until the write that carries it lands.
+
+cached documents are shared between requests: treat what `load` returns as
+read-only and deep-copy it before editing.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .worker_pool import config_value
+
+DEFAULT_FLOWCHART_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class FlowchartCache:
+    """in-memory lru of parsed flowcharts with hit/miss counters"""
+
+    def __init__(self, max_bytes: int = DEFAULT_FLOWCHART_CACHE_BYTES):
+        self.max_bytes = max(0, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # path -> ((st_mtime_ns, st_size), document)
+        self._entries: 'OrderedDict[str, Tuple[Tuple[int, int], Any]]' = OrderedDict()
+        self._bytes = 0
+        # path -> document accepted but not yet written; never evicted
+        self._staged: Dict[str, Any] = {}
+
+    def load(self, path: str, parse: Callable[[bytes], Any]) -> Any:
+        """the parsed document at `path`, parsing only when the file changed; raises like open() when it is missing"""
+        path = os.path.abspath(path)
+        with self._lock:
+            staged = self._staged.get(path)
+            if staged is not None:
+                self.hits += 1
+                return staged
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self.discard(path)
+            raise
+        # stamped before reading: a write racing the read leaves a stale stamp, so the next load re-parses
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        with open(path, 'rb') as f:
+            document = parse(f.read())
+        self._store(path, stamp, document)
+        return document
+
+    def stage(self, path: str, document: Any) -> None:
+        """serve `document` for `path` until a `store` of that same document"""
+        with self._lock:
+            self._staged[os.path.abspath(path)] = document
+
+    def store(self, path: str, document: Any) -> None:
+        """write-through after `document` was written to `path`"""
+        path = os.path.abspath(path)
+        with self._lock:
+            # a newer staged save stays in front of this write
+            if self._staged.get(path) is document:
+                del self._staged[path]
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.discard(path)
+            return
+        self._store(path, (st.st_mtime_ns, st.st_size), document)
+
+    def _store(self, path: str, stamp: Tuple[int, int], document: Any) -> None:
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._bytes -= previous[0][1]
+            # a document larger than the whole budget is never cached
+            if stamp[1] > self.max_bytes:
+                return
+            self._entries[path] = (stamp, document)
+            self._bytes += stamp[1]
+            while self._bytes > self.max_bytes and self._entries:
+                _path, (old_stamp, _doc) = self._entries.popitem(last=False)
+                self._bytes -= old_stamp[1]
+                self.evictions += 1
+
+    def discard(self, path: str) -> None:
+        with self._lock:
+            self._staged.pop(os.path.abspath(path), None)
+            entry = self._entries.pop(os.path.abspath(path), None)
+            if entry is not None:
+                self._bytes -= entry[0][1]
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._entries)
+            # staged saves are not a cache: they stay until written
+            self._entries.clear()
+            self._bytes = 0
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'staged': len(self._staged),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+_cache: Optional[FlowchartCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_flowchart_cache() -> FlowchartCache:
+    """the process-wide cache; its budget follows FLOWCRAFT_FLOWCHART_CACHE_BYTES"""
+    global _cache
+    try:
+        max_bytes = int(config_value('FLOWCRAFT_FLOWCHART_CACHE_BYTES', DEFAULT_FLOWCHART_CACHE_BYTES))
+    except Exception:
+        max_bytes = DEFAULT_FLOWCHART_CACHE_BYTES
+    with _cache_lock:
+        if _cache is None:
+            _cache = FlowchartCache(max_bytes)
+        _cache.max_bytes = max(0, max_bytes)
+        return _cache
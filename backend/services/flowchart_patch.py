@@ -0,0 +1,283 @@
+"""edits applied to a flowchart document without re-sending it whole.
+
+two formats are accepted by `PATCH /api/flowchart`:
+  - json patch (rfc 6902): a list of add / remove / replace / move / copy / test
+    operations addressed by json pointer
+  - collection edits keyed by identity: {"upsert": {"nodes": [...], ...},
+    "delete": {"nodes": [ids], "links": [{"source", "target"}], ...}}. nodes,
+    groups and annotations are matched by `id`, links by (source, target); an
+    upserted item replaces the stored one or is appended.
+
+neither mutates its input: containers along the edited paths are copied and
+everything else is shared with the original, which may be the cached document
+other requests are reading. cost follows the size of the edit, not the graph.
+
+`document_delta` / `apply_document_delta` compute and replay the collection
+edits between two documents; the backup store keeps snapshots that way.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+COLLECTIONS = ('nodes', 'links', 'groups', 'annotations')
+
+
+class PatchError(ValueError):
+    """the patch is malformed or does not apply to the document"""
+
+
+def _pointer(path: Any) -> List[str]:
+    if not isinstance(path, str) or (path and not path.startswith('/')):
+        raise PatchError(f'invalid json pointer: {path!r}')
+    return [part.replace('~1', '/').replace('~0', '~') for part in path.split('/')[1:]]
+
+
+def _index(container: List[Any], token: str, allow_end: bool) -> int:
+    if token == '-' and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        raise PatchError(f'invalid array index: {token!r}')
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f'array index out of range: {index}')
+    return index
+
+
+def _child(container: Any, token: str) -> Any:
+    if isinstance(container, dict):
+        if token not in container:
+            raise PatchError(f'path not found: {token!r}')
+        return container[token]
+    if isinstance(container, list):
+        return container[_index(container, token, allow_end=False)]
+    raise PatchError(f'cannot descend into {type(container).__name__}')
+
+
+def _get(document: Any, tokens: List[str]) -> Any:
+    for token in tokens:
+        document = _child(document, token)
+    return document
+
+
+def _edit(document: Any, tokens: List[str], change) -> Any:
+    """copy of `document` with `change(parent_copy, last_token)` applied at `tokens`; only the path is copied"""
+    if not tokens:
+        raise PatchError('the document root cannot be edited in place')
+    head, rest = tokens[0], tokens[1:]
+    if isinstance(document, dict):
+        copy: Any = dict(document)
+    elif isinstance(document, list):
+        copy = list(document)
+    else:
+        raise PatchError(f'cannot descend into {type(document).__name__}')
+    if not rest:
+        change(copy, head)
+        return copy
+    if isinstance(copy, dict):
+        copy[head] = _edit(_child(copy, head), rest, change)
+    else:
+        index = _index(copy, head, allow_end=False)
+        copy[index] = _edit(copy[index], rest, change)
+    return copy
+
+
+def _add(document: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+
+    def change(parent: Any, token: str) -> None:
+        if isinstance(parent, dict):
+            parent[token] = value
+        else:
+            parent.insert(_index(parent, token, allow_end=True), value)
+
+    return _edit(document, tokens, change)
+
+
+def _remove(document: Any, tokens: List[str]) -> Any:
+    def change(parent: Any, token: str) -> None:
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise PatchError(f'path not found: {token!r}')
+            del parent[token]
+        else:
+            del parent[_index(parent, token, allow_end=False)]
+
+    return _edit(document, tokens, change)
+
+
+def _replace(document: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+
+    def change(parent: Any, token: str) -> None:
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise PatchError(f'path not found: {token!r}')
+            parent[token] = value
+        else:
+            parent[_index(parent, token, allow_end=False)] = value
+
+    return _edit(document, tokens, change)
+
+
+def apply_json_patch(document: Dict[str, Any], operations: Any) -> Dict[str, Any]:
+    """apply rfc 6902 operations in order; raises PatchError and leaves `document` untouched on failure"""
+    if not isinstance(operations, list):
+        raise PatchError('a json patch is a list of operations')
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise PatchError('every patch operation must be an object')
+        op = operation.get('op')
+        tokens = _pointer(operation.get('path'))
+        if op in ('add', 'replace', 'test') and 'value' not in operation:
+            raise PatchError(f'{op} needs a value')
+        if op == 'add':
+            document = _add(document, tokens, operation['value'])
+        elif op == 'remove':
+            document = _remove(document, tokens)
+        elif op == 'replace':
+            document = _replace(document, tokens, operation['value'])
+        elif op in ('move', 'copy'):
+            source = _pointer(operation.get('from'))
+            value = _get(document, source)
+            if op == 'move':
+                if tokens[:len(source)] == source and tokens != source:
+                    raise PatchError('cannot move a value into itself')
+                document = _remove(document, source)
+            document = _add(document, tokens, value)
+        elif op == 'test':
+            if _get(document, tokens) != operation['value']:
+                raise PatchError(f"test failed at {operation.get('path')}")
+        else:
+            raise PatchError(f'unknown patch op: {op!r}')
+    if not isinstance(document, dict):
+        raise PatchError('the patched document must stay an object')
+    return document
+
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _checked(collection: str, key: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """reject ids and link endpoints that are not scalars (they could not be compared or hashed)"""
+    if not all(isinstance(part, _SCALARS) for part in key):
+        what = 'link endpoints' if collection == 'links' else f'{collection} ids'
+        raise PatchError(f'{what} must be strings or numbers')
+    return key
+
+
+def _identity(collection: str, item: Any) -> Tuple[Any, ...]:
+    if not isinstance(item, dict):
+        raise PatchError(f'{collection} entries must be objects')
+    if collection == 'links':
+        return _checked(collection, (item.get('source'), item.get('target')))
+    if 'id' not in item:
+        raise PatchError(f'{collection} entries need an id')
+    return _checked(collection, (item['id'],))
+
+
+def _stored_identity(collection: str, item: Any) -> Any:
+    """identity of an item already in the document; none for items that have none"""
+    if not isinstance(item, dict):
+        return None
+    if collection == 'links':
+        key = (item.get('source'), item.get('target'))
+    elif 'id' in item:
+        key = (item['id'],)
+    else:
+        return None
+    return key if all(isinstance(part, _SCALARS) for part in key) else None
+
+
+def _delete_identity(collection: str, item: Any) -> Tuple[Any, ...]:
+    if collection == 'links':
+        if isinstance(item, dict):
+            return _checked(collection, (item.get('source'), item.get('target')))
+        if isinstance(item, (list, tuple)) and len(item) == 2:
+            return _checked(collection, (item[0], item[1]))
+        raise PatchError('links are deleted by {source, target}')
+    return _checked(collection, (item.get('id'),) if isinstance(item, dict) else (item,))
+
+
+def apply_collection_edits(document: Dict[str, Any], upsert: Any = None, delete: Any = None) -> Dict[str, Any]:
+    """apply upserts and deletes per collection (deletes first); unknown ids in deletes are ignored"""
+    upsert = upsert or {}
+    delete = delete or {}
+    if not isinstance(upsert, dict) or not isinstance(delete, dict):
+        raise PatchError('upsert and delete map collection names to lists')
+    result = dict(document)
+    for collection in set(upsert) | set(delete):
+        if collection not in COLLECTIONS:
+            raise PatchError(f'unknown collection: {collection!r}')
+        added = upsert.get(collection) or []
+        removed = delete.get(collection) or []
+        if not isinstance(added, list) or not isinstance(removed, list):
+            raise PatchError(f'{collection} edits must be lists')
+        items = list(result.get(collection) or [])
+        if removed:
+            gone = {_delete_identity(collection, item) for item in removed}
+            items = [item for item in items if _stored_identity(collection, item) not in gone]
+        if added:
+            position = {_stored_identity(collection, item): i for i, item in enumerate(items)}
+            position.pop(None, None)
+            for item in added:
+                key = _identity(collection, item)
+                if key in position:
+                    items[position[key]] = item
+                else:
+                    position[key] = len(items)
+                    items.append(item)
+        result[collection] = items
+    return result
+
+
+def _collection_delta(collection: str, before: Any, after: Any) -> Any:
+    """(upserts, deletes) turning `before` into `after`, or none when apply_collection_edits could not reproduce it"""
+    if not isinstance(before, list) or not isinstance(after, list):
+        return None
+    before_keys = [_stored_identity(collection, item) for item in before]
+    after_keys = [_stored_identity(collection, item) for item in after]
+    if None in before_keys or None in after_keys:
+        return None
+    if len(set(before_keys)) != len(before_keys) or len(set(after_keys)) != len(after_keys):
+        return None
+    stored = dict(zip(before_keys, before))
+    present = set(after_keys)
+    # stored items keep their place and new ones are appended; any other order is not expressible
+    kept = [key for key in before_keys if key in present]
+    if kept + [key for key in after_keys if key not in stored] != after_keys:
+        return None
+    upserts = [item for key, item in zip(after_keys, after) if key not in stored or stored[key] != item]
+    deletes = [
+        {'source': key[0], 'target': key[1]} if collection == 'links' else key[0]
+        for key in before_keys if key not in present
+    ]
+    return upserts, deletes
+
+
+def document_delta(base: Dict[str, Any], document: Dict[str, Any]) -> Dict[str, Any]:
+    """edits turning `base` into `document`: collection upserts / deletes where possible, whole values otherwise"""
+    delta: Dict[str, Any] = {'set': {}, 'unset': [], 'upsert': {}, 'delete': {}}
+    for key, value in document.items():
+        if key in base and base[key] == value:
+            continue
+        edits = _collection_delta(key, base[key], value) if key in COLLECTIONS and key in base else None
+        if edits is None:
+            delta['set'][key] = value
+            continue
+        upserts, deletes = edits
+        if upserts:
+            delta['upsert'][key] = upserts
+        if deletes:
+            delta['delete'][key] = deletes
+    delta['unset'] = [key for key in base if key not in document]
+    return {key: value for key, value in delta.items() if value}
+
+
+def apply_document_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """inverse of `document_delta`; shares unchanged values with `base`"""
+    document = apply_collection_edits(base, delta.get('upsert'), delta.get('delete'))
+    for key in delta.get('unset') or []:
+        document.pop(key, None)
+    document.update(delta.get('set') or {})
+    return document
@@ -0,0 +1,190 @@
+"""versioned, coalesced flowchart saves for the builder's autosave.
+
+every flowchart document carries an integer `version` (0 when missing) that
+each accepted save bumps. a save may name the version it was based on; when
+that is no longer the current one the save is refused so it cannot overwrite
+edits it never saw.
+
+accepted saves are staged in the flowchart cache right away, so every reader in
+this process sees them, and written to disk once per coalescing window
+(FLOWCRAFT_SAVE_COALESCE_MS, default 500; 0 writes on the request thread): a
+burst of saves becomes one atomic write and one backup snapshot of the last
+document. pending saves are flushed at exit and before restores or renames; a
+write that fails is logged and retried on the next window.
+
+`patch_flowchart_version` takes an edit instead of a whole document (see
+flowchart_patch.py) and applies it to the current version under the same lock.
+"""
+
+import atexit
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import current_app
+
+from .flowchart_cache import get_flowchart_cache
+from .storage import LEGACY_SUMMARIES_KEY, get_flowchart_path, load_flowchart, save_flowchart, write_backup_snapshot
+from .worker_pool import config_value
+
+DEFAULT_SAVE_COALESCE_MS = 500
+
+_state_lock = threading.Lock()
+# path -> (flowchart name, document, app) waiting for its timer
+_pending: Dict[str, Tuple[str, Dict[str, Any], Any]] = {}
+_timers: Dict[str, threading.Timer] = {}
+# per path: `_version_locks` orders version checks, `_write_locks` orders disk writes
+_version_locks: Dict[str, threading.Lock] = {}
+_write_locks: Dict[str, threading.Lock] = {}
+
+
+def document_version(document: Any) -> int:
+    try:
+        return int((document or {}).get('version') or 0)
+    except (TypeError, ValueError, AttributeError):
+        return 0
+
+
+def coalesce_seconds() -> float:
+    try:
+        return max(0.0, float(config_value('FLOWCRAFT_SAVE_COALESCE_MS', DEFAULT_SAVE_COALESCE_MS)) / 1000.0)
+    except (TypeError, ValueError):
+        return DEFAULT_SAVE_COALESCE_MS / 1000.0
+
+
+def _lock(locks: Dict[str, threading.Lock], path: str) -> threading.Lock:
+    with _state_lock:
+        lock = locks.get(path)
+        if lock is None:
+            lock = locks[path] = threading.Lock()
+        return lock
+
+
+def _write(flowchart_name: str, document: Dict[str, Any], backup: bool = True) -> None:
+    save_flowchart(document, flowchart_name)
+    if backup:
+        try:
+            write_backup_snapshot(flowchart_name, document)
+        except Exception:
+            pass
+
+
+def _schedule(path: str, window: float) -> None:
+    """start the timer that flushes `path`; caller holds `_state_lock`"""
+    timer = threading.Timer(window, _flush, args=(path,))
+    timer.daemon = True
+    _timers[path] = timer
+    timer.start()
+
+
+def _flush(path: str) -> None:
+    with _lock(_write_locks, path):
+        with _state_lock:
+            item = _pending.pop(path, None)
+            timer = _timers.pop(path, None)
+        if timer is not None:
+            timer.cancel()
+        if item is None:
+            return
+        flowchart_name, document, app = item
+        with app.app_context():
+            try:
+                _write(flowchart_name, document)
+            except Exception as e:
+                print(f"warning: could not write flowchart {flowchart_name}, retrying: {e}")
+                # the staged document keeps being served; queue it again unless a newer save replaced it
+                with _state_lock:
+                    _pending.setdefault(path, item)
+                    if path not in _timers:
+                        _schedule(path, coalesce_seconds() or DEFAULT_SAVE_COALESCE_MS / 1000.0)
+
+
+def _accept(flowchart_name: str, path: str, document: Dict[str, Any]) -> None:
+    """write `document` now, or stage it and schedule the write; caller holds the version lock"""
+    # save_flowchart would strip this key into a new dict, and the cache only unstages the very object it staged
+    document.pop(LEGACY_SUMMARIES_KEY, None)
+    window = coalesce_seconds()
+    if window <= 0:
+        with _lock(_write_locks, path):
+            _write(flowchart_name, document)
+        return
+    get_flowchart_cache().stage(path, document)
+    with _state_lock:
+        _pending[path] = (flowchart_name, document, current_app._get_current_object())
+        if path not in _timers:
+            _schedule(path, window)
+
+
+def save_flowchart_version(flowchart_name: str, document: Dict[str, Any], base_version: Optional[int] = None) -> Tuple[bool, int]:
+    """accept a save unless `base_version` is stale.
+
+    returns (accepted, version): the version the document was saved as, or the
+    current version when the save was refused. with no `base_version` the save
+    is always accepted.
+    """
+    path = os.path.abspath(get_flowchart_path(flowchart_name))
+    with _lock(_version_locks, path):
+        # load sees staged saves, so back-to-back saves compare against each other
+        current = document_version(load_flowchart(flowchart_name))
+        if base_version is not None and int(base_version) != current:
+            return False, current
+        _accept(flowchart_name, path, dict(document, version=current + 1))
+    return True, current + 1
+
+
+def patch_flowchart_version(flowchart_name: str, base_version: int, edit: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Tuple[bool, int]:
+    """apply `edit` to the current document when `base_version` is still current.
+
+    `edit` gets the shared (cached) document and must return a new one without
+    mutating it; its PatchError propagates with nothing saved. returns
+    (accepted, version) like `save_flowchart_version`.
+    """
+    path = os.path.abspath(get_flowchart_path(flowchart_name))
+    with _lock(_version_locks, path):
+        current_document = load_flowchart(flowchart_name)
+        current = document_version(current_document)
+        if int(base_version) != current:
+            return False, current
+        document = edit(current_document)
+        _accept(flowchart_name, path, dict(document, version=current + 1))
+    return True, current + 1
+
+
+def flush_flowchart_saves(flowchart_name: Optional[str] = None) -> None:
+    """write pending saves now: one flowchart's, or every flowchart's when none"""
+    if flowchart_name is None:
+        with _state_lock:
+            paths = list(_pending)
+    else:
+        paths = [os.path.abspath(get_flowchart_path(flowchart_name))]
+    for path in paths:
+        _flush(path)
+
+
+def discard_flowchart_saves(flowchart_name: str) -> None:
+    """drop a pending save without writing it (the flowchart is being deleted)"""
+    path = os.path.abspath(get_flowchart_path(flowchart_name))
+    with _state_lock:
+        _pending.pop(path, None)
+        timer = _timers.pop(path, None)
+    if timer is not None:
+        timer.cancel()
+    get_flowchart_cache().discard(path)
+
+
+def restore_flowchart(flowchart_name: str, restore: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+    """run a backup restore and stamp the restored document with the next version,
+    so clients holding the pre-restore version see their next save refused"""
+    flush_flowchart_saves(flowchart_name)
+    path = os.path.abspath(get_flowchart_path(flowchart_name))
+    with _lock(_version_locks, path), _lock(_write_locks, path):
+        before = document_version(load_flowchart(flowchart_name))
+        restored = restore(flowchart_name)
+        if not restored:
+            return restored
+        restored = dict(restored, version=before + 1)
+        save_flowchart(restored, flowchart_name)
+    return restored
+
+
+atexit.register(flush_flowchart_saves)
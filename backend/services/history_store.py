@@ -0,0 +1,377 @@
+"""sqlite store for execution history.
+
+one row per run in `runs` and one row per node result in `node_results`, in
+`<history dir>/history.sqlite3` (FLOWCRAFT_HISTORY_DB overrides the path).
+runs carry the summary fields the dashboard shows and are indexed by
+flowchart + timestamp, flowchart + status and execution id, so finding one run
+or listing a flowchart's newest runs no longer parses every history file.
+
+the store only speaks in history entries, the same dicts the json files held:
+{execution_id, timestamp, flowchart_name, execution_data}. storage.py owns the
+store and keeps the public history functions; importing the old per-run json
+files also lives there.
+
+the values of data_save nodes are indexed in `data_saves`, one row per saved
+variable per run, so the data matrix reads them without loading entries.
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    execution_id TEXT PRIMARY KEY,
+    flowchart TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    status TEXT,
+    total_nodes INTEGER,
+    successful_nodes INTEGER,
+    failed_node TEXT,
+    elapsed_ms INTEGER,
+    summary TEXT,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_flowchart_timestamp ON runs (flowchart, timestamp, execution_id);
+CREATE INDEX IF NOT EXISTS runs_flowchart_status ON runs (flowchart, status, timestamp);
+CREATE INDEX IF NOT EXISTS runs_flowchart_failed_node ON runs (flowchart, failed_node, timestamp);
+CREATE TABLE IF NOT EXISTS node_results (
+    execution_id TEXT NOT NULL REFERENCES runs (execution_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    node_id TEXT,
+    node_name TEXT,
+    success INTEGER,
+    runtime INTEGER,
+    result TEXT NOT NULL,
+    PRIMARY KEY (execution_id, position)
+);
+CREATE INDEX IF NOT EXISTS node_results_node ON node_results (node_id);
+CREATE TABLE IF NOT EXISTS data_saves (
+    execution_id TEXT NOT NULL REFERENCES runs (execution_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    node_name TEXT,
+    variable_name TEXT,
+    value_type TEXT,
+    value TEXT,
+    PRIMARY KEY (execution_id, position)
+);
+CREATE TABLE IF NOT EXISTS imported (
+    flowchart TEXT PRIMARY KEY,
+    imported_at TEXT NOT NULL
+);
+"""
+
+# bumped when an index table is added; older databases are backfilled on open
+SCHEMA_VERSION = 1
+
+
+def flowchart_key(flowchart_name: str) -> str:
+    """history is keyed by the flowchart's base name, like the history/<name>/ folders"""
+    return flowchart_name[:-5] if flowchart_name.endswith('.json') else flowchart_name
+
+
+class HistoryStore:
+    """execution history in one sqlite file; connections are per thread"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA foreign_keys = ON')
+            conn.execute('PRAGMA busy_timeout = 10000')
+            with self._schema_lock:
+                if not self._schema_ready:
+                    # wal lets the dashboard read while a run is being written
+                    conn.execute('PRAGMA journal_mode = WAL')
+                    conn.executescript(SCHEMA)
+                    if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                        self._backfill(conn)
+                        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def _backfill(self, conn: sqlite3.Connection) -> None:
+        """index the data saves of runs stored before the data_saves table existed"""
+        with conn:
+            for execution_id, body in conn.execute('SELECT execution_id, entry FROM runs').fetchall():
+                execution_data = json.loads(body).get('execution_data') or {}
+                results = [json.loads(r) for (r,) in conn.execute(
+                    "SELECT result FROM node_results WHERE execution_id = ? AND result LIKE '%data_save%' ORDER BY position", (execution_id,)
+                )]
+                self._put_data_saves(conn, execution_id, data_save_rows(execution_data, results))
+
+    @staticmethod
+    def _put_data_saves(conn: sqlite3.Connection, execution_id: str, rows: List[Tuple[Any, Any, str, Any]]) -> None:
+        conn.execute('DELETE FROM data_saves WHERE execution_id = ?', (execution_id,))
+        conn.executemany(
+            'INSERT INTO data_saves (execution_id, position, node_name, variable_name, value_type, value) VALUES (?, ?, ?, ?, ?, ?)',
+            [
+                (execution_id, position, node_name, variable_name, value_type, json.dumps(value, default=str))
+                for position, (node_name, variable_name, value_type, value) in enumerate(rows)
+            ],
+        )
+
+    def put(self, entry: Dict[str, Any], summary: Dict[str, Any], replace: bool = True) -> bool:
+        """store one history entry; with replace=False an existing run is kept. returns whether it was written"""
+        execution_data = dict(entry.get('execution_data') or {})
+        results = execution_data.pop('results', None) or []
+        stored = dict(entry, execution_data=execution_data)
+        verb = 'INSERT OR REPLACE' if replace else 'INSERT OR IGNORE'
+        conn = self._db()
+        with conn:
+            cursor = conn.execute(
+                f'{verb} INTO runs (execution_id, flowchart, timestamp, status, total_nodes, successful_nodes, failed_node, elapsed_ms, summary, entry) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    entry['execution_id'], flowchart_key(entry.get('flowchart_name') or ''), entry.get('timestamp') or '',
+                    summary.get('status'), summary.get('total_nodes'), summary.get('successful_nodes'),
+                    summary.get('failed_node'), summary.get('elapsed_ms'),
+                    json.dumps(summary, default=str), json.dumps(stored, default=str),
+                ),
+            )
+            if cursor.rowcount == 0:
+                return False
+            conn.execute('DELETE FROM node_results WHERE execution_id = ?', (entry['execution_id'],))
+            conn.executemany(
+                'INSERT INTO node_results (execution_id, position, node_id, node_name, success, runtime, result) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (
+                        entry['execution_id'], position,
+                        None if r.get('node_id') is None else str(r.get('node_id')), r.get('node_name'),
+                        1 if r.get('success') else 0, _int_or_none(r.get('runtime')), json.dumps(r, default=str),
+                    )
+                    for position, r in enumerate(results)
+                    if isinstance(r, dict)
+                ],
+            )
+            self._put_data_saves(conn, entry['execution_id'], data_save_rows(execution_data, results))
+        return True
+
+    def _entries(self, rows: Iterable[Any]) -> List[Dict[str, Any]]:
+        """rebuild full entries from run rows (execution_id, entry), attaching node results in order"""
+        entries: Dict[str, Dict[str, Any]] = {}
+        for execution_id, body in rows:
+            entry = json.loads(body)
+            entry.setdefault('execution_data', {})['results'] = []
+            entries[execution_id] = entry
+        if entries:
+            ids = list(entries)
+            conn = self._db()
+            # sqlite caps bound parameters, so large histories are fetched in slices
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                marks = ','.join('?' * len(chunk))
+                for execution_id, body in conn.execute(
+                    f'SELECT execution_id, result FROM node_results WHERE execution_id IN ({marks}) ORDER BY execution_id, position', chunk
+                ):
+                    entries[execution_id]['execution_data']['results'].append(json.loads(body))
+        return list(entries.values())
+
+    def entries(self, flowchart_name: str) -> List[Dict[str, Any]]:
+        """every run of a flowchart, newest first"""
+        rows = self._db().execute(
+            'SELECT execution_id, entry FROM runs WHERE flowchart = ? ORDER BY timestamp DESC', (flowchart_key(flowchart_name),)
+        ).fetchall()
+        return self._entries(rows)
+
+    def entry(self, flowchart_name: str, execution_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._db().execute(
+            'SELECT execution_id, entry FROM runs WHERE execution_id = ? AND flowchart = ?', (execution_id, flowchart_key(flowchart_name))
+        ).fetchall()
+        found = self._entries(rows)
+        return found[0] if found else None
+
+    def summaries(
+        self,
+        flowchart_name: str,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[str, str]] = None,
+        statuses: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        failed_node: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """stored run summaries, newest first, without touching entries or node results.
+
+        `before` is the (timestamp, execution_id) of the last run on the previous
+        page; `since` is inclusive and `until` exclusive. returns the page and
+        the cursor for the next one (none on the last page).
+        """
+        where = ['flowchart = ?']
+        params: List[Any] = [flowchart_key(flowchart_name)]
+        if before is not None:
+            where.append('(timestamp < ? OR (timestamp = ? AND execution_id < ?))')
+            params.extend([before[0], before[0], before[1]])
+        if statuses:
+            where.append(f"status IN ({','.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if since:
+            where.append('timestamp >= ?')
+            params.append(since)
+        if until:
+            where.append('timestamp < ?')
+            params.append(until)
+        if failed_node:
+            where.append('failed_node = ?')
+            params.append(failed_node)
+        sql = f"SELECT execution_id, timestamp, summary FROM runs WHERE {' AND '.join(where)} ORDER BY timestamp DESC, execution_id DESC"
+        if limit is not None:
+            # one extra row tells whether another page exists
+            sql += ' LIMIT ?'
+            params.append(limit + 1)
+        rows = self._db().execute(sql, params).fetchall()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][1], rows[-1][0]) if rows else None
+        return [json.loads(summary) if summary else {'execution_id': execution_id, 'timestamp': timestamp} for execution_id, timestamp, summary in rows], next_cursor
+
+    def latest_results(self, flowchart_name: str, usable: Callable[[Dict[str, Any]], bool], node_ids: Optional[Iterable[Any]] = None) -> Dict[Any, Dict[str, Any]]:
+        """newest successful node result per node id that passes `usable`, tagged with its execution_id.
+
+        reads node_results newest run first and parses only rows of nodes not
+        yet found; with `node_ids` it stops once all of them are found.
+        """
+        wanted = None if node_ids is None else {str(node_id) for node_id in node_ids}
+        found: Dict[Any, Dict[str, Any]] = {}
+        settled = set()
+        rows = self._db().execute(
+            'SELECT n.node_id, n.execution_id, n.result FROM node_results n JOIN runs r ON r.execution_id = n.execution_id '
+            'WHERE r.flowchart = ? AND n.success = 1 AND n.node_id IS NOT NULL ORDER BY r.timestamp DESC, r.execution_id DESC, n.position',
+            (flowchart_key(flowchart_name),),
+        )
+        for node_id, execution_id, body in rows:
+            if node_id in settled or (wanted is not None and node_id not in wanted):
+                continue
+            result = json.loads(body)
+            if not usable(result):
+                continue
+            settled.add(node_id)
+            found[result.get('node_id', node_id)] = dict(result, execution_id=execution_id)
+            if wanted is not None and settled >= wanted:
+                break
+        return found
+
+    def data_saves(self, execution_ids: List[str]) -> Dict[str, List[Tuple[Any, Any, str, Any]]]:
+        """indexed (node_name, variable_name, type, value) rows per run, in save order"""
+        saves: Dict[str, List[Tuple[Any, Any, str, Any]]] = {execution_id: [] for execution_id in execution_ids}
+        conn = self._db()
+        for start in range(0, len(execution_ids), 500):
+            chunk = execution_ids[start:start + 500]
+            marks = ','.join('?' * len(chunk))
+            for execution_id, node_name, variable_name, value_type, value in conn.execute(
+                f'SELECT execution_id, node_name, variable_name, value_type, value FROM data_saves WHERE execution_id IN ({marks}) ORDER BY execution_id, position', chunk
+            ):
+                saves[execution_id].append((node_name, variable_name, value_type, json.loads(value) if value is not None else None))
+        return saves
+
+    def delete(self, flowchart_name: str, execution_id: str) -> bool:
+        conn = self._db()
+        with conn:
+            cursor = conn.execute('DELETE FROM runs WHERE execution_id = ? AND flowchart = ?', (execution_id, flowchart_key(flowchart_name)))
+        return cursor.rowcount > 0
+
+    def delete_flowchart(self, flowchart_name: str) -> int:
+        """drop every run of a flowchart and forget that its json history was imported"""
+        key = flowchart_key(flowchart_name)
+        conn = self._db()
+        with conn:
+            cursor = conn.execute('DELETE FROM runs WHERE flowchart = ?', (key,))
+            conn.execute('DELETE FROM imported WHERE flowchart = ?', (key,))
+        return cursor.rowcount
+
+    def rename_flowchart(self, old_name: str, new_name: str) -> None:
+        old_key, new_key = flowchart_key(old_name), flowchart_key(new_name)
+        conn = self._db()
+        with conn:
+            conn.execute('UPDATE runs SET flowchart = ? WHERE flowchart = ?', (new_key, old_key))
+            conn.execute('DELETE FROM imported WHERE flowchart = ?', (new_key,))
+            conn.execute('UPDATE imported SET flowchart = ? WHERE flowchart = ?', (new_key, old_key))
+
+    def is_imported(self, flowchart_name: str) -> bool:
+        row = self._db().execute('SELECT 1 FROM imported WHERE flowchart = ?', (flowchart_key(flowchart_name),)).fetchone()
+        return row is not None
+
+    def mark_imported(self, flowchart_name: str, when: str) -> None:
+        conn = self._db()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO imported (flowchart, imported_at) VALUES (?, ?)', (flowchart_key(flowchart_name), when))
+
+
+def json_type(value: Any) -> str:
+    """type names as the builder records them in data_saves"""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, int):
+        return 'integer'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, (list, tuple)):
+        return 'array'
+    return 'object'
+
+
+def data_save_rows(execution_data: Dict[str, Any], results: List[Any]) -> List[Tuple[Any, Any, str, Any]]:
+    """(node_name, variable_name, type, value) per saved variable of a run.
+
+    uses the normalized `data_saves` list when the run has one, else the
+    synthesized data_save results older builder runs carry.
+    """
+    saves = execution_data.get('data_saves')
+    if isinstance(saves, list):
+        rows = []
+        for save in saves:
+            if not isinstance(save, dict):
+                continue
+            content = save.get('variable_content')
+            if isinstance(content, (list, tuple)) and len(content) == 2:
+                value_type, value = content
+            else:
+                value_type, value = json_type(content), content
+            rows.append((save.get('node_name'), save.get('variable_name'), str(value_type), value))
+        return rows
+    rows = []
+    for result in results:
+        if not isinstance(result, dict) or result.get('function_name') != 'data_save':
+            continue
+        returned = result.get('return_value')
+        if not isinstance(returned, dict) or not returned:
+            continue
+        meta = result.get('data_save') or {}
+        first = next(iter(returned))
+        variable_name = meta.get('variable_name') or first
+        value = returned.get(variable_name, returned[first])
+        rows.append((meta.get('data_name') or result.get('node_name') or first, variable_name, json_type(value), value))
+    return rows
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_stores: Dict[str, HistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_history_store(path: str) -> HistoryStore:
+    """the process-wide store for a database path"""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = HistoryStore(path)
+        return store
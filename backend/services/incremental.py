@@ -0,0 +1,73 @@
+"""make-style incremental runs.
+
+every server-side node result carries a `fingerprint` (the script plus the
+local modules it imports) and an `inputs_hash` (bound arguments plus mocked
+inputs). an incremental run compares both against the newest successful result
+for that node in history and reuses its stored return value when they match.
+a node whose script changed is re-executed; its descendants re-run only if the
+values they receive actually changed. a stored result whose artifacts were
+evicted is not reused: the node runs again.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .artifacts import ArtifactStore, refs_present
+from .cache import NodeResultCache, node_signature, run_cached
+from .storage import get_latest_node_results
+
+
+def _has_signature(result: Dict[str, Any]) -> bool:
+    return bool(result.get('fingerprint') and result.get('inputs_hash'))
+
+
+def baseline_results(flowchart_name: str, node_ids: Optional[Iterable[Any]] = None) -> Dict[Any, Dict[str, Any]]:
+    """newest successful, fingerprinted result per node id across saved history (only `node_ids` when given)"""
+    return get_latest_node_results(flowchart_name, _has_signature, node_ids)
+
+
+def _reused_result(previous: Dict[str, Any], signature: Dict[str, str]) -> Dict[str, Any]:
+    """result for a node taken from history instead of being executed"""
+    return {
+        'success': True,
+        'output': previous.get('output', ''),
+        'error': None,
+        'return_value': previous.get('return_value'),
+        'function_name': previous.get('function_name', signature['function_name']),
+        'function_args': previous.get('function_args', {}),
+        # keep the stored signature: a forced reuse of a dirty node must stay dirty next time
+        'fingerprint': previous.get('fingerprint'),
+        'inputs_hash': previous.get('inputs_hash'),
+        'reused': True,
+        'reused_from': previous.get('execution_id'),
+    }
+
+
+def run_node_incrementally(
+    file_path: str,
+    function_args: Dict[str, Any],
+    input_values: Dict[str, Any],
+    execute: Callable[[], Dict[str, Any]],
+    previous: Optional[Dict[str, Any]] = None,
+    force_reuse: bool = False,
+    cache: Optional[NodeResultCache] = None,
+    ttl: Optional[float] = None,
+    artifact_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """reuse `previous` when the node is clean (or `force_reuse`), else run it through the result cache.
+
+    the returned result always carries the node's fingerprint and inputs hash so
+    it can serve as the baseline for the next incremental run.
+    """
+    signature = node_signature(file_path, function_args, input_values)
+    if signature is None:
+        return execute()
+    if previous is not None:
+        clean = previous.get('fingerprint') == signature['fingerprint'] and previous.get('inputs_hash') == signature['inputs_hash']
+        stored = not artifact_dir or refs_present(previous.get('return_value'), ArtifactStore(artifact_dir))
+        if (clean or force_reuse) and stored:
+            return _reused_result(previous, signature)
+    result = run_cached(cache, ttl, file_path, function_args, input_values, execute, signature=signature)
+    result['fingerprint'] = signature['fingerprint']
+    result['inputs_hash'] = signature['inputs_hash']
+    result.setdefault('reused', False)
+    return result
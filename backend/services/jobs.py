@@ -0,0 +1,198 @@
+"""background jobs for flow runs.
+
+`POST /api/jobs` turns a run (or resume) request into a `Job` and hands it to
+the `JobManager`, which runs up to FLOWCRAFT_JOB_WORKERS jobs at once and queues
+at most FLOWCRAFT_JOB_QUEUE more. jobs keep their partial results and an event
+log, so clients can poll or tail progress and cancel by job id after the
+submitting request has long returned.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .events import EventLog
+from .worker_pool import config_value
+
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_JOB_QUEUE = 16
+# finished jobs kept in memory for status/event polling
+MAX_FINISHED_JOBS = 100
+
+FINISHED_STATES = ('completed', 'failed', 'cancelled')
+
+
+class QueueFull(Exception):
+    """raised when a job is submitted while the queue is at capacity"""
+
+
+class Job:
+    """state of one queued or running flow run"""
+
+    def __init__(self, kind: str, flowchart_name: str, request: Dict[str, Any]):
+        self.job_id = str(uuid.uuid4())
+        self.kind = kind
+        self.flowchart_name = flowchart_name
+        self.request = request
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.results: List[Dict[str, Any]] = []
+        self.running_nodes: Dict[Any, Dict[str, Any]] = {}
+        self.outcome: Optional[Dict[str, Any]] = None
+        self.cancel_event = threading.Event()
+        self.events = EventLog()
+        self._lock = threading.Lock()
+        self.future = None
+
+    @property
+    def tracking_prefix(self) -> str:
+        """prefix for running-process keys, so cancelling a job only stops its own nodes"""
+        return f"job:{self.job_id}:"
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def on_event(self, event: str, data: Dict[str, Any]) -> None:
+        """executor callback: track partial results and forward to the event log"""
+        with self._lock:
+            if event == 'node_start':
+                self.running_nodes[data.get('node_id')] = data
+            elif event == 'node_result':
+                self.running_nodes.pop(data.get('node_id'), None)
+                self.results.append(data)
+        self.events.publish(event, data)
+
+    def summary(self, include_results: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            info: Dict[str, Any] = {
+                'job_id': self.job_id,
+                'kind': self.kind,
+                'flowchart_name': self.flowchart_name,
+                'status': self.status,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'completed_nodes': len(self.results),
+                'total_nodes': len(self.request.get('execution_order') or []),
+                'running_nodes': list(self.running_nodes.values()),
+            }
+            if self.outcome is not None:
+                info['message'] = self.outcome.get('message')
+                info['execution_id'] = self.outcome.get('execution_id')
+            if include_results:
+                info['results'] = sorted(self.results, key=lambda r: r.get('index', 0))
+                if self.outcome is not None:
+                    info['outcome'] = self.outcome
+            return info
+
+
+class JobManager:
+    """bounded executor for jobs: fixed worker count plus a capped waiting queue"""
+
+    def __init__(self, max_workers: int = DEFAULT_JOB_WORKERS, max_queue: int = DEFAULT_JOB_QUEUE):
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='flowcraft-job')
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def _pending(self) -> int:
+        return len([j for j in self._jobs.values() if j.status == 'queued'])
+
+    def submit(self, job: Job, work: Callable[[Job], Dict[str, Any]]) -> Job:
+        """queue `work(job)`; raises QueueFull when every worker is busy and the queue is full"""
+        with self._lock:
+            running = len([j for j in self._jobs.values() if j.status == 'running'])
+            if running >= self.max_workers and self._pending() >= self.max_queue:
+                raise QueueFull(f'job queue is full ({self.max_queue} waiting)')
+            self._jobs[job.job_id] = job
+            self._prune()
+        job.events.publish('queued', {'job_id': job.job_id})
+        job.future = self._executor.submit(self._run, job, work)
+        return job
+
+    def _run(self, job: Job, work: Callable[[Job], Dict[str, Any]]) -> None:
+        if job.cancel_event.is_set():
+            # cancelled after a worker picked it up, too late for future.cancel()
+            job.status = 'cancelled'
+            job.finished_at = time.time()
+            job.events.publish('done', job.summary(), close=True)
+            return
+        job.status = 'running'
+        job.started_at = time.time()
+        job.events.publish('started', {'job_id': job.job_id})
+        try:
+            outcome = work(job)
+        except Exception as e:
+            outcome = {'status': 'error', 'message': f'failed to execute flowchart: {str(e)}', 'results': list(job.results)}
+        job.outcome = outcome
+        job.finished_at = time.time()
+        if job.cancel_event.is_set() or outcome.get('status') == 'cancelled':
+            job.status = 'cancelled'
+        elif outcome.get('status') == 'success':
+            job.status = 'completed'
+        else:
+            job.status = 'failed'
+        job.events.publish('done', job.summary(), close=True)
+
+    def cancel(self, job: Job) -> bool:
+        """cancel a queued job outright, or ask a running one to stop scheduling nodes"""
+        job.cancel_event.set()
+        if job.status == 'queued' and job.future is not None and job.future.cancel():
+            job.status = 'cancelled'
+            job.finished_at = time.time()
+            job.events.publish('done', job.summary(), close=True)
+            return True
+        return not job.finished
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def _prune(self) -> None:
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.created_at)
+        for old in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            self._jobs.pop(old.job_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {'max_workers': self.max_workers, 'max_queue': self.max_queue, 'jobs': counts}
+
+    def shutdown(self) -> None:
+        for job in self.list():
+            if not job.finished:
+                self.cancel(job)
+        self._executor.shutdown(wait=False)
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """process-wide job manager sized from FLOWCRAFT_JOB_WORKERS / FLOWCRAFT_JOB_QUEUE"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            try:
+                workers = int(config_value('FLOWCRAFT_JOB_WORKERS', DEFAULT_JOB_WORKERS))
+            except Exception:
+                workers = DEFAULT_JOB_WORKERS
+            try:
+                queue = int(config_value('FLOWCRAFT_JOB_QUEUE', DEFAULT_JOB_QUEUE))
+            except Exception:
+                queue = DEFAULT_JOB_QUEUE
+            _manager = JobManager(workers, queue)
+        return _manager
@@ -0,0 +1,249 @@
+"""long-lived session kernel that keeps node return values in memory.
+
+started as `python -m backend.services.kernel` (or forked from the worker pool)
+by `sessions.py`, one per flowchart session. it reads length-prefixed json
+requests on stdin (same framing as runner.py) and answers each with one
+result frame on the FLOWCRAFT_RESULT_FD channel, until stdin closes.
+
+ops:
+  - run: execute a node's first function in this process. arguments are bound
+    from `function_args`, then from the stored variables of `upstream` node
+    ids, so large upstream values never leave the kernel. the return value is
+    kept under `node_id`, along with the variables in scope after the node
+    (its inputs plus its returns), so a node further down binds the same
+    arguments it would in a normal run.
+  - inspect: describe the stored values
+  - evict: drop stored values (`node_ids`, or everything)
+  - ping
+"""
+
+import ast
+import asyncio
+import builtins
+import contextlib
+import inspect
+import io
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from .runner import FRAME_RESULT_JSON, RESULT_FD_ENV, _MockInput, _ResourceMeter, _error_location, _error_message, encode_frame, read_message
+
+# return values up to this many bytes of json are sent back whole; larger ones as a reference
+INLINE_RETURN_BYTES = 64 * 1024
+PREVIEW_CHARS = 500
+
+
+def _first_function(source: str) -> Optional[str]:
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return node.name
+    return None
+
+
+def _preview(value: Any) -> str:
+    try:
+        text = repr(value)
+    except Exception:
+        text = f'<{type(value).__name__}>'
+    return text if len(text) <= PREVIEW_CHARS else text[:PREVIEW_CHARS] + '...'
+
+
+def _approx_size(value: Any) -> Optional[int]:
+    """cheap size estimate: library-reported bytes when available, else sys.getsizeof"""
+    size = getattr(value, 'nbytes', None)
+    if isinstance(size, int):
+        return size
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage):
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, 'sum') else usage)
+        except Exception:
+            pass
+    try:
+        return sys.getsizeof(value)
+    except Exception:
+        return None
+
+
+def _type_name(value: Any) -> str:
+    kind = type(value)
+    module = kind.__module__
+    return kind.__name__ if module == 'builtins' else f'{module}.{kind.__name__}'
+
+
+def _reference(node_id: Any, value: Any) -> Dict[str, Any]:
+    return {'$ref': node_id, 'type': _type_name(value), 'size_bytes': _approx_size(value), 'preview': _preview(value)}
+
+
+def _wire_value(node_id: Any, value: Any) -> Any:
+    """the return value as sent to the server: inline when small and json-safe, else a reference"""
+    try:
+        body = json.dumps(value)
+    except (TypeError, ValueError):
+        return _reference(node_id, value)
+    return value if len(body) <= INLINE_RETURN_BYTES else _reference(node_id, value)
+
+
+class Kernel:
+    def __init__(self):
+        # key -> {'node_id', 'value', 'variables', 'scope', 'stored_at'}; keys are str(node_id).
+        # `variables` are the node's own returns, `scope` everything visible downstream of it
+        self.store: Dict[str, Dict[str, Any]] = {}
+
+    def _upstream_variables(self, upstream: List[Any]) -> Dict[str, Any]:
+        merged: Dict[str, Any] = {}
+        for node_id in upstream or []:
+            entry = self.store.get(str(node_id))
+            if entry is not None:
+                merged.update(entry['scope'])
+        return merged
+
+    @staticmethod
+    def _bind(function: Any, explicit: Dict[str, Any], available: Dict[str, Any]) -> Dict[str, Any]:
+        call_args: Dict[str, Any] = {}
+        missing = []
+        for name, param in inspect.signature(function).parameters.items():
+            if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                continue
+            if name in explicit:
+                call_args[name] = explicit[name]
+            elif name in available:
+                call_args[name] = available[name]
+            elif param.default is param.empty:
+                missing.append(name)
+        if missing:
+            raise TypeError(f"missing required function arguments: {', '.join(missing)}")
+        return call_args
+
+    def run(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        node_id = request.get('node_id')
+        file_path = request['file_path']
+        input_values = request.get('input_values') or {}
+        explicit = request.get('function_args') or {}
+        if os.path.dirname(file_path) not in sys.path:
+            sys.path.insert(0, os.path.dirname(file_path))
+        mock_input = _MockInput(input_values)
+        previous_input = builtins.input
+        builtins.input = mock_input
+        stdout, stderr = io.StringIO(), io.StringIO()
+        function_name = None
+        call_args: Dict[str, Any] = {}
+        upstream = self._upstream_variables(request.get('upstream') or [])
+        meter = _ResourceMeter()
+        try:
+            with meter, contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    source = f.read()
+                function_name = _first_function(source)
+                if function_name is None:
+                    raise LookupError('no function found in python file')
+                namespace: Dict[str, Any] = {'__name__': '__main__', '__file__': file_path, '__builtins__': builtins}
+                exec(compile(source, file_path, 'exec'), namespace)
+                function = namespace[function_name]
+                call_args = self._bind(function, explicit, upstream)
+                value = function(**call_args)
+                if inspect.iscoroutine(value):
+                    value = asyncio.run(value)
+        except KeyboardInterrupt:
+            raise
+        except BaseException as e:
+            # sys.exit() and friends fail the node; the kernel and its stored values live on
+            error_line, error_file = _error_location(sys.exc_info()[2], file_path)
+            error_msg = _error_message(e)
+            if error_line is not None:
+                error_msg = f"Line {error_line}: {error_msg}"
+            return {
+                'success': False, 'error': error_msg, 'error_line': error_line, 'error_file': error_file,
+                'output': stdout.getvalue().strip(), 'stderr': stderr.getvalue(), 'return_value': None,
+                'function_name': function_name, 'metrics': meter.metrics,
+            }
+        finally:
+            builtins.input = previous_input
+
+        variables: Dict[str, Any] = {}
+        if isinstance(value, dict):
+            variables.update(value)
+        elif value is not None:
+            variables[request.get('variable_name') or str(node_id)] = value
+            if request.get('return_name'):
+                variables[request['return_name']] = value
+        scope = dict(upstream)
+        scope.update(explicit)
+        scope.update(variables)
+        self.store[str(node_id)] = {'node_id': node_id, 'value': value, 'variables': variables, 'scope': scope, 'stored_at': time.time()}
+        return {
+            'success': True,
+            'output': stdout.getvalue().strip(),
+            'stderr': stderr.getvalue(),
+            'error': None,
+            'return_value': _wire_value(node_id, value),
+            'function_name': function_name,
+            'function_args': explicit,
+            # arguments taken from upstream values held in this kernel
+            'bound_from_session': sorted(name for name in call_args if name not in explicit),
+            'input_calls': mock_input.calls,
+            'input_used': mock_input.calls > 0,
+            'metrics': meter.metrics,
+        }
+
+    def inspect(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        entries = []
+        for entry in self.store.values():
+            value = entry['value']
+            entries.append({
+                'node_id': entry['node_id'],
+                'type': _type_name(value),
+                'size_bytes': _approx_size(value),
+                'preview': _preview(value),
+                'variables': sorted(entry['variables']),
+                'stored_at': entry['stored_at'],
+            })
+        return {'success': True, 'entries': entries}
+
+    def evict(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        node_ids = request.get('node_ids')
+        if node_ids is None:
+            evicted = len(self.store)
+            self.store.clear()
+        else:
+            evicted = len([1 for node_id in node_ids if self.store.pop(str(node_id), None) is not None])
+        return {'success': True, 'evicted': evicted}
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get('op')
+        if op == 'run':
+            return self.run(request)
+        if op == 'inspect':
+            return self.inspect(request)
+        if op == 'evict':
+            return self.evict(request)
+        if op == 'ping':
+            return {'success': True, 'pid': os.getpid()}
+        return {'success': False, 'error': f'unknown op: {op}'}
+
+
+def main() -> None:
+    result_fd = int(os.environ[RESULT_FD_ENV])
+    os.set_inheritable(result_fd, False)
+    channel = os.fdopen(result_fd, 'wb')
+    kernel = Kernel()
+    stream = sys.stdin.buffer
+    while True:
+        try:
+            request = read_message(stream)
+        except EOFError:
+            return
+        try:
+            response = kernel.handle(request)
+        except (Exception, SystemExit) as e:
+            response = {'success': False, 'error': f'kernel error: {_error_message(e)}'}
+        channel.write(encode_frame(FRAME_RESULT_JSON, json.dumps(response, default=str).encode('utf-8')))
+        channel.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""map (fan-out) nodes.
+
+a `map_node` takes a list-valued upstream variable and calls its python
+file's function once per item, or per chunk of items, on up to `concurrency`
+worker processes at a time. node settings live under `map` in the flowchart
+json:
+
+    "map": {"over": "nav_links_save", "item_arg": "item", "chunk_size": 1,
+            "concurrency": 4, "on_error": "fail", "output": "products"}
+
+results come back in the original item order as one list variable (`output`,
+default the node's variable name). with `chunk_size` > 1 the function gets a
+list of items and list results are concatenated. `on_error` decides what a failed item does:
+"fail" stops the node, "skip" leaves the item out and "null" keeps a none in
+its place.
+
+a list large enough to have been stored as an artifact (see artifacts.py)
+arrives as a reference and is loaded from `artifact_dir` before fanning out.
+"""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from .artifacts import ArtifactStore, artifact_settings, decode_value, is_artifact_ref
+
+MAP_NODE_TYPE = 'map_node'
+DEFAULT_MAP_CONCURRENCY = 4
+FAILURE_POLICIES = ('fail', 'skip', 'null')
+# per-item errors kept on the node result
+MAX_REPORTED_ERRORS = 20
+
+
+def map_settings(node: Dict[str, Any]) -> Dict[str, Any]:
+    """normalized `map` settings of a node"""
+    # imported here because the executor imports this module
+    from .executor import variable_name_for_node
+    config = node.get('map') or {}
+    try:
+        chunk_size = max(1, int(config.get('chunk_size') or 1))
+    except Exception:
+        chunk_size = 1
+    try:
+        concurrency = max(1, int(config.get('concurrency') or DEFAULT_MAP_CONCURRENCY))
+    except Exception:
+        concurrency = DEFAULT_MAP_CONCURRENCY
+    on_error = config.get('on_error') if config.get('on_error') in FAILURE_POLICIES else 'fail'
+    return {
+        'over': config.get('over'),
+        'item_arg': config.get('item_arg') or 'item',
+        'chunk_size': chunk_size,
+        'concurrency': concurrency,
+        'on_error': on_error,
+        'output': config.get('output') or variable_name_for_node(node),
+    }
+
+
+def _failed(message: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+    return {'success': False, 'error': message, 'output': '', 'return_value': None, 'map': {'total': 0, 'completed': 0, 'failed': 0, 'settings': settings}}
+
+
+def _merge_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {}
+    for result in results:
+        for key, value in (result.get('metrics') or {}).items():
+            if not isinstance(value, (int, float)):
+                continue
+            if key == 'peak_rss_bytes':
+                merged[key] = max(merged.get(key, 0), value)
+            else:
+                merged[key] = merged.get(key, 0) + value
+    for key in ('cpu_user_s', 'cpu_system_s'):
+        if key in merged:
+            merged[key] = round(merged[key], 4)
+    return merged
+
+
+def run_map_node(
+    node: Dict[str, Any],
+    variables: Dict[str, Any],
+    run_item: Callable[[int, Dict[str, Any]], Dict[str, Any]],
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    artifact_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """fan a map node out over its list and gather the per-item results.
+
+    `run_item(index, function_args)` runs the node's function for one item (or
+    chunk) and returns a process-layer result. `on_progress` receives
+    {completed, failed, total, fraction} after every finished item.
+    """
+    settings = map_settings(node)
+    if not settings['over']:
+        return _failed('map node has no `map.over` variable configured', settings)
+    if settings['over'] not in variables:
+        return _failed(f"map variable '{settings['over']}' is not available from upstream nodes", settings)
+    items = variables[settings['over']]
+    if is_artifact_ref(items):
+        try:
+            items = decode_value(items, ArtifactStore(artifact_dir or artifact_settings()['artifact_dir']))
+        except Exception as e:
+            return _failed(f"map variable '{settings['over']}' could not be loaded: {e}", settings)
+    if isinstance(items, (str, bytes, dict)) or not hasattr(items, '__iter__'):
+        return _failed(f"map variable '{settings['over']}' is not a list", settings)
+    items = list(items)
+    size = settings['chunk_size']
+    units = [items[i:i + size] for i in range(0, len(items), size)] if size > 1 else items
+    total = len(units)
+
+    outcomes: List[Optional[Dict[str, Any]]] = [None] * total
+    completed = failed = 0
+    stop = False
+    with ThreadPoolExecutor(max_workers=settings['concurrency']) as pool:
+        pending = iter(range(total))
+        in_flight: Dict[Any, int] = {}
+
+        def _submit_next() -> bool:
+            index = next(pending, None)
+            if index is None:
+                return False
+            args = dict(variables)
+            args[settings['item_arg']] = units[index]
+            in_flight[pool.submit(run_item, index, args)] = index
+            return True
+
+        # keep at most `concurrency` items queued so a failure or cancel stops the rest
+        while len(in_flight) < settings['concurrency'] and _submit_next():
+            pass
+        while in_flight:
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                index = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'success': False, 'error': str(e), 'output': '', 'return_value': None}
+                outcomes[index] = result
+                completed += 1
+                if not result.get('success'):
+                    failed += 1
+                    if settings['on_error'] == 'fail':
+                        stop = True
+                if on_progress is not None:
+                    on_progress({'completed': completed, 'failed': failed, 'total': total, 'fraction': round(completed / total, 4) if total else 1.0})
+            cancelled = cancel_event is not None and cancel_event.is_set()
+            while not stop and not cancelled and len(in_flight) < settings['concurrency'] and _submit_next():
+                pass
+
+    finished = [o for o in outcomes if o is not None]
+    errors = [{'index': i, 'error': o.get('error')} for i, o in enumerate(outcomes) if o is not None and not o.get('success')]
+    values: List[Any] = []
+    for index, outcome in enumerate(outcomes):
+        if outcome is None:
+            continue
+        if outcome.get('success'):
+            value = outcome.get('return_value')
+            if size > 1 and isinstance(value, list):
+                values.extend(value)
+            else:
+                values.append(value)
+        elif settings['on_error'] == 'null':
+            # one none per item, so a failed chunk keeps the output aligned with the input
+            values.extend([None] * (len(units[index]) if size > 1 else 1))
+    output_lines = [f"[{i}] {o['output']}" for i, o in enumerate(outcomes) if o is not None and o.get('output')]
+    summary = {'total': total, 'completed': completed, 'failed': failed, 'chunk_size': size, 'errors': errors[:MAX_REPORTED_ERRORS], 'settings': settings}
+    result: Dict[str, Any] = {
+        'output': '\n'.join(output_lines),
+        'return_value': {settings['output']: values},
+        'function_args': {settings['over']: f'<{len(items)} items>'},
+        'metrics': _merge_metrics(finished),
+        'map': summary,
+    }
+    if completed < total:
+        first = errors[0] if errors else None
+        reason = f"item {first['index']} failed: {first['error']}" if first else 'map cancelled'
+        result.update(success=False, error=f'{reason} ({completed} of {total} items finished)')
+    elif errors and settings['on_error'] == 'fail':
+        result.update(success=False, error=f"item {errors[0]['index']} failed: {errors[0]['error']}")
+    else:
+        result.update(success=True, error=None)
+    return result
@@ -0,0 +1,289 @@
+"""batch engine that runs one flowchart over many input sets.
+
+items come from an explicit list, a spreadsheet/csv/json(l) file, a cartesian
+grid of values, or the product of a list and a grid. every item seeds the
+flow's initial variables and runs through its own `DagExecutor`, with up to
+`max_parallel` items in flight. a failing item is recorded and the batch
+carries on.
+
+results stream to a single jsonl file (one meta line, then one compact line per
+item) instead of one history file per run, and progress is published as an
+event log that the sse route tails.
+"""
+
+import csv
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+from .artifacts import evict_artifacts
+from .events import EventLog
+from .executor import DagExecutor
+
+DEFAULT_BATCH_PARALLEL = 4
+# finished batches kept in memory for status/event polling
+MAX_FINISHED_BATCHES = 20
+
+
+def load_items_from_file(path: str, sheet: Optional[str] = None) -> List[Dict[str, Any]]:
+    """read batch items (one dict per row) from .xlsx, .csv, .json or .jsonl"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            return [dict(row) for row in csv.DictReader(f)]
+    if ext == '.jsonl':
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    if ext == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError('json item files must contain a list of objects')
+        return data
+    if ext in ('.xlsx', '.xlsm'):
+        try:
+            import openpyxl
+        except ImportError:
+            openpyxl = None
+        if openpyxl is not None:
+            workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+            try:
+                worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+                rows = worksheet.iter_rows(values_only=True)
+                header = next(rows, None) or ()
+                names = [str(h) if h is not None else f"column_{i}" for i, h in enumerate(header)]
+                return [dict(zip(names, row)) for row in rows if any(v is not None for v in row)]
+            finally:
+                workbook.close()
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ValueError('reading .xlsx files needs openpyxl or pandas installed')
+        frame = pd.read_excel(path, sheet_name=sheet or 0)
+        return json.loads(frame.to_json(orient='records', date_format='iso'))
+    raise ValueError(f'unsupported item file type: {ext or path}')
+
+
+def expand_items(items: Optional[List[Dict[str, Any]]] = None, grid: Optional[Dict[str, List[Any]]] = None) -> List[Dict[str, Any]]:
+    """items x cartesian product of grid values; either side may be empty"""
+    base = [dict(item) for item in (items or [])] or [{}]
+    if not grid:
+        return base if items else []
+    keys = list(grid.keys())
+    combos = [dict(zip(keys, values)) for values in itertools.product(*[list(grid[k]) for k in keys])]
+    return [{**item, **combo} for item in base for combo in combos]
+
+
+class MultirunBatch:
+    """one batch: item expansion, bounded execution, event log and aggregated results"""
+
+    def __init__(
+        self,
+        flowchart_name: str,
+        flowchart_data: Dict[str, Any],
+        execution_order: List[Any],
+        items: List[Dict[str, Any]],
+        run_node_for: Callable[[str], Callable[[Dict[str, Any], str, Dict[str, Any], Dict[str, Any]], Dict[str, Any]]],
+        project_root: str,
+        results_path: str,
+        max_parallel: int = DEFAULT_BATCH_PARALLEL,
+        node_parallel: int = 1,
+        include_output: bool = False,
+        batch_id: Optional[str] = None,
+        artifact_dir: Optional[str] = None,
+        artifact_max_bytes: int = 0,
+    ):
+        self.batch_id = batch_id or str(uuid.uuid4())
+        self.flowchart_name = flowchart_name
+        self.flowchart_data = flowchart_data
+        self.execution_order = list(execution_order)
+        self.items = list(items)
+        # run_node_for(tracking_prefix) -> run_node callable for DagExecutor
+        self.run_node_for = run_node_for
+        self.project_root = project_root
+        self.results_path = results_path
+        self.max_parallel = max(1, int(max_parallel))
+        self.node_parallel = max(1, int(node_parallel))
+        self.include_output = include_output
+        self.artifact_dir = artifact_dir
+        # store budget enforced once the batch finishes (0: unbounded)
+        self.artifact_max_bytes = artifact_max_bytes
+        self.node_names = {n['id']: n.get('name', n['id']) for n in flowchart_data.get('nodes', []) or []}
+
+        self.status = 'pending'
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.completed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.cancelled = threading.Event()
+        self.events = EventLog()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def tracking_prefix(self, index: Optional[int] = None) -> str:
+        """prefix for running-process keys, so batch nodes never collide with builder runs"""
+        prefix = f"multirun:{self.batch_id}:"
+        return prefix if index is None else f"{prefix}{index}:"
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('completed', 'cancelled', 'failed')
+
+    # execution
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=f"multirun-{self.batch_id[:8]}", daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str)
+        with self._write_lock:
+            with open(self.results_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def _run_item(self, index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.time()
+        record: Dict[str, Any] = {'index': index, 'inputs': item}
+        if self.cancelled.is_set():
+            record.update({'status': 'cancelled', 'elapsed_ms': 0})
+            return record
+        try:
+            executor = DagExecutor(
+                self.flowchart_data,
+                self.execution_order,
+                self.run_node_for(self.tracking_prefix(index)),
+                self.project_root,
+                max_parallel=self.node_parallel,
+                initial_variables=item,
+                # items already running stop scheduling nodes once the batch is cancelled
+                cancel_event=self.cancelled,
+                artifact_dir=self.artifact_dir,
+            )
+            outcome = executor.run()
+            results = outcome.get('results', [])
+            record['status'] = outcome.get('status')
+            record['returns'] = {str(self.node_names.get(r['node_id'], r['node_id'])): r.get('return_value') for r in results if r.get('success')}
+            failed = next((r for r in results if not r.get('success')), None)
+            if failed is not None:
+                record['failed_node'] = failed.get('node_name')
+                record['error'] = failed.get('error')
+            elif outcome.get('status') != 'success':
+                record['error'] = outcome.get('message')
+            if self.include_output:
+                record['output'] = {str(r.get('node_name')): r.get('output', '') for r in results}
+        except Exception as e:
+            # one broken item must not take the batch down
+            record.update({'status': 'error', 'error': str(e)})
+        record['elapsed_ms'] = int((time.time() - started) * 1000)
+        return record
+
+    def _finish_item(self, record: Dict[str, Any]) -> None:
+        self._write(record)
+        self.completed += 1
+        if record.get('status') == 'success':
+            self.succeeded += 1
+        elif record.get('status') != 'cancelled':
+            self.failed += 1
+        self.events.publish('item', {
+            'index': record['index'],
+            'status': record.get('status'),
+            'elapsed_ms': record.get('elapsed_ms'),
+            'failed_node': record.get('failed_node'),
+            'error': record.get('error'),
+            'progress': self.progress(),
+        })
+
+    def _run(self) -> None:
+        self.status = 'running'
+        self.started_at = time.time()
+        self._write({'type': 'meta', 'batch_id': self.batch_id, 'flowchart_name': self.flowchart_name,
+                     'execution_order': self.execution_order, 'total_items': len(self.items),
+                     'started_at': self.started_at})
+        self.events.publish('start', {'batch_id': self.batch_id, 'total_items': len(self.items)})
+        final_status = 'completed'
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+                futures = [pool.submit(self._run_item, index, item) for index, item in enumerate(self.items)]
+                # report in completion order so progress is live even when early items are slow
+                for future in as_completed(futures):
+                    self._finish_item(future.result())
+            if self.cancelled.is_set():
+                final_status = 'cancelled'
+        except Exception as e:
+            final_status = 'failed'
+            self.events.publish('error', {'message': str(e)})
+        if self.artifact_dir:
+            evict_artifacts(self.artifact_dir, self.artifact_max_bytes)
+        self.finished_at = time.time()
+        self.status = final_status
+        self.events.publish('done', self.summary(), close=True)
+
+    def progress(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.time()) - (self.started_at or time.time())
+        return {
+            'total': len(self.items),
+            'completed': self.completed,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'elapsed_s': round(elapsed, 3),
+            'runs_per_minute': round(self.completed / elapsed * 60, 1) if elapsed > 0 else 0.0,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'batch_id': self.batch_id,
+            'flowchart_name': self.flowchart_name,
+            'status': self.status,
+            'max_parallel': self.max_parallel,
+            'results_file': self.results_path,
+            **self.progress(),
+        }
+
+
+_batches: Dict[str, MultirunBatch] = {}
+_batches_lock = threading.Lock()
+
+
+def register_batch(batch: MultirunBatch) -> None:
+    with _batches_lock:
+        _batches[batch.batch_id] = batch
+        finished = sorted((b for b in _batches.values() if b.finished), key=lambda b: b.created_at)
+        for old in finished[:max(0, len(finished) - MAX_FINISHED_BATCHES)]:
+            _batches.pop(old.batch_id, None)
+
+
+def get_batch(batch_id: str) -> Optional[MultirunBatch]:
+    with _batches_lock:
+        return _batches.get(batch_id)
+
+
+def list_batches() -> List[MultirunBatch]:
+    with _batches_lock:
+        return sorted(_batches.values(), key=lambda b: b.created_at, reverse=True)
+
+
+def read_batch_results(path: str) -> Dict[str, Any]:
+    """load an aggregated results file into {meta, items}"""
+    meta: Dict[str, Any] = {}
+    items: List[Dict[str, Any]] = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get('type') == 'meta':
+                meta = record
+            else:
+                items.append(record)
+    items.sort(key=lambda r: r.get('index', 0))
+    return {'meta': meta, 'items': items}
@@ -1,30 +1,220 @@
+import json
 import os
+import queue
 import subprocess
 import sys
-import tempfile
+import threading
 import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
 import ast
 import psutil
-import traceback
+
+from .artifacts import artifact_settings
+from .runner import FRAME_RESULT_JSON, RESULT_FD_ENV, encode_message, read_frames
+from .worker_pool import PACKAGE_ROOT, config_value, get_worker_pool
+
+RUNNER_MODULE = 'backend.services.runner'
+# console output kept per stream for the final result of a streamed run
+DEFAULT_STREAM_BUFFER_BYTES = 1024 * 1024
+# lines buffered between the pipe readers and a streaming response
+STREAM_QUEUE_LINES = 1000
 
 # process tracking shared map and lock should be owned by the app context.
 # to preserve behavior, these will be injected from the caller.
 
 
-def create_temp_execution_script(file_path: str, function_args: Dict[str, Any], input_values: Dict[str, Any]) -> Dict[str, Any]:
-    """create a temp script that wraps the target file and function call, returning path and metadata"""
+def spawn_python_process(argv: List[str], unbuffered: bool = False, result_pipe: bool = False):
+    """start a python child for argv, forking from the warm worker pool when available.
+
+    with result_pipe the child gets a dedicated result channel (see runner.py) and
+    the returned process exposes its read end as `result_fd`.
+    """
+    # all comments in lower case
+    env_overrides = {'PYTHONUNBUFFERED': '1'} if unbuffered else {}
+    pool = get_worker_pool()
+    if pool is not None:
+        try:
+            return pool.spawn(argv, cwd=os.getcwd(), env=env_overrides, unbuffered=unbuffered, result_pipe=result_pipe)
+        except Exception as e:
+            print(f"warning: worker pool spawn failed, using a cold interpreter: {e}")
+    env = os.environ.copy()
+    env.update(env_overrides)
+    # keep `-m backend.services...` importable regardless of cwd
+    env['PYTHONPATH'] = os.pathsep.join(p for p in [PACKAGE_ROOT, env.get('PYTHONPATH', '')] if p)
+    pass_fds = ()
+    result_r = result_w = None
+    if result_pipe:
+        result_r, result_w = os.pipe()
+        pass_fds = (result_w,)
+        env[RESULT_FD_ENV] = str(result_w)
+    try:
+        process = subprocess.Popen(
+            [sys.executable] + (['-u'] if unbuffered else []) + list(argv),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=os.getcwd(),
+            env=env,
+            bufsize=1 if unbuffered else -1,
+            pass_fds=pass_fds
+        )
+    except Exception:
+        if result_r is not None:
+            os.close(result_r)
+        raise
+    finally:
+        if result_w is not None:
+            os.close(result_w)
+    process.result_fd = result_r
+    return process
+
+
+class ResultChannel:
+    """drain a runner's result pipe on a background thread so the child never blocks on it"""
+
+    def __init__(self, fd: Optional[int]):
+        self._frames: List[Any] = []
+        self._thread = None
+        if fd is not None:
+            self._thread = threading.Thread(target=self._drain, args=(fd,), daemon=True)
+            self._thread.start()
+
+    def _drain(self, fd: int) -> None:
+        try:
+            with os.fdopen(fd, 'rb') as stream:
+                self._frames = read_frames(stream)
+        except Exception:
+            pass
+
+    def result(self, timeout: Optional[float] = 5.0) -> Optional[Dict[str, Any]]:
+        """the decoded result payload, or none if the child exited without sending one"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        for kind, body in self._frames:
+            if kind == FRAME_RESULT_JSON:
+                try:
+                    return json.loads(body.decode('utf-8'))
+                except Exception:
+                    return None
+        return None
+
+
+class OutputRing:
+    """keep the most recent lines of a stream within a byte budget"""
+
+    def __init__(self, max_bytes: int = DEFAULT_STREAM_BUFFER_BYTES):
+        self.max_bytes = max(1, int(max_bytes))
+        self.lines: Deque[str] = deque()
+        self.size = 0
+        self.dropped_lines = 0
+
+    def append(self, line: str) -> None:
+        self.lines.append(line)
+        self.size += len(line)
+        while self.size > self.max_bytes and len(self.lines) > 1:
+            self.size -= len(self.lines.popleft())
+            self.dropped_lines += 1
+
+    @property
+    def truncated(self) -> bool:
+        return self.dropped_lines > 0
+
+    def text(self) -> str:
+        return ''.join(self.lines)
+
+
+def stream_buffer_bytes() -> int:
+    try:
+        return max(1024, int(config_value('FLOWCRAFT_STREAM_BUFFER_BYTES', DEFAULT_STREAM_BUFFER_BYTES)))
+    except Exception:
+        return DEFAULT_STREAM_BUFFER_BYTES
+
+
+def iter_process_output(process: Any) -> Iterator[Tuple[str, str]]:
+    """yield ('stdout' | 'stderr', line) as either pipe produces output, until both close.
+
+    each pipe is drained by its own thread so a chatty stderr can never fill its
+    buffer and stall the child while we wait on stdout. the hand-off queue is
+    bounded, which applies back-pressure instead of buffering without limit.
+    """
+    lines: 'queue.Queue[Tuple[str, Optional[str]]]' = queue.Queue(maxsize=STREAM_QUEUE_LINES)
+
+    def _pump(name: str, stream: Any) -> None:
+        try:
+            for line in iter(stream.readline, ''):
+                lines.put((name, line))
+        except Exception:
+            pass
+        finally:
+            lines.put((name, None))
+
+    open_streams = 0
+    for name, stream in (('stdout', process.stdout), ('stderr', process.stderr)):
+        if stream is not None:
+            threading.Thread(target=_pump, args=(name, stream), daemon=True).start()
+            open_streams += 1
+    while open_streams:
+        name, line = lines.get()
+        if line is None:
+            open_streams -= 1
+            continue
+        yield name, line
+
+
+def collect_streamed_output(process: Any, on_output: Callable[[str, str], None], timeout: float) -> Dict[str, Any]:
+    """drain a running process line by line, handing each line to `on_output`.
+
+    returns the bounded stdout/stderr tails, whether either was truncated and
+    whether the process had to be killed for running past `timeout` seconds.
+    """
+    timed_out = threading.Event()
+
+    def _expire() -> None:
+        if process.poll() is None:
+            timed_out.set()
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+    timer = threading.Timer(timeout, _expire)
+    timer.daemon = True
+    timer.start()
+    buffer_bytes = stream_buffer_bytes()
+    console = {'stdout': OutputRing(buffer_bytes), 'stderr': OutputRing(buffer_bytes)}
+    try:
+        for stream_name, line in iter_process_output(process):
+            console[stream_name].append(line)
+            try:
+                on_output(stream_name, line)
+            except Exception:
+                # a broken listener must not stop the pipes from draining
+                pass
+        process.wait()
+    finally:
+        timer.cancel()
+    return {
+        'stdout': console['stdout'].text(),
+        'stderr': console['stderr'].text(),
+        'truncated': console['stdout'].truncated or console['stderr'].truncated,
+        'timed_out': timed_out.is_set(),
+    }
+
+
+def prepare_function_call(file_path: str, function_args: Dict[str, Any]) -> Dict[str, Any]:
+    """pick the first top-level function in the file and bind its formal args, or return an error"""
     # all comments in lower case
     with open(file_path, 'r', encoding='utf-8') as f:
-        original_content = f.read()
+        tree = ast.parse(f.read())
 
-    tree = ast.parse(original_content)
     functions = []
     # only consider top-level functions defined at module scope (exclude nested/inner defs)
     for node in tree.body:
-        if isinstance(node, ast.FunctionDef):
-            functions.append({'name': node.name, 'args': [arg.arg for arg in node.args.args]})
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append({'name': node.name, 'args': [arg.arg for arg in node.args.args], 'is_async': isinstance(node, ast.AsyncFunctionDef)})
 
     if not functions:
         return {
@@ -47,109 +237,71 @@ def create_temp_execution_script(file_path: str, function_args: Dict[str, Any],
             'error': f"missing required function arguments: {', '.join(missing_args)}"
         }
 
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as temp_script:
-        temp_script.write(f'''
-import json
-import sys
-import os
-import traceback
-sys.path.insert(0, os.path.dirname({repr(file_path)}))
-
-input_values_for_mock = {repr(input_values)}
-input_call_count = 0
-
-def mock_input(prompt=""):
-    global input_call_count, input_values_for_mock
-    input_call_count += 1
-    value_list = list(input_values_for_mock.values())
-    if input_call_count <= len(value_list):
-        _val = value_list[input_call_count - 1]
-        print(f"{{prompt}}{{_val}}")
-        return str(_val)
-    else:
-        print(f"{{prompt}}")
-        return ""
-
-import builtins
-builtins.input = mock_input
-
-# compile the original code with the original filename to preserve line numbers
-original_code = {repr(original_content)}
-compiled_code = compile(original_code, {repr(file_path)}, 'exec')
-exec(compiled_code)
-
-try:
-    if {len(formal_function_args) > 0}:
-        result = {function_name}(**{repr(call_args)})
-    else:
-        result = {function_name}()
-    output_data = {{
-        'success': True,
-        'return_value': result,
-        'function_name': '{function_name}',
-        'function_args': {repr(call_args)},
-        'input_values': {repr(input_values)},
-        'input_calls': input_call_count,
-        'input_used': bool(input_call_count > 0)
-    }}
-    print("__RESULT_START__")
-    print(json.dumps(output_data, default=str))
-    print("__RESULT_END__")
-except Exception as e:
-    # capture traceback and extract original file line number
-    exc_type, exc_value, exc_traceback = sys.exc_info()
-    tb_list = traceback.extract_tb(exc_traceback)
-    error_line = None
-    error_file = None
-    original_file_path = {repr(file_path)}
-    for tb in reversed(tb_list):
-        if tb.filename == original_file_path:
-            error_line = tb.lineno
-            error_file = tb.filename
-            break
-
-    error_msg = str(e)
-    if error_line is not None:
-        error_msg = f"Line {{error_line}}: {{error_msg}}"
-
-    output_data = {{
-        'success': False,
-        'error': error_msg,
-        'error_line': error_line,
-        'error_file': error_file,
-        'function_name': '{function_name}',
-        'function_args': {repr(call_args)},
-        'input_values': {repr(input_values)},
-        'input_calls': input_call_count,
-        'input_used': bool(input_call_count > 0)
-    }}
-    print("__RESULT_START__")
-    print(json.dumps(output_data, default=str))
-    print("__RESULT_END__")
-''')
-        temp_script_path = temp_script.name
-
     return {
-        'temp_script_path': temp_script_path,
         'function_name': function_name,
         'call_args': call_args,
+        'is_async': functions[0]['is_async'],
     }
 
 
-def start_unbuffered_process(temp_script_path: str):
-    """start the temp script with unbuffered stdio for live streaming"""
-    # all comments in lower case
-    env = os.environ.copy()
-    env['PYTHONUNBUFFERED'] = '1'
-    return subprocess.Popen(
-        [sys.executable, '-u', temp_script_path],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        cwd=os.getcwd(),
-        env=env,
-        bufsize=1
-    )
+def start_runner_process(
+    file_path: str,
+    function_name: str,
+    call_args: Dict[str, Any],
+    input_values: Dict[str, Any],
+    unbuffered: bool = False,
+    artifacts: Optional[Dict[str, Any]] = None,
+):
+    """start the runner module and hand it the call request over stdin.
+
+    the runner reads exactly one framed message, so stdin is only flushed here;
+    callers close it (communicate() does this) once they no longer need it.
+    `artifacts` is `artifact_settings()`, resolved here when not given.
+    """
+    if artifacts is None:
+        artifacts = artifact_settings()
+    process = spawn_python_process(['-m', RUNNER_MODULE], unbuffered=unbuffered, result_pipe=True)
+    process.result_channel = ResultChannel(process.result_fd)
+    try:
+        process.stdin.buffer.write(encode_message({
+            'file_path': file_path,
+            'function_name': function_name,
+            'function_args': call_args,
+            'input_values': input_values,
+            **artifacts,
+        }))
+        process.stdin.flush()
+    except (BrokenPipeError, OSError, ValueError):
+        # the child died before reading its request; its exit status tells the rest
+        pass
+    return process
+
+
+def build_node_result(result_data: Optional[Dict[str, Any]], stdout: str, stderr: str, returncode: Optional[int], wall_ms: Optional[int] = None) -> Dict[str, Any]:
+    """combine the runner's result payload with captured console output.
+
+    `wall_ms` is the server-side time from spawn to exit; it is added to the
+    runner's `metrics` so process startup is accounted for too.
+    """
+    if result_data is None:
+        result_data = {
+            'success': returncode == 0,
+            'output': stdout,
+            'error': stderr if stderr else None,
+            'return_value': None,
+        }
+    else:
+        result_data['output'] = (stdout or '').strip()
+        result_data['error'] = stderr if stderr else result_data.get('error')
+    if wall_ms is not None:
+        result_data['metrics'] = {'wall_ms': wall_ms, **(result_data.get('metrics') or {})}
+    return result_data
+
+
+def ms_since(started: float) -> int:
+    """milliseconds since a time.perf_counter() reading"""
+    return int((time.perf_counter() - started) * 1000)
+
 
 def execute_python_function_with_tracking(
     file_path: str,
@@ -158,148 +310,43 @@ def execute_python_function_with_tracking(
     node_id: Optional[str] = None,
     running_processes: Optional[Dict[str, Any]] = None,
     process_lock: Optional[Any] = None,
+    on_output: Optional[Callable[[str, str], None]] = None,
+    artifacts: Optional[Dict[str, Any]] = None,
 ):
-    """execute a single function from a python file with process tracking for termination"""
+    """execute a single function from a python file with process tracking for termination.
+
+    with `on_output`, console lines are passed to it as ('stdout' | 'stderr', line)
+    while the node runs instead of being collected only at exit. callers on
+    threads without an app context pass `artifacts` (see start_runner_process).
+    """
     if function_args is None:
         function_args = {}
     if input_values is None:
         input_values = {}
 
-    temp_script_path = None
     process = None
 
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as temp_script:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                original_content = f.read()
-
-            tree = ast.parse(original_content)
-            functions = []
-            # only consider top-level functions defined at module scope (exclude nested/inner defs)
-            for node in tree.body:
-                if isinstance(node, ast.FunctionDef):
-                    functions.append({'name': node.name, 'args': [arg.arg for arg in node.args.args]})
-
-            if not functions:
-                return {
-                    'success': False,
-                    'error': 'no function found in python file',
-                    'output': '',
-                    'return_value': None
-                }
-
-            function_name = functions[0]['name']
-            formal_function_args = functions[0]['args']
-
-            call_args: Dict[str, Any] = {}
-            missing_args = []
-            for arg_name in formal_function_args:
-                if arg_name in function_args:
-                    call_args[arg_name] = function_args[arg_name]
-                else:
-                    missing_args.append(arg_name)
-
-            if missing_args:
-                return {
-                    'success': False,
-                    'error': f'missing required function arguments: {", ".join(missing_args)}',
-                    'output': '',
-                    'return_value': None
-                }
-
-            temp_script.write(f'''
-import json
-import sys
-import os
-import traceback
-sys.path.insert(0, os.path.dirname({repr(file_path)}))
-
-input_values_for_mock = {repr(input_values)}
-input_call_count = 0
-
-def mock_input(prompt=""):
-    global input_call_count, input_values_for_mock
-    input_call_count += 1
-    value_list = list(input_values_for_mock.values())
-    if input_call_count <= len(value_list):
-        _val = value_list[input_call_count - 1]
-        print(f"{{prompt}}{{_val}}")
-        return str(_val)
-    else:
-        print(f"{{prompt}}")
-        return ""
-
-import builtins
-builtins.input = mock_input
-
-# compile the original code with the original filename to preserve line numbers
-original_code = {repr(original_content)}
-compiled_code = compile(original_code, {repr(file_path)}, 'exec')
-exec(compiled_code)
-
-try:
-    if {len(formal_function_args) > 0}:
-        result = {function_name}(**{repr(call_args)})
-    else:
-        result = {function_name}()
-    output_data = {{
-        'success': True,
-        'return_value': result,
-        'function_name': '{function_name}',
-        'function_args': {repr(call_args)},
-        'input_values': {repr(input_values)},
-        'input_calls': input_call_count,
-        'input_used': bool(input_call_count > 0)
-    }}
-    print("__RESULT_START__")
-    print(json.dumps(output_data, default=str))
-    print("__RESULT_END__")
-except Exception as e:
-    # capture full traceback for line number extraction
-    exc_type, exc_value, exc_traceback = sys.exc_info()
-    tb_list = traceback.extract_tb(exc_traceback)
-    
-    # find the line number in the original file
-    error_line = None
-    error_file = None
-    original_file_path = {repr(file_path)}
-    
-    # look for the error in the original file
-    for tb in reversed(tb_list):  # start from the most recent frame
-        if tb.filename == original_file_path:
-            error_line = tb.lineno
-            error_file = tb.filename
-            break
-    
-    # format error message with line number if available
-    error_msg = str(e)
-    if error_line is not None:
-        error_msg = f"Line {{error_line}}: {{error_msg}}"
-    
-    output_data = {{
-        'success': False,
-        'error': error_msg,
-        'error_line': error_line,
-        'error_file': error_file,
-        'function_name': '{function_name}',
-        'function_args': {repr(call_args)},
-        'input_values': {repr(input_values)},
-        'input_calls': input_call_count,
-        'input_used': bool(input_call_count > 0)
-    }}
-    print("__RESULT_START__")
-    print(json.dumps(output_data, default=str))
-    print("__RESULT_END__")
-''')
-            temp_script_path = temp_script.name
-
-        process = subprocess.Popen(
-            [sys.executable, temp_script_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            cwd=os.getcwd()
-        )
+        meta = prepare_function_call(file_path, function_args)
+        if 'error' in meta:
+            return {
+                'success': False,
+                'error': meta['error'],
+                'output': '',
+                'return_value': None
+            }
+
+        if meta['is_async']:
+            # imported here because async_workers builds on this module
+            from .async_workers import async_worker_enabled, execute_async_function
+            if async_worker_enabled():
+                return execute_async_function(
+                    file_path, meta, input_values, artifacts if artifacts is not None else artifact_settings(),
+                    node_id=node_id, running_processes=running_processes, process_lock=process_lock, on_output=on_output,
+                )
+
+        started = time.perf_counter()
+        process = start_runner_process(file_path, meta['function_name'], meta['call_args'], input_values, unbuffered=on_output is not None, artifacts=artifacts)
 
         if node_id and running_processes is not None and process_lock is not None:
             with process_lock:
@@ -307,9 +354,24 @@ except Exception as e:
                     'process': process,
                     'start_time': datetime.now(),
                     'file_path': file_path,
-                    'temp_script_path': temp_script_path
                 }
 
+        if on_output is not None:
+            try:
+                process.stdin.close()
+            except Exception:
+                pass
+            streamed = collect_streamed_output(process, on_output, 30)
+            if node_id and running_processes is not None and process_lock is not None:
+                with process_lock:
+                    running_processes.pop(node_id, None)
+            if streamed['timed_out']:
+                return {'success': False, 'error': 'execution timed out after 30 seconds', 'output': '', 'return_value': None, 'metrics': {'wall_ms': ms_since(started)}}
+            result_data = build_node_result(process.result_channel.result(), streamed['stdout'], streamed['stderr'], process.returncode, ms_since(started))
+            if streamed['truncated']:
+                result_data['output_truncated'] = True
+            return result_data
+
         try:
             stdout, stderr = process.communicate(timeout=30)
             process.wait()
@@ -318,30 +380,7 @@ except Exception as e:
                 with process_lock:
                     running_processes.pop(node_id, None)
 
-            result_data = None
-            if "__RESULT_START__" in stdout and "__RESULT_END__" in stdout:
-                result_start = stdout.find("__RESULT_START__") + len("__RESULT_START__")
-                result_end = stdout.find("__RESULT_END__")
-                result_json = stdout[result_start:result_end].strip()
-                try:
-                    import json as _json
-                    result_data = _json.loads(result_json)
-                    console_output = stdout[:stdout.find("__RESULT_START__")].strip()
-                    if stdout[result_end + len("__RESULT_END__"):].strip():
-                        console_output += stdout[result_end + len("__RESULT_END__"):].strip()
-                    result_data['output'] = console_output
-                    result_data['error'] = stderr if stderr else result_data.get('error')
-                except Exception:
-                    pass
-
-            if result_data is None:
-                result_data = {
-                    'success': process.returncode == 0,
-                    'output': stdout,
-                    'error': stderr if stderr else None,
-                    'return_value': None,
-                }
-            return result_data
+            return build_node_result(process.result_channel.result(), stdout, stderr, process.returncode, ms_since(started))
 
         except subprocess.TimeoutExpired:
             try:
@@ -352,7 +391,7 @@ except Exception as e:
             if node_id and running_processes is not None and process_lock is not None:
                 with process_lock:
                     running_processes.pop(node_id, None)
-            return {'success': False, 'error': 'execution timed out after 30 seconds', 'output': '', 'return_value': None}
+            return {'success': False, 'error': 'execution timed out after 30 seconds', 'output': '', 'return_value': None, 'metrics': {'wall_ms': ms_since(started)}}
 
     except Exception as e:
         if process:
@@ -366,28 +405,19 @@ except Exception as e:
                 running_processes.pop(node_id, None)
         return {'success': False, 'error': f'execution failed: {str(e)}', 'output': '', 'return_value': None}
 
-    finally:
-        if temp_script_path and os.path.exists(temp_script_path):
-            for attempt in range(5):
-                try:
-                    os.unlink(temp_script_path)
-                    break
-                except (OSError, PermissionError) as e:
-                    if attempt < 4:
-                        time.sleep(0.1 * (attempt + 1))
-                    else:
-                        print(f"warning: failed to clean up temporary file {temp_script_path}: {e}")
-
 
 def stop_all_processes(running_processes: Dict[str, Any]) -> Dict[str, Any]:
-    """terminate all tracked processes and clean temp files."""
+    """terminate all tracked processes."""
     terminated_count = 0
-    cleaned_files = 0
     for node_id, process_info in list(running_processes.items()):
         try:
             process = process_info['process']
-            temp_script_path = process_info.get('temp_script_path')
-            if process.poll() is None:
+            if getattr(process, 'shared', False):
+                # a task on the shared async worker: cancel it, the worker keeps serving others
+                if process.poll() is None:
+                    process.terminate()
+                    terminated_count += 1
+            elif process.poll() is None:
                 try:
                     parent = psutil.Process(process.pid)
                     children = parent.children(recursive=True)
@@ -412,20 +442,19 @@ def stop_all_processes(running_processes: Dict[str, Any]) -> Dict[str, Any]:
                             pass
                 except psutil.NoSuchProcess:
                     pass
-            if temp_script_path and os.path.exists(temp_script_path):
-                for attempt in range(3):
-                    try:
-                        os.unlink(temp_script_path)
-                        cleaned_files += 1
-                        break
-                    except (OSError, PermissionError):
-                        if attempt < 2:
-                            time.sleep(0.1)
-                        else:
-                            print(f"warning: could not clean up temp file {temp_script_path}")
             del running_processes[node_id]
         except Exception as e:
             print(f"error terminating process for node {node_id}: {e}")
-    return {'terminated': terminated_count, 'cleaned_files': cleaned_files}
+    return {'terminated': terminated_count}
+
+
 
 
+def stop_processes_with_prefix(running_processes: Dict[str, Any], process_lock: Any, prefix: str) -> Dict[str, Any]:
+    """terminate only the tracked processes whose key starts with `prefix` (one job or batch)"""
+    with process_lock:
+        matching = {k: v for k, v in running_processes.items() if str(k).startswith(prefix)}
+        outcome = stop_all_processes(matching)
+        for key in matching:
+            running_processes.pop(key, None)
+    return outcome
@@ -0,0 +1,261 @@
+"""fixed entry point that executes one node function.
+
+started as `python -m backend.services.runner` (or forked from the worker
+pool) and fed a single length-prefixed request on stdin:
+
+    4-byte big-endian payload length | utf-8 json payload
+
+payload keys: file_path, function_name, function_args, input_values, and
+optionally artifact_dir / inline_bytes (see artifacts.py: artifact references
+in the arguments are loaded before the call, and large or non-json return
+values are stored as artifacts). the node
+file is read and compiled here with its real filename so tracebacks keep the
+original line numbers; nothing is written to disk. the result includes
+`metrics` (run time, cpu seconds, peak rss and i/o bytes of this process and
+the children it waited for).
+
+the result goes back on a dedicated pipe (fd named by FLOWCRAFT_RESULT_FD) as
+binary frames, so stdout/stderr carry only user output:
+
+    1-byte frame kind | 4-byte big-endian payload length | payload
+"""
+
+import asyncio
+import builtins
+import inspect
+import json
+import os
+import struct
+import sys
+import time
+import traceback
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from .artifacts import DEFAULT_INLINE_BYTES, ArtifactStore, decode_value, encode_return_value
+
+HEADER = struct.Struct('>I')
+FRAME_HEADER = struct.Struct('>BI')
+RESULT_FD_ENV = 'FLOWCRAFT_RESULT_FD'
+
+# result frame kinds
+FRAME_RESULT_JSON = 1
+
+
+def encode_message(payload: Dict[str, Any]) -> bytes:
+    """frame a request for the runner"""
+    body = json.dumps(payload, default=str).encode('utf-8')
+    return HEADER.pack(len(body)) + body
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            raise EOFError('runner request truncated')
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def read_message(stream: BinaryIO) -> Dict[str, Any]:
+    """read one framed request from a binary stream"""
+    (size,) = HEADER.unpack(_read_exact(stream, HEADER.size))
+    return json.loads(_read_exact(stream, size).decode('utf-8'))
+
+
+class _MockInput:
+    """replacement for builtins.input that replays provided values in order"""
+
+    def __init__(self, input_values: Dict[str, Any]):
+        self.values = list((input_values or {}).values())
+        self.calls = 0
+
+    def __call__(self, prompt: str = '') -> str:
+        self.calls += 1
+        if self.calls <= len(self.values):
+            value = self.values[self.calls - 1]
+            print(f"{prompt}{value}")
+            return str(value)
+        print(f"{prompt}")
+        return ""
+
+
+def _error_location(exc_traceback, file_path: str):
+    # find the most recent frame that belongs to the node file
+    for tb in reversed(traceback.extract_tb(exc_traceback)):
+        if tb.filename == file_path:
+            return tb.lineno, tb.filename
+    return None, None
+
+
+def _io_bytes() -> Tuple[Optional[int], Optional[int]]:
+    """(read_bytes, write_bytes) for this process, when the platform exposes them"""
+    try:
+        import psutil
+        counters = psutil.Process().io_counters()
+        return counters.read_bytes, counters.write_bytes
+    except Exception:
+        pass
+    try:
+        values = {}
+        with open('/proc/self/io', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                values[key.strip()] = int(value)
+        return values.get('read_bytes'), values.get('write_bytes')
+    except Exception:
+        return None, None
+
+
+def _cpu_and_rss() -> Dict[str, Any]:
+    """cpu seconds and peak rss for this process plus any children it waited for"""
+    try:
+        import resource
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        # ru_maxrss is kilobytes on linux and bytes on macos
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return {
+            'cpu_user_s': round(own.ru_utime + children.ru_utime, 4),
+            'cpu_system_s': round(own.ru_stime + children.ru_stime, 4),
+            'peak_rss_bytes': max(own.ru_maxrss, children.ru_maxrss) * scale,
+        }
+    except Exception:
+        pass
+    try:
+        import psutil
+        process = psutil.Process()
+        times = process.cpu_times()
+        memory = process.memory_info()
+        return {
+            'cpu_user_s': round(times.user + getattr(times, 'children_user', 0.0), 4),
+            'cpu_system_s': round(times.system + getattr(times, 'children_system', 0.0), 4),
+            'peak_rss_bytes': getattr(memory, 'peak_wset', memory.rss),
+        }
+    except Exception:
+        return {}
+
+
+class _ResourceMeter:
+    """measure what one node run costs: run time, cpu, peak rss and i/o bytes"""
+
+    def __enter__(self) -> '_ResourceMeter':
+        self.started = time.perf_counter()
+        self.io_start = _io_bytes()
+        self.metrics: Dict[str, Any] = {}
+        return self
+
+    def __exit__(self, *exc) -> None:
+        read_end, write_end = _io_bytes()
+        read_start, write_start = self.io_start
+        self.metrics = {
+            'run_ms': int((time.perf_counter() - self.started) * 1000),
+            **_cpu_and_rss(),
+            'read_bytes': read_end - read_start if read_end is not None and read_start is not None else None,
+            'write_bytes': write_end - write_start if write_end is not None and write_start is not None else None,
+        }
+
+
+def _error_message(error: BaseException) -> str:
+    if isinstance(error, SystemExit):
+        return f"node called sys.exit({error.code!r})"
+    return str(error)
+
+
+def run_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """execute the requested function and build the result payload"""
+    file_path = request['file_path']
+    function_name = request['function_name']
+    call_args = request.get('function_args') or {}
+    input_values = request.get('input_values') or {}
+
+    sys.path.insert(0, os.path.dirname(file_path))
+    mock_input = _MockInput(input_values)
+    builtins.input = mock_input
+
+    def _base() -> Dict[str, Any]:
+        return {
+            'function_name': function_name,
+            'function_args': call_args,
+            'input_values': input_values,
+            'input_calls': mock_input.calls,
+            'input_used': bool(mock_input.calls > 0),
+        }
+
+    store = ArtifactStore(request['artifact_dir']) if request.get('artifact_dir') else None
+    meter = _ResourceMeter()
+    try:
+        with meter:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                source = f.read()
+            # compile with the original filename to preserve line numbers
+            compiled_code = compile(source, file_path, 'exec')
+            namespace: Dict[str, Any] = {'__name__': '__main__', '__file__': file_path, '__builtins__': builtins}
+            exec(compiled_code, namespace)
+            # upstream artifacts are loaded (memory-mapped where possible) only here, in the child
+            values = {name: decode_value(value, store) for name, value in call_args.items()} if store else call_args
+            result = namespace[function_name](**values)
+            if inspect.iscoroutine(result):
+                # an `async def` node run on its own (the shared async worker was bypassed)
+                result = asyncio.run(result)
+            if store is not None:
+                result = encode_return_value(result, store, request.get('inline_bytes', DEFAULT_INLINE_BYTES))
+        return {'success': True, 'return_value': result, 'metrics': meter.metrics, **_base()}
+    except (Exception, SystemExit) as e:
+        # sys.exit() in a node is a failed run that still owes a result frame
+        error_line, error_file = _error_location(sys.exc_info()[2], file_path)
+        error_msg = _error_message(e)
+        if error_line is not None:
+            error_msg = f"Line {error_line}: {error_msg}"
+        return {'success': False, 'error': error_msg, 'error_line': error_line, 'error_file': error_file, 'metrics': meter.metrics, **_base()}
+
+
+def encode_frame(kind: int, body: bytes) -> bytes:
+    return FRAME_HEADER.pack(kind, len(body)) + body
+
+
+def read_frame(stream: BinaryIO) -> Optional[Tuple[int, bytes]]:
+    """read one result frame; none at eof or when the frame is truncated"""
+    try:
+        kind, size = FRAME_HEADER.unpack(_read_exact(stream, FRAME_HEADER.size))
+        return kind, _read_exact(stream, size)
+    except EOFError:
+        return None
+
+
+def read_frames(stream: BinaryIO) -> List[Tuple[int, bytes]]:
+    """read result frames until eof; a truncated trailing frame is dropped"""
+    frames: List[Tuple[int, bytes]] = []
+    while True:
+        frame = read_frame(stream)
+        if frame is None:
+            return frames
+        frames.append(frame)
+
+
+def emit_result(output_data: Dict[str, Any]) -> None:
+    """send the result on the result channel, or stdout when run by hand"""
+    body = json.dumps(output_data, default=str).encode('utf-8')
+    result_fd = os.environ.get(RESULT_FD_ENV)
+    if not result_fd:
+        print(body.decode('utf-8'))
+        return
+    with os.fdopen(int(result_fd), 'wb') as channel:
+        channel.write(encode_frame(FRAME_RESULT_JSON, body))
+
+
+def main(stream: Optional[BinaryIO] = None) -> None:
+    stream = stream or sys.stdin.buffer
+    result_fd = os.environ.get(RESULT_FD_ENV)
+    if result_fd:
+        # keep the channel out of any processes the node itself starts, so eof arrives on exit
+        os.set_inheritable(int(result_fd), False)
+    request = read_message(stream)
+    emit_result(run_request(request))
+    sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
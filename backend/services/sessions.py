@@ -0,0 +1,285 @@
+"""per-flowchart session kernels.
+
+a session is one long-lived kernel process (see `kernel.py`) per flowchart.
+node runs in a session execute inside it and leave their return values there
+under the node id, so a later node binds upstream values by reference instead
+of the browser shipping them back as json for a fresh process each time.
+
+config keys/env vars:
+  - FLOWCRAFT_SESSION_MAX: kernels kept at once; the least recently used is shut down
+  - FLOWCRAFT_SESSION_IDLE_SECONDS: shut down kernels idle for this long (0 = never)
+  - FLOWCRAFT_SESSION_RUN_TIMEOUT: seconds a node may run before its kernel is restarted
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .executor import single_return_name, variable_name_for_node
+from .processes import OutputRing, iter_process_output, ms_since, spawn_python_process
+from .runner import FRAME_RESULT_JSON, encode_message, read_frame
+from .worker_pool import config_value
+
+KERNEL_MODULE = 'backend.services.kernel'
+DEFAULT_SESSION_MAX = 4
+DEFAULT_IDLE_SECONDS = 1800
+DEFAULT_RUN_TIMEOUT = 300
+# stray kernel output (subprocesses, c extensions) kept for inspection
+CONSOLE_BUFFER_BYTES = 64 * 1024
+
+
+class SessionError(Exception):
+    """the kernel died, timed out or could not be started"""
+
+
+def _setting(key: str, default: int) -> int:
+    try:
+        return max(0, int(config_value(key, default)))
+    except Exception:
+        return default
+
+
+class SessionKernel:
+    """one flowchart's kernel process; requests are answered one at a time"""
+
+    def __init__(self, flowchart_name: str):
+        self.flowchart_name = flowchart_name
+        self.process = None
+        self.started_at: Optional[float] = None
+        self.last_used = time.time()
+        self.runs = 0
+        self.console = OutputRing(CONSOLE_BUFFER_BYTES)
+        self._responses: 'queue.Queue[Optional[bytes]]' = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def _start(self) -> None:
+        process = spawn_python_process(['-m', KERNEL_MODULE], result_pipe=True)
+        responses: 'queue.Queue[Optional[bytes]]' = queue.Queue()
+
+        def _read_responses(fd: int) -> None:
+            try:
+                with os.fdopen(fd, 'rb') as stream:
+                    while True:
+                        frame = read_frame(stream)
+                        if frame is None:
+                            break
+                        if frame[0] == FRAME_RESULT_JSON:
+                            responses.put(frame[1])
+            except Exception:
+                pass
+            finally:
+                # eof: the kernel exited
+                responses.put(None)
+
+        def _drain_console() -> None:
+            for _, line in iter_process_output(process):
+                self.console.append(line)
+
+        threading.Thread(target=_read_responses, args=(process.result_fd,), daemon=True).start()
+        threading.Thread(target=_drain_console, daemon=True).start()
+        self.process = process
+        self._responses = responses
+        self.started_at = time.time()
+        self.runs = 0
+
+    def _stop(self) -> None:
+        process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            # closing stdin ends the kernel loop; kill if it does not go quietly
+            process.stdin.close()
+            process.wait(timeout=2)
+        except Exception:
+            try:
+                process.kill()
+                process.wait(timeout=5)
+            except Exception:
+                pass
+
+    def request(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """send one request and wait for its answer, starting the kernel if needed"""
+        with self._lock:
+            return self._request(payload, timeout)
+
+    def _request(self, payload: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        if not self.alive:
+            self._stop()
+            self._start()
+        self.last_used = time.time()
+        try:
+            self.process.stdin.buffer.write(encode_message(payload))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            self._stop()
+            raise SessionError(f'session kernel is not accepting requests: {str(e)}')
+        try:
+            body = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            self._stop()
+            raise SessionError(f'session kernel did not answer within {timeout:.0f} seconds and was restarted; stored values were lost')
+        self.last_used = time.time()
+        if body is None:
+            self._stop()
+            raise SessionError('session kernel exited; stored values were lost')
+        return json.loads(body.decode('utf-8'))
+
+    def run_node(
+        self,
+        node: Dict[str, Any],
+        file_path: str,
+        function_args: Dict[str, Any],
+        input_values: Dict[str, Any],
+        upstream: List[Any],
+        tracking_key: Optional[str] = None,
+        running_processes: Optional[Dict[str, Any]] = None,
+        process_lock: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """run a node in the kernel; returns a result shaped like a process-layer node result"""
+        payload = {
+            'op': 'run',
+            'node_id': node.get('id'),
+            'file_path': file_path,
+            'function_args': function_args or {},
+            'input_values': input_values or {},
+            'upstream': list(upstream or []),
+            'variable_name': variable_name_for_node(node),
+            'return_name': single_return_name(file_path),
+        }
+        with self._lock:
+            if not self.alive:
+                self._stop()
+                self._start()
+            tracked = tracking_key and running_processes is not None and process_lock is not None
+            if tracked:
+                # stop-execution may kill the kernel; the run then fails and the next one restarts it
+                with process_lock:
+                    running_processes[tracking_key] = {'process': self.process, 'start_time': datetime.now(), 'file_path': file_path}
+            started = time.perf_counter()
+            try:
+                response = self._request(payload, _setting('FLOWCRAFT_SESSION_RUN_TIMEOUT', DEFAULT_RUN_TIMEOUT) or None)
+            finally:
+                if tracked:
+                    with process_lock:
+                        running_processes.pop(tracking_key, None)
+            self.runs += 1
+        stderr = response.pop('stderr', '')
+        if stderr:
+            response['error'] = stderr if response.get('success') else f"{response.get('error')}\n{stderr}"
+        response['metrics'] = {'wall_ms': ms_since(started), **(response.get('metrics') or {})}
+        response['session'] = True
+        return response
+
+    def inspect(self) -> List[Dict[str, Any]]:
+        if not self.alive:
+            return []
+        return self.request({'op': 'inspect'}, timeout=30).get('entries', [])
+
+    def evict(self, node_ids: Optional[List[Any]] = None) -> int:
+        if not self.alive:
+            return 0
+        return self.request({'op': 'evict', 'node_ids': node_ids}, timeout=30).get('evicted', 0)
+
+    def restart(self) -> None:
+        with self._lock:
+            self._stop()
+            self._start()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._stop()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'flowchart_name': self.flowchart_name,
+            'alive': self.alive,
+            'pid': self.process.pid if self.alive else None,
+            'started_at': self.started_at,
+            'last_used': self.last_used,
+            'runs': self.runs,
+            'console_tail': self.console.text()[-2000:],
+        }
+
+
+_sessions: Dict[str, SessionKernel] = {}
+_sessions_lock = threading.Lock()
+
+
+def _reap_locked() -> List[SessionKernel]:
+    """unregister idle sessions and the least recently used ones over the cap; the caller
+    shuts them down once `_sessions_lock` is released (see `_shutdown_later`)"""
+    reaped: List[SessionKernel] = []
+    idle = _setting('FLOWCRAFT_SESSION_IDLE_SECONDS', DEFAULT_IDLE_SECONDS)
+    now = time.time()
+    for name, session in list(_sessions.items()):
+        if idle and now - session.last_used > idle:
+            reaped.append(_sessions.pop(name))
+    limit = max(1, _setting('FLOWCRAFT_SESSION_MAX', DEFAULT_SESSION_MAX))
+    while len(_sessions) > limit:
+        oldest = min(_sessions, key=lambda n: _sessions[n].last_used)
+        reaped.append(_sessions.pop(oldest))
+    return reaped
+
+
+def _shutdown_later(sessions: List[SessionKernel]) -> None:
+    """stop reaped sessions off the request thread; each waits for its own run to finish"""
+    if not sessions:
+        return
+
+    def _stop_all() -> None:
+        for session in sessions:
+            try:
+                session.shutdown()
+            except Exception:
+                pass
+
+    threading.Thread(target=_stop_all, name='session-reaper', daemon=True).start()
+
+
+def get_session(flowchart_name: str, create: bool = True) -> Optional[SessionKernel]:
+    """the flowchart's session, created on first use when `create`"""
+    with _sessions_lock:
+        reaped = _reap_locked()
+        session = _sessions.get(flowchart_name)
+        if session is None and create:
+            session = _sessions[flowchart_name] = SessionKernel(flowchart_name)
+            reaped += _reap_locked()
+    _shutdown_later(reaped)
+    return session
+
+
+def list_sessions() -> List[SessionKernel]:
+    with _sessions_lock:
+        reaped = _reap_locked()
+        sessions = list(_sessions.values())
+    _shutdown_later(reaped)
+    return sessions
+
+
+def close_session(flowchart_name: str) -> bool:
+    with _sessions_lock:
+        session = _sessions.pop(flowchart_name, None)
+    if session is None:
+        return False
+    session.shutdown()
+    return True
+
+
+def shutdown_sessions() -> None:
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.shutdown()
+
+
+atexit.register(shutdown_sessions)
@@ -1,8 +1,14 @@
 import json
 import os
+import threading
 from flask import current_app
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import backup_store
+from .flowchart_cache import get_flowchart_cache
+from .history_store import HistoryStore, flowchart_key, get_history_store
+from .worker_pool import config_value
 
 # note: this module centralizes filesystem access for flowcharts and history.
 
@@ -20,8 +26,8 @@ def _history_dir() -> str:
         return 'history'
 DEFAULT_FLOWCHART = 'default.json'
 
-# keep only a limited number of execution summaries in the flowchart file to avoid bloat
-MAX_EXECUTION_SUMMARIES = 200
+# run summaries used to be embedded in the flowchart file under this key; they live in the history database now
+LEGACY_SUMMARIES_KEY = 'executions'
 def _backups_root_dir() -> str:
     try:
         # keep backups under root/flowcharts/backups/
@@ -45,20 +51,13 @@ def _backup_dir_for(flowchart_name: str) -> str:
 
 
 def write_backup_snapshot(flowchart_name: str, data: Dict[str, Any]) -> str:
-    """write a timestamped backup snapshot for the given flowchart and return path"""
+    """write a backup snapshot for the given flowchart and return its path.
+    a snapshot identical to the newest one is skipped (its path is returned);
+    the rest are stored as deltas against periodic keyframes (see backup_store.py)"""
     backup_dir = _backup_dir_for(flowchart_name)
-    ts = datetime.now().strftime('%Y%m%dT%H%M%S')
-    filename = f"{ts}.json"
-    path = os.path.join(backup_dir, filename)
     try:
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2)
-        # prune old backups; keep only the most recent 50 per flowchart
-        try:
-            prune_backups(flowchart_name, keep=50)
-        except Exception:
-            pass
-        return path
+        # keeps at least the most recent 50 per flowchart
+        return backup_store.write_snapshot(backup_dir, data, keep=50)
     except Exception:
         return ''
 
@@ -67,61 +66,39 @@ def get_latest_backup_path(flowchart_name: str) -> str:
     """return the latest backup file path for a flowchart, or empty string if none"""
     backup_dir = _backup_dir_for(flowchart_name)
     try:
-        entries = [fn for fn in os.listdir(backup_dir) if fn.endswith('.json')]
+        entries = backup_store.list_entries(backup_dir)
         if not entries:
             return ''
-        # filenames are timestamped sortable
-        entries.sort(reverse=True)
-        return os.path.join(backup_dir, entries[0])
+        return os.path.join(backup_dir, entries[-1].filename)
     except Exception:
         return ''
 
 
-def restore_latest_backup(flowchart_name: str) -> Dict[str, Any]:
-    """restore the latest backup into the active flowchart file; return restored data or {}"""
-    latest = get_latest_backup_path(flowchart_name)
-    if not latest or not os.path.exists(latest):
+def _restore_backup_entry(flowchart_name: str, entry: Optional[backup_store.BackupEntry]) -> Dict[str, Any]:
+    """rebuild a snapshot and write it into the active flowchart file; return restored data or {}"""
+    if entry is None:
         return {}
     try:
-        # copy bytes to ensure exact restore
-        import shutil
-        target_path = get_flowchart_path(flowchart_name)
-        shutil.copyfile(latest, target_path)
-        # load and return restored json
-        with open(target_path, 'r') as f:
-            return json.load(f)
+        data = backup_store.read_snapshot(_backup_dir_for(flowchart_name), entry)
+        save_flowchart(dict(data), flowchart_name)
+        return load_flowchart(flowchart_name)
     except Exception:
         return {}
 
 
+def restore_latest_backup(flowchart_name: str) -> Dict[str, Any]:
+    """restore the latest backup into the active flowchart file; return restored data or {}"""
+    entries = backup_store.list_entries(_backup_dir_for(flowchart_name))
+    return _restore_backup_entry(flowchart_name, entries[-1] if entries else None)
+
+
 def prune_backups(flowchart_name: str, keep: int = 50) -> int:
-    """delete older backup files, keeping only the newest `keep` entries; returns the number deleted"""
-    backup_dir = _backup_dir_for(flowchart_name)
+    """delete the oldest backups while at least `keep` remain; returns the number deleted.
+    snapshots go in whole keyframe chains, so a few more than `keep` may stay"""
     try:
-        files = [fn for fn in os.listdir(backup_dir) if fn.endswith('.json')]
-        if len(files) <= keep:
-            return 0
-        files.sort(reverse=True)  # newest first (timestamped filenames)
-        to_delete = files[keep:]
-        deleted = 0
-        for fn in to_delete:
-            try:
-                os.remove(os.path.join(backup_dir, fn))
-                deleted += 1
-            except Exception:
-                # continue on errors to avoid interrupting the main flow
-                pass
-        return deleted
+        return backup_store.prune(_backup_dir_for(flowchart_name), keep)
     except Exception:
         return 0
-    try:
-        with open(latest, 'r') as f:
-            data = json.load(f)
-        # write to active flowchart
-        save_flowchart(data, flowchart_name)
-        return data
-    except Exception:
-        return {}
 
 
 def ensure_flowcharts_dir() -> None:
@@ -139,21 +116,47 @@ def get_flowchart_path(flowchart_name: str) -> str:
     return os.path.join(_flowcharts_dir(), flowchart_name)
 
 
+def _parse_flowchart(raw: bytes) -> Dict[str, Any]:
+    data = json.loads(raw)
+    if isinstance(data, dict):
+        data.pop(LEGACY_SUMMARIES_KEY, None)
+    return data
+
+
 def load_flowchart(flowchart_name: str = DEFAULT_FLOWCHART) -> Dict[str, Any]:
-    """load flowchart data from json file"""
+    """load flowchart data from json file.
+
+    documents come from the process-wide flowchart cache and are shared, so
+    treat the result as read-only and deep-copy it before editing.
+    """
     flowchart_path = get_flowchart_path(flowchart_name)
-    if os.path.exists(flowchart_path):
-        with open(flowchart_path, 'r') as f:
-            return json.load(f)
-    # default skeleton when no file exists yet
-    return {"nodes": [], "links": [], "groups": [], "executions": []}
+    try:
+        return get_flowchart_cache().load(flowchart_path, _parse_flowchart)
+    except FileNotFoundError:
+        # default skeleton when no file exists yet
+        return {"nodes": [], "links": [], "groups": []}
 
 
 def save_flowchart(data: Dict[str, Any], flowchart_name: str = DEFAULT_FLOWCHART) -> None:
-    """save flowchart data to json file"""
+    """save flowchart data to json file; the file holds graph data only.
+    the saved document goes into the flowchart cache, so callers must not mutate it afterwards.
+    """
     flowchart_path = get_flowchart_path(flowchart_name)
-    with open(flowchart_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    if isinstance(data, dict) and LEGACY_SUMMARIES_KEY in data:
+        data = {k: v for k, v in data.items() if k != LEGACY_SUMMARIES_KEY}
+    cache = get_flowchart_cache()
+    # written next to the target and renamed into place, so readers never see a half-written file
+    tmp_path = f"{flowchart_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, flowchart_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        cache.discard(flowchart_path)
+        raise
+    cache.store(flowchart_path, data)
 
 
 def ensure_history_dir(flowchart_name: str) -> str:
@@ -166,11 +169,68 @@ def ensure_history_dir(flowchart_name: str) -> str:
     return history_path
 
 
+def batch_results_path(flowchart_name: str, batch_id: str) -> str:
+    """path of the aggregated jsonl results file for a multirun batch"""
+    batches_path = os.path.join(ensure_history_dir(flowchart_name), 'batches')
+    os.makedirs(batches_path, exist_ok=True)
+    return os.path.join(batches_path, f"{batch_id}.jsonl")
+
+
+def _history_store() -> HistoryStore:
+    """the history database, `history.sqlite3` in the history folder unless FLOWCRAFT_HISTORY_DB is set"""
+    path = config_value('FLOWCRAFT_HISTORY_DB', None) or os.path.join(_history_dir(), 'history.sqlite3')
+    parent = os.path.dirname(os.path.abspath(path))
+    if not os.path.exists(parent):
+        os.makedirs(parent)
+    return get_history_store(path)
+
+
+def _ensure_history_imported(flowchart_name: str) -> HistoryStore:
+    """store for reads; a flowchart's json history files are imported the first time it is read"""
+    store = _history_store()
+    if not store.is_imported(flowchart_name):
+        import_json_history(flowchart_name)
+    return store
+
+
+def import_json_history(flowchart_name: str = None, replace: bool = False) -> int:
+    """import `history/<flow>/<uuid>.json` files into the history database.
+
+    all flowcharts when `flowchart_name` is none. runs already in the database
+    are kept unless `replace`. the json files are left in place. returns the
+    number of runs written.
+    """
+    store = _history_store()
+    root = _history_dir()
+    if flowchart_name is not None:
+        names = [flowchart_key(flowchart_name)]
+    else:
+        names = [n for n in os.listdir(root) if os.path.isdir(os.path.join(root, n))] if os.path.isdir(root) else []
+    imported = 0
+    for name in names:
+        history_path = os.path.join(root, name)
+        filenames = [fn for fn in os.listdir(history_path) if fn.endswith('.json')] if os.path.isdir(history_path) else []
+        for filename in filenames:
+            try:
+                with open(os.path.join(history_path, filename), 'r') as f:
+                    entry = json.load(f)
+                entry.setdefault('execution_id', filename[:-5])
+                entry.setdefault('flowchart_name', name + '.json')
+                execution_data = entry.get('execution_data') or {}
+                summary = execution_summary(entry['flowchart_name'], entry['execution_id'], entry.get('timestamp', ''), execution_data)
+                if store.put(entry, summary, replace=replace):
+                    imported += 1
+            except Exception:
+                # one unreadable file must not block the rest
+                pass
+        store.mark_imported(name, datetime.now().isoformat())
+    return imported
+
+
 def save_execution_history(flowchart_name: str, execution_data: Dict[str, Any]) -> str:
-    """save execution history to json file"""
+    """save execution history to the history database"""
     import uuid
 
-    history_path = ensure_history_dir(flowchart_name)
     execution_id = str(uuid.uuid4())
     timestamp = datetime.now().isoformat()
     history_entry: Dict[str, Any] = {
@@ -179,218 +239,252 @@ def save_execution_history(flowchart_name: str, execution_data: Dict[str, Any])
         'flowchart_name': flowchart_name,
         'execution_data': execution_data
     }
-    filename = f"{execution_id}.json"
-    filepath = os.path.join(history_path, filename)
-    with open(filepath, 'w') as f:
-        json.dump(history_entry, f, indent=2)
-    # also append a lightweight summary into the flowchart json for dashboard kpis
     try:
-        _append_execution_summary_to_flowchart(flowchart_name, execution_id, timestamp, execution_data)
+        summary = execution_summary(flowchart_name, execution_id, timestamp, execution_data)
     except Exception:
-        # keep silent to ensure primary history write never fails due to summary issues
-        pass
+        summary = {'execution_id': execution_id, 'timestamp': timestamp, 'flowchart_name': flowchart_name, 'status': execution_data.get('status', 'unknown')}
+    # the summary is stored with the run; the dashboard reads it from there, so the flowchart file is never rewritten
+    _history_store().put(history_entry, summary)
     return execution_id
 
 
 def get_execution_history(flowchart_name: str) -> List[Dict[str, Any]]:
-    """get execution history for a flowchart"""
-    if flowchart_name.endswith('.json'):
-        flowchart_name = flowchart_name[:-5]
-    history_path = os.path.join(_history_dir(), flowchart_name)
-    if not os.path.exists(history_path):
-        return []
-    history_entries: List[Dict[str, Any]] = []
-    for filename in os.listdir(history_path):
-        if filename.endswith('.json'):
-            filepath = os.path.join(history_path, filename)
-            try:
-                with open(filepath, 'r') as f:
-                    entry = json.load(f)
-                    history_entries.append(entry)
-            except Exception:
-                pass
-    try:
-        history_entries.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-    except Exception:
-        pass
-    return history_entries
+    """get execution history for a flowchart, newest first"""
+    return _ensure_history_imported(flowchart_name).entries(flowchart_name)
+
+
+def get_latest_node_results(flowchart_name: str, usable: Callable[[Dict[str, Any]], bool], node_ids: Optional[Iterable[Any]] = None) -> Dict[Any, Dict[str, Any]]:
+    """newest successful result per node id passing `usable`, read from the node results index"""
+    return _ensure_history_imported(flowchart_name).latest_results(flowchart_name, usable, node_ids)
+
+
+def get_execution_entry(flowchart_name: str, execution_id: str) -> Optional[Dict[str, Any]]:
+    """one history entry by id, or none"""
+    return _ensure_history_imported(flowchart_name).entry(flowchart_name, execution_id)
+
+
+def get_execution_summaries(
+    flowchart_name: str,
+    limit: Optional[int] = None,
+    before: Optional[str] = None,
+    statuses: Optional[List[str]] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    failed_node: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """summaries stored with each run (see execution_summary), newest first, for list views.
+
+    `before` is the cursor returned with the previous page ("<timestamp>|<execution_id>",
+    or a bare timestamp). returns the page and the next cursor, none on the last page.
+    """
+    cursor = None
+    if before:
+        timestamp, _, execution_id = before.partition('|')
+        cursor = (timestamp, execution_id)
+    page, next_cursor = _ensure_history_imported(flowchart_name).summaries(
+        flowchart_name, limit=limit, before=cursor, statuses=statuses, since=since, until=until, failed_node=failed_node,
+    )
+    return page, f"{next_cursor[0]}|{next_cursor[1]}" if next_cursor else None
+
+
+def get_data_saves(execution_ids: List[str]) -> Dict[str, List[Tuple[Any, Any, str, Any]]]:
+    """indexed data_save values per run id: (node_name, variable_name, type, value) in save order"""
+    return _history_store().data_saves(list(execution_ids))
 
 
 def delete_execution_history(flowchart_name: str, execution_id: str) -> bool:
     """delete a specific execution history entry"""
-    if flowchart_name.endswith('.json'):
-        flowchart_name = flowchart_name[:-5]
-    history_path = os.path.join(_history_dir(), flowchart_name)
-    filepath = os.path.join(history_path, f"{execution_id}.json")
+    deleted = _ensure_history_imported(flowchart_name).delete(flowchart_name, execution_id)
+    # drop the imported json file too so a later re-import cannot bring it back
+    filepath = os.path.join(_history_dir(), flowchart_key(flowchart_name), f"{execution_id}.json")
     if os.path.exists(filepath):
         os.remove(filepath)
-        return True
-    return False
+        deleted = True
+    return deleted
+
+
+def delete_flowchart_history(flowchart_name: str) -> int:
+    """delete every run of a flowchart: database rows and its history folder (batches included)"""
+    removed = _history_store().delete_flowchart(flowchart_name)
+    history_path = os.path.join(_history_dir(), flowchart_key(flowchart_name))
+    if os.path.exists(history_path):
+        import shutil
+        shutil.rmtree(history_path)
+    return removed
 
 
-def _append_execution_summary_to_flowchart(flowchart_name: str, execution_id: str, timestamp: str, execution_data: Dict[str, Any]) -> None:
-    """append a compact execution summary to the flowchart json under `executions`.
-    this is used by the dashboard for fast metrics without scanning the history folder.
-    comments: keep this robust and additive; never raise if something goes wrong.
+def summarize_node_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """total cpu and i/o plus the largest peak rss across node results that carry `metrics`.
+    cached and reused results are skipped because they cost nothing in this run.
     """
-    # compute summary fields
-    try:
-        execution_order = execution_data.get('execution_order', []) or []
-        total_nodes = len(execution_order)
-        order_id_set = set(execution_order)
-        results = execution_data.get('results', []) or []
-        # only consider nodes that were part of the execution order
-        results_in_order = [r for r in results if r.get('node_id') in order_id_set]
-        successful_nodes = len([r for r in results_in_order if r.get('success', False)])
-        completed_nodes = len(results_in_order)
-        success_percentage = (successful_nodes / total_nodes * 100.0) if total_nodes > 0 else 0.0
-        completed_percentage = (completed_nodes / total_nodes * 100.0) if total_nodes > 0 else 0.0
-        failed_node = None
-        error_snippet = None
-        for r in results_in_order:
-            if not r.get('success', False):
-                failed_node = r.get('node_name', 'unknown')
-                try:
-                    err_text = r.get('error')
-                    if isinstance(err_text, str) and err_text:
-                        # include line number if available
-                        error_line = r.get('error_line')
-                        if error_line and error_line > 0:
-                            error_snippet = f"Line {error_line}: {err_text[:50]}"
-                        else:
-                            # include first 50 characters of the error message
-                            error_snippet = err_text[:50]
-                except Exception:
-                    pass
-                break
-        elapsed_ms = 0
-        for r in results_in_order:
+    totals: Dict[str, Any] = {'cpu_user_s': 0.0, 'cpu_system_s': 0.0, 'peak_rss_bytes': 0, 'read_bytes': 0, 'write_bytes': 0, 'wall_ms': 0}
+    measured = 0
+    for r in results or []:
+        metrics = r.get('metrics')
+        if not isinstance(metrics, dict) or r.get('cached') or r.get('reused'):
+            continue
+        measured += 1
+        for key in ('cpu_user_s', 'cpu_system_s', 'read_bytes', 'write_bytes', 'wall_ms'):
             try:
-                elapsed_ms += int(r.get('runtime', 0) or 0)
+                totals[key] += metrics.get(key) or 0
             except Exception:
-                # ignore bad runtimes
                 pass
-        # human friendly string for table display: always seconds with 3 decimals
-        def _format_elapsed(ms: int) -> str:
+        try:
+            totals['peak_rss_bytes'] = max(totals['peak_rss_bytes'], int(metrics.get('peak_rss_bytes') or 0))
+        except Exception:
+            pass
+    if not measured:
+        return {}
+    totals['cpu_user_s'] = round(totals['cpu_user_s'], 3)
+    totals['cpu_system_s'] = round(totals['cpu_system_s'], 3)
+    totals['measured_nodes'] = measured
+    return totals
+
+
+def execution_summary(flowchart_name: str, execution_id: str, timestamp: str, execution_data: Dict[str, Any]) -> Dict[str, Any]:
+    """compact summary of one run: node counts, failed node, elapsed time, resources.
+    stored with the run in the history database, where the dashboard and `/api/history` read it.
+    """
+    execution_order = execution_data.get('execution_order', []) or []
+    total_nodes = len(execution_order)
+    order_id_set = set(execution_order)
+    results = execution_data.get('results', []) or []
+    # only consider nodes that were part of the execution order
+    results_in_order = [r for r in results if r.get('node_id') in order_id_set]
+    successful_nodes = len([r for r in results_in_order if r.get('success', False)])
+    completed_nodes = len(results_in_order)
+    success_percentage = (successful_nodes / total_nodes * 100.0) if total_nodes > 0 else 0.0
+    completed_percentage = (completed_nodes / total_nodes * 100.0) if total_nodes > 0 else 0.0
+    failed_node = None
+    error_snippet = None
+    for r in results_in_order:
+        if not r.get('success', False):
+            failed_node = r.get('node_name', 'unknown')
             try:
-                ms = int(ms)
+                err_text = r.get('error')
+                if isinstance(err_text, str) and err_text:
+                    # include line number if available
+                    error_line = r.get('error_line')
+                    if error_line and error_line > 0:
+                        error_snippet = f"Line {error_line}: {err_text[:50]}"
+                    else:
+                        # include first 50 characters of the error message
+                        error_snippet = err_text[:50]
             except Exception:
-                return '0.000s'
-            seconds = ms / 1000.0
-            return f"{seconds:.3f}s"
-
-        summary: Dict[str, Any] = {
-            'execution_id': execution_id,
-            'timestamp': timestamp,
-            'flowchart_name': flowchart_name,
-            'status': execution_data.get('status', 'unknown'),
-            'total_nodes': total_nodes,
-            'successful_nodes': successful_nodes,
-            'completed_nodes': completed_nodes,
-            'success_percentage': round(success_percentage, 1),
-            'completed_percentage': round(completed_percentage, 1),
-            'failed_node': failed_node,
-            'elapsed_ms': int(elapsed_ms),
-            'execution_time': _format_elapsed(elapsed_ms),
-        }
-
-        # add error preview if failed
+                pass
+            break
+    elapsed_ms = 0
+    for r in results_in_order:
         try:
-            status_val = str(execution_data.get('status', ''))
-            if (status_val.lower() == 'failed' or failed_node is not None) and error_snippet:
-                summary['error_snippet'] = error_snippet
+            elapsed_ms += int(r.get('runtime', 0) or 0)
         except Exception:
+            # ignore bad runtimes
             pass
+    # human friendly string for table display: always seconds with 3 decimals
+    def _format_elapsed(ms: int) -> str:
+        try:
+            ms = int(ms)
+        except Exception:
+            return '0.000s'
+        seconds = ms / 1000.0
+        return f"{seconds:.3f}s"
+
+    summary: Dict[str, Any] = {
+        'execution_id': execution_id,
+        'timestamp': timestamp,
+        'flowchart_name': flowchart_name,
+        'status': execution_data.get('status', 'unknown'),
+        'total_nodes': total_nodes,
+        'successful_nodes': successful_nodes,
+        'completed_nodes': completed_nodes,
+        'success_percentage': round(success_percentage, 1),
+        'completed_percentage': round(completed_percentage, 1),
+        'failed_node': failed_node,
+        'elapsed_ms': int(elapsed_ms),
+        'execution_time': _format_elapsed(elapsed_ms),
+    }
+
+    # resource totals for nodes measured by the server (see runner metrics)
+    resources = summarize_node_metrics(results_in_order)
+    if resources:
+        summary['resources'] = resources
+
+    # map nodes: how many fanned-out items ran and failed
+    map_results = [r.get('map') for r in results_in_order if isinstance(r.get('map'), dict)]
+    if map_results:
+        summary['map_items'] = {
+            'total': sum(int(m.get('total') or 0) for m in map_results),
+            'completed': sum(int(m.get('completed') or 0) for m in map_results),
+            'failed': sum(int(m.get('failed') or 0) for m in map_results),
+        }
 
-        # load, mutate, and save the flowchart json
-        flow = load_flowchart(flowchart_name)
-        if not isinstance(flow, dict):
-            flow = {}
-        executions_list = flow.get('executions')
-        if not isinstance(executions_list, list):
-            executions_list = []
-        executions_list.insert(0, summary)
-        # cap size to keep file small
-        if len(executions_list) > MAX_EXECUTION_SUMMARIES:
-            executions_list = executions_list[:MAX_EXECUTION_SUMMARIES]
-        flow['executions'] = executions_list
-        save_flowchart(flow, flowchart_name)
+    # add error preview if failed
+    try:
+        status_val = str(execution_data.get('status', ''))
+        if (status_val.lower() == 'failed' or failed_node is not None) and error_snippet:
+            summary['error_snippet'] = error_snippet
     except Exception:
-        # never raise
-        return
+        pass
+    return summary
 
 
 def list_backups(flowchart_name: str) -> List[Dict[str, Any]]:
-    """list backups for a flowchart sorted newest first, including node/link counts"""
+    """list backups for a flowchart sorted newest first, including node/link counts.
+    counts come from the folder's backup index, not from the snapshots"""
     backup_dir = _backup_dir_for(flowchart_name)
     results: List[Dict[str, Any]] = []
     try:
-        files = [fn for fn in os.listdir(backup_dir) if fn.endswith('.json')]
-        files.sort(reverse=True)
-        for fn in files:
-            path = os.path.join(backup_dir, fn)
-            timestamp = fn[:-5]
+        for record in backup_store.index_records(backup_dir):
+            timestamp = record['timestamp']
             # parse readable datetime from filename
             readable = timestamp
             try:
-                readable = datetime.strptime(timestamp, '%Y%m%dT%H%M%S').strftime('%Y-%m-%d %H:%M:%S')
-            except Exception:
-                pass
-            nodes = 0
-            links = 0
-            groups = 0
-            try:
-                with open(path, 'r') as f:
-                    data = json.load(f)
-                nodes = len((data or {}).get('nodes') or [])
-                links = len((data or {}).get('links') or [])
-                groups = len((data or {}).get('groups') or [])
+                readable = datetime.strptime(timestamp, backup_store.TIMESTAMP_FORMAT).strftime('%Y-%m-%d %H:%M:%S')
             except Exception:
                 pass
             results.append({
-                'filename': fn,
+                'filename': record['filename'],
                 'timestamp': timestamp,
                 'date_readable': readable,
-                'nodes': nodes,
-                'links': links,
-                'groups': groups,
+                'nodes': record.get('nodes', 0),
+                'links': record.get('links', 0),
+                'groups': record.get('groups', 0),
+                'bytes': record.get('bytes', 0),
+                'hash': record.get('hash'),
             })
         return results
     except Exception:
         return []
 
 
+def rebuild_backup_indexes(flowchart_name: Optional[str] = None) -> int:
+    """recreate the backup index of one flowchart, or of every flowchart with backups; returns snapshots indexed"""
+    if flowchart_name:
+        return backup_store.rebuild_index(_backup_dir_for(flowchart_name))
+    root = _backups_root_dir()
+    total = 0
+    for name in sorted(os.listdir(root)):
+        if os.path.isdir(os.path.join(root, name)):
+            total += backup_store.rebuild_index(os.path.join(root, name))
+    return total
+
+
 def delete_backup_file(flowchart_name: str, timestamp: str) -> bool:
-    """delete a specific backup by timestamp (filename without .json)"""
+    """delete a specific backup by timestamp (filename without extension)"""
     backup_dir = _backup_dir_for(flowchart_name)
-    filename = f"{timestamp}.json"
-    path = os.path.join(backup_dir, filename)
     try:
-        if os.path.exists(path):
-            os.remove(path)
-            return True
-        return False
+        entry = backup_store.find_entry(backup_dir, timestamp)
+        if entry is None:
+            return False
+        backup_store.remove_snapshot(backup_dir, entry)
+        return True
     except Exception:
         return False
 
 
 def restore_backup_file(flowchart_name: str, timestamp: str) -> Dict[str, Any]:
-    """restore a specific backup file (by timestamp) into the active flowchart"""
-    backup_dir = _backup_dir_for(flowchart_name)
-    filename = f"{timestamp}.json"
-    path = os.path.join(backup_dir, filename)
-    try:
-        if not os.path.exists(path):
-            return {}
-        # exact file copy
-        import shutil
-        target_path = get_flowchart_path(flowchart_name)
-        shutil.copyfile(path, target_path)
-        # load and return restored json
-        with open(target_path, 'r') as f:
-            return json.load(f)
-    except Exception:
-        return {}
+    """restore a specific backup (by timestamp) into the active flowchart"""
+    return _restore_backup_entry(flowchart_name, backup_store.find_entry(_backup_dir_for(flowchart_name), timestamp))
 
 
 # helpers for renaming flowcharts (file + related directories)
@@ -439,6 +533,13 @@ def rename_flowchart(old_name: str, new_name: str) -> Dict[str, str]:
 
     # perform file rename
     os.rename(old_path, new_path)
+    get_flowchart_cache().discard(old_path)
+
+    # move the flowchart's runs in the history database
+    try:
+        _history_store().rename_flowchart(old_name, new_filename)
+    except Exception:
+        pass
 
     # rename history directory if present
     try:
@@ -0,0 +1,448 @@
+"""warm interpreter pool for node execution.
+
+each worker is a zygote process (see `zygote.py`) that imports the configured
+preload modules once and forks a copy-on-write child per node run, so runs do
+not pay a cold interpreter start plus heavy imports every time. children are
+returned as `PooledProcess` handles that mimic the parts of `subprocess.Popen`
+used by the execution routes, so they plug into `running_processes` and
+`stop_all_processes` unchanged.
+
+config keys/env vars:
+  - FLOWCRAFT_WORKER_POOL_SIZE: number of zygotes (0 disables the pool)
+  - FLOWCRAFT_WORKER_PRELOAD: comma separated modules imported once per zygote
+  - FLOWCRAFT_WORKER_MAX_RUNS: recycle a zygote after this many forks (0 = never)
+"""
+
+import atexit
+import itertools
+import json
+import os
+import select
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+from .runner import RESULT_FD_ENV
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_PRELOAD = ('json', 'requests', 'bs4', 'pandas')
+DEFAULT_MAX_RUNS = 200
+# how long to wait for a zygote to acknowledge a fork request
+SPAWN_TIMEOUT = 30.0
+MAX_MESSAGE_BYTES = 65536
+# directory containing the `backend` package, so `-m backend.services...` always resolves
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def config_value(key: str, default: Any) -> Any:
+    """read a setting from the flask app config, then the environment, then default"""
+    try:
+        from flask import current_app
+        value = current_app.config.get(key)
+        if value is not None:
+            return value
+    except Exception:
+        pass
+    value = os.environ.get(key)
+    if value is not None:
+        return value
+    return default
+
+
+def pool_settings() -> Dict[str, Any]:
+    """resolve pool size, preload list and recycle threshold"""
+    try:
+        size = int(config_value('FLOWCRAFT_WORKER_POOL_SIZE', DEFAULT_POOL_SIZE))
+    except Exception:
+        size = DEFAULT_POOL_SIZE
+    preload = config_value('FLOWCRAFT_WORKER_PRELOAD', DEFAULT_PRELOAD)
+    if isinstance(preload, str):
+        preload = [m.strip() for m in preload.split(',') if m.strip()]
+    try:
+        max_runs = int(config_value('FLOWCRAFT_WORKER_MAX_RUNS', DEFAULT_MAX_RUNS))
+    except Exception:
+        max_runs = DEFAULT_MAX_RUNS
+    return {'size': max(0, size), 'preload': list(preload or []), 'max_runs': max(0, max_runs)}
+
+
+def pool_supported() -> bool:
+    """the zygote needs fork and fd passing over unix sockets (posix, python 3.9+)"""
+    return hasattr(os, 'fork') and hasattr(socket, 'send_fds') and hasattr(socket, 'AF_UNIX')
+
+
+class PooledProcess:
+    """popen-like handle for a child forked by a zygote"""
+
+    def __init__(self, worker: '_ZygoteWorker', pid: int, argv: List[str], stdin, stdout, stderr):
+        self._worker = worker
+        self.pid = pid
+        self.args = argv
+        self.stdin = stdin
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode: Optional[int] = None
+        # read end of the runner's result channel, when one was requested
+        self.result_fd: Optional[int] = None
+        self._exited = threading.Event()
+
+    def _set_exit(self, returncode: int) -> None:
+        if self.returncode is None:
+            self.returncode = returncode
+        self._exited.set()
+
+    def poll(self) -> Optional[int]:
+        if self._exited.is_set():
+            return self.returncode
+        if not self._worker.alive:
+            # zygote died: the child was reparented, so fall back to checking the pid
+            try:
+                gone = psutil.Process(self.pid).status() == psutil.STATUS_ZOMBIE
+            except psutil.NoSuchProcess:
+                gone = True
+            if gone:
+                self._set_exit(-1)
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            self._exited.wait(0.5 if remaining is None else min(0.5, remaining))
+        return self.returncode  # type: ignore[return-value]
+
+    def communicate(self, input: Optional[str] = None, timeout: Optional[float] = None):
+        """drain stdout/stderr concurrently and wait for exit, like popen.communicate"""
+        chunks: Dict[str, List[str]] = {'stdout': [], 'stderr': []}
+
+        def _drain(name: str, stream) -> None:
+            try:
+                chunks[name].append(stream.read())
+            except Exception:
+                pass
+
+        readers = []
+        for name, stream in (('stdout', self.stdout), ('stderr', self.stderr)):
+            if stream is not None:
+                t = threading.Thread(target=_drain, args=(name, stream), daemon=True)
+                t.start()
+                readers.append(t)
+        if self.stdin is not None:
+            try:
+                if input:
+                    self.stdin.write(input)
+                self.stdin.close()
+            except (BrokenPipeError, OSError, ValueError):
+                pass
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for t in readers:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            t.join(remaining)
+            if t.is_alive():
+                raise subprocess.TimeoutExpired(self.args, timeout)
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        self.wait(remaining)
+        stdout = ''.join(chunks['stdout']) if self.stdout is not None else None
+        stderr = ''.join(chunks['stderr']) if self.stderr is not None else None
+        return stdout, stderr
+
+    def send_signal(self, sig: int) -> None:
+        if self.poll() is not None:
+            return
+        try:
+            os.kill(self.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def terminate(self) -> None:
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self.send_signal(signal.SIGKILL)
+
+
+class _ZygoteWorker:
+    """server-side handle for one zygote process"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, preload: List[str]):
+        self.runs = 0
+        self.alive = True
+        self.ready = threading.Event()
+        self.preloaded: List[str] = []
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._children: Dict[int, PooledProcess] = {}
+        self._early_exits: Dict[int, int] = {}
+
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        env = os.environ.copy()
+        # make sure `-m backend.services.zygote` resolves even when cwd is elsewhere
+        env['PYTHONPATH'] = os.pathsep.join(p for p in [PACKAGE_ROOT, env.get('PYTHONPATH', '')] if p)
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, '-m', 'backend.services.zygote', str(child_sock.fileno()), ','.join(preload)],
+                pass_fds=(child_sock.fileno(),),
+                stdin=subprocess.DEVNULL,
+                env=env,
+                cwd=os.getcwd(),
+            )
+        finally:
+            child_sock.close()
+        self.sock = parent_sock
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def _read_loop(self) -> None:
+        while True:
+            try:
+                ready, _, _ = select.select([self.sock], [], [], 1.0)
+            except (OSError, ValueError):
+                break
+            if not ready:
+                if self.process.poll() is not None:
+                    break
+                continue
+            try:
+                data = self.sock.recv(MAX_MESSAGE_BYTES)
+            except OSError:
+                break
+            if not data:
+                break
+            try:
+                message = json.loads(data.decode('utf-8'))
+            except Exception:
+                continue
+            self._dispatch(message)
+        self._mark_dead()
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        kind = message.get('type')
+        if kind == 'ready':
+            self.preloaded = list(message.get('preloaded') or [])
+            self.ready.set()
+        elif kind == 'spawned':
+            with self._lock:
+                slot = self._pending.get(message.get('id'))
+            if slot is not None:
+                slot['reply'] = message
+                slot['event'].set()
+        elif kind == 'exit':
+            pid = message.get('pid')
+            returncode = message.get('returncode', -1)
+            with self._lock:
+                proc = self._children.pop(pid, None)
+                if proc is None:
+                    # exit raced ahead of the spawn call registering the child
+                    self._early_exits[pid] = returncode
+            if proc is not None:
+                proc._set_exit(returncode)
+
+    def _mark_dead(self) -> None:
+        self.alive = False
+        self.ready.set()
+        with self._lock:
+            pending = list(self._pending.values())
+        for slot in pending:
+            slot['reply'] = {'type': 'spawned', 'error': 'worker exited'}
+            slot['event'].set()
+        try:
+            self.sock.close()
+        except Exception:
+            pass
+
+    @property
+    def active_children(self) -> int:
+        with self._lock:
+            return len(self._children)
+
+    def spawn(self, argv: List[str], cwd: Optional[str], env: Optional[Dict[str, str]], unbuffered: bool, result_pipe: bool = False) -> PooledProcess:
+        if not self.alive:
+            raise OSError('worker is not running')
+        stdin_r, stdin_w = os.pipe()
+        out_r, out_w = os.pipe()
+        err_r, err_w = os.pipe()
+        child_fds = [stdin_r, out_w, err_w]
+        parent_fds = [stdin_w, out_r, err_r]
+        env = dict(env or {})
+        if result_pipe:
+            res_r, res_w = os.pipe()
+            child_fds.append(res_w)
+            parent_fds.append(res_r)
+            # the child sees the result channel as fd 3
+            env[RESULT_FD_ENV] = '3'
+        request_id = next(self._ids)
+        slot: Dict[str, Any] = {'event': threading.Event(), 'reply': None}
+        with self._lock:
+            self._pending[request_id] = slot
+        try:
+            payload = {
+                'type': 'spawn',
+                'id': request_id,
+                'argv': list(argv),
+                'cwd': cwd,
+                'env': env,
+                'unbuffered': bool(unbuffered),
+            }
+            socket.send_fds(self.sock, [json.dumps(payload).encode('utf-8')], child_fds)
+        except Exception:
+            for fd in parent_fds:
+                os.close(fd)
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise
+        finally:
+            for fd in child_fds:
+                os.close(fd)
+
+        got_reply = slot['event'].wait(SPAWN_TIMEOUT)
+        with self._lock:
+            self._pending.pop(request_id, None)
+        reply = slot['reply'] or {}
+        if not got_reply or 'pid' not in reply:
+            for fd in parent_fds:
+                os.close(fd)
+            raise OSError(reply.get('error') or 'worker did not acknowledge spawn request')
+
+        buffering = 1 if unbuffered else -1
+        proc = PooledProcess(
+            self,
+            int(reply['pid']),
+            list(argv),
+            open(stdin_w, 'w', encoding='utf-8', buffering=buffering),
+            open(out_r, 'r', encoding='utf-8', errors='replace', buffering=buffering),
+            open(err_r, 'r', encoding='utf-8', errors='replace', buffering=buffering),
+        )
+        proc.result_fd = parent_fds[3] if result_pipe else None
+        with self._lock:
+            early = self._early_exits.pop(proc.pid, None)
+            if early is None:
+                self._children[proc.pid] = proc
+        if early is not None:
+            proc._set_exit(early)
+        return proc
+
+    def retire(self) -> None:
+        """stop accepting work; the zygote exits once its in-flight children finish"""
+        try:
+            self.sock.send(json.dumps({'type': 'shutdown'}).encode('utf-8'))
+        except OSError:
+            pass
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self.retire()
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            try:
+                self.process.kill()
+            except Exception:
+                pass
+
+
+class WorkerPool:
+    """fixed-size set of zygotes; forks are spread round-robin and workers recycle after max_runs"""
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, preload: Optional[List[str]] = None, max_runs: int = DEFAULT_MAX_RUNS):
+        self.size = max(1, int(size))
+        self.preload = list(preload if preload is not None else DEFAULT_PRELOAD)
+        self.max_runs = max(0, int(max_runs))
+        self._lock = threading.Lock()
+        self._workers: List[_ZygoteWorker] = [_ZygoteWorker(self.preload) for _ in range(self.size)]
+        self._retired: List[_ZygoteWorker] = []
+        self._next = 0
+        self.total_runs = 0
+        self.recycled = 0
+
+    def spawn(self, argv: List[str], cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None, unbuffered: bool = False, result_pipe: bool = False) -> PooledProcess:
+        """fork a child running `argv` (script path or `-m module ...`) from a warm zygote"""
+        with self._lock:
+            index = self._next % self.size
+            self._next += 1
+            worker = self._workers[index]
+            if not worker.alive:
+                worker = _ZygoteWorker(self.preload)
+                self._workers[index] = worker
+            worker.runs += 1
+            self.total_runs += 1
+            recycle = bool(self.max_runs) and worker.runs >= self.max_runs
+            if recycle:
+                # swap in a fresh zygote now so no other thread forks from the old one
+                self._workers[index] = _ZygoteWorker(self.preload)
+                self._retired = [w for w in self._retired if w.alive] + [worker]
+                self.recycled += 1
+        try:
+            return worker.spawn(argv, cwd, env, unbuffered, result_pipe)
+        finally:
+            if recycle:
+                worker.retire()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            workers = list(self._workers)
+        return {
+            'size': self.size,
+            'preload': self.preload,
+            'max_runs': self.max_runs,
+            'total_runs': self.total_runs,
+            'recycled': self.recycled,
+            'workers': [
+                {'pid': w.process.pid, 'alive': w.alive, 'runs': w.runs, 'active_children': w.active_children, 'preloaded': w.preloaded}
+                for w in workers
+            ],
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            workers = self._workers + self._retired
+            self._workers = []
+            self._retired = []
+        for worker in workers:
+            worker.stop()
+
+
+_pool: Optional[WorkerPool] = None
+_pool_failed = False
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> Optional[WorkerPool]:
+    """return the process-wide pool, creating it on first use; none when disabled or unsupported"""
+    global _pool, _pool_failed
+    if _pool is not None:
+        return _pool
+    if _pool_failed or not pool_supported():
+        return None
+    settings = pool_settings()
+    if settings['size'] <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            try:
+                _pool = WorkerPool(settings['size'], settings['preload'], settings['max_runs'])
+            except Exception as e:
+                _pool_failed = True
+                print(f"warning: could not start worker pool, falling back to cold interpreters: {e}")
+                return None
+    return _pool
+
+
+def shutdown_worker_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool = _pool
+        _pool = None
+    if pool is not None:
+        pool.shutdown()
+
+
+atexit.register(shutdown_worker_pool)
@@ -0,0 +1,250 @@
+"""zygote process for the warm interpreter pool.
+
+a zygote imports the configured preload modules once and then forks a
+copy-on-write child per node run. it is started by `worker_pool` with one end
+of a unix datagram socketpair and only depends on the standard library so it
+stays cheap to start and safe to fork.
+
+protocol (one json datagram per message):
+  - pool -> zygote: {"type": "spawn", "id", "argv", "cwd", "env", "unbuffered"}
+    with the child's stdin/stdout/stderr (and optional result channel) fds
+    attached via scm_rights; they become fds 0-3 in the child
+  - pool -> zygote: {"type": "shutdown"}
+  - zygote -> pool: {"type": "ready", "preloaded": [...], "failed": [...]}
+  - zygote -> pool: {"type": "spawned", "id", "pid"} or {"type": "spawned", "id", "error"}
+  - zygote -> pool: {"type": "exit", "pid", "returncode"}
+"""
+
+import importlib
+import io
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import traceback
+from typing import Any, Dict, List
+
+MAX_MESSAGE_BYTES = 65536
+# how often to check that the owning server process is still alive
+PARENT_CHECK_INTERVAL = 1.0
+
+
+def _send(sock: socket.socket, payload: Dict[str, Any]) -> None:
+    try:
+        sock.send(json.dumps(payload).encode('utf-8'))
+    except OSError:
+        pass
+
+
+def _preload(modules: List[str]) -> Dict[str, List[str]]:
+    """import modules once so every forked child inherits them warm"""
+    loaded: List[str] = []
+    failed: List[str] = []
+    for name in modules:
+        name = name.strip()
+        if not name:
+            continue
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except Exception:
+            # optional heavy deps (pandas, bs4) may not be installed; skip quietly
+            failed.append(name)
+    return {'preloaded': loaded, 'failed': failed}
+
+
+def _exit_code_from_system_exit(exc: SystemExit) -> int:
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # mirror the interpreter: non-int exit codes are printed and map to 1
+    try:
+        print(code, file=sys.stderr)
+    except Exception:
+        pass
+    return 1
+
+
+def _run_child(request: Dict[str, Any], fds: List[int], owned_fds: List[int]) -> None:
+    """body of a forked child: rewire stdio, run the requested target, never return"""
+    code = 1
+    try:
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        for fd in owned_fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+        # attach the pipes handed over by the server as fds 0/1/2 (and 3 for the result channel).
+        # move them out of the way first so a received fd numbered 0-3 is not clobbered.
+        import fcntl
+        staged = [fcntl.fcntl(fd, fcntl.F_DUPFD, 10) for fd in fds]
+        for fd in fds:
+            os.close(fd)
+        for target, fd in enumerate(staged):
+            os.dup2(fd, target)
+            os.close(fd)
+
+        cwd = request.get('cwd')
+        if cwd:
+            os.chdir(cwd)
+        os.environ.update({str(k): str(v) for k, v in (request.get('env') or {}).items()})
+
+        write_through = bool(request.get('unbuffered'))
+        sys.stdin = io.TextIOWrapper(io.FileIO(0, 'r', closefd=False), encoding='utf-8', errors='replace')
+        sys.stdout = io.TextIOWrapper(io.FileIO(1, 'w', closefd=False), encoding='utf-8', errors='replace', line_buffering=True, write_through=write_through)
+        sys.stderr = io.TextIOWrapper(io.FileIO(2, 'w', closefd=False), encoding='utf-8', errors='backslashreplace', line_buffering=True, write_through=True)
+
+        import runpy
+        argv = list(request.get('argv') or [])
+        code = 0
+        try:
+            if argv and argv[0] == '-m':
+                sys.argv = argv[1:]
+                runpy.run_module(argv[1], run_name='__main__', alter_sys=True)
+            else:
+                sys.argv = argv
+                sys.path.insert(0, os.path.dirname(os.path.abspath(argv[0])))
+                runpy.run_path(argv[0], run_name='__main__')
+        except SystemExit as e:
+            code = _exit_code_from_system_exit(e)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+    except BaseException:
+        try:
+            traceback.print_exc()
+        except Exception:
+            pass
+        code = 1
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        os._exit(code)
+
+
+def serve(sock: socket.socket, preload: List[str]) -> None:
+    """main zygote loop: fork children on request and report their exit codes"""
+    parent_pid = os.getppid()
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    signal.set_wakeup_fd(wake_w)
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+    # the server owns interrupt handling; ctrl+c in the terminal should not kill the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    status = _preload(preload)
+    _send(sock, {'type': 'ready', **status})
+
+    children: Dict[int, Any] = {}
+    accepting = True
+
+    def _reap() -> None:
+        while children:
+            try:
+                pid, wait_status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                children.clear()
+                return
+            if pid == 0:
+                return
+            children.pop(pid, None)
+            _send(sock, {'type': 'exit', 'pid': pid, 'returncode': os.waitstatus_to_exitcode(wait_status)})
+
+    while accepting or children:
+        try:
+            ready, _, _ = select.select([sock, wake_r], [], [], PARENT_CHECK_INTERVAL)
+        except OSError:
+            ready = []
+
+        if wake_r in ready:
+            try:
+                while os.read(wake_r, 512):
+                    pass
+            except (BlockingIOError, OSError):
+                pass
+        _reap()
+
+        if os.getppid() != parent_pid:
+            # server went away: do not leave orphaned node processes behind
+            for pid in list(children):
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
+            break
+
+        if sock not in ready:
+            continue
+        try:
+            data, fds, _flags, _addr = socket.recv_fds(sock, MAX_MESSAGE_BYTES, 4)
+        except OSError:
+            break
+        if not data:
+            break
+        try:
+            request = json.loads(data.decode('utf-8'))
+        except Exception:
+            for fd in fds:
+                os.close(fd)
+            continue
+
+        kind = request.get('type')
+        if kind == 'shutdown':
+            accepting = False
+            continue
+        if kind != 'spawn' or not accepting:
+            for fd in fds:
+                os.close(fd)
+            continue
+        if len(fds) < 3:
+            for fd in fds:
+                os.close(fd)
+            _send(sock, {'type': 'spawned', 'id': request.get('id'), 'error': 'missing stdio fds'})
+            continue
+
+        try:
+            pid = os.fork()
+        except OSError as e:
+            for fd in fds:
+                os.close(fd)
+            _send(sock, {'type': 'spawned', 'id': request.get('id'), 'error': str(e)})
+            continue
+
+        if pid == 0:
+            _run_child(request, fds, [sock.fileno(), wake_r, wake_w])
+
+        for fd in fds:
+            os.close(fd)
+        children[pid] = request.get('id')
+        _send(sock, {'type': 'spawned', 'id': request.get('id'), 'pid': pid})
+
+
+def main() -> None:
+    # argv: <socket fd> <comma separated preload modules>
+    sock_fd = int(sys.argv[1])
+    preload = sys.argv[2].split(',') if len(sys.argv) > 2 and sys.argv[2] else []
+    sock = socket.socket(fileno=sock_fd)
+    try:
+        serve(sock, preload)
+    finally:
+        try:
+            sock.close()
+        except Exception:
+            pass
+
+
+if __name__ == '__main__':
+    main()
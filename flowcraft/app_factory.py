@@ -12,11 +12,54 @@ def _resolve_dir(default_rel: str, env_key: str, app_root: str) -> str:
      return os.path.abspath(os.path.join(app_root, default_rel))
 
 
+def data_config(project_root: str | None = None) -> dict:
+     """data directories and project root as app config, allowing an override via FLOWCRAFT_DATA_DIR"""
+     project_root = project_root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+     data_root = os.environ.get("FLOWCRAFT_DATA_DIR")
+     if data_root:
+          return dict(
+               FLOWCRAFT_NODES_DIR=os.path.join(data_root, "nodes"),
+               FLOWCRAFT_FLOWCHARTS_DIR=os.path.join(data_root, "flowcharts"),
+               FLOWCRAFT_HISTORY_DIR=os.path.join(data_root, "history"),
+               FLOWCRAFT_CACHE_DIR=os.path.join(data_root, "cache"),
+               FLOWCRAFT_ARTIFACT_DIR=os.path.join(data_root, "artifacts"),
+               FLOWCRAFT_PROJECT_ROOT=os.path.abspath(data_root),
+          )
+     # default project root to current working directory when no explicit data root
+     try:
+          project_root_conf = os.getcwd()
+     except Exception:
+          project_root_conf = project_root
+     return dict(
+          FLOWCRAFT_NODES_DIR=_resolve_dir("nodes", "FLOWCRAFT_NODES_DIR", project_root),
+          FLOWCRAFT_FLOWCHARTS_DIR=_resolve_dir("flowcharts", "FLOWCRAFT_FLOWCHARTS_DIR", project_root),
+          FLOWCRAFT_HISTORY_DIR=_resolve_dir("history", "FLOWCRAFT_HISTORY_DIR", project_root),
+          FLOWCRAFT_CACHE_DIR=_resolve_dir("cache", "FLOWCRAFT_CACHE_DIR", project_root),
+          FLOWCRAFT_ARTIFACT_DIR=_resolve_dir("artifacts", "FLOWCRAFT_ARTIFACT_DIR", project_root),
+          FLOWCRAFT_PROJECT_ROOT=project_root_conf,
+     )
+
+
 def create_app(config: dict | None = None) -> Flask:
      """create and configure a flask app with all flowcraft blueprints.
 
       config keys/env vars:
         - FLOWCRAFT_DATA_DIR (optional root where nodes/ flowcharts/ history/ live)
+        - FLOWCRAFT_WORKER_POOL_SIZE (warm zygote interpreters for node runs; 0 disables)
+        - FLOWCRAFT_WORKER_PRELOAD (comma separated modules each zygote imports once)
+        - FLOWCRAFT_WORKER_MAX_RUNS (recycle a zygote after this many forked runs)
+        - FLOWCRAFT_CACHE_DIR (node result cache; defaults next to history/)
+        - FLOWCRAFT_CACHE_MAX_BYTES (lru budget for the node result cache)
+        - FLOWCRAFT_FLOWCHART_CACHE_BYTES (in-memory lru budget for parsed flowcharts, in file bytes)
+        - FLOWCRAFT_SAVE_COALESCE_MS (window in which builder saves are merged into one disk write and backup)
+        - FLOWCRAFT_BACKUP_KEYFRAME_INTERVAL (delta backups stored between full keyframes; 0 stores every backup whole)
+        - FLOWCRAFT_ARTIFACT_DIR (content-addressed return value artifacts; defaults next to history/)
+        - FLOWCRAFT_ARTIFACT_INLINE_BYTES (largest json return value kept inline in results)
+        - FLOWCRAFT_ARTIFACT_MAX_BYTES (lru budget for the artifact store, enforced after each run; 0: unbounded)
+        - FLOWCRAFT_JOB_WORKERS / FLOWCRAFT_JOB_QUEUE (concurrent background jobs and queue cap)
+        - FLOWCRAFT_SESSION_MAX / FLOWCRAFT_SESSION_IDLE_SECONDS / FLOWCRAFT_SESSION_RUN_TIMEOUT (session kernels)
+        - FLOWCRAFT_HISTORY_DB (sqlite execution history; defaults to history/history.sqlite3)
+        - FLOWCRAFT_ASYNC_WORKER (run `async def` nodes on one shared event loop; 0 disables)
       """
      # resolve static and templates folders for both dev (repo) and installed (pip) cases
      # comments: prefer package-local copies; fallback to repo root; lastly, scan common install prefixes
@@ -62,29 +105,8 @@ def create_app(config: dict | None = None) -> Flask:
      app = Flask(__name__, template_folder=templates_dir, static_folder=static_dir)
      CORS(app)
 
-     # compute data dirs, allowing an override via FLOWCRAFT_DATA_DIR
-     data_root = os.environ.get("FLOWCRAFT_DATA_DIR")
-     if data_root:
-          nodes_dir = os.path.join(data_root, "nodes")
-          flowcharts_dir = os.path.join(data_root, "flowcharts")
-          history_dir = os.path.join(data_root, "history")
-          project_root_conf = os.path.abspath(data_root)
-     else:
-          nodes_dir = _resolve_dir("nodes", "FLOWCRAFT_NODES_DIR", project_root)
-          flowcharts_dir = _resolve_dir("flowcharts", "FLOWCRAFT_FLOWCHARTS_DIR", project_root)
-          history_dir = _resolve_dir("history", "FLOWCRAFT_HISTORY_DIR", project_root)
-          # default project root to current working directory when no explicit data root
-          try:
-               project_root_conf = os.getcwd()
-          except Exception:
-               project_root_conf = project_root
-
-     app.config.update(
-          FLOWCRAFT_NODES_DIR=nodes_dir,
-          FLOWCRAFT_FLOWCHARTS_DIR=flowcharts_dir,
-          FLOWCRAFT_HISTORY_DIR=history_dir,
-          FLOWCRAFT_PROJECT_ROOT=project_root_conf,
-     )
+     app.config.update(data_config(project_root))
+     flowcharts_dir = app.config['FLOWCRAFT_FLOWCHARTS_DIR']
 
      # ensure at least one flowchart exists on app load
      try:
@@ -98,8 +120,7 @@ def create_app(config: dict | None = None) -> Flask:
                          json.dump({
                               'nodes': [],
                               'links': [],
-                              'groups': [],
-                              'executions': []
+                              'groups': []
                          }, f, indent=2)
      except Exception:
           # comments: never block app startup on init; downstream routes can handle absence
@@ -113,6 +134,9 @@ def create_app(config: dict | None = None) -> Flask:
      from backend.routes.analysis import analysis_bp
      from backend.routes.editors import editors_bp
      from backend.routes.settings import settings_bp
+     from backend.routes.multirun import multirun_bp
+     from backend.routes.jobs import jobs_bp
+     from backend.routes.sessions import sessions_bp
 
      app.register_blueprint(ui_bp)
      app.register_blueprint(flowcharts_bp)
@@ -121,6 +145,9 @@ def create_app(config: dict | None = None) -> Flask:
      app.register_blueprint(analysis_bp)
      app.register_blueprint(editors_bp)
      app.register_blueprint(settings_bp)
+     app.register_blueprint(multirun_bp)
+     app.register_blueprint(jobs_bp)
+     app.register_blueprint(sessions_bp)
 
      if config:
           app.config.update(config)
@@ -1,11 +1,203 @@
 import os
+import sys
+import json
 import argparse
-from werkzeug.serving import run_simple
+import threading
 
-from .app_factory import create_app
 
+def _parse_inputs(pairs: list[str]) -> dict:
+    """`key=value` pairs as initial variables; values that parse as json keep their type"""
+    variables = {}
+    for pair in pairs:
+        key, sep, raw = pair.partition("=")
+        if not sep or not key:
+            raise ValueError(f"--input expects key=value, got {pair!r}")
+        try:
+            variables[key] = json.loads(raw)
+        except ValueError:
+            variables[key] = raw
+    return variables
+
+
+def _event_printer(node_names: dict):
+    """print executor events as one line each on stderr, so --json output stays clean for scripts"""
+
+    def _print_event(event: str, data: dict) -> None:
+        name = data.get("node_name") or node_names.get(data.get("node_id"), data.get("node_id"))
+        if event == "node_start":
+            line = f"-> {name}"
+        elif event == "node_result":
+            wall_ms = (data.get("metrics") or {}).get("wall_ms", data.get("runtime"))
+            flags = "".join(f", {flag}" for flag in ("cached", "reused") if data.get(flag))
+            line = f"ok {name} ({wall_ms} ms{flags})" if data.get("success") else f"FAILED {name}: {data.get('error')}"
+        elif event == "node_skipped":
+            line = f"skip {name} ({data.get('reason')})"
+        elif event == "condition":
+            line = f"if {name}: {'condition met' if data.get('condition_met') else 'condition not met'}"
+        elif event == "map_progress":
+            line = f"   {name}: {data.get('completed')}/{data.get('total')} items"
+        elif event in ("stdout", "stderr"):
+            line = f"   {name} | {data.get('line')}"
+        else:
+            return
+        print(line, file=sys.stderr, flush=True)
+
+    return _print_event
+
+
+def run_command(argv: list[str]) -> int:
+    """`flowcraft run`: execute a flowchart headless and return the process exit code.
+
+    exit codes: 0 success, 1 the run failed or was cancelled, 2 the run could
+    not start (unknown flowchart, missing files, bad arguments), 130 ctrl-c.
+    """
+    parser = argparse.ArgumentParser(prog="flowcraft run", description="run a flowchart without the web server (for cron and ci)")
+    parser.add_argument("flowchart", help="flowchart name under flowcharts/, with or without .json")
+    parser.add_argument("--parallel", type=int, default=None, help="nodes running at once (default FLOWCRAFT_MAX_PARALLEL or 4)")
+    parser.add_argument("--input", action="append", default=[], metavar="KEY=VALUE", help="initial variable, repeatable; json values keep their type")
+    parser.add_argument("--data-dir", default=os.environ.get("FLOWCRAFT_DATA_DIR"))
+    parser.add_argument("--use-cache", action="store_true", help="reuse cached node results")
+    parser.add_argument("--incremental", action="store_true", help="re-run only nodes whose code or inputs changed")
+    parser.add_argument("--no-history", action="store_true", help="do not save the run to history")
+    parser.add_argument("--quiet", "-q", action="store_true", help="no per-node progress or console output")
+    parser.add_argument("--json", action="store_true", help="print the run outcome as json on stdout")
+    args = parser.parse_args(argv)
+    try:
+        variables = _parse_inputs(args.input)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.data_dir:
+        os.environ["FLOWCRAFT_DATA_DIR"] = args.data_dir
+    # a bare app only carries the data-dir config the services read; no blueprints, no server
+    from flask import Flask
+    from .app_factory import data_config
+    from backend.services.executor import execution_order_for
+    from backend.services.flow_runs import FlowRun
+    from backend.services.processes import stop_all_processes
+    from backend.services.storage import get_flowchart_path, load_flowchart
+
+    app = Flask("flowcraft")
+    app.config.update(data_config())
+    flowchart_name = args.flowchart if args.flowchart.endswith(".json") else args.flowchart + ".json"
+    with app.app_context():
+        if not os.path.exists(get_flowchart_path(flowchart_name)):
+            print(f"error: flowchart not found: {get_flowchart_path(flowchart_name)}", file=sys.stderr)
+            return 2
+        flowchart_data = load_flowchart(flowchart_name)
+        execution_order = execution_order_for(flowchart_data)
+        if not execution_order:
+            print("error: the flowchart has no linked nodes to run", file=sys.stderr)
+            return 2
+        running_processes: dict = {}
+        process_lock = threading.Lock()
+        cancel_event = threading.Event()
+        options = {
+            "use_cache": args.use_cache,
+            "incremental": args.incremental,
+            "save_history": not args.no_history,
+            "max_parallel": args.parallel,
+        }
+        flow_run = FlowRun(
+            options, flowchart_name, execution_order, variables, running_processes, process_lock,
+            on_event=None if args.quiet else _event_printer({n.get("id"): n.get("name") for n in flowchart_data.get("nodes", []) or []}),
+            cancel_event=cancel_event,
+            stream_output=not args.quiet,
+            evaluate_conditions=True,
+        )
+        invalid = flow_run.validate()
+        if invalid is not None:
+            print(f"error: {invalid['body']['message']}", file=sys.stderr)
+            return 2
+
+        # the run goes on a thread so ctrl-c can cancel it and stop running nodes
+        holder: dict = {}
+
+        def _run() -> None:
+            with app.app_context():
+                try:
+                    holder["outcome"] = flow_run.run()
+                except Exception as e:
+                    holder["outcome"] = {"status": "error", "message": f"failed to execute flowchart: {str(e)}", "results": []}
+
+        thread = threading.Thread(target=_run, daemon=True)
+        thread.start()
+        interrupted = False
+        while thread.is_alive():
+            try:
+                thread.join(0.5)
+            except KeyboardInterrupt:
+                interrupted = True
+                cancel_event.set()
+                with process_lock:
+                    stop_all_processes(running_processes)
+        outcome = holder.get("outcome") or {"status": "error", "message": "run ended without an outcome", "results": []}
+
+    if args.json:
+        print(json.dumps({**outcome, "final_variables": flow_run.final_variables()}, default=str))
+    print(f"{outcome.get('status')}: {outcome.get('message')}" + (f" (history {outcome['execution_id']})" if outcome.get("execution_id") else ""), file=sys.stderr)
+    if interrupted:
+        return 130
+    return 0 if outcome.get("status") == "success" else 1
+
+
+def history_command(argv: list[str]) -> int:
+    """`flowcraft history import`: load per-run json history files into the history database"""
+    parser = argparse.ArgumentParser(prog="flowcraft history", description="manage execution history")
+    parser.add_argument("action", choices=["import"])
+    parser.add_argument("--flowchart", default=None, help="only this flowchart (default: all)")
+    parser.add_argument("--replace", action="store_true", help="overwrite runs already in the database")
+    parser.add_argument("--data-dir", default=os.environ.get("FLOWCRAFT_DATA_DIR"))
+    args = parser.parse_args(argv)
+
+    if args.data_dir:
+        os.environ["FLOWCRAFT_DATA_DIR"] = args.data_dir
+    from flask import Flask
+    from .app_factory import data_config
+    from backend.services.storage import import_json_history
+
+    app = Flask("flowcraft")
+    app.config.update(data_config())
+    with app.app_context():
+        imported = import_json_history(args.flowchart, replace=args.replace)
+    print(f"imported {imported} runs", file=sys.stderr)
+    return 0
+
+
+def backups_command(argv: list[str]) -> int:
+    """`flowcraft backups rebuild-index`: recreate backup indexes from the snapshot files"""
+    parser = argparse.ArgumentParser(prog="flowcraft backups", description="manage flowchart backups")
+    parser.add_argument("action", choices=["rebuild-index"])
+    parser.add_argument("--flowchart", default=None, help="only this flowchart (default: all)")
+    parser.add_argument("--data-dir", default=os.environ.get("FLOWCRAFT_DATA_DIR"))
+    args = parser.parse_args(argv)
+
+    if args.data_dir:
+        os.environ["FLOWCRAFT_DATA_DIR"] = args.data_dir
+    from flask import Flask
+    from .app_factory import data_config
+    from backend.services.storage import rebuild_backup_indexes
+
+    app = Flask("flowcraft")
+    app.config.update(data_config())
+    with app.app_context():
+        indexed = rebuild_backup_indexes(args.flowchart)
+    print(f"indexed {indexed} backups", file=sys.stderr)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "run":
+        sys.exit(run_command(argv[1:]))
+    if argv and argv[0] == "history":
+        sys.exit(history_command(argv[1:]))
+    if argv and argv[0] == "backups":
+        sys.exit(backups_command(argv[1:]))
+
+    from werkzeug.serving import run_simple
+    from .app_factory import create_app
 
-def main() -> None:
     parser = argparse.ArgumentParser(prog="flowcraft", description="run flowcraft locally")
     parser.add_argument("serve", nargs="?", default="serve", help=argparse.SUPPRESS)
     parser.add_argument("--host", default="0.0.0.0")
@@ -15,7 +207,7 @@ def main() -> None:
     parser.add_argument("--port", type=int, default=default_cli_port)
     parser.add_argument("--debug", action="store_true", default=True)
     parser.add_argument("--data-dir", default=os.environ.get("FLOWCRAFT_DATA_DIR"))
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.data_dir:
         os.environ["FLOWCRAFT_DATA_DIR"] = args.data_dir
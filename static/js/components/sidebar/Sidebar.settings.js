@@ -33,7 +33,7 @@
             });
         }
 
-        // wire clear executions + history button (resets executions key and removes history files)
+        // wire clear executions + history button (deletes the flowchart's runs from the history database)
         const clearAllBtn = document.getElementById('clear_executions_btn');
         if (clearAllBtn) {
             clearAllBtn.addEventListener('click', async () => {
@@ -193,7 +193,8 @@
                             timestamp: result.timestamp,
                             return_value: result.return_value,
                             function_name: result.function_name,
-                            input_args: result.input_args
+                            input_args: result.input_args,
+                            metrics: result.metrics
                         });
                     }
                 }
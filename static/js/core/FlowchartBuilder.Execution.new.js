@@ -90,6 +90,12 @@
                 this.updateExecutionStatus('running', `executing ${data.current} of ${data.total}`);
             });
             
+            this.executionOrchestrator.on('nodeProgress', (data) => {
+                const percent = Math.round((data.fraction || 0) * 100);
+                const failed = data.failed ? `, ${data.failed} failed` : '';
+                this.updateExecutionStatus('running', `${data.node.name}: ${data.completed} of ${data.total} items (${percent}%${failed})`);
+            });
+            
             // tracking
             this.executionOrchestrator.on('trackNode', (node) => {
                 this.panToNode(node);
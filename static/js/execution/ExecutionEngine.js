@@ -32,327 +32,273 @@ class ExecutionEngine extends EventEmitter {
         this.executionAborted = false;
         this.executionStarting = false;
         
+        // variables restored for a resume seed the server-side run
+        const initialVariables = {};
+        this.nodeVariables.forEach(vars => Object.assign(initialVariables, vars || {}));
+
         // reset state
         this.resetExecutionState();
         
         this.emit('executionStarted', { nodeCount: executionOrder.length });
 
         try {
-            // execute nodes sequentially
-            for (let i = 0; i < executionOrder.length; i++) {
-                if (this.executionAborted) {
-                    this.emit('executionStopped', 'execution stopped by user');
-                    await this.saveExecutionHistory('stopped', executionOrder, 'execution stopped by user');
-                    return false;
-                }
+            // the server loads the saved flowchart, so flush a pending autosave first
+            if (this.state.autosaveTimer) {
+                clearTimeout(this.state.autosaveTimer);
+                this.state.autosaveTimer = null;
+                await this.state.save(true);
+            }
 
-                const node = executionOrder[i];
-                const success = await this.executeNode(node, i + 1, executionOrder.length);
-                
-                // persist data save nodes after successful python execution
-                if (success && node.type === 'python_file') {
-                    await this.persistDataSaveForNode(node);
-                }
-                
-                this.emit('executionProgress', {
-                    current: i + 1,
-                    total: executionOrder.length,
-                    node: node
-                });
+            // one sse connection runs the whole flow; the browser only renders its events
+            const response = await fetch('/api/run-stream', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    flowchart_name: this.state.storage.getCurrentFlowchart(),
+                    execution_order: executionOrder.map(n => n.id),
+                    variables: initialVariables,
+                    save_history: true
+                }),
+                signal: this.currentController.signal
+            });
 
-                if (!success) {
-                    if (this.executionAborted) {
-                        this.emit('executionStopped', 'execution stopped by user');
-                        await this.saveExecutionHistory('stopped', executionOrder, 'execution stopped by user');
-                    } else {
-                        this.emit('executionFailed', {
-                            node: node,
-                            message: `execution stopped at node: ${node.name}`
-                        });
-                        await this.saveExecutionHistory('failed', executionOrder, `execution stopped at node: ${node.name}`);
-                    }
-                    return false;
-                }
+            if (!response.ok) {
+                let message = `execution failed: http ${response.status}`;
+                try {
+                    const body = await response.json();
+                    if (body && body.message) message = body.message;
+                } catch (_) {}
+                this.emit('executionError', message);
+                return false;
             }
 
-            // all nodes completed successfully
-            this.emit('executionCompleted', 'execution completed successfully');
-            await this.saveExecutionHistory('success', executionOrder);
-            return true;
+            const run = {
+                order: executionOrder,
+                nodes: new Map(executionOrder.map((n, i) => [n.id, { node: n, position: i + 1 }])),
+                started: new Map(),
+                finished: 0,
+                outcome: null
+            };
+            await this.readEventStream(response, (event, data) => this.handleRunEvent(run, event, data));
+
+            const outcome = run.outcome;
+            if (this.executionAborted || !outcome || outcome.status === 'cancelled') {
+                // stopExecution already reported the stop
+                if (!this.executionAborted) this.emit('executionStopped', 'execution stopped by user');
+                return false;
+            }
+            if (outcome.status === 'success') {
+                this.emit('executionCompleted', 'execution completed successfully');
+                return true;
+            }
+            const failed = typeof outcome.failed_at_index === 'number' ? executionOrder[outcome.failed_at_index] : null;
+            if (failed && outcome.status === 'failed') {
+                this.emit('executionFailed', {
+                    node: failed,
+                    message: `execution stopped at node: ${failed.name}`
+                });
+            } else {
+                this.emit('executionError', outcome.message || 'execution failed');
+            }
+            return false;
 
         } catch (error) {
+            if (error.name === 'AbortError') {
+                return false;
+            }
             this.emit('executionError', `execution failed: ${error.message}`);
-            await this.saveExecutionHistory('error', executionOrder, error.message);
             return false;
         } finally {
             this.isExecuting = false;
+            this.currentController = null;
             this.emit('executionFinished');
         }
     }
 
-    async stopExecution() {
-        if (!this.isExecuting) return;
-        
-        this.executionAborted = true;
-        
-        // abort current request
-        if (this.currentController) {
-            this.currentController.abort();
-        }
-        
-        // terminate python processes
-        try {
-            await fetch('/api/stop-execution', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' }
-            });
-        } catch (error) {
-            // silently fail
-        }
-        
-        this.isExecuting = false;
-        this.currentController = null;
-        this.emit('executionStopped', 'execution stopped by user');
-    }
-
-    async executeNode(node, currentIndex, totalNodes) {
-        // skip if nodes
-        if (node.type === 'if_node') {
-            return await this.executeIfNode(node);
-        }
-        
-        // skip blocked nodes
-        if (this.blockedNodeIds.has(node.id)) {
-            this.emit('nodeSkipped', { node, reason: 'blocked by condition' });
-            return true;
-        }
-        
-        // skip input nodes
-        if (node.type === 'input_node') {
-            this.emit('nodeSkipped', { node, reason: 'input node' });
-            return true;
-        }
-        
-        // skip data save nodes
-        if (node.type === 'data_save') {
-            this.emit('nodeSkipped', { node, reason: 'data save node' });
-            return true;
-        }
-        
-        // execute python nodes
-        if (node.type === 'python_file') {
-            return await this.executePythonNode(node, currentIndex, totalNodes);
+    // parse a text/event-stream response body, calling onEvent(event, data) per message
+    async readEventStream(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const chunk = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                let event = 'message';
+                const dataLines = [];
+                chunk.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) dataLines.push(line.slice(5).replace(/^ /, ''));
+                });
+                if (dataLines.length === 0) continue;
+                let data;
+                try {
+                    data = JSON.parse(dataLines.join('\n'));
+                } catch (_) {
+                    continue;
+                }
+                onEvent(event, data);
+            }
         }
-        
-        return true;
     }
 
-    async executePythonNode(node, currentIndex, totalNodes) {
-        const startTime = Date.now();
-        
-        this.emit('nodeExecutionStarted', {
-            node,
-            currentIndex,
-            totalNodes,
-            timestamp: new Date().toISOString()
-        });
-
-        try {
-            // gather input values
-            const inputValues = await this.gatherInputValues(node);
-            
-            // prepare execution request
-            const requestBody = {
-                python_file: node.pythonFile,
-                arguments: inputValues,
-                node_id: node.id,
-                upstream_variables: this.gatherUpstreamVariables(node)
-            };
-            
-            // execute python file
-            const response = await fetch('/api/execute-python', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(requestBody),
-                signal: this.currentController.signal
-            });
-            
-            const result = await response.json();
-            const executionTime = Date.now() - startTime;
-            
-            if (result.success) {
-                // store results
-                this.nodeExecutionResults.set(node.id, result);
-                if (result.variables) {
-                    this.nodeVariables.set(node.id, result.variables);
-                }
-                
-                // add to execution feed
+    handleRunEvent(run, event, data) {
+        const entry = data && run.nodes.get(data.node_id);
+        switch (event) {
+            case 'node_start': {
+                if (!entry) return;
+                run.started.set(data.node_id, Date.now());
                 this.addToExecutionFeed({
-                    node_id: node.id,
-                    node_name: node.name,
-                    started_at: new Date(startTime).toISOString(),
-                    finished_at: new Date().toISOString(),
-                    success: true,
-                    lines: result.output ? result.output.split('\n').map(text => ({
-                        text,
-                        ts: new Date().toISOString()
-                    })) : []
+                    node_id: entry.node.id,
+                    node_name: entry.node.name,
+                    started_at: new Date().toISOString(),
+                    finished_at: null,
+                    success: null,
+                    lines: []
                 });
-                
-                this.emit('nodeExecutionCompleted', {
-                    node,
-                    result,
-                    executionTime,
-                    currentIndex,
-                    totalNodes
+                this.emit('nodeExecutionStarted', {
+                    node: entry.node,
+                    currentIndex: entry.position,
+                    totalNodes: run.order.length,
+                    timestamp: new Date().toISOString()
                 });
-                
-                return true;
-            } else {
-                this.emit('nodeExecutionFailed', {
-                    node,
-                    error: result.error || 'unknown error',
-                    executionTime
-                });
-                return false;
+                return;
             }
-        } catch (error) {
-            if (error.name === 'AbortError') {
-                this.emit('nodeExecutionAborted', { node });
-                return false;
+            case 'stdout':
+            case 'stderr': {
+                if (!entry) return;
+                const feedEntry = this.feedEntryFor(data.node_id);
+                const line = { text: data.line, ts: new Date().toISOString(), stream: event };
+                if (feedEntry) feedEntry.lines.push(line);
+                this.emit('nodeOutput', { node: entry.node, stream: event, line: data.line });
+                return;
             }
-            
-            this.emit('nodeExecutionError', {
-                node,
-                error: error.message,
-                executionTime: Date.now() - startTime
-            });
-            return false;
-        }
-    }
-
-    async executeIfNode(node) {
-        // evaluate conditions from incoming links
-        const incomingLinks = this.state.linkManager.getIncomingLinks(node.id);
-        let conditionMet = false;
-        
-        for (const link of incomingLinks) {
-            const sourceNode = this.state.getNode(link.source);
-            if (!sourceNode || sourceNode.type !== 'python_file') continue;
-            
-            const conditions = link.conditions || [];
-            if (conditions.length === 0) continue;
-            
-            const variables = this.nodeVariables.get(sourceNode.id) || {};
-            const result = this.evaluateConditions(conditions, variables);
-            
-            if (result) {
-                conditionMet = true;
-                break;
+            case 'result': {
+                if (!entry) return;
+                const executionTime = Date.now() - (run.started.get(data.node_id) || Date.now());
+                const feedEntry = this.feedEntryFor(data.node_id);
+                if (feedEntry) {
+                    feedEntry.finished_at = new Date().toISOString();
+                    feedEntry.success = data.success;
+                    this.emit('executionFeedUpdated', feedEntry);
+                }
+                this.nodeExecutionResults.set(data.node_id, data);
+                if (data.success) {
+                    this.nodeVariables.set(data.node_id, this.variablesFromResult(entry.node, data.return_value));
+                    this.emit('nodeExecutionCompleted', {
+                        node: entry.node,
+                        result: data,
+                        executionTime,
+                        currentIndex: entry.position,
+                        totalNodes: run.order.length
+                    });
+                    this.persistDataSaveForNode(entry.node);
+                } else {
+                    this.emit('nodeExecutionFailed', {
+                        node: entry.node,
+                        error: data.error || 'unknown error',
+                        executionTime
+                    });
+                }
+                this.emitProgress(run, entry.node);
+                return;
             }
-        }
-        
-        // block downstream nodes if condition not met
-        if (!conditionMet) {
-            const outgoingLinks = this.state.linkManager.getOutgoingLinks(node.id);
-            outgoingLinks.forEach(link => {
-                const targetNode = this.state.getNode(link.target);
-                if (targetNode && targetNode.type === 'python_file') {
-                    this.blockedNodeIds.add(targetNode.id);
+            case 'condition': {
+                if (!entry) return;
+                (data.blocked || []).forEach(id => this.blockedNodeIds.add(id));
+                this.state.linkManager.getOutgoingLinks(data.node_id).forEach(link => {
+                    const targetNode = this.state.getNode(link.target);
+                    if (!targetNode || targetNode.type !== 'python_file') return;
                     this.state.updateLink(link.source, link.target, {
-                        runtime_condition: false,
-                        runtime_details: 'blocked by condition'
+                        runtime_condition: !!data.condition_met,
+                        runtime_details: data.condition_met ? 'condition met' : 'blocked by condition'
                     });
-                }
-            });
-        } else {
-            // mark true branches
-            const outgoingLinks = this.state.linkManager.getOutgoingLinks(node.id);
-            outgoingLinks.forEach(link => {
-                this.state.updateLink(link.source, link.target, {
-                    runtime_condition: true,
-                    runtime_details: 'condition met'
                 });
-            });
+                this.emit('ifNodeEvaluated', {
+                    node: entry.node,
+                    conditionMet: !!data.condition_met,
+                    blockedNodes: Array.from(this.blockedNodeIds)
+                });
+                this.emitProgress(run, entry.node);
+                return;
+            }
+            case 'node_skipped': {
+                if (!entry) return;
+                this.emit('nodeSkipped', { node: entry.node, reason: data.reason || 'blocked by condition' });
+                this.emitProgress(run, entry.node);
+                return;
+            }
+            case 'map_progress': {
+                if (!entry) return;
+                // fraction of a map node's items finished so far
+                this.emit('nodeProgress', {
+                    node: entry.node,
+                    completed: data.completed,
+                    failed: data.failed,
+                    total: data.total,
+                    fraction: data.fraction
+                });
+                return;
+            }
+            case 'done':
+                run.outcome = data;
+                return;
+            default:
+                return;
         }
-        
-        this.emit('ifNodeEvaluated', {
-            node,
-            conditionMet,
-            blockedNodes: Array.from(this.blockedNodeIds)
-        });
-        
-        return true;
     }
 
-    evaluateConditions(conditions, variables) {
-        if (!conditions || conditions.length === 0) return false;
-        
-        const combiner = conditions[0].combiner || 'and';
-        const results = conditions.map(condition => {
-            const value = variables[condition.variable];
-            return this.evaluateSingleCondition(value, condition.operator, condition.value);
+    emitProgress(run, node) {
+        run.finished += 1;
+        this.emit('executionProgress', {
+            current: run.finished,
+            total: run.order.length,
+            node: node
         });
-        
-        if (combiner === 'and') {
-            return results.every(r => r);
-        } else {
-            return results.some(r => r);
-        }
     }
 
-    evaluateSingleCondition(value, operator, compareValue) {
-        // convert values for comparison
-        const numValue = parseFloat(value);
-        const numCompare = parseFloat(compareValue);
-        
-        switch (operator) {
-            case '==': return value == compareValue;
-            case '!=': return value != compareValue;
-            case '>': return numValue > numCompare;
-            case '>=': return numValue >= numCompare;
-            case '<': return numValue < numCompare;
-            case '<=': return numValue <= numCompare;
-            case 'contains': return String(value).includes(String(compareValue));
-            case 'not contains': return !String(value).includes(String(compareValue));
-            case 'is true': return value === true || value === 'true' || value === 1;
-            case 'is false': return value === false || value === 'false' || value === 0;
-            case 'is empty': return !value || value === '' || value === null;
-            case 'is not empty': return value && value !== '' && value !== null;
-            default: return false;
+    feedEntryFor(nodeId) {
+        for (let i = this.executionFeed.length - 1; i >= 0; i--) {
+            if (this.executionFeed[i].node_id === nodeId) return this.executionFeed[i];
         }
+        return null;
+    }
+
+    // mirror the server's variable naming: dicts merge, other values are keyed by node name
+    variablesFromResult(node, returnValue) {
+        if (returnValue === null || returnValue === undefined) return {};
+        if (typeof returnValue === 'object' && !Array.isArray(returnValue)) return { ...returnValue };
+        const name = String(node.name || node.id).toLowerCase().replace(/[^a-zA-Z0-9]/g, '_');
+        return { [name]: returnValue };
     }
 
-    async gatherInputValues(node) {
-        const inputValues = {};
+    async stopExecution() {
+        if (!this.isExecuting) return;
         
-        // find connected input node
-        const inputNodes = this.state.nodes.filter(n => 
-            n.type === 'input_node' && n.targetNodeId === node.id
-        );
+        this.executionAborted = true;
         
-        if (inputNodes.length > 0) {
-            const inputNode = inputNodes[0];
-            Object.assign(inputValues, inputNode.inputValues || {});
+        // dropping the stream cancels the server-side run
+        if (this.currentController) {
+            this.currentController.abort();
         }
         
-        return inputValues;
-    }
-
-    gatherUpstreamVariables(node) {
-        const upstreamVars = {};
-        const incomingLinks = this.state.linkManager.getIncomingLinks(node.id);
-        
-        incomingLinks.forEach(link => {
-            const sourceNode = this.state.getNode(link.source);
-            if (sourceNode && this.nodeVariables.has(sourceNode.id)) {
-                const vars = this.nodeVariables.get(sourceNode.id);
-                Object.assign(upstreamVars, vars);
-            }
-        });
+        // terminate python processes
+        try {
+            await fetch('/api/stop-execution', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' }
+            });
+        } catch (error) {
+            // silently fail
+        }
         
-        return upstreamVars;
+        this.isExecuting = false;
+        this.currentController = null;
+        this.emit('executionStopped', 'execution stopped by user');
     }
 
     async persistDataSaveForNode(pythonNode) {
@@ -409,34 +355,6 @@ class ExecutionEngine extends EventEmitter {
         this.emit('executionFeedUpdated', entry);
     }
 
-    async saveExecutionHistory(status, executionOrder, errorMessage = null) {
-        try {
-            const historyData = {
-                timestamp: new Date().toISOString(),
-                status,
-                execution_order: executionOrder.map(n => ({
-                    id: n.id,
-                    name: n.name,
-                    type: n.type
-                })),
-                error_message: errorMessage,
-                execution_feed: this.executionFeed,
-                node_variables: Array.from(this.nodeVariables.entries()).map(([nodeId, vars]) => ({
-                    node_id: nodeId,
-                    variables: vars
-                }))
-            };
-            
-            await fetch('/api/execution-history', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(historyData)
-            });
-        } catch (error) {
-            // silently fail - history is optional
-        }
-    }
-
     getExecutionResults() {
         return {
             results: Array.from(this.nodeExecutionResults.entries()),
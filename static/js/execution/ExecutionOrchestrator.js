@@ -71,6 +71,10 @@ class ExecutionOrchestrator extends EventEmitter {
             this.emit('executionProgress', data);
         });
         
+        this.engine.on('nodeProgress', (data) => {
+            this.emit('nodeProgress', data);
+        });
+        
         this.engine.on('executionFeedUpdated', (entry) => {
             this.emit('executionFeedUpdated', entry);
         });
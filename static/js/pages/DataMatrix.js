@@ -102,34 +102,62 @@
     
     // create flowchart modal is wired by centralized navigation module
     
-    // fetch latest history for current flowchart
-    try { console.log('[dm] fetching history for', flowFilename); } catch(_) {}
+    // one request per page: run fields and data_save values come back as columns
+    const PAGE_SIZE = 100;
+    async function fetchMatrixPage(before){
+        const q = new URLSearchParams({ flowchart_name: flowFilename, limit: String(PAGE_SIZE) });
+        if (before) q.set('before', before);
+        const res = await fetch(`/api/data-matrix?${q.toString()}`);
+        try { console.log('[dm] /api/data-matrix status', res.status); } catch(_) {}
+        return res.json();
+    }
+
+    // turn the columnar payload back into one execution object (with its saves) per run
+    function rowsFromMatrix(data){
+        const runCols = (data.runs && data.runs.columns) || [];
+        const runVals = (data.runs && data.runs.values) || [];
+        const saveCols = (data.data_saves && data.data_saves.columns) || [];
+        const saveVals = (data.data_saves && data.data_saves.values) || [];
+        const saveTypes = (data.data_saves && data.data_saves.types) || [];
+        const rows = [];
+        for (let i = 0; i < (data.count || 0); i++) {
+            const exec = {};
+            runCols.forEach((name, c) => { exec[name] = runVals[c] ? runVals[c][i] : null; });
+            const saves = [];
+            saveCols.forEach((col, c) => {
+                const type = saveTypes[c] ? saveTypes[c][i] : null;
+                if (type === null || typeof type === 'undefined') return;
+                saves.push({ node_name: col.node_name, variable_name: col.variable_name, type, value: saveVals[c][i] });
+            });
+            rows.push({ exec, saves });
+        }
+        return rows;
+    }
+
+    try { console.log('[dm] fetching data matrix for', flowFilename); } catch(_) {}
     let data;
     try {
-        const res = await fetch(`/api/history?flowchart_name=${encodeURIComponent(flowFilename)}`);
-        try { console.log('[dm] /api/history status', res.status); } catch(_) {}
-        data = await res.json();
-        try { console.log('[dm] /api/history json', data); } catch(_) {}
+        data = await fetchMatrixPage(null);
     } catch (err) {
-        try { console.error('[dm] /api/history fetch failed', err); } catch(_) {}
+        try { console.error('[dm] /api/data-matrix fetch failed', err); } catch(_) {}
         container.appendChild(el('div','dm_error','failed to load history (network error)'));
         return;
     }
     if (!data || data.status !== 'success') {
-        try { console.warn('[dm] history api returned non-success', data); } catch(_) {}
+        try { console.warn('[dm] data matrix api returned non-success', data); } catch(_) {}
         container.appendChild(el('div','dm_error','failed to load history'));
         return;
     }
 
-    const executions = data.history || [];
-    try { console.log('[dm] executions count', executions.length); } catch(_) {}
-    if (executions.length === 0) {
+    const firstRows = rowsFromMatrix(data);
+    try { console.log('[dm] executions count', firstRows.length); } catch(_) {}
+    if (firstRows.length === 0) {
         try { console.log('[dm] no executions for', flowFilename); } catch(_) {}
         container.appendChild(el('div','dm_empty','no executions yet'));
         return;
     }
 
-    // helper to fetch full execution details for richer data
+    // full execution entry, only fetched when failure details are opened
     async function fetchDetails(executionId){
         try { console.log('[dm] fetching details for', executionId); } catch(_) {}
         try {
@@ -144,12 +172,9 @@
         return null;
     }
 
-    // render one row block per execution and enrich with detailed data
-    const detailPromises = executions.map(exec => fetchDetails(exec.execution_id));
-    const details = await Promise.all(detailPromises);
-    try { console.log('[dm] fetched details count', details.length); } catch(_) {}
-    executions.forEach((exec, idx) => {
-        try { console.log('[dm] render row', { idx, exec, detail: details[idx] }); } catch(_) {}
+    // render one row block per execution
+    function renderExecution(exec, saves){
+        try { console.log('[dm] render row', { exec, saves }); } catch(_) {}
         const row = el('div','dm_row');
 
         // left: high-level execution info
@@ -270,18 +295,7 @@
         </tr>`;
         table.appendChild(thead);
         const tbody = el('tbody');
-        const detail = details[idx];
         // helpers for type column
-        function inferType(value){
-            if (value === null) return 'null';
-            if (typeof value === 'undefined') return 'undefined';
-            if (Array.isArray(value)) return 'array';
-            if (typeof value === 'number') return Number.isInteger(value) ? 'integer' : 'float';
-            if (typeof value === 'string') return 'string';
-            if (typeof value === 'boolean') return 'boolean';
-            if (value && typeof value === 'object') return 'object';
-            return 'unknown';
-        }
         function normalizeTypeName(raw){
             const t = String(raw || '-').toLowerCase();
             if (t.includes('int')) return 'integer';
@@ -300,70 +314,32 @@
             s.textContent = normalized;
             return s;
         }
-        if (detail && detail.execution_data) {
-            // prefer normalized array if available
-            const dsNorm = Array.isArray(detail.execution_data.data_saves) ? detail.execution_data.data_saves : null;
-            if (dsNorm && dsNorm.length > 0) {
-                dsNorm.forEach(r => {
-                    const tr = document.createElement('tr');
-                    const td1 = document.createElement('td'); td1.className='dm_col_var_name'; td1.textContent = r.node_name || '-';
-                    const td2 = document.createElement('td'); td2.className='dm_col_py_name'; td2.textContent = r.variable_name || '-';
-                    const td3 = document.createElement('td'); td3.className='dm_col_value'; td3.textContent = Array.isArray(r.variable_content) ? String(r.variable_content[1]) : '';
-                    const td4 = document.createElement('td'); td4.className='dm_col_actions';
-                    const typeText = Array.isArray(r.variable_content) ? String(r.variable_content[0] || '-') : '-';
-                    td4.appendChild(typeTag(typeText));
-                    const openBtn = el('button','btn btn_secondary dm_open_btn','<span class="material-icons u_icon_18">open_in_new</span>');
-                    // open detail view for this variable
-                    openBtn.addEventListener('click', () => {
-                        openVariableDetail({
-                            dataName: r.node_name || '-',
-                            pythonVar: r.variable_name || '-',
-                            typeText: typeText,
-                            value: Array.isArray(r.variable_content) ? r.variable_content[1] : ''
-                        });
+        if (saves.length > 0) {
+            saves.forEach(r => {
+                const typeText = String(r.type || '-');
+                const value = r.value;
+                const tr = document.createElement('tr');
+                const td1 = document.createElement('td'); td1.className='dm_col_var_name'; td1.textContent = r.node_name || '-';
+                const td2 = document.createElement('td'); td2.className='dm_col_py_name'; td2.textContent = r.variable_name || '-';
+                const td3 = document.createElement('td'); td3.className='dm_col_value'; td3.textContent = (value === null || typeof value === 'undefined') ? 'null' : (typeof value === 'object' ? JSON.stringify(value) : String(value));
+                const td4 = document.createElement('td'); td4.className='dm_col_actions';
+                td4.appendChild(typeTag(typeText));
+                const openBtn = el('button','btn btn_secondary dm_open_btn','<span class="material-icons u_icon_18">open_in_new</span>');
+                // open detail view for this variable
+                openBtn.addEventListener('click', () => {
+                    openVariableDetail({
+                        dataName: r.node_name || '-',
+                        pythonVar: r.variable_name || '-',
+                        typeText: typeText,
+                        value
                     });
-                    td4.appendChild(openBtn);
-                    tr.appendChild(td1); tr.appendChild(td2); tr.appendChild(td3); tr.appendChild(td4);
-                    tbody.appendChild(tr);
                 });
-            } else if (Array.isArray(detail.execution_data.results)) {
-                const results = detail.execution_data.results;
-                // fallback: infer from synthesized results
-                const dsRows = results.filter(r => r.function_name === 'data_save' || (r.node_name && r.python_file && r.return_value && typeof r.return_value === 'object' && Object.keys(r.return_value).length === 1 && detail.execution_data.flowchart_state && detail.execution_data.flowchart_state.nodes && detail.execution_data.flowchart_state.nodes.find(n=>n.id===r.node_id && n.type==='data_save')));
-                if (dsRows.length === 0) {
-                    tbody.appendChild(el('tr','', '<td colspan="3" style="opacity:.7; text-align: center;">no saved data</td>'));
-                } else {
-                    dsRows.forEach(r => {
-                        const keys = (r.return_value && typeof r.return_value === 'object') ? Object.keys(r.return_value) : [];
-                        const dataName = (r.data_save && r.data_save.data_name) || (keys[0] || '-');
-                        const pyVar = (r.data_save && r.data_save.variable_name) || (keys[0] || '-');
-                        const value = keys.length ? r.return_value[keys[0]] : null;
-                        const tr = document.createElement('tr');
-                        const td1 = document.createElement('td'); td1.className='dm_col_var_name'; td1.textContent = dataName || '-';
-                        const td2 = document.createElement('td'); td2.className='dm_col_py_name'; td2.textContent = pyVar || '-';
-                        const td3 = document.createElement('td'); td3.className='dm_col_value'; td3.textContent = (value === null || typeof value === 'undefined') ? 'null' : (typeof value === 'object' ? JSON.stringify(value) : String(value));
-                        const td4 = document.createElement('td'); td4.className='dm_col_actions';
-                        const typeText = inferType(value);
-                        td4.appendChild(typeTag(typeText));
-                        const openBtn = el('button','btn btn_secondary dm_open_btn','<span class="material-icons u_icon_18">open_in_new</span>');
-                        openBtn.addEventListener('click', () => {
-                            openVariableDetail({
-                                dataName: dataName || '-',
-                                pythonVar: pyVar || '-',
-                                typeText: typeText,
-                                value
-                            });
-                        });
-                        td4.appendChild(openBtn);
-                        tr.appendChild(td1); tr.appendChild(td2); tr.appendChild(td3); tr.appendChild(td4);
-                        tbody.appendChild(tr);
-                    });
-                }
-            } else {
-                tbody.appendChild(el('tr','', '<td colspan="3" style="opacity:.7">no saved data</td>'));
-            }
+                td4.appendChild(openBtn);
+                tr.appendChild(td1); tr.appendChild(td2); tr.appendChild(td3); tr.appendChild(td4);
+                tbody.appendChild(tr);
+            });
         } else {
-            tbody.appendChild(el('tr','', '<td colspan="3" style="opacity:.7; text-align: center;">no data</td>'));
+            tbody.appendChild(el('tr','', '<td colspan="3" style="opacity:.7; text-align: center;">no saved data</td>'));
         }
         table.appendChild(tbody);
         content.appendChild(table);
@@ -373,7 +349,9 @@
         const failureInfo = el('div','dm_failure_info');
         failureInfo.style.display = 'none'; // hide by default
 
-        if (exec.status === 'failed') {
+        // the full entry is fetched the first time failure details are opened
+        let failureLoaded = false;
+        function buildFailureInfo(detail) {
             // try to resolve failure details from detailed execution data
             let failedResult = null;
             try {
@@ -425,7 +403,11 @@
             try {
                 statusEl.style.cursor = 'pointer';
                 statusEl.title = 'toggle failure details';
-                statusEl.addEventListener('click', () => {
+                statusEl.addEventListener('click', async () => {
+                    if (!failureLoaded) {
+                        failureLoaded = true;
+                        buildFailureInfo(await fetchDetails(exec.execution_id));
+                    }
                     // ensure failure info is appended to the row before toggling
                     if (!row.contains(failureInfo)) {
                         row.appendChild(failureInfo);
@@ -542,15 +524,41 @@
             const rRect = row.getBoundingClientRect();
             console.log('[dm] row appended', { childCount: cCount, rowRect: { x: rRect.x, y: rRect.y, w: rRect.width, h: rRect.height } });
         } catch(_) {}
-    });
-    
+    }
+
     // update status bar with execution count
-    const executionCount = executions.length;
+    let executionCount = 0;
+    let hasMore = false;
     const statusText = document.getElementById('status_text');
-    if (statusText) {
-        statusText.textContent = `${executionCount} execution${executionCount !== 1 ? 's' : ''}`;
+    function updateStatusText(){
+        if (statusText) statusText.textContent = `${executionCount}${hasMore ? '+' : ''} execution${executionCount !== 1 ? 's' : ''}`;
     }
 
+    // older runs load a page at a time behind a button kept under the last row
+    const loadMoreBtn = el('button','btn btn_secondary dm_row_btn dm_load_more','<span class="material-icons u_icon_18">expand_more</span><span class="btn_label">Load more</span>');
+    function renderPage(page){
+        rowsFromMatrix(page).forEach(({ exec, saves }) => renderExecution(exec, saves));
+        executionCount += page.count || 0;
+        hasMore = !!page.has_more;
+        nextBefore = page.next_before;
+        loadMoreBtn.style.display = hasMore ? '' : 'none';
+        container.appendChild(loadMoreBtn);
+        updateStatusText();
+    }
+    let nextBefore = null;
+    loadMoreBtn.addEventListener('click', async () => {
+        loadMoreBtn.disabled = true;
+        try {
+            const page = await fetchMatrixPage(nextBefore);
+            if (page && page.status === 'success') renderPage(page);
+            else alert('failed to load more executions');
+        } catch (e) {
+            alert('error loading executions');
+        }
+        loadMoreBtn.disabled = false;
+    });
+    renderPage(data);
+
     // show and wire clear history button (reuse same api as settings page)
     const clearBtn = document.getElementById('clear_history_status_btn');
     if (clearBtn) {
@@ -574,7 +582,7 @@
                 } else {
                     alert(json && json.message ? json.message : 'failed to clear history');
                     clearBtn.disabled = false;
-                    if (statusText) statusText.textContent = `${executionCount} execution${executionCount !== 1 ? 's' : ''}`;
+                    updateStatusText();
                 }
             } catch (e) {
                 alert('error clearing history');
@@ -4,12 +4,20 @@ class Storage {
         this.apiEndpoint = apiEndpoint;
         // initial value will be determined by url or last accessed
         this.currentFlowchart = null;
+        // server version of the current flowchart as last loaded or saved; sent back so stale saves are refused
+        this.version = null;
+        // per-item json of the last state the server confirmed, keyed by identity; lets saves send only what changed
+        this.baseline = null;
     }
 
     /**
      * set current flowchart name
      */
     setCurrentFlowchart(flowchartName) {
+        if (flowchartName !== this.currentFlowchart) {
+            this.version = null;
+            this.baseline = null;
+        }
         this.currentFlowchart = flowchartName;
         try {
             localStorage.setItem('last_accessed_flowchart', flowchartName);
@@ -31,10 +39,101 @@ class Storage {
         return null;
     }
 
+    /**
+     * identity of a saved item: links by (source, target), everything else by id; null when it has none
+     */
+    _itemKey(collection, item) {
+        if (!item || typeof item !== 'object') return null;
+        if (collection === 'links') return JSON.stringify([item.source, item.target]);
+        return item.id === undefined || item.id === null ? null : JSON.stringify(item.id);
+    }
+
+    /**
+     * snapshot of the collections as { collection: { keys: [...], items: Map(key -> json) } }; null when an item has no identity
+     */
+    _snapshot(data) {
+        const snapshot = {};
+        for (const collection of Storage.COLLECTIONS) {
+            const keys = [];
+            const items = new Map();
+            for (const item of (data && data[collection]) || []) {
+                const key = this._itemKey(collection, item);
+                if (key === null || items.has(key)) return null;
+                keys.push(key);
+                items.set(key, JSON.stringify(item));
+            }
+            snapshot[collection] = { keys, items };
+        }
+        return snapshot;
+    }
+
+    /**
+     * upsert/delete edits turning the baseline into `snapshot`, or null when a full save is the better request:
+     * no baseline, a reorder the server would not reproduce, a large change, or one the destructive-change guard must see
+     */
+    _delta(snapshot) {
+        const base = this.baseline;
+        if (!base || !snapshot || this.version === null) return null;
+        const upsert = {};
+        const remove = {};
+        let changed = 0;
+        let total = 0;
+        for (const collection of Storage.COLLECTIONS) {
+            const before = base[collection];
+            const after = snapshot[collection];
+            total += Math.max(before.keys.length, after.keys.length);
+            const deleted = before.keys.filter(key => !after.items.has(key));
+            // the server keeps stored items in place and appends new ones; any other order needs a full save
+            const kept = before.keys.filter(key => after.items.has(key));
+            const added = after.keys.filter(key => !before.items.has(key));
+            const expected = kept.concat(added);
+            if (expected.some((key, i) => key !== after.keys[i])) return null;
+            const upserts = after.keys.filter(key => before.items.get(key) !== after.items.get(key));
+            if (deleted.length) {
+                remove[collection] = deleted.map((key) => {
+                    const id = JSON.parse(key);
+                    return collection === 'links' ? { source: id[0], target: id[1] } : id;
+                });
+            }
+            if (upserts.length) upsert[collection] = upserts.map(key => JSON.parse(after.items.get(key)));
+            changed += deleted.length + upserts.length;
+        }
+        const beforeNodes = base.nodes.keys.length;
+        if (beforeNodes > 0 && snapshot.nodes.keys.length <= Math.floor(beforeNodes * 0.1)) return null;
+        if (changed > Math.max(Storage.DELTA_MIN_ITEMS, total / 2)) return null;
+        return { upsert, delete: remove, changed };
+    }
+
+    /**
+     * send a delta save; resolves to the response, or null when it should be retried as a full save
+     */
+    async _patch(delta) {
+        const response = await fetch(this.apiEndpoint, {
+            method: 'PATCH',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                flowchart_name: this.currentFlowchart,
+                version: this.version,
+                upsert: delta.upsert,
+                delete: delta.delete
+            })
+        });
+        // a patch the server could not apply falls back to sending the whole document
+        return response.status === 400 ? null : response;
+    }
+
     /**
      * save flowchart data to server
+     * small edits go out as a PATCH of the changed items; anything else as the whole document
+     * saves run one at a time so each one sends the version the previous one got back
      */
-    async save(data, isAutosave = false, force = false) {
+    save(data, isAutosave = false, force = false) {
+        const run = () => this._saveNow(data, isAutosave, force);
+        this._saveChain = (this._saveChain || Promise.resolve()).then(run, run);
+        return this._saveChain;
+    }
+
+    async _saveNow(data, isAutosave, force) {
         try {
             // do not attempt to save if we don't yet know which flowchart is active
             if (!this.currentFlowchart) {
@@ -45,6 +144,12 @@ class Storage {
                 flowchart_name: this.currentFlowchart,
                 force: !!force
             };
+            if (this.version !== null) saveData.version = this.version;
+            const snapshot = this._snapshot(data);
+            const delta = force ? null : this._delta(snapshot);
+            if (delta && delta.changed === 0) {
+                return { success: true, message: isAutosave ? null : 'flowchart saved successfully' };
+            }
 
             // console.log(`[Storage] Saving to flowchart: ${this.currentFlowchart}`, {
             //     isAutosave,
@@ -53,16 +158,24 @@ class Storage {
             //     groupCount: data.groups?.length || 0
             // });
 
-            const response = await fetch(this.apiEndpoint, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(saveData)
-            });
+            let response = delta ? await this._patch(delta) : null;
+            if (!response) {
+                response = await fetch(this.apiEndpoint, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: JSON.stringify(saveData)
+                });
+            }
 
             if (response.ok) {
                 // console.log(`[Storage] Successfully saved to ${this.currentFlowchart}`);
+                try {
+                    const payload = await response.json();
+                    if (payload && typeof payload.version === 'number') this.version = payload.version;
+                } catch(_) {}
+                this.baseline = snapshot;
                 return { success: true, message: isAutosave ? null : 'flowchart saved successfully' };
             } else {
                 // try to parse structured error for destructive change
@@ -71,6 +184,11 @@ class Storage {
                 if (response.status === 409 && payload && payload.code === 'destructive_change') {
                     return { success: false, code: 'destructive_change', payload };
                 }
+                if (response.status === 409 && payload && payload.code === 'version_conflict') {
+                    // someone else saved since this tab loaded; keep the version so every later save is refused too
+                    console.warn(`[Storage] save refused for ${this.currentFlowchart}: server is at version ${payload.current_version}`);
+                    return { success: false, code: 'version_conflict', payload, message: payload.message || 'flowchart was changed elsewhere; reload it before saving' };
+                }
                 console.error(`[Storage] Failed to save to ${this.currentFlowchart}:`, response.status);
                 return { success: false, message: 'error saving flowchart' };
             }
@@ -93,6 +211,8 @@ class Storage {
             });
             const data = await response.json();
             if (response.ok && data && data.status === 'success') {
+                if (data.data && typeof data.data.version === 'number') this.version = data.data.version;
+                this.baseline = this._snapshot(data.data);
                 return { success: true, data: data.data };
             }
             return { success: false, message: (data && data.message) || 'failed to restore backup' };
@@ -112,6 +232,7 @@ class Storage {
                 ...data,
                 flowchart_name: this.currentFlowchart
             };
+            if (this.version !== null) saveData.version = this.version;
 
             const payload = JSON.stringify(saveData);
 
@@ -149,6 +270,10 @@ class Storage {
             const response = await fetch(url);
             if (response.ok) {
                 const data = await response.json();
+                if (name === this.currentFlowchart) {
+                    this.version = typeof data.version === 'number' ? data.version : 0;
+                    this.baseline = this._snapshot(data);
+                }
                 return { 
                     success: true, 
                     data: {
@@ -309,4 +434,8 @@ class Storage {
     }
 }
 
+Storage.COLLECTIONS = ['nodes', 'links', 'groups', 'annotations'];
+// a delta is sent while it touches at most this many items or half the document, whichever is more
+Storage.DELTA_MIN_ITEMS = 20;
+
 window.Storage = Storage;
\ No newline at end of file
@@ -0,0 +1,47 @@
+import pytest
+
+from flowcraft.app_factory import create_app
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """an app whose data directories live under a temp folder"""
+    monkeypatch.setenv('FLOWCRAFT_DATA_DIR', str(tmp_path))
+    monkeypatch.setenv('FLOWCRAFT_SAVE_COALESCE_MS', '0')
+    monkeypatch.setenv('FLOWCRAFT_WORKER_POOL_SIZE', '0')
+    return create_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_flow(app, tmp_path):
+    """write node scripts and a flowchart linking them; returns the flowchart name.
+
+    `nodes` maps node ids to python source (or to a dict with `type` for if / input
+    nodes); `links` are (source, target) pairs or full link dicts.
+    """
+    import json
+    import os
+
+    def _make(name, nodes, links=()):
+        flow_nodes = []
+        for i, (node_id, spec) in enumerate(nodes.items()):
+            node = {'id': node_id, 'name': node_id, 'x': 0, 'y': i * 100}
+            if isinstance(spec, dict):
+                node.update(spec)
+            else:
+                (tmp_path / f'{node_id}.py').write_text(spec)
+                node.update(type='python_file', pythonFile=f'nodes/{node_id}.py')
+            flow_nodes.append(node)
+        flow_links = [link if isinstance(link, dict) else {'source': link[0], 'target': link[1]} for link in links]
+        flowcharts_dir = app.config['FLOWCRAFT_FLOWCHARTS_DIR']
+        os.makedirs(flowcharts_dir, exist_ok=True)
+        with open(os.path.join(flowcharts_dir, f'{name}.json'), 'w') as f:
+            json.dump({'nodes': flow_nodes, 'links': flow_links}, f)
+        return f'{name}.json'
+
+    return _make
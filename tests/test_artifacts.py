@@ -0,0 +1,33 @@
+import os
+
+from backend.services.artifacts import ArtifactStore
+
+
+def _age(store, ref, seconds_ago):
+    path = store.path_for(ref['$artifact'], ref['codec'])
+    stamp = os.stat(path).st_mtime - seconds_ago
+    os.utime(path, (stamp, stamp))
+
+
+def test_evict_drops_least_recently_used_first(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    refs = [store.put(bytes([n]) * 10000) for n in range(3)]
+    for n, ref in enumerate(refs):
+        _age(store, ref, 3600 - n * 60)
+    # reading the oldest one makes it the most recently used
+    store.get(refs[0])
+    size = refs[0]['size_bytes']
+    assert store.evict(2 * size) == 1
+    assert os.path.exists(store.path_for(refs[0]['$artifact'], 'pickle'))
+    assert not os.path.exists(store.path_for(refs[1]['$artifact'], 'pickle'))
+    assert store.stats()['artifacts'] == 2
+
+
+def test_evict_keeps_recent_artifacts_and_zero_means_unbounded(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    store.put(b'x' * 10000)
+    store.put(b'y' * 10000)
+    assert store.evict(1) == 0
+    assert store.evict(0, min_age=0) == 0
+    assert store.evict(1, min_age=0) == 2
+    assert store.stats()['artifacts'] == 0
@@ -0,0 +1,29 @@
+import asyncio
+import contextvars
+
+from backend.services.async_runner import run_task
+
+
+def test_slow_module_code_does_not_block_other_tasks(tmp_path):
+    slow = tmp_path / 'slow.py'
+    slow.write_text('import time\ntime.sleep(0.5)\n\nasync def main():\n    return "slow"\n')
+    fast = tmp_path / 'fast.py'
+    fast.write_text('async def main(x):\n    return x + 1\n')
+    finished = []
+
+    async def run(path, args):
+        result = await run_task({'id': path.name, 'file_path': str(path), 'function_name': 'main', 'function_args': args})
+        finished.append(path.name)
+        return result
+
+    async def both():
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            loop.create_task(run(slow, {}), context=contextvars.Context()),
+            loop.create_task(run(fast, {'x': 1}), context=contextvars.Context()),
+        )
+
+    slow_result, fast_result = asyncio.run(both())
+    assert finished == ['fast.py', 'slow.py']
+    assert slow_result['return_value'] == 'slow'
+    assert fast_result['return_value'] == 2
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.services import backup_store
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """each snapshot gets its own second"""
+    ticks = iter(range(10000))
+    start = datetime(2026, 1, 1)
+
+    class FakeDatetime:
+        @staticmethod
+        def now():
+            return start + timedelta(seconds=next(ticks))
+
+    monkeypatch.setattr(backup_store, 'datetime', FakeDatetime)
+    monkeypatch.setenv('FLOWCRAFT_BACKUP_KEYFRAME_INTERVAL', '3')
+
+
+def _document(n):
+    nodes = [{'id': f'n{i}', 'name': f'node {i}', 'python_file': f'nodes/n{i}.py'} for i in range(40)]
+    nodes[n % 40] = dict(nodes[n % 40], name=f'edited {n}')
+    return {'nodes': nodes, 'links': [{'source': 'n0', 'target': 'n1'}], 'version': n}
+
+
+def _kinds(directory):
+    return ''.join('k' if entry.keyframe else 'd' for entry in backup_store.list_entries(directory))
+
+
+def _restore_all(directory):
+    return [backup_store.read_snapshot(directory, entry) for entry in backup_store.list_entries(directory)]
+
+
+def test_keyframes_and_deltas_restore_exactly(tmp_path, clock):
+    directory = str(tmp_path)
+    documents = [_document(n) for n in range(9)]
+    for document in documents:
+        backup_store.write_snapshot(directory, document)
+    assert _kinds(directory) == 'kdddkdddk'
+    assert _restore_all(directory) == [backup_store.backup_content(d) for d in documents]
+    records = backup_store.index_records(directory)[::-1]
+    assert [record['hash'] for record in records] == [backup_store.content_hash(backup_store.backup_content(d)) for d in documents]
+
+
+def test_unchanged_content_is_not_written_again(tmp_path, clock):
+    directory = str(tmp_path)
+    first = backup_store.write_snapshot(directory, _document(1))
+    # only the version differs
+    assert backup_store.write_snapshot(directory, dict(_document(1), version=7)) == first
+    assert len(backup_store.list_entries(directory)) == 1
+
+
+def test_prune_drops_whole_chains(tmp_path, clock):
+    directory = str(tmp_path)
+    documents = [_document(n) for n in range(9)]
+    for document in documents:
+        backup_store.write_snapshot(directory, document)
+    # dropping the first chain leaves 5 >= keep; the second would leave 1
+    assert backup_store.prune(directory, keep=4) == 4
+    assert _kinds(directory) == 'kdddk'
+    assert _restore_all(directory) == [backup_store.backup_content(d) for d in documents[4:]]
+    assert len(backup_store.index_records(directory)) == 5
+
+
+def test_removing_a_keyframe_rebases_its_deltas(tmp_path, clock):
+    directory = str(tmp_path)
+    documents = [_document(n) for n in range(6)]
+    for document in documents:
+        backup_store.write_snapshot(directory, document)
+    entries = backup_store.list_entries(directory)
+    backup_store.remove_snapshot(directory, entries[0])
+    assert _kinds(directory) == 'kddkd'
+    assert _restore_all(directory) == [backup_store.backup_content(d) for d in documents[1:]]
+    backup_store.remove_snapshot(directory, backup_store.list_entries(directory)[3])
+    assert _kinds(directory) == 'kddk'
+    assert _restore_all(directory) == [backup_store.backup_content(documents[n]) for n in (1, 2, 3, 5)]
+    assert backup_store.rebuild_index(directory) == 4
+
+
+@pytest.mark.parametrize('damage', ['delete', 'corrupt'])
+def test_missing_or_corrupt_index_is_rebuilt_from_the_snapshots(tmp_path, clock, damage):
+    directory = str(tmp_path)
+    for n in range(5):
+        backup_store.write_snapshot(directory, _document(n))
+    expected = backup_store.index_records(directory)
+    index_path = tmp_path / backup_store.INDEX_FILENAME
+    if damage == 'delete':
+        index_path.unlink()
+    else:
+        index_path.write_text('{"entries": [tru')
+    assert backup_store.read_index(directory) == {}
+    assert backup_store.index_records(directory) == expected
+    assert len(backup_store.read_index(directory)) == 5
+
+
+def test_listing_reads_only_the_index(tmp_path, clock, monkeypatch):
+    directory = str(tmp_path)
+    for n in range(5):
+        backup_store.write_snapshot(directory, _document(n))
+
+    def _no_snapshot_reads(*args, **kwargs):
+        raise AssertionError('listing decoded a snapshot')
+
+    monkeypatch.setattr(backup_store, 'read_snapshot', _no_snapshot_reads)
+    records = backup_store.index_records(directory)
+    assert [record['nodes'] for record in records] == [40] * 5
+    assert records[0]['hash'] == backup_store.content_hash(backup_store.backup_content(_document(4)))
@@ -0,0 +1,63 @@
+from backend.services import cache
+from backend.services.cache import NodeResultCache, run_cached
+
+
+def _counting(calls):
+    def _execute():
+        calls.append(1)
+        return {'success': True, 'output': '', 'return_value': len(calls)}
+    return _execute
+
+
+def _run(result_cache, node, args, calls):
+    return run_cached(result_cache, None, str(node), args, {}, _counting(calls))
+
+
+def test_editing_the_source_or_a_local_import_is_a_miss(tmp_path):
+    helper = tmp_path / 'helper.py'
+    helper.write_text('FACTOR = 2\n')
+    node = tmp_path / 'node.py'
+    node.write_text('import helper\n\ndef f(x):\n    return x * helper.FACTOR\n')
+    result_cache, calls = NodeResultCache(str(tmp_path / 'cache')), []
+    assert _run(result_cache, node, {'x': 1}, calls)['cached'] is False
+    assert _run(result_cache, node, {'x': 1}, calls)['cached'] is True
+    node.write_text('import helper\n\ndef f(x):\n    return x * helper.FACTOR + 0\n')
+    assert _run(result_cache, node, {'x': 1}, calls)['cached'] is False
+    helper.write_text('FACTOR = 30\n')
+    assert _run(result_cache, node, {'x': 1}, calls)['cached'] is False
+    assert len(calls) == 3
+
+
+def test_changed_upstream_inputs_are_a_miss(tmp_path):
+    node = tmp_path / 'node.py'
+    node.write_text('def f(x):\n    return x\n')
+    result_cache, calls = NodeResultCache(str(tmp_path / 'cache')), []
+    _run(result_cache, node, {'x': 1}, calls)
+    # variables the function does not take don't bust the entry
+    assert _run(result_cache, node, {'x': 1, 'unrelated': 5}, calls)['cached'] is True
+    assert _run(result_cache, node, {'x': 2}, calls)['cached'] is False
+    assert run_cached(result_cache, None, str(node), {'x': 2}, {'name': 'ada'}, _counting(calls))['cached'] is False
+    assert len(calls) == 3
+
+
+def test_a_different_runtime_is_a_miss(tmp_path, monkeypatch):
+    node = tmp_path / 'node.py'
+    node.write_text('def f():\n    return 1\n')
+    result_cache, calls = NodeResultCache(str(tmp_path / 'cache')), []
+    _run(result_cache, node, {}, calls)
+    monkeypatch.setattr(cache, 'runtime_fingerprint', lambda: 'another python')
+    assert _run(result_cache, node, {}, calls)['cached'] is False
+    assert _run(result_cache, node, {}, calls)['cached'] is True
+    assert len(calls) == 2
+
+
+def test_execute_node_flags_cached_results(client, tmp_path):
+    (tmp_path / 'add.py').write_text('def add(a, b):\n    print("adding")\n    return a + b\n')
+    body = {'node_id': 'n1', 'python_file': 'nodes/add.py', 'function_args': {'a': 1, 'b': 2}, 'use_cache': True}
+    first = client.post('/api/execute-node', json=body).get_json()
+    assert first['success'] and first['cached'] is False
+    second = client.post('/api/execute-node', json=body).get_json()
+    assert second['cached'] is True
+    assert (second['return_value'], second['output']) == (3, 'adding')
+    uncached = client.post('/api/execute-node', json=dict(body, use_cache=False)).get_json()
+    assert 'cached' not in uncached
@@ -0,0 +1,77 @@
+import json
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from flowcraft.cli import _parse_inputs, run_command
+
+START = 'def start(n):\n    total = n * 2\n    return total\n'
+AFTER = 'def after(total):\n    result = total + 1\n    return result\n'
+
+
+@pytest.fixture
+def gated_flow(make_flow):
+    return make_flow('gated', {'start': START, 'gate': {'type': 'if_node'}, 'after': AFTER}, [
+        {'source': 'start', 'target': 'gate', 'conditions': [{'variable': 'total', 'operator': '==', 'value': 42}]},
+        ('gate', 'after'),
+    ])
+
+
+def _json_outcome(capsys):
+    return json.loads(capsys.readouterr().out)
+
+
+def test_parse_inputs_keeps_json_types():
+    assert _parse_inputs(['n=50', 'xs=[1, 2]', 'name=ada', 'flag=true', 'empty=']) == {
+        'n': 50, 'xs': [1, 2], 'name': 'ada', 'flag': True, 'empty': '',
+    }
+    with pytest.raises(ValueError, match='key=value'):
+        _parse_inputs(['novalue'])
+
+
+def test_met_condition_runs_every_node(gated_flow, capsys):
+    assert run_command([gated_flow[:-5], '--input', 'n=21', '--json', '--quiet']) == 0
+    outcome = _json_outcome(capsys)
+    assert outcome['status'] == 'success'
+    assert outcome['final_variables']['result'] == 43
+    assert 'skipped_nodes' not in outcome
+
+
+def test_unmet_condition_skips_the_gated_node(gated_flow, capsys):
+    assert run_command([gated_flow, '--input', 'n=1', '--json', '--quiet']) == 0
+    outcome = _json_outcome(capsys)
+    assert outcome['skipped_nodes'] == ['after']
+    assert 'result' not in outcome['final_variables']
+
+
+def test_failed_run_exits_1(make_flow):
+    flowchart = make_flow('broken', {'a': 'def a():\n    raise ValueError("boom")\n', 'b': 'def b():\n    pass\n'}, [('a', 'b')])
+    assert run_command([flowchart, '--quiet']) == 1
+
+
+def test_runs_that_cannot_start_exit_2(app, make_flow):
+    assert run_command(['missing']) == 2
+    assert run_command([make_flow('lonely', {'a': 'def a():\n    pass\n'})]) == 2
+    with pytest.raises(SystemExit) as exc:
+        run_command(['missing', '--input', 'novalue'])
+    assert exc.value.code == 2
+
+
+def test_ctrl_c_stops_the_run_and_exits_130(make_flow, tmp_path):
+    started = tmp_path / 'started'
+    slow = f'import time\n\n\ndef slow():\n    open({str(started)!r}, "w").close()\n    time.sleep(30)\n'
+    flowchart = make_flow('slow', {'slow': slow, 'b': 'def b():\n    pass\n'}, [('slow', 'b')])
+
+    def _interrupt():
+        deadline = time.monotonic() + 20
+        while not started.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        os.kill(os.getpid(), signal.SIGINT)
+
+    threading.Thread(target=_interrupt, daemon=True).start()
+    began = time.monotonic()
+    assert run_command([flowchart, '--quiet']) == 130
+    assert time.monotonic() - began < 20
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+
+from backend.services.storage import save_execution_history
+
+
+def _runs(app):
+    """five runs newest last; the third failed, the fourth saved nothing"""
+    ids = []
+    with app.app_context():
+        for i in range(5):
+            execution_data = {'status': 'failed' if i == 2 else 'success', 'results': [{'node_id': 'a', 'success': i != 2}]}
+            if i != 3:
+                execution_data['data_saves'] = [
+                    {'node_name': 'total', 'variable_name': 'total', 'variable_content': i * 10},
+                    {'node_name': 'stats', 'variable_name': 'mean', 'variable_content': {'i': i}},
+                ]
+            ids.append(save_execution_history('flow.json', execution_data))
+    return ids
+
+
+def test_pages_newest_first_with_before_cursor(app, client):
+    ids = _runs(app)
+    first = client.get('/api/data-matrix?flowchart_name=flow.json&limit=2').get_json()
+    runs = dict(zip(first['runs']['columns'], first['runs']['values']))
+    assert runs['execution_id'] == [ids[4], ids[3]]
+    assert first['data_saves']['columns'] == [{'node_name': 'total', 'variable_name': 'total'}, {'node_name': 'stats', 'variable_name': 'mean'}]
+    assert first['data_saves']['values'] == [[40, None], [{'i': 4}, None]]
+    assert first['has_more'] is True
+
+    seen, before = [], None
+    while True:
+        query = '/api/data-matrix?flowchart_name=flow.json&limit=2' + (f'&before={before}' if before else '')
+        page = client.get(query).get_json()
+        seen += page['runs']['values'][0]
+        before = page['next_before']
+        if not page['has_more']:
+            break
+    assert seen == ids[::-1]
+
+
+def test_status_filter(app, client):
+    ids = _runs(app)
+    page = client.get('/api/data-matrix?flowchart_name=flow.json&status=failed').get_json()
+    assert page['runs']['values'][0] == [ids[2]]
+    assert page['data_saves']['values'][0] == [20]
+    both = client.get('/api/data-matrix?flowchart_name=flow.json&status=failed,success').get_json()
+    assert both['count'] == 5
+
+
+def test_csv_and_jsonl_exports(app, client):
+    ids = _runs(app)
+    response = client.get('/api/data-matrix?flowchart_name=flow.json&format=csv&status=success')
+    assert response.mimetype == 'text/csv'
+    assert 'flow_data.csv' in response.headers['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row['execution_id'] for row in rows] == [ids[4], ids[3], ids[1], ids[0]]
+    assert [row['total'] for row in rows] == ['40', '', '10', '0']
+    assert json.loads(rows[0]['stats.mean']) == {'i': 4}
+
+    response = client.get('/api/data-matrix?flowchart_name=flow.json&format=jsonl&limit=2')
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['execution_id'] for line in lines] == [ids[4], ids[3]]
+    assert lines[0]['data_saves'] == {'total': 40, 'stats.mean': {'i': 4}}
+    assert lines[1]['data_saves'] == {}
+
+
+def test_unknown_format_is_rejected(client):
+    response = client.get('/api/data-matrix?format=xml')
+    assert response.status_code == 400
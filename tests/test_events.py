@@ -0,0 +1,39 @@
+from backend.services.events import EventLog
+
+
+def _names(log, since=0):
+    return [(event['seq'], event['event']) for event in log.iter_events(since)]
+
+
+def test_replay_from_sequence_number():
+    log = EventLog()
+    for name in ('start', 'item', 'item'):
+        log.publish(name, {})
+    log.publish('done', {}, close=True)
+    assert _names(log, 2) == [(2, 'item'), (3, 'done')]
+
+
+def test_transient_events_are_capped_and_lifecycle_events_kept():
+    log = EventLog(transient=('stdout',), keep_transient=3)
+    log.publish('node_start', {})
+    for line in range(10):
+        log.publish('stdout', {'line': line})
+    log.publish('result', {})
+    log.publish('done', {}, close=True)
+    events = list(log.iter_events())
+    assert [event['event'] for event in events] == ['node_start', 'stdout', 'stdout', 'stdout', 'result', 'done']
+    assert [event['data'].get('line') for event in events[1:4]] == [7, 8, 9]
+    assert [event['seq'] for event in events] == [0, 8, 9, 10, 11, 12]
+    assert len(log.events) <= 3 * 2 + 3
+
+
+def test_tail_keeps_up_with_live_output():
+    log = EventLog(transient=('stdout',), keep_transient=2)
+    tail = log.iter_events()
+    seen = []
+    for line in range(5):
+        log.publish('stdout', {'line': line})
+        seen.append(next(tail)['data']['line'])
+    log.publish('done', {}, close=True)
+    assert seen == [0, 1, 2, 3, 4]
+    assert next(tail)['event'] == 'done'
@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+
+from backend.services.executor import DagExecutor, execution_order_for
+
+
+def _flow(tmp_path, links, types=None):
+    types = types or {}
+    ids = sorted({link['source'] for link in links} | {link['target'] for link in links})
+    nodes = []
+    for i, node_id in enumerate(ids):
+        node = {'id': node_id, 'name': node_id, 'type': types.get(node_id, 'python_file'), 'x': 0, 'y': i * 100}
+        if node['type'] == 'python_file':
+            (tmp_path / f'{node_id}.py').write_text(f'def {node_id}():\n    pass\n')
+            node['pythonFile'] = f'{node_id}.py'
+        nodes.append(node)
+    return {'nodes': nodes, 'links': links}
+
+
+class Recorder:
+    """run_node stand-in returning `{<id>_out: <id>}` and recording what each node saw"""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.seen = {}
+        self.finished = []
+        self._lock = threading.Lock()
+
+    def __call__(self, node, file_path, function_args, input_values):
+        with self._lock:
+            self.seen[node['id']] = (function_args, list(self.finished))
+            self.finished.append(node['id'])
+        if node['id'] in self.fail:
+            return {'success': False, 'error': 'boom', 'output': '', 'return_value': None}
+        return {'success': True, 'output': '', 'return_value': {f"{node['id']}_out": node['id']}, '_return_name': None}
+
+
+DIAMOND = [
+    {'source': 'a', 'target': 'b'}, {'source': 'a', 'target': 'c'},
+    {'source': 'b', 'target': 'd'}, {'source': 'c', 'target': 'd'},
+]
+
+
+@pytest.mark.parametrize('max_parallel', [1, 4])
+def test_nodes_run_after_their_upstream_and_see_its_values(tmp_path, max_parallel):
+    flow = _flow(tmp_path, DIAMOND)
+    run_node = Recorder()
+    outcome = DagExecutor(flow, ['a', 'b', 'c', 'd'], run_node, str(tmp_path), max_parallel=max_parallel, initial_variables={'seed': 1}).run()
+    assert outcome['status'] == 'success'
+    assert [r['node_id'] for r in outcome['results']] == ['a', 'b', 'c', 'd']
+    args, finished_before = run_node.seen['d']
+    assert {'a', 'b', 'c'} <= set(finished_before)
+    assert args == {'seed': 1, 'a_out': 'a', 'b_out': 'b', 'c_out': 'c'}
+    assert run_node.seen['b'][0] == {'seed': 1, 'a_out': 'a'}
+
+
+def test_failure_stops_downstream_nodes(tmp_path):
+    flow = _flow(tmp_path, DIAMOND)
+    run_node = Recorder(fail={'b'})
+    outcome = DagExecutor(flow, ['a', 'b', 'c', 'd'], run_node, str(tmp_path), max_parallel=1).run()
+    assert outcome['status'] == 'failed'
+    assert outcome['failed_at_index'] == 1
+    assert 'd' not in run_node.seen
+
+
+def test_cycle_is_reported(tmp_path):
+    flow = _flow(tmp_path, [{'source': 'a', 'target': 'b'}, {'source': 'b', 'target': 'a'}])
+    outcome = DagExecutor(flow, ['a', 'b'], Recorder(), str(tmp_path)).run()
+    assert outcome['status'] == 'error'
+    assert 'cycle' in outcome['message']
+
+
+def test_unmet_condition_skips_nodes_behind_the_if_node(tmp_path):
+    links = [
+        {'source': 'a', 'target': 'gate', 'conditions': [{'variable': 'a_out', 'operator': '==', 'value': 'nope'}]},
+        {'source': 'gate', 'target': 'b'},
+        {'source': 'b', 'target': 'c'},
+    ]
+    flow = _flow(tmp_path, links, types={'gate': 'if_node'})
+    events = []
+    run_node = Recorder()
+    outcome = DagExecutor(
+        flow, ['a', 'gate', 'b', 'c'], run_node, str(tmp_path),
+        on_event=lambda event, data: events.append((event, data.get('node_id'))), evaluate_conditions=True,
+    ).run()
+    assert outcome['status'] == 'success'
+    assert outcome['skipped_nodes'] == ['b']
+    assert ('condition', 'gate') in events and ('node_skipped', 'b') in events
+    assert set(run_node.seen) == {'a', 'c'}
+    # the skipped node forwards what it received
+    assert run_node.seen['c'][0] == {'a_out': 'a'}
+
+
+def test_met_condition_runs_everything(tmp_path):
+    links = [
+        {'source': 'a', 'target': 'gate', 'conditions': [{'variable': 'a_out', 'operator': '==', 'value': 'a'}]},
+        {'source': 'gate', 'target': 'b'},
+    ]
+    flow = _flow(tmp_path, links, types={'gate': 'if_node'})
+    run_node = Recorder()
+    outcome = DagExecutor(flow, ['a', 'gate', 'b'], run_node, str(tmp_path), evaluate_conditions=True).run()
+    assert 'skipped_nodes' not in outcome
+    assert set(run_node.seen) == {'a', 'b'}
+
+
+def test_execution_order_follows_links_then_position(tmp_path):
+    flow = _flow(tmp_path, DIAMOND)
+    by_id = {node['id']: node for node in flow['nodes']}
+    # c sits above b on the canvas, so it goes first among the ready pair
+    by_id['c']['y'], by_id['b']['y'] = 50, 250
+    assert execution_order_for(flow) == ['a', 'c', 'b', 'd']
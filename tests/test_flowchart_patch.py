@@ -0,0 +1,102 @@
+import copy
+import json
+
+import pytest
+
+from backend.services.flowchart_patch import PatchError, apply_collection_edits, apply_document_delta, apply_json_patch, document_delta
+
+BASE = {
+    'nodes': [{'id': 'a', 'name': 'load'}, {'id': 'b', 'name': 'clean'}, {'id': 'c', 'name': 'save'}],
+    'links': [{'source': 'a', 'target': 'b'}, {'source': 'b', 'target': 'c'}],
+    'groups': [],
+    'title': 'flow',
+}
+
+
+@pytest.mark.parametrize('upsert, delete', [
+    (None, {'nodes': [{'id': [1]}]}),
+    (None, {'nodes': [{'a': 1}, [1]]}),
+    (None, {'links': [{'source': {'x': 1}, 'target': 'b'}]}),
+    (None, {'links': [[['a'], 'b']]}),
+    ({'nodes': [{'id': {'x': 1}}]}, None),
+    ({'links': [{'source': 'a', 'target': ['b']}]}, None),
+])
+def test_unhashable_identities_are_rejected(upsert, delete):
+    with pytest.raises(PatchError):
+        apply_collection_edits({'nodes': [{'id': 'a'}], 'links': []}, upsert, delete)
+
+
+def test_stored_items_with_odd_ids_are_left_alone():
+    document = {'nodes': [{'id': ['legacy']}, {'id': 'a'}]}
+    result = apply_collection_edits(document, {'nodes': [{'id': 'b'}]}, {'nodes': ['a']})
+    assert result['nodes'] == [{'id': ['legacy']}, {'id': 'b'}]
+
+
+def test_patch_route_answers_400_for_unhashable_ids(client):
+    response = client.patch('/api/flowchart', json={'version': 0, 'delete': {'nodes': [{'id': [1]}]}})
+    assert response.status_code == 400
+    assert response.json['code'] == 'invalid_patch'
+
+
+def test_json_patch_applies_without_touching_the_input():
+    document = copy.deepcopy(BASE)
+    patched = apply_json_patch(document, [
+        {'op': 'replace', 'path': '/nodes/1/name', 'value': 'tidy'},
+        {'op': 'add', 'path': '/nodes/-', 'value': {'id': 'd'}},
+        {'op': 'remove', 'path': '/links/0'},
+        {'op': 'move', 'from': '/title', 'path': '/name'},
+        {'op': 'test', 'path': '/name', 'value': 'flow'},
+    ])
+    assert document == BASE
+    assert [n['id'] for n in patched['nodes']] == ['a', 'b', 'c', 'd']
+    assert patched['nodes'][1]['name'] == 'tidy'
+    assert patched['links'] == [{'source': 'b', 'target': 'c'}]
+    assert 'title' not in patched and patched['name'] == 'flow'
+    # untouched containers are shared, not copied
+    assert patched['groups'] is document['groups']
+
+
+@pytest.mark.parametrize('operations', [
+    [{'op': 'test', 'path': '/title', 'value': 'other'}],
+    [{'op': 'remove', 'path': '/nodes/9'}],
+    [{'op': 'replace', 'path': '', 'value': []}],
+    [{'op': 'frobnicate', 'path': '/title'}],
+    [{'op': 'move', 'from': '/nodes', 'path': '/nodes/0'}],
+])
+def test_bad_json_patches_raise(operations):
+    with pytest.raises(PatchError):
+        apply_json_patch(BASE, operations)
+
+
+def test_collection_edits_upsert_in_place_and_append():
+    result = apply_collection_edits(
+        BASE,
+        upsert={'nodes': [{'id': 'b', 'name': 'tidy'}, {'id': 'd'}], 'links': [{'source': 'c', 'target': 'd'}]},
+        delete={'nodes': ['a'], 'links': [{'source': 'a', 'target': 'b'}]},
+    )
+    assert result['nodes'] == [{'id': 'b', 'name': 'tidy'}, {'id': 'c', 'name': 'save'}, {'id': 'd'}]
+    assert result['links'] == [{'source': 'b', 'target': 'c'}, {'source': 'c', 'target': 'd'}]
+    assert result['title'] == 'flow'
+
+
+@pytest.mark.parametrize('change', [
+    lambda d: d['nodes'][1].update(name='tidy'),
+    lambda d: d['nodes'].append({'id': 'd'}),
+    lambda d: d['nodes'].pop(0),
+    lambda d: d['links'].pop(),
+    lambda d: d.update(title='renamed'),
+    lambda d: d.pop('groups'),
+    lambda d: d.update(annotations=[{'id': 'n1', 'text': 'hi'}]),
+    # reordering cannot be expressed as edits and falls back to a whole value
+    lambda d: d['nodes'].reverse(),
+])
+def test_document_delta_round_trips(change):
+    document = copy.deepcopy(BASE)
+    change(document)
+    delta = document_delta(BASE, document)
+    assert apply_document_delta(BASE, delta) == document
+    assert len(json.dumps(delta)) <= len(json.dumps(document))
+
+
+def test_identical_documents_have_an_empty_delta():
+    assert document_delta(BASE, copy.deepcopy(BASE)) == {}
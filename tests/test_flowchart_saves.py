@@ -0,0 +1,46 @@
+import pytest
+
+from backend.services.flowchart_cache import get_flowchart_cache
+from backend.services.flowchart_saves import flush_flowchart_saves, save_flowchart_version
+from backend.services.storage import load_flowchart
+
+
+@pytest.fixture
+def coalescing(app):
+    app.config['FLOWCRAFT_SAVE_COALESCE_MS'] = 60000
+    with app.app_context():
+        yield app
+        flush_flowchart_saves()
+
+
+def test_legacy_key_is_stripped_and_staged_entry_cleared(coalescing):
+    accepted, version = save_flowchart_version('legacy.json', {'nodes': [{'id': 'a'}], 'executions': [1, 2]})
+    assert (accepted, version) == (True, 1)
+    assert 'executions' not in load_flowchart('legacy.json')
+    flush_flowchart_saves('legacy.json')
+    assert get_flowchart_cache().stats()['staged'] == 0
+    assert load_flowchart('legacy.json') == {'nodes': [{'id': 'a'}], 'version': 1}
+
+
+def test_failed_write_is_queued_again(coalescing, monkeypatch):
+    from backend.services import flowchart_saves
+
+    real_write = flowchart_saves._write
+    calls = []
+
+    def flaky_write(flowchart_name, document, backup=True):
+        calls.append(document)
+        if len(calls) == 1:
+            raise OSError('disk full')
+        real_write(flowchart_name, document, backup)
+
+    monkeypatch.setattr(flowchart_saves, '_write', flaky_write)
+    save_flowchart_version('flaky.json', {'nodes': []})
+    flush_flowchart_saves('flaky.json')
+    assert len(calls) == 1
+    assert flowchart_saves._pending and flowchart_saves._timers
+    assert load_flowchart('flaky.json')['version'] == 1
+    flush_flowchart_saves('flaky.json')
+    assert len(calls) == 2
+    assert not flowchart_saves._pending and not flowchart_saves._timers
+    assert get_flowchart_cache().stats()['staged'] == 0
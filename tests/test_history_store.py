@@ -0,0 +1,127 @@
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.services.history_store import HistoryStore
+from backend.services.storage import delete_execution_history, save_execution_history, get_data_saves, get_execution_entry, get_execution_summaries, import_json_history
+from flowcraft.cli import history_command
+
+
+def _put(store, execution_id, timestamp, status='success', data_saves=None):
+    execution_data = {'status': status, 'results': [{'node_id': 'a', 'success': status == 'success'}]}
+    if data_saves is not None:
+        execution_data['data_saves'] = data_saves
+    entry = {'execution_id': execution_id, 'timestamp': timestamp, 'flowchart_name': 'flow.json', 'execution_data': execution_data}
+    store.put(entry, {'execution_id': execution_id, 'timestamp': timestamp, 'status': status})
+
+
+def test_summaries_page_newest_first_with_stable_cursor(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.sqlite3'))
+    # two runs share a timestamp; the execution id breaks the tie
+    for execution_id, timestamp in [('r1', '2026-01-01'), ('r2', '2026-01-02'), ('r3', '2026-01-02'), ('r4', '2026-01-03'), ('r5', '2026-01-04')]:
+        _put(store, execution_id, timestamp, status='failed' if execution_id == 'r4' else 'success')
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.summaries('flow', limit=2, before=cursor)
+        seen.extend(summary['execution_id'] for summary in page)
+        if cursor is None:
+            break
+    assert seen == ['r5', 'r4', 'r3', 'r2', 'r1']
+    assert [s['execution_id'] for s in store.summaries('flow', statuses=['failed'])[0]] == ['r4']
+    assert [s['execution_id'] for s in store.summaries('flow', since='2026-01-02', until='2026-01-04')[0]] == ['r4', 'r3', 'r2']
+    assert store.summaries('other')[0] == []
+
+
+def test_older_databases_are_backfilled_on_open(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    saves = [{'node_name': 'save', 'variable_name': 'total', 'variable_content': 3}]
+    _put(HistoryStore(path), 'r1', '2026-01-01', data_saves=saves)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute('DELETE FROM data_saves')
+        conn.execute('PRAGMA user_version = 0')
+    conn.close()
+    store = HistoryStore(path)
+    assert store.data_saves(['r1']) == {'r1': [('save', 'total', 'integer', 3)]}
+    assert store._db().execute('PRAGMA user_version').fetchone()[0] >= 1
+
+
+def _write_json_runs(app, flowchart='flow', runs=3, status='success'):
+    history_dir = os.path.join(app.config['FLOWCRAFT_HISTORY_DIR'], flowchart)
+    os.makedirs(history_dir, exist_ok=True)
+    for n in range(runs):
+        with open(os.path.join(history_dir, f'run{n}.json'), 'w') as f:
+            json.dump({'timestamp': f'2026-01-0{n + 1}T00:00:00', 'execution_data': {'status': status, 'results': []}}, f)
+    return history_dir
+
+
+def test_json_history_is_imported_on_first_read(app):
+    history_dir = _write_json_runs(app)
+    with app.app_context():
+        page, cursor = get_execution_summaries('flow.json', limit=2)
+        assert [s['execution_id'] for s in page] == ['run2', 'run1']
+        page, cursor = get_execution_summaries('flow.json', limit=2, before=cursor)
+        assert ([s['execution_id'] for s in page], cursor) == (['run0'], None)
+        assert get_execution_entry('flow.json', 'run1')['flowchart_name'] == 'flow.json'
+        assert get_data_saves(['run1']) == {'run1': []}
+        # deleting a run drops its json file too, so it is not imported again
+        assert delete_execution_history('flow.json', 'run1')
+        assert not os.path.exists(os.path.join(history_dir, 'run1.json'))
+        assert [s['execution_id'] for s in get_execution_summaries('flow.json')[0]] == ['run2', 'run0']
+
+
+def test_import_keeps_stored_runs_unless_replace(app):
+    _write_json_runs(app)
+    with app.app_context():
+        assert import_json_history('flow') == 3
+        assert import_json_history() == 0
+        _write_json_runs(app, status='failed')
+        assert import_json_history('flow') == 0
+        assert get_execution_entry('flow.json', 'run0')['execution_data']['status'] == 'success'
+        assert import_json_history('flow', replace=True) == 3
+        assert get_execution_entry('flow.json', 'run0')['execution_data']['status'] == 'failed'
+
+
+def test_history_import_command(app, tmp_path, capsys):
+    _write_json_runs(app, flowchart='other', runs=2)
+    assert history_command(['import', '--data-dir', str(tmp_path)]) == 0
+    assert 'imported 2 runs' in capsys.readouterr().err
+    assert history_command(['import', '--flowchart', 'other']) == 0
+    assert 'imported 0 runs' in capsys.readouterr().err
+    assert history_command(['import', '--replace']) == 0
+    assert 'imported 2 runs' in capsys.readouterr().err
+
+
+@pytest.fixture
+def away_from_utc(monkeypatch):
+    """a server local time zone well off utc, so naive and utc timestamps differ"""
+    if not hasattr(time, 'tzset'):
+        pytest.skip('needs time.tzset')
+    monkeypatch.setenv('TZ', 'Asia/Kolkata')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_history_bounds_with_an_offset_are_compared_in_local_time(app, client, away_from_utc):
+    with app.app_context():
+        execution_id = save_execution_history('flow.json', {'status': 'success', 'results': []})
+    now = datetime.now(timezone.utc)
+
+    def _ids(**bounds):
+        query = '&'.join(f'{key}={value.replace("+", "%2B")}' for key, value in bounds.items())
+        body = client.get(f'/api/history?flowchart_name=flow.json&{query}').get_json()
+        assert body['status'] == 'success', body
+        return [item['execution_id'] for item in body['history']]
+
+    hour_ago, in_an_hour = now - timedelta(hours=1), now + timedelta(hours=1)
+    plus_two = timezone(timedelta(hours=2))
+    assert _ids(since=hour_ago.strftime('%Y-%m-%dT%H:%M:%SZ')) == [execution_id]
+    assert _ids(since=in_an_hour.strftime('%Y-%m-%dT%H:%M:%SZ')) == []
+    assert _ids(until=hour_ago.astimezone(plus_two).isoformat()) == []
+    assert _ids(until=in_an_hour.astimezone(plus_two).isoformat()) == [execution_id]
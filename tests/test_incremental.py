@@ -0,0 +1,70 @@
+from backend.services.incremental import baseline_results
+from backend.services.storage import save_execution_history
+
+
+def _result(node_id, success=True, fingerprint='f', **extra):
+    return dict({'node_id': node_id, 'success': success, 'fingerprint': fingerprint, 'inputs_hash': 'h'}, **extra)
+
+
+def test_baseline_takes_newest_usable_result_per_node(app):
+    with app.app_context():
+        old = save_execution_history('flow', {'status': 'success', 'results': [_result(1, return_value='old'), _result('b', return_value='old')]})
+        new = save_execution_history('flow', {'status': 'failed', 'results': [
+            _result(1, return_value='new'),
+            _result('b', success=False),
+            _result('c', fingerprint=None),
+        ]})
+        save_execution_history('other', {'status': 'success', 'results': [_result('b', return_value='other')]})
+        baseline = baseline_results('flow')
+        assert set(baseline) == {1, 'b'}
+        assert (baseline[1]['return_value'], baseline[1]['execution_id']) == ('new', new)
+        assert (baseline['b']['return_value'], baseline['b']['execution_id']) == ('old', old)
+        assert set(baseline_results('flow', [1])) == {1}
+        assert baseline_results('missing') == {}
+
+
+COUNTED_BYTES = '''import os
+
+
+def make():
+    # one line per real execution, so tests can tell runs from reuse
+    with open(os.path.join(os.path.dirname(__file__), 'calls.txt'), 'a') as f:
+        f.write('x')
+    return b'payload' * 10
+'''
+
+
+def _calls(tmp_path):
+    path = tmp_path / 'calls.txt'
+    return len(path.read_text()) if path.exists() else 0
+
+
+def _evict_all(app):
+    from backend.services.artifacts import ArtifactStore
+    assert ArtifactStore(app.config['FLOWCRAFT_ARTIFACT_DIR']).evict(1, min_age=0) >= 1
+
+
+def test_evicted_artifacts_are_not_reused_incrementally(app, client, make_flow, tmp_path):
+    flowchart = make_flow('bytes', {'make': COUNTED_BYTES})
+    body = {'flowchart_name': flowchart, 'execution_order': ['make'], 'incremental': True}
+    first = client.post('/api/run', json=body).json
+    assert first['status'] == 'success' and '$artifact' in first['results'][0]['return_value']
+    assert client.post('/api/run', json=body).json['results'][0]['reused'] is True
+    assert _calls(tmp_path) == 1
+    _evict_all(app)
+    third = client.post('/api/run', json=body).json
+    assert third['results'][0]['reused'] is False
+    assert _calls(tmp_path) == 2
+
+
+def test_evicted_artifacts_turn_cache_hits_into_misses(app, client, make_flow, tmp_path):
+    flowchart = make_flow('bytes', {'make': COUNTED_BYTES})
+    body = {'flowchart_name': flowchart, 'execution_order': ['make'], 'use_cache': True}
+    client.post('/api/run', json=body)
+    assert client.post('/api/run', json=body).json['results'][0]['cached'] is True
+    _evict_all(app)
+    again = client.post('/api/run', json=body).json
+    assert again['status'] == 'success' and again['results'][0]['cached'] is False
+    assert _calls(tmp_path) == 2
+    # the rerun stored the artifact again, so the next run is a hit
+    assert client.post('/api/run', json=body).json['results'][0]['cached'] is True
@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+
+import pytest
+
+from backend.services.jobs import Job, JobManager, QueueFull
+
+
+def _job():
+    return Job('run', 'flow.json', {'execution_order': [1, 2]})
+
+
+def _events(job):
+    return [event['event'] for event in job.events.events]
+
+
+def test_runs_a_job_to_completion():
+    manager = JobManager(max_workers=1, max_queue=1)
+    job = manager.submit(_job(), lambda job: {'status': 'success', 'message': 'ok'})
+    job.future.result(timeout=5)
+    assert job.status == 'completed'
+    assert _events(job) == ['queued', 'started', 'done']
+    assert job.events.closed
+    manager.shutdown()
+
+
+def test_queue_cap_rejects_extra_jobs():
+    manager = JobManager(max_workers=1, max_queue=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def block(job):
+        started.set()
+        release.wait(5)
+        return {'status': 'success'}
+
+    running = manager.submit(_job(), block)
+    assert started.wait(5)
+    queued = manager.submit(_job(), block)
+    with pytest.raises(QueueFull):
+        manager.submit(_job(), block)
+    release.set()
+    running.future.result(timeout=5)
+    queued.future.result(timeout=5)
+    manager.shutdown()
+
+
+def test_cancel_while_queued():
+    manager = JobManager(max_workers=1, max_queue=4)
+    release = threading.Event()
+    started = threading.Event()
+
+    def block(job):
+        started.set()
+        release.wait(5)
+        return {'status': 'success'}
+
+    manager.submit(_job(), block)
+    assert started.wait(5)
+    queued = manager.submit(_job(), block)
+    assert manager.cancel(queued)
+    assert queued.status == 'cancelled'
+    assert queued.events.closed
+    release.set()
+    manager.shutdown()
+
+
+def test_cancel_after_pickup_finishes_the_job():
+    manager = JobManager(max_workers=1, max_queue=1)
+    job = _job()
+    # the worker took the job, then cancel arrived before it started running
+    job.cancel_event.set()
+    manager._run(job, lambda job: pytest.fail('cancelled job must not run'))
+    assert job.status == 'cancelled'
+    assert job.finished_at is not None
+    assert _events(job) == ['done']
+    assert job.events.closed
+    manager.shutdown()
+
+
+def test_cancel_running_job_is_reported_cancelled():
+    manager = JobManager(max_workers=1, max_queue=1)
+    started = threading.Event()
+
+    def work(job):
+        started.set()
+        job.cancel_event.wait(5)
+        return {'status': 'cancelled', 'message': 'stopped'}
+
+    job = manager.submit(_job(), work)
+    assert started.wait(5)
+    assert manager.cancel(job)
+    job.future.result(timeout=5)
+    assert job.status == 'cancelled'
+    manager.shutdown()
+
+
+def test_queued_job_runs_the_flowchart_as_it_is_when_it_starts(client, make_flow, tmp_path, monkeypatch):
+    from backend.services import jobs
+
+    manager = JobManager(max_workers=1, max_queue=4)
+    monkeypatch.setattr(jobs, '_manager', manager)
+    release = threading.Event()
+    started = threading.Event()
+
+    def block(job):
+        started.set()
+        release.wait(5)
+        return {'status': 'success'}
+
+    manager.submit(_job(), block)
+    assert started.wait(5)
+    flowchart = make_flow('queued', {'a': 'def a():\n    value = "old"\n    return value\n', 'b': 'def b(value):\n    return value\n'}, [('a', 'b')])
+    response = client.post('/api/jobs', json={'flowchart_name': flowchart, 'execution_order': ['a', 'b']})
+    assert response.status_code == 202
+    job = manager.get(response.get_json()['job_id'])
+    assert job.status == 'queued'
+    # point node a at another script while the job waits
+    (tmp_path / 'newer.py').write_text('def newer():\n    value = "new"\n    return value\n')
+    path = os.path.join(client.application.config['FLOWCRAFT_FLOWCHARTS_DIR'], flowchart)
+    with open(path) as f:
+        document = json.load(f)
+    document['nodes'][0]['pythonFile'] = 'nodes/newer.py'
+    with open(path, 'w') as f:
+        json.dump(document, f)
+    release.set()
+    job.future.result(timeout=30)
+    assert job.status == 'completed', job.outcome
+    assert [r['return_value'] for r in job.outcome['results']] == ['new', 'new']
+    manager.shutdown()
@@ -0,0 +1,47 @@
+import builtins
+
+from backend.services.kernel import Kernel
+
+
+def _write(tmp_path, name, source):
+    path = tmp_path / name
+    path.write_text(source)
+    return str(path)
+
+
+def test_binds_values_from_nodes_further_upstream(tmp_path):
+    a = _write(tmp_path, 'a.py', 'def a():\n    x = 5\n    return x\n')
+    b = _write(tmp_path, 'b.py', 'def b(x):\n    y = x + 1\n    return y\n')
+    c = _write(tmp_path, 'c.py', 'def c(x, y):\n    return x * y\n')
+    kernel = Kernel()
+    assert kernel.run({'node_id': 1, 'file_path': a, 'return_name': 'x'})['success']
+    assert kernel.run({'node_id': 2, 'file_path': b, 'upstream': [1], 'return_name': 'y'})['success']
+    # c only lists b upstream but also takes a's `x`, as it would under DagExecutor
+    result = kernel.run({'node_id': 3, 'file_path': c, 'upstream': [2]})
+    assert result['success'], result['error']
+    assert result['return_value'] == 30
+    assert result['bound_from_session'] == ['x', 'y']
+
+
+def test_restores_input_after_each_run(tmp_path):
+    ok = _write(tmp_path, 'ok.py', 'def f():\n    return input("name")\n')
+    bad = _write(tmp_path, 'bad.py', 'def f():\n    raise ValueError("boom")\n')
+    original = builtins.input
+    kernel = Kernel()
+    assert kernel.run({'node_id': 1, 'file_path': ok, 'input_values': {'name': 'ada'}})['return_value'] == 'ada'
+    assert builtins.input is original
+    assert not kernel.run({'node_id': 2, 'file_path': bad})['success']
+    assert builtins.input is original
+
+
+def test_sys_exit_fails_the_node_and_keeps_the_session(tmp_path):
+    a = _write(tmp_path, 'a.py', 'def a():\n    x = 5\n    return x\n')
+    bail = _write(tmp_path, 'bail.py', 'import sys\n\ndef f():\n    print("leaving")\n    sys.exit(3)\n')
+    b = _write(tmp_path, 'b.py', 'def b(x):\n    return x + 1\n')
+    kernel = Kernel()
+    assert kernel.run({'node_id': 1, 'file_path': a, 'return_name': 'x'})['success']
+    result = kernel.run({'node_id': 2, 'file_path': bail, 'upstream': [1]})
+    assert not result['success']
+    assert 'sys.exit(3)' in result['error']
+    assert result['output'] == 'leaving'
+    assert kernel.run({'node_id': 3, 'file_path': b, 'upstream': [1]})['return_value'] == 6
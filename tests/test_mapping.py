@@ -0,0 +1,67 @@
+import json
+
+from backend.services.artifacts import ArtifactStore, DEFAULT_INLINE_BYTES, encode_value, is_artifact_ref
+from backend.services.mapping import run_map_node
+
+
+def _node(**settings):
+    return {'id': 'm', 'name': 'double', 'type': 'map_node', 'map': dict({'over': 'items', 'item_arg': 'item', 'concurrency': 4}, **settings)}
+
+
+def _double(index, args):
+    return {'success': True, 'output': '', 'return_value': args['item'] * 2}
+
+
+def test_maps_in_item_order():
+    result = run_map_node(_node(), {'items': [3, 1, 2]}, _double)
+    assert result['success']
+    assert result['return_value'] == {'double': [6, 2, 4]}
+
+
+def test_maps_over_artifact_backed_list(tmp_path):
+    items = list(range(20000))
+    assert len(json.dumps(items)) > DEFAULT_INLINE_BYTES
+    store = ArtifactStore(str(tmp_path))
+    ref = encode_value(items, store)
+    assert is_artifact_ref(ref)
+
+    result = run_map_node(_node(chunk_size=1000), {'items': ref}, lambda i, args: {'success': True, 'output': '', 'return_value': [x * 2 for x in args['item']]}, artifact_dir=str(tmp_path))
+    assert result['success'], result['error']
+    assert result['return_value'] == {'double': [x * 2 for x in items]}
+    assert result['map']['total'] == 20
+
+
+def test_missing_artifact_fails_the_node(tmp_path):
+    ref = encode_value(list(range(20000)), ArtifactStore(str(tmp_path / 'a')))
+    result = run_map_node(_node(), {'items': ref}, _double, artifact_dir=str(tmp_path / 'b'))
+    assert not result['success']
+    assert 'could not be loaded' in result['error']
+
+
+def test_rejects_non_list():
+    result = run_map_node(_node(), {'items': {'a': 1}}, _double)
+    assert not result['success']
+    assert 'is not a list' in result['error']
+
+
+def test_skip_policy_leaves_failed_items_out():
+    def run_item(index, args):
+        if args['item'] == 2:
+            return {'success': False, 'error': 'boom', 'output': '', 'return_value': None}
+        return _double(index, args)
+
+    result = run_map_node(_node(on_error='skip'), {'items': [1, 2, 3]}, run_item)
+    assert result['success']
+    assert result['return_value'] == {'double': [2, 6]}
+    assert result['map']['failed'] == 1
+
+
+def test_failed_chunk_is_null_filled_per_item():
+    def _run(index, args):
+        if 4 in args['item']:
+            return {'success': False, 'error': 'boom', 'output': '', 'return_value': None}
+        return {'success': True, 'output': '', 'return_value': [x * 2 for x in args['item']]}
+
+    result = run_map_node(_node(chunk_size=3, on_error='null'), {'items': list(range(8))}, _run)
+    assert result['return_value'] == {'double': [0, 2, 4, None, None, None, 12, 14]}
+    assert result['map']['failed'] == 1
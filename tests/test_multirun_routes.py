@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.mark.parametrize('key, value', [('node_parallel', 'abc'), ('node_parallel', 0), ('max_parallel', 'x'), ('max_parallel', -1)])
+def test_rejects_invalid_parallelism(client, key, value):
+    response = client.post('/api/multirun', json={'execution_order': [1], 'items': [{}], key: value})
+    assert response.status_code == 400
+    assert response.json['message'] == f'{key} must be a positive integer'
@@ -0,0 +1,57 @@
+import json
+
+from backend.services.processes import OutputRing, execute_python_function_with_tracking
+
+# well past a 64 kb pipe buffer on both streams, interleaved so neither pipe is read alone
+CHATTY = '''import sys
+
+
+def chatty(lines):
+    for i in range(lines):
+        print(f"out {i:06d} " + "x" * 100)
+        print(f"err {i:06d} " + "y" * 100, file=sys.stderr)
+    return lines
+'''
+
+
+def test_output_ring_keeps_the_newest_lines_within_budget():
+    ring = OutputRing(25)
+    for i in range(10):
+        ring.append(f"line {i}\n")
+    assert ring.text() == 'line 7\nline 8\nline 9\n'
+    assert ring.truncated and ring.dropped_lines == 7
+    # a single line larger than the budget is still kept
+    big = OutputRing(4)
+    big.append('0123456789\n')
+    assert big.text() == '0123456789\n' and not big.truncated
+
+
+def test_large_streamed_output_does_not_deadlock(tmp_path, monkeypatch):
+    monkeypatch.setenv('FLOWCRAFT_WORKER_POOL_SIZE', '0')
+    monkeypatch.setenv('FLOWCRAFT_STREAM_BUFFER_BYTES', '4096')
+    node = tmp_path / 'chatty.py'
+    node.write_text(CHATTY)
+    seen = {'stdout': 0, 'stderr': 0}
+
+    def on_output(stream, line):
+        seen[stream] += 1
+
+    artifacts = {'artifact_dir': str(tmp_path / 'artifacts'), 'inline_bytes': 1024}
+    result = execute_python_function_with_tracking(str(node), {'lines': 5000}, {}, on_output=on_output, artifacts=artifacts)
+    assert result['success'], result.get('error')
+    assert result['return_value'] == 5000
+    assert seen == {'stdout': 5000, 'stderr': 5000}
+    assert result['output_truncated'] is True
+    assert result['output'].endswith('out 004999 ' + 'x' * 100)
+    assert len(result['output']) <= 4096 and len(result['error']) <= 4096
+
+
+def test_stream_route_sends_every_line_and_a_truncated_result(client, tmp_path, monkeypatch):
+    monkeypatch.setenv('FLOWCRAFT_STREAM_BUFFER_BYTES', '4096')
+    (tmp_path / 'chatty.py').write_text(CHATTY)
+    body = {'node_id': 'n1', 'python_file': 'nodes/chatty.py', 'function_args': {'lines': 2000}}
+    events = client.post('/api/execute-node-stream', json=body).get_data(as_text=True).split('\n\n')
+    kinds = [event.split('\n', 1)[0] for event in events if event]
+    assert kinds.count('event: stdout') == 2000 and kinds.count('event: stderr') == 2000
+    result = json.loads(events[-2].split('data: ', 1)[1])
+    assert result['success'] and result['output_truncated'] is True
@@ -0,0 +1,54 @@
+import io
+
+import pytest
+
+from backend.services import worker_pool
+from backend.services.processes import start_runner_process
+from backend.services.runner import (
+    FRAME_RESULT_JSON, encode_frame, encode_message, read_frames, read_message, run_request,
+)
+
+
+def test_messages_round_trip_back_to_back():
+    stream = io.BytesIO(encode_message({'a': 1}) + encode_message({'b': 'ü'}))
+    assert read_message(stream) == {'a': 1}
+    assert read_message(stream) == {'b': 'ü'}
+    with pytest.raises(EOFError):
+        read_message(stream)
+
+
+@pytest.mark.parametrize('cut', [2, 7])
+def test_truncated_request_raises(cut):
+    # cut inside the length header, then inside the payload
+    message = encode_message({'file_path': 'x.py'})
+    with pytest.raises(EOFError, match='truncated'):
+        read_message(io.BytesIO(message[:cut]))
+
+
+def test_read_frames_drops_a_truncated_trailing_frame():
+    whole = encode_frame(FRAME_RESULT_JSON, b'{"success": true}')
+    partial = encode_frame(FRAME_RESULT_JSON, b'{"success": false}')[:-3]
+    assert read_frames(io.BytesIO(whole + partial)) == [(FRAME_RESULT_JSON, b'{"success": true}')]
+    assert read_frames(io.BytesIO(b'')) == []
+
+
+def test_sys_exit_is_reported_as_a_failure(tmp_path):
+    node = tmp_path / 'bail.py'
+    node.write_text('import sys\n\ndef f():\n    sys.exit(2)\n')
+    result = run_request({'file_path': str(node), 'function_name': 'f', 'function_args': {}, 'input_values': {}})
+    assert not result['success']
+    assert result['error'] == 'Line 4: node called sys.exit(2)'
+
+
+def test_result_goes_to_the_result_pipe_and_stdout_keeps_user_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker_pool, '_pool', None)
+    monkeypatch.setenv('FLOWCRAFT_WORKER_POOL_SIZE', '0')
+    node = tmp_path / 'node.py'
+    node.write_text('def f(x):\n    print("hello")\n    return {"doubled": x * 2}\n')
+    process = start_runner_process(str(node), 'f', {'x': 21}, {}, artifacts={'artifact_dir': str(tmp_path / 'artifacts'), 'inline_bytes': 1024})
+    stdout, stderr = process.communicate(timeout=30)
+    assert process.returncode == 0, stderr
+    assert stdout == 'hello\n'
+    result = process.result_channel.result()
+    assert result['success']
+    assert result['return_value'] == {'doubled': 42}
@@ -0,0 +1,34 @@
+import threading
+import time
+
+from backend.services import sessions
+
+
+def test_reaping_does_not_wait_for_a_busy_session(monkeypatch):
+    release = threading.Event()
+    stopped = threading.Event()
+
+    class BusySession(sessions.SessionKernel):
+        def shutdown(self):
+            # stands in for a run holding the session lock
+            release.wait(5)
+            stopped.set()
+
+    monkeypatch.setenv('FLOWCRAFT_SESSION_MAX', '1')
+    monkeypatch.setattr(sessions, '_sessions', {'old.json': BusySession('old.json')})
+    sessions._sessions['old.json'].last_used = 0
+
+    started = time.monotonic()
+    session = sessions.get_session('new.json')
+    assert time.monotonic() - started < 1
+    assert session.flowchart_name == 'new.json'
+    assert list(sessions._sessions) == ['new.json']
+
+    release.set()
+    assert stopped.wait(5)
+
+
+def test_delete_without_a_body(client):
+    response = client.delete('/api/session')
+    assert response.status_code == 404
+    assert response.get_json()['message'] == 'no session for this flowchart'
@@ -0,0 +1,88 @@
+import os
+import subprocess
+
+import pytest
+
+from backend.services import worker_pool
+from backend.services.processes import spawn_python_process, stop_all_processes
+from backend.services.runner import RESULT_FD_ENV
+from backend.services.worker_pool import PooledProcess, WorkerPool, pool_supported
+
+pytestmark = pytest.mark.skipif(not pool_supported(), reason='the zygote needs fork and scm_rights fd passing')
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(size=1, preload=['json'], max_runs=0)
+    assert pool._workers[0].ready.wait(10)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def script(tmp_path):
+    def _write(source):
+        path = tmp_path / f'script{len(list(tmp_path.iterdir()))}.py'
+        path.write_text(source)
+        return str(path)
+    return _write
+
+
+def test_children_fork_from_the_zygote_with_passed_fds(pool, script):
+    path = script('import os, sys\nprint(os.getppid())\nprint(sys.stdin.read().upper())\nsys.exit(3)\n')
+    proc = pool.spawn([path])
+    stdout, stderr = proc.communicate('hello', timeout=10)
+    assert stdout.split() == [str(pool._workers[0].process.pid), 'HELLO']
+    assert proc.returncode == 3
+    assert pool.stats()['workers'][0]['preloaded'] == ['json']
+
+
+def test_result_channel_reaches_the_server(pool, script):
+    path = script(f'import os\nos.write(int(os.environ["{RESULT_FD_ENV}"]), b"result")\nprint("console")\n')
+    proc = pool.spawn([path], result_pipe=True)
+    stdout, _ = proc.communicate(timeout=10)
+    with os.fdopen(proc.result_fd, 'rb') as channel:
+        assert channel.read() == b'result'
+    assert stdout == 'console\n'
+
+
+def test_workers_recycle_after_max_runs(script):
+    pool = WorkerPool(size=1, preload=[], max_runs=2)
+    try:
+        path = script('print("ok")\n')
+        first = pool._workers[0]
+        for _ in range(2):
+            assert pool.spawn([path]).communicate(timeout=10)[0] == 'ok\n'
+        assert pool.recycled == 1
+        assert pool._workers[0] is not first
+        # the retired zygote exits once its children are done
+        first.process.wait(timeout=10)
+        assert pool.spawn([path]).communicate(timeout=10)[0] == 'ok\n'
+        assert pool.total_runs == 3
+    finally:
+        pool.shutdown()
+
+
+def test_stopping_a_pooled_process_leaves_the_zygote_running(pool, script):
+    proc = pool.spawn([script('import time\ntime.sleep(60)\n')])
+    running = {'node': {'process': proc}}
+    assert stop_all_processes(running) == {'terminated': 1}
+    assert proc.wait(timeout=10) != 0
+    assert running == {}
+    assert pool._workers[0].alive
+    assert pool.spawn([script('print("still here")\n')]).communicate(timeout=10)[0] == 'still here\n'
+
+
+def test_spawn_uses_the_pool_and_falls_back_when_disabled(pool, script, monkeypatch):
+    path = script('print("hi")\n')
+    monkeypatch.setattr(worker_pool, '_pool', pool)
+    proc = spawn_python_process([path])
+    assert isinstance(proc, PooledProcess)
+    assert proc.communicate(timeout=10)[0] == 'hi\n'
+
+    monkeypatch.setattr(worker_pool, '_pool', None)
+    monkeypatch.setenv('FLOWCRAFT_WORKER_POOL_SIZE', '0')
+    proc = spawn_python_process([path])
+    assert isinstance(proc, subprocess.Popen)
+    assert proc.communicate(timeout=10)[0] == 'hi\n'
+    assert worker_pool.get_worker_pool() is None